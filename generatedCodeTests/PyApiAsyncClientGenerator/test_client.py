@@ -1,15 +1,25 @@
+import asyncio
+import copy
 import logging
 import os
+import threading
+import time
 import types
 from datetime import datetime, timezone, timedelta
+from urllib.parse import urlparse
+from uuid import uuid4
 
+import aiohttp
 import pytest
+from aiohttp import test_utils, web
 from marshmallow.exceptions import ValidationError
+from typeguard import TypeCheckError
 
-from generated.api import Generated, AllDataclassesCollection as dto, AllConstantsCollection as constants
+from generated.api import Generated, AsyncConcurrencyLimiter, CircuitBreaker, HedgePolicy, HttpCache, JsonCodec, SqliteEndpointCacheBackend, AllDataclassesCollection as dto, AllConstantsCollection as constants
 
 BASE_URL = os.environ['BASE_URL']
 SECURED_BASE_URL = os.environ['SECURED_BASE_URL']
+UNREACHABLE_BASE_URL = 'http://localhost:1'
 
 
 @pytest.fixture()
@@ -52,6 +62,23 @@ async def test_get_list():
         assert isinstance(item, dto.BasicDto)
 
 
+@pytest.mark.asyncio
+async def test_get_list_without_streaming():
+    api = Generated(base_url=BASE_URL, use_response_streaming=False)
+    result = [item async for item in api.get_basic_dto_list()]
+
+    assert len(result) == 1
+    assert isinstance(result[0], dto.BasicDto)
+
+
+@pytest.mark.asyncio
+async def test_get_list_streaming_releases_connection():
+    async with Generated(base_url=BASE_URL, connection_pool_kwargs=dict(limit=1)) as api:
+        for _ in range(3):
+            async for item in api.get_basic_dto_list():
+                assert isinstance(item, dto.BasicDto)
+
+
 @pytest.mark.asyncio
 async def test_post(basic_dto):
     api = Generated(base_url=BASE_URL)
@@ -80,6 +107,347 @@ async def test_post_empty_list():
         assert 1 is 2   # should not happen
 
 
+@pytest.mark.asyncio
+async def test_compressed_response(basic_dto):
+    api = Generated(base_url=BASE_URL)
+    result = [item async for item in api.create_basic_dto_bulk([basic_dto] * 50)]
+
+    assert len(result) == 50
+    traffic = api.get_stats()['traffic']
+    assert 0 < traffic['wire_bytes'] < traffic['decoded_bytes']
+
+
+@pytest.mark.asyncio
+async def test_uncompressed_response(basic_dto):
+    api = Generated(base_url=BASE_URL, use_response_compression=False)
+    result = [item async for item in api.create_basic_dto_bulk([basic_dto] * 50)]
+
+    assert len(result) == 50
+    traffic = api.get_stats()['traffic']
+    assert 0 < traffic['wire_bytes'] == traffic['decoded_bytes']
+
+
+@pytest.mark.asyncio
+async def test_compressed_request(basic_dto):
+    api = Generated(base_url=BASE_URL, request_compression='gzip', request_compression_min_size=0)
+    result = [item async for item in api.create_basic_dto_bulk([basic_dto] * 50)]
+
+    assert len(result) == 50
+
+
+@pytest.mark.asyncio
+async def test_streamed_request(basic_dto):
+    api = Generated(base_url=BASE_URL, use_request_streaming=True)
+    result = [item async for item in api.create_basic_dto_bulk(basic_dto for _ in range(1000))]
+
+    assert len(result) == 1000
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('backend', JsonCodec.BACKENDS)
+async def test_json_codec(backend, basic_dto):
+    pytest.importorskip(backend)
+    api = Generated(base_url=BASE_URL, json_codec=JsonCodec(backend))
+    result = await api.create_basic_dto(basic_dto)
+
+    assert isinstance(result, dto.BasicDto)
+    assert api.get_stats()['json']['backend'] == backend
+
+
+@pytest.mark.asyncio
+async def test_http_cache():
+    api = Generated(base_url=BASE_URL, http_cache=HttpCache())
+    first = await api.get_container_dto()
+    traffic = api.get_stats()['traffic']
+    second = await api.get_container_dto()
+
+    assert first == second
+    assert api.get_stats()['traffic'] == traffic  # body is not downloaded again
+    stats = api.get_stats()['http_cache']
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+
+@pytest.mark.asyncio
+async def test_http_cache_reuse_objects():
+    api = Generated(base_url=BASE_URL, http_cache=HttpCache(reuse_objects=True))
+    first = [item async for item in api.get_basic_dto_list()]
+    second = [item async for item in api.get_basic_dto_list()]
+    third = [item async for item in api.get_basic_dto_list()]
+
+    assert first == second == third
+    assert second[0] is third[0]
+
+
+@pytest.mark.asyncio
+async def test_request_coalescing():
+    api = Generated(base_url=BASE_URL, headers={'x-delay': '0.3'}, use_request_coalescing=True)
+
+    async def get_list():
+        return [item async for item in api.get_basic_dto_list()]
+
+    results = await asyncio.gather(*(get_list() for _ in range(8)))
+
+    assert all(result == results[0] for result in results)
+    stats = api.get_stats()['single_flight']
+    assert stats['requests'] == 1
+    assert stats['coalesced'] == 7
+
+
+@pytest.mark.asyncio
+async def test_request_hedging():
+    hedge_policy = HedgePolicy(min_samples=5, budget_percent=100)
+    api = Generated(base_url=BASE_URL, use_request_hedging=True, hedge_policy=hedge_policy)
+    for _ in range(5):
+        await api.ping()
+
+    # only the first of identical requests is slow
+    slow_api = Generated(base_url=BASE_URL, headers={'x-delay': '1', 'x-delay-key': str(uuid4())}, use_request_hedging=True, hedge_policy=hedge_policy)
+    started = time.monotonic()
+    await slow_api.ping()
+
+    assert time.monotonic() - started < 0.5
+    stats = slow_api.get_stats()['hedges']
+    assert stats['hedges'] == 1
+    assert stats['hedges_won'] == 1
+
+
+@pytest.mark.asyncio
+async def test_call_hook_of_hedged_request():
+    hedge_policy = HedgePolicy(min_samples=5, budget_percent=100)
+    api = Generated(base_url=BASE_URL, use_request_hedging=True, hedge_policy=hedge_policy)
+    for _ in range(5):
+        await api.get_container_dto()
+
+    events = []
+    slow_api = Generated(base_url=BASE_URL, headers={'x-delay': '1', 'x-delay-key': str(uuid4())}, use_request_hedging=True, hedge_policy=hedge_policy, on_call=events.append)
+    await slow_api.get_container_dto()
+
+    assert len(events) == 1
+    assert events[0].attempts == 1
+    assert events[0].status == 200
+    assert events[0].ttfb < 0.5
+
+
+@pytest.mark.asyncio
+async def test_call_hook(basic_dto):
+    events = []
+    api = Generated(base_url=BASE_URL, on_call=events.append)
+    items = [item async for item in api.get_basic_dto_list()]
+    [item async for item in api.create_basic_dto_bulk([basic_dto])]
+    await api.get_container_dto()
+    await api.ping()
+
+    assert [event.endpoint for event in events] == ['get_basic_dto_list', 'create_basic_dto_bulk', 'get_container_dto', 'ping']
+    listed, created, got, pinged = events
+    assert listed.method == 'GET'
+    assert listed.status == 200
+    assert listed.items == len(items)
+    assert listed.response_bytes > 0
+    assert set(listed.phases()) == {'connect', 'send', 'ttfb', 'parse', 'construct'}
+    assert created.method == 'POST'
+    assert created.request_bytes > 0
+    assert created.serialize > 0
+    assert got.items == 1
+    assert set(got.phases()) == {'connect', 'send', 'ttfb', 'read', 'parse', 'construct'}
+    assert pinged.items is None
+    assert all(event.error is None and event.attempts == 1 and event.duration > 0 for event in events)
+
+
+@pytest.mark.asyncio
+async def test_request_batching(basic_dto):
+    api = Generated(base_url=BASE_URL, batch_max_size=3)
+
+    results = await asyncio.gather(*(api.create_batched_basic_dto(basic_dto) for _ in range(8)))
+
+    assert all(isinstance(result, dto.BasicDto) for result in results)
+    stats = api.get_stats()['batches']
+    assert stats['calls'] == 8
+    assert stats['requests'] == 3
+
+
+@pytest.mark.asyncio
+async def test_request_batching_disabled(basic_dto):
+    events = []
+    api = Generated(base_url=BASE_URL, on_call=events.append)
+    await asyncio.gather(api.create_batched_basic_dto(basic_dto), api.create_batched_basic_dto(basic_dto))
+
+    # single-item endpoint is called
+    assert [event.endpoint for event in events] == ['create_batched_basic_dto', 'create_batched_basic_dto']
+    assert api.get_stats()['batches'] == {}
+
+
+@pytest.mark.asyncio
+async def test_request_batching_cancelled(basic_dto):
+    api = Generated(base_url=BASE_URL, headers={'x-delay': '0.3'}, batch_max_size=2)
+    calls = asyncio.gather(*(api.create_batched_basic_dto(basic_dto) for _ in range(2)), return_exceptions=True)
+    await asyncio.sleep(0.1)
+    for task in api._request_batcher._tasks:
+        task.cancel()
+
+    results = await asyncio.wait_for(calls, timeout=1)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_gather():
+    api = Generated(base_url=BASE_URL, headers={'x-delay': '0.1'})
+    timestamps = [datetime(2024, 1, day, tzinfo=timezone.utc) for day in range(1, 11)]
+
+    started = time.monotonic()
+    results = [result async for result in api.gather('get_basic_dto_by_timestamp', ({'timestamp': timestamp} for timestamp in timestamps), concurrency=5)]
+
+    # two windows of concurrent calls
+    assert 0.2 <= time.monotonic() - started < 0.5
+    assert [kwargs['timestamp'] for kwargs, _ in results] == timestamps
+    assert all(item.timestamp == kwargs['timestamp'] for kwargs, item in results)
+
+
+@pytest.mark.asyncio
+async def test_gather_unordered_with_errors():
+    api = Generated(base_url=BASE_URL)
+
+    async def kwargs_aiter():
+        for kwargs in [{}, {'unknown_argument': 1}, {}]:
+            yield kwargs
+
+    results = [result async for result in api.gather(api.get_basic_dto_list, kwargs_aiter(), ordered=False)]
+
+    assert len(results) == 3
+    errors = [result for _, result in results if isinstance(result, Exception)]
+    assert len(errors) == 1 and isinstance(errors[0], TypeError)
+    # streamed results are read completely
+    assert all(isinstance(result, list) for _, result in results if result not in errors)
+
+    with pytest.raises(TypeError):
+        async for _ in api.gather(api.get_basic_dto_list, kwargs_aiter(), return_exceptions=False):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_rate_limit():
+    api = Generated(base_url=BASE_URL, rate_limit=20)
+
+    started = time.monotonic()
+    results = [result async for result in api.gather('ping', ({} for _ in range(5)))]
+
+    # concurrent calls are spaced by 1/20 s
+    assert len(results) == 5
+    assert time.monotonic() - started >= 0.19
+    stats = api.get_stats()['rate_limit']
+    assert stats['requests'] == 5
+    assert stats['delayed'] == 4
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency():
+    api = Generated(base_url=BASE_URL, headers={'x-delay': '0.05'}, use_adaptive_concurrency=True, concurrency_limiter=AsyncConcurrencyLimiter(initial_limit=2))
+    timestamps = [datetime(2024, 1, day, tzinfo=timezone.utc) for day in range(1, 21)]
+
+    results = [result async for result in api.gather('get_basic_dto_by_timestamp', ({'timestamp': timestamp} for timestamp in timestamps))]
+
+    assert len(results) == 20
+    stats = api.get_stats()['concurrency']
+    assert stats['waits'] > 0
+    assert stats['limit'] > 2
+    assert stats['in_flight'] == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_backoff():
+    api = Generated(base_url=BASE_URL, headers={'x-status': '429'}, max_retries=1, use_adaptive_concurrency=True)
+
+    with pytest.raises(RuntimeError):
+        await api.ping()
+
+    stats = api.get_stats()['concurrency']
+    assert stats['decreases'] == 1
+    assert stats['limit'] == 2
+
+
+def test_adaptive_concurrency_requires_async_limiter():
+    from generated.api import ConcurrencyLimiter
+
+    # sync limiter would block event loop while waiting for a slot
+    with pytest.raises(TypeCheckError):
+        Generated(base_url=BASE_URL, use_adaptive_concurrency=True, concurrency_limiter=ConcurrencyLimiter())
+
+
+@pytest.mark.asyncio
+async def test_endpoint_cache():
+    api = Generated(base_url=BASE_URL)
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    first = await api.get_cached_basic_dto_by_timestamp(timestamp)
+    second = await api.get_cached_basic_dto_by_timestamp(timestamp)
+
+    assert first is second
+    stats = api.get_stats()['endpoint_cache']
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+    api.invalidate_cache()
+    assert api.get_stats()['endpoint_cache']['entries'] == 0
+
+
+@pytest.mark.asyncio
+async def test_endpoint_cache_stale_while_revalidate(monkeypatch):
+    api = Generated(base_url=BASE_URL, endpoint_cache_max_staleness=30)
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    first = await api.get_cached_basic_dto_by_timestamp(timestamp)
+
+    # result expires in 60 seconds
+    monotonic = time.monotonic
+    monkeypatch.setattr(time, 'monotonic', lambda: monotonic() + 70)
+    assert await api.get_cached_basic_dto_by_timestamp(timestamp) is first
+
+    for _ in range(50):
+        if api.get_stats()['endpoint_cache']['refreshes']:
+            break
+        await asyncio.sleep(0.1)
+
+    assert await api.get_cached_basic_dto_by_timestamp(timestamp) is not first
+    stats = api.get_stats()['endpoint_cache']
+    assert stats['stale_hits'] == 1
+    assert stats['refreshes'] == 1
+
+
+def test_endpoint_cache_key(basic_dto):
+    make_key = Generated(base_url=BASE_URL)._endpoint_cache._make_key
+    key = make_key('create_basic_dto', basic_dto)
+
+    # arguments are compared by value rather than by identity
+    assert key == make_key('create_basic_dto', copy.deepcopy(basic_dto))
+    assert ' at 0x' not in key[1]
+
+    basic_dto.documented_value = 3.5
+    assert make_key('create_basic_dto', basic_dto) != key
+
+
+@pytest.mark.asyncio
+async def test_endpoint_cache_single_load():
+    api = Generated(base_url=BASE_URL)
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    results = await asyncio.gather(*(api.get_cached_basic_dto_by_timestamp(timestamp) for _ in range(8)))
+
+    # waiters are woken up once result is stored and get the same object
+    assert all(result is results[0] for result in results)
+    assert api.get_stats()['endpoint_cache']['lock_waits'] == 7
+
+
+@pytest.mark.asyncio
+async def test_endpoint_cache_shared_backend(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    apis = [Generated(base_url=BASE_URL, endpoint_cache_backend=SqliteEndpointCacheBackend(path)) for _ in range(4)]
+
+    results = await asyncio.gather(*(api.get_cached_basic_dto_by_timestamp(timestamp) for api in apis))
+
+    assert all(result == results[0] for result in results)
+    assert sum(api.get_stats()['endpoint_cache']['misses'] for api in apis) >= 1
+    assert sum(api.get_stats()['endpoint_cache']['lock_waits'] for api in apis) >= 1
+
+
 @pytest.mark.asyncio
 async def test_post_request_wrong_enum_value(basic_dto):
     api = Generated()
@@ -101,14 +469,57 @@ async def test_403():
 
 @pytest.mark.asyncio
 async def test_retries(caplog):
+    api = Generated(base_url=UNREACHABLE_BASE_URL, max_retries=3, retry_timeout=0.1, logger=logging.getLogger())
+    with pytest.raises(RuntimeError):
+        with caplog.at_level(logging.WARNING):
+            await api.ping()
+
+    assert 'got ClientConnectorError on BaseJsonHttpAsyncClient._mk_request, attempt 1 / 3' in caplog.messages
+    assert 'got ClientConnectorError on BaseJsonHttpAsyncClient._mk_request, attempt 2 / 3' in caplog.messages
+    assert 'got ClientConnectorError on BaseJsonHttpAsyncClient._mk_request, attempt 3 / 3' in caplog.messages
+
+
+@pytest.mark.asyncio
+async def test_no_retries_on_client_error(caplog):
     api = Generated(base_url=SECURED_BASE_URL, max_retries=3, retry_timeout=0.1, logger=logging.getLogger())
     with pytest.raises(RuntimeError):
         with caplog.at_level(logging.WARNING):
             await api.ping()
 
     assert 'got ClientResponseError on BaseJsonHttpAsyncClient._mk_request, attempt 1 / 3' in caplog.messages
-    assert 'got ClientResponseError on BaseJsonHttpAsyncClient._mk_request, attempt 2 / 3' in caplog.messages
-    assert 'got ClientResponseError on BaseJsonHttpAsyncClient._mk_request, attempt 3 / 3' in caplog.messages
+    assert 'got ClientResponseError on BaseJsonHttpAsyncClient._mk_request, attempt 2 / 3' not in caplog.messages
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker(caplog):
+    breaker = CircuitBreaker(min_calls=2, window_size=2, cool_down=60)
+    api = Generated(base_url=UNREACHABLE_BASE_URL, max_retries=1, circuit_breaker=breaker, logger=logging.getLogger())
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await api.ping()
+
+    caplog.clear()
+    with pytest.raises(RuntimeError, match='Circuit breaker is open'):
+        with caplog.at_level(logging.WARNING):
+            await api.ping()
+    assert not any('ClientConnectorError' in message for message in caplog.messages)
+    assert api.get_stats()['circuits'][urlparse(UNREACHABLE_BASE_URL).netloc]['rejected'] == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_counts_timeouts(monkeypatch):
+    breaker = CircuitBreaker(min_calls=2, window_size=2, cool_down=60)
+    api = Generated(base_url=BASE_URL, max_retries=1, circuit_breaker=breaker)
+
+    async def send_request(*args, **kwargs):
+        raise asyncio.TimeoutError()
+
+    monkeypatch.setattr(api._client, '_send_request', send_request)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await api.ping()
+
+    assert breaker.get_state(urlparse(BASE_URL).netloc) == CircuitBreaker.OPEN
 
 
 @pytest.mark.asyncio
@@ -123,20 +534,83 @@ async def test_user_agent_and_headers():
     await api.ping()
 
 
-@pytest.mark.skip('aiohttp session logs are unavailable')
 @pytest.mark.asyncio
-async def test_keepalive_connection(basic_dto, caplog):
-    with caplog.at_level(logging.DEBUG):
-        api = Generated(base_url=BASE_URL)
-        await api.create_basic_dto(basic_dto)
-        await api.create_basic_dto(basic_dto)
-        await api.create_basic_dto(basic_dto)
-        async for _ in api.get_basic_dto_list():
-            pass
+async def test_session_reuse():
+    async with Generated(base_url=BASE_URL, connection_pool_kwargs=dict(limit=5, ttl_dns_cache=60)) as api:
+        await api.ping()
+        session = api._client._session
+        await api.get_container_dto()
+
+        assert api._client._session is session
+        assert session.connector.limit == 5
+
+    assert session.closed
+
+
+def test_session_of_stopped_loop_is_detached():
+    api = Generated(base_url=BASE_URL)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(api.ping())
+    session = api._client._session
+
+    async def ping_and_close():
+        await api.ping()
+        assert api._client._session is not session
+        await api.aclose()
+
+    asyncio.run(ping_and_close())
+    # stopped loop would never close stale session, so it is not waited for
+    assert session.closed
+    loop.close()
+
+
+def test_session_of_running_loop_is_closed():
+    api = Generated(base_url=BASE_URL)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(api.ping(), loop).result()
+    session = api._client._session
+
+    async def ping_and_close():
+        await api.ping()
+        assert api._client._session is not session
+        await api.aclose()
+
+    asyncio.run(ping_and_close())
+    # stale session is closed by its own loop which keeps running in another thread
+    time.sleep(0.1)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_keepalive_connection(monkeypatch):
+    connections = []
+    create_connection = aiohttp.TCPConnector._create_connection
+
+    async def counted_create_connection(self, *args, **kwargs):
+        connections.append(args)
+        return await create_connection(self, *args, **kwargs)
+
+    monkeypatch.setattr(aiohttp.TCPConnector, '_create_connection', counted_create_connection)
+
+    async def ping(request):
+        return web.Response(text='pong')
+
+    # mock server closes each connection, so keep-alive one is served locally
+    app = web.Application()
+    app.router.add_get('/api/v1/ping', ping)
+    async with test_utils.TestServer(app) as server:
+        async with Generated(base_url=str(server.make_url('/'))) as api:
+            await api.ping()
+            await api.ping()
+            await api.ping()
 
-    message = 'Starting new HTTP connection (1): localhost:8081'
-    assert message in caplog.messages
-    assert caplog.messages.count(message) == 1
+    # sequential requests reuse single keep-alive connection
+    assert len(connections) == 1
 
 
 @pytest.mark.asyncio
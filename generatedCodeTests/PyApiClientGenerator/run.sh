@@ -1,5 +1,7 @@
 mkdir -p generated/
 cp ../../src/test/resources/org/codegen/generators/PyApiClientGenerator/endpointsOutput.py generated/api.py
+mkdir -p generated/features/
+cp ../../src/test/resources/org/codegen/generators/PyApiClientGenerator/features/*Output.py generated/features/
 
 for image in 'python:3.10-alpine' \
              'python:3.11-alpine' \
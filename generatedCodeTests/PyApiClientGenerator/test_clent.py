@@ -1,16 +1,21 @@
+import copy
 import logging
 import os
+import time
 import types
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from urllib.parse import urlparse
+from uuid import uuid4
 
 import pytest
 from marshmallow.exceptions import ValidationError
 
-from generated.api import Generated, AllDataclassesCollection as dto, AllConstantsCollection as constants
+from generated.api import Generated, RetryPolicy, CircuitBreaker, ConcurrencyLimiter, HedgePolicy, HttpCache, JsonCodec, SqliteEndpointCacheBackend, AllDataclassesCollection as dto, AllConstantsCollection as constants
 
 BASE_URL = os.environ['BASE_URL']
 SECURED_BASE_URL = os.environ['SECURED_BASE_URL']
+UNREACHABLE_BASE_URL = 'http://localhost:1'
 
 
 @pytest.fixture()
@@ -73,6 +78,437 @@ def test_post_empty_list():
         next(result)
 
 
+def test_compressed_response(basic_dto):
+    api = Generated(base_url=BASE_URL)
+    result = list(api.create_basic_dto_bulk([basic_dto] * 50))
+
+    assert len(result) == 50
+    traffic = api.get_stats()['traffic']
+    assert 0 < traffic['wire_bytes'] < traffic['decoded_bytes']
+
+
+def test_uncompressed_response(basic_dto):
+    api = Generated(base_url=BASE_URL, use_response_compression=False)
+    result = list(api.create_basic_dto_bulk([basic_dto] * 50))
+
+    assert len(result) == 50
+    traffic = api.get_stats()['traffic']
+    assert 0 < traffic['wire_bytes'] == traffic['decoded_bytes']
+
+
+def test_compressed_request(basic_dto):
+    api = Generated(base_url=BASE_URL, request_compression='gzip', request_compression_min_size=0)
+    result = list(api.create_basic_dto_bulk([basic_dto] * 50))
+
+    assert len(result) == 50
+
+
+def test_compressed_request_debug_curl(basic_dto):
+    api = Generated(base_url="http://none", use_debug_curl=True, max_retries=0, request_compression='gzip', request_compression_min_size=0)
+    with pytest.raises(RuntimeError) as e:
+        next(api.create_basic_dto_bulk([basic_dto]))
+
+    assert '"enum_value"' in str(e.value)
+    assert 'content-encoding' not in str(e.value)
+
+
+def test_unsupported_request_compression():
+    with pytest.raises(ValueError):
+        Generated(base_url=BASE_URL, request_compression='lzma')
+
+
+def test_streamed_request(basic_dto):
+    api = Generated(base_url=BASE_URL, use_request_streaming=True)
+    result = list(api.create_basic_dto_bulk(basic_dto for _ in range(1000)))
+
+    assert len(result) == 1000
+    assert isinstance(result[0], dto.BasicDto)
+
+
+def test_post_iterator_without_streaming(basic_dto):
+    api = Generated(base_url=BASE_URL)
+    result = list(api.create_basic_dto_bulk(iter([basic_dto, basic_dto])))
+
+    assert len(result) == 2
+
+
+@pytest.mark.parametrize('backend', JsonCodec.BACKENDS)
+def test_json_codec(backend, basic_dto):
+    pytest.importorskip(backend)
+    api = Generated(base_url=BASE_URL, json_codec=JsonCodec(backend, streaming_backend='python'))
+    result = list(api.create_basic_dto_bulk([basic_dto] * 3))
+
+    assert len(result) == 3
+    assert result[0].list_value == [100, 200, 300]
+    assert api.get_stats()['json'] == dict(backend=backend, streaming_backend='python')
+
+
+def test_http_cache():
+    api = Generated(base_url=BASE_URL, http_cache=HttpCache())
+    first = api.get_container_dto()
+    traffic = api.get_stats()['traffic']
+    second = api.get_container_dto()
+
+    assert first == second
+    assert api.get_stats()['traffic'] == traffic  # body is not downloaded again
+    stats = api.get_stats()['http_cache']
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['entries'] == 1
+
+
+def test_http_cache_reuse_objects():
+    api = Generated(base_url=BASE_URL, http_cache=HttpCache(reuse_objects=True))
+    first = list(api.get_basic_dto_list())
+    second = list(api.get_basic_dto_list())
+    third = list(api.get_basic_dto_list())
+
+    assert first == second == third
+    assert second[0] is third[0]
+
+
+def test_http_cache_eviction():
+    api = Generated(base_url=BASE_URL, http_cache=HttpCache(max_bytes=300))
+    api.get_basic_dto_by_timestamp(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    api.get_basic_dto_by_timestamp(datetime(2024, 1, 2, tzinfo=timezone.utc))
+
+    stats = api.get_stats()['http_cache']
+    assert stats['entries'] == 1
+    assert stats['evictions'] == 1
+    assert stats['bytes'] <= 300
+
+
+def test_http_cache_on_disk(tmp_path):
+    Generated(base_url=BASE_URL, http_cache=HttpCache(directory=str(tmp_path))).get_container_dto()
+
+    # stored responses survive restart
+    api = Generated(base_url=BASE_URL, http_cache=HttpCache(directory=str(tmp_path)))
+    assert isinstance(api.get_container_dto(), dto.ContainerDto)
+    assert api.get_stats()['http_cache']['hits'] == 1
+
+
+def test_request_coalescing():
+    api = Generated(base_url=BASE_URL, headers={'x-delay': '0.3'}, use_request_coalescing=True)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: list(api.get_basic_dto_list()), range(8)))
+
+    assert all(result == results[0] for result in results)
+    stats = api.get_stats()['single_flight']
+    assert stats['requests'] == 1
+    assert stats['coalesced'] == 7
+    assert stats['in_flight'] == 0
+
+    # request is sent again once previous one is finished
+    assert list(api.get_basic_dto_list()) == results[0]
+    assert api.get_stats()['single_flight']['requests'] == 2
+
+
+def test_request_hedging():
+    hedge_policy = HedgePolicy(min_samples=5, budget_percent=100)
+    api = Generated(base_url=BASE_URL, use_request_hedging=True, hedge_policy=hedge_policy)
+    for _ in range(5):
+        api.ping()
+
+    # only the first of identical requests is slow
+    slow_api = Generated(base_url=BASE_URL, headers={'x-delay': '1', 'x-delay-key': str(uuid4())}, use_request_hedging=True, hedge_policy=hedge_policy)
+    started = time.monotonic()
+    slow_api.ping()
+
+    assert time.monotonic() - started < 0.5
+    stats = slow_api.get_stats()['hedges']
+    assert stats['requests'] == 6
+    assert stats['hedges'] == 1
+    assert stats['hedges_won'] == 1
+
+
+def test_call_hook_of_hedged_request():
+    hedge_policy = HedgePolicy(min_samples=5, budget_percent=100)
+    api = Generated(base_url=BASE_URL, use_request_hedging=True, hedge_policy=hedge_policy)
+    for _ in range(5):
+        api.get_container_dto()
+
+    events = []
+    slow_api = Generated(base_url=BASE_URL, headers={'x-delay': '1', 'x-delay-key': str(uuid4())}, use_request_hedging=True, hedge_policy=hedge_policy, on_call=events.append)
+    slow_api.get_container_dto()
+    # let the losing request complete
+    time.sleep(1)
+
+    assert len(events) == 1
+    assert events[0].attempts == 1
+    assert events[0].status == 200
+    assert events[0].ttfb < 0.5
+
+
+def test_call_hook(basic_dto):
+    events = []
+    api = Generated(base_url=BASE_URL, on_call=events.append)
+    items = list(api.get_basic_dto_list())
+    list(api.create_basic_dto_bulk([basic_dto]))
+    api.get_container_dto()
+    api.ping()
+
+    assert [event.endpoint for event in events] == ['get_basic_dto_list', 'create_basic_dto_bulk', 'get_container_dto', 'ping']
+    listed, created, got, pinged = events
+    assert listed.method == 'GET'
+    assert listed.status == 200
+    assert listed.items == len(items)
+    assert listed.response_bytes > 0
+    assert set(listed.phases()) == {'ttfb', 'read', 'parse', 'construct'}
+    assert created.method == 'POST'
+    assert created.request_bytes > 0
+    assert created.serialize > 0
+    assert got.items == 1
+    assert pinged.items is None
+    assert all(event.error is None and event.attempts == 1 and event.duration > 0 for event in events)
+
+
+def test_call_hook_on_error():
+    events = []
+    api = Generated(base_url=SECURED_BASE_URL, max_retries=0, on_call=events.append)
+    with pytest.raises(RuntimeError):
+        api.ping()
+
+    assert len(events) == 1
+    assert events[0].status == 403
+    assert events[0].error is not None
+
+
+def test_request_batching(basic_dto):
+    api = Generated(base_url=BASE_URL, batch_max_size=3, batch_max_delay=0.3)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: api.create_batched_basic_dto(basic_dto), range(8)))
+
+    assert all(isinstance(result, dto.BasicDto) for result in results)
+    stats = api.get_stats()['batches']
+    assert stats['calls'] == 8
+    assert stats['requests'] == 3
+    assert stats['pending'] == 0
+
+
+def test_request_batching_disabled(basic_dto):
+    events = []
+    api = Generated(base_url=BASE_URL, on_call=events.append)
+    api.create_batched_basic_dto(basic_dto)
+    api.create_batched_basic_dto(basic_dto)
+
+    # single-item endpoint is called
+    assert [event.endpoint for event in events] == ['create_batched_basic_dto', 'create_batched_basic_dto']
+    assert api.get_stats()['batches'] == {}
+
+
+def test_map():
+    api = Generated(base_url=BASE_URL, headers={'x-delay': '0.1'})
+    timestamps = [datetime(2024, 1, day, tzinfo=timezone.utc) for day in range(1, 11)]
+
+    started = time.monotonic()
+    results = list(api.map('get_basic_dto_by_timestamp', ({'timestamp': timestamp} for timestamp in timestamps)))
+
+    # calls are made concurrently
+    assert time.monotonic() - started < 0.6
+    assert [kwargs['timestamp'] for kwargs, _ in results] == timestamps
+    assert all(item.timestamp == kwargs['timestamp'] for kwargs, item in results)
+
+
+def test_map_unordered_with_errors():
+    api = Generated(base_url=BASE_URL)
+    kwargs_list = [{}, {'unknown_argument': 1}, {}]
+
+    results = list(api.map(api.get_basic_dto_list, kwargs_list, ordered=False))
+
+    assert len(results) == 3
+    errors = [result for _, result in results if isinstance(result, Exception)]
+    assert len(errors) == 1 and isinstance(errors[0], TypeError)
+    # streamed results are read completely
+    assert all(isinstance(result, list) for _, result in results if result not in errors)
+
+    with pytest.raises(TypeError):
+        list(api.map(api.get_basic_dto_list, kwargs_list, return_exceptions=False))
+
+
+def test_rate_limit():
+    api = Generated(base_url=BASE_URL, rate_limit=20, rate_limit_burst=2)
+
+    started = time.monotonic()
+    for _ in range(6):
+        api.ping()
+
+    # two requests are sent at once, the rest ones are spaced by 1/20 s
+    assert time.monotonic() - started >= 0.19
+    stats = api.get_stats()['rate_limit']
+    assert stats['requests'] == 6
+    assert stats['delayed'] == 4
+    assert stats['wait_seconds'] > 0
+
+
+def test_rate_limit_invalid():
+    with pytest.raises(ValueError):
+        Generated(base_url=BASE_URL, rate_limit=-1)
+
+
+def test_endpoint_rate_limit():
+    api = Generated(base_url=BASE_URL, endpoint_rate_limits={'get_limited_basic_dto_list': 10})
+
+    started = time.monotonic()
+    for _ in range(3):
+        list(api.get_limited_basic_dto_list())
+
+    assert time.monotonic() - started >= 0.19
+    stats = api.get_stats()
+    assert stats['rate_limit'] == {}
+    assert stats['endpoint_rate_limits']['get_limited_basic_dto_list']['delayed'] == 2
+
+
+def test_adaptive_concurrency():
+    api = Generated(base_url=BASE_URL, headers={'x-delay': '0.05'}, use_adaptive_concurrency=True, concurrency_limiter=ConcurrencyLimiter(initial_limit=2))
+    timestamps = [datetime(2024, 1, day, tzinfo=timezone.utc) for day in range(1, 21)]
+
+    results = list(api.map('get_basic_dto_by_timestamp', ({'timestamp': timestamp} for timestamp in timestamps)))
+
+    assert len(results) == 20
+    stats = api.get_stats()['concurrency']
+    # calls beyond the limit have waited, limit has grown while latency stayed low
+    assert stats['waits'] > 0
+    assert stats['limit'] > 2
+    assert stats['in_flight'] == 0
+    assert 0 < stats['gradient'] <= 1
+
+
+def test_adaptive_concurrency_backoff():
+    api = Generated(base_url=BASE_URL, headers={'x-status': '503'}, max_retries=2, retry_timeout=0.01, use_adaptive_concurrency=True, concurrency_limiter=ConcurrencyLimiter(initial_limit=8))
+
+    with pytest.raises(RuntimeError):
+        api.ping()
+
+    stats = api.get_stats()['concurrency']
+    # each retry follows decrease, so limit is cut by both of them
+    assert stats['decreases'] == 2
+    assert stats['limit'] == 2
+
+
+def test_endpoint_cache():
+    api = Generated(base_url=BASE_URL)
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    first = api.get_cached_basic_dto_by_timestamp(timestamp)
+    second = api.get_cached_basic_dto_by_timestamp(timestamp)
+
+    assert first is second
+    stats = api.get_stats()['endpoint_cache']
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['entries'] == 1
+    assert stats['bytes'] > 0
+
+    api.invalidate_cache('get_cached_basic_dto_by_timestamp')
+    assert api.get_cached_basic_dto_by_timestamp(timestamp) is not first
+
+
+def test_endpoint_cache_is_per_instance():
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    first = Generated(base_url=BASE_URL).get_cached_basic_dto_by_timestamp(timestamp)
+    second = Generated(base_url=BASE_URL).get_cached_basic_dto_by_timestamp(timestamp)
+
+    assert first == second
+    assert first is not second
+
+
+def test_endpoint_cache_eviction():
+    api = Generated(base_url=BASE_URL, endpoint_cache_max_entries=1)
+    api.get_cached_basic_dto_by_timestamp(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    api.get_cached_basic_dto_by_timestamp(datetime(2024, 1, 2, tzinfo=timezone.utc))
+
+    stats = api.get_stats()['endpoint_cache']
+    assert stats['entries'] == 1
+    assert stats['evictions'] == 1
+
+
+def test_endpoint_cache_key(basic_dto):
+    make_key = Generated(base_url=BASE_URL)._endpoint_cache._make_key
+    key = make_key('create_basic_dto', basic_dto)
+
+    # arguments are compared by value rather than by identity
+    assert key == make_key('create_basic_dto', copy.deepcopy(basic_dto))
+    assert ' at 0x' not in key[1]
+    assert make_key('get_basic_dto_list', {'b': {2, 1}, 'a': 1}) == make_key('get_basic_dto_list', {'a': 1, 'b': {1, 2}})
+
+    basic_dto.documented_value = 3.5
+    assert make_key('create_basic_dto', basic_dto) != key
+
+
+def test_endpoint_cache_single_load():
+    api = Generated(base_url=BASE_URL)
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: api.get_cached_basic_dto_by_timestamp(timestamp), range(8)))
+
+    # waiters are woken up once result is stored and get the same object
+    assert all(result is results[0] for result in results)
+
+
+def test_endpoint_cache_stale_while_revalidate(monkeypatch):
+    api = Generated(base_url=BASE_URL, endpoint_cache_max_staleness=30)
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    first = api.get_cached_basic_dto_by_timestamp(timestamp)
+
+    # result expires in 60 seconds
+    monotonic = time.monotonic
+    monkeypatch.setattr(time, 'monotonic', lambda: monotonic() + 70)
+    assert api.get_cached_basic_dto_by_timestamp(timestamp) is first
+
+    for _ in range(50):
+        if api.get_stats()['endpoint_cache']['refreshes']:
+            break
+        time.sleep(0.1)
+
+    assert api.get_cached_basic_dto_by_timestamp(timestamp) is not first
+    stats = api.get_stats()['endpoint_cache']
+    assert stats['stale_hits'] == 1
+    assert stats['refreshes'] == 1
+    assert stats['refresh_failures'] == 0
+
+    # too stale result is not returned
+    monkeypatch.setattr(time, 'monotonic', lambda: monotonic() + 200)
+    api.get_cached_basic_dto_by_timestamp(timestamp)
+    assert api.get_stats()['endpoint_cache']['expirations'] == 1
+
+
+def test_endpoint_cache_shared_backend(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    first_api = Generated(base_url=BASE_URL, endpoint_cache_backend=SqliteEndpointCacheBackend(path))
+    second_api = Generated(base_url=BASE_URL, endpoint_cache_backend=SqliteEndpointCacheBackend(path))
+
+    first = first_api.get_cached_basic_dto_by_timestamp(timestamp)
+    assert second_api.get_cached_basic_dto_by_timestamp(timestamp) == first
+    assert first_api.get_stats()['endpoint_cache']['misses'] == 1
+    assert second_api.get_stats()['endpoint_cache']['hits'] == 1
+
+    second_api.invalidate_cache()
+    first_api.get_cached_basic_dto_by_timestamp(timestamp)
+    assert first_api.get_stats()['endpoint_cache']['misses'] == 2
+
+
+def test_endpoint_cache_shared_backend_single_load(tmp_path):
+    class CountingBackend(SqliteEndpointCacheBackend):
+        stored = 0
+
+        def set(self, *args, **kwargs):
+            CountingBackend.stored += 1
+            super().set(*args, **kwargs)
+
+    path = str(tmp_path / 'cache.db')
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    apis = [Generated(base_url=BASE_URL, endpoint_cache_backend=CountingBackend(path)) for _ in range(8)]
+
+    with ThreadPoolExecutor(max_workers=len(apis)) as executor:
+        results = list(executor.map(lambda api: api.get_cached_basic_dto_by_timestamp(timestamp), apis))
+
+    assert all(result == results[0] for result in results)
+    assert CountingBackend.stored == 1
+
+
 def test_post_request_wrong_enum_value(basic_dto):
     api = Generated()
     basic_dto.enum_value = constants.EnumValue.VALUE_1 + 'azaza'
@@ -90,14 +526,116 @@ def test_403():
 
 
 def test_retries(caplog):
+    api = Generated(base_url=UNREACHABLE_BASE_URL, max_retries=3, retry_timeout=0.1, logger=logging.getLogger())
+    with pytest.raises(RuntimeError):
+        with caplog.at_level(logging.WARNING):
+            api.ping()
+
+    assert 'got NewConnectionError on BaseJsonHttpClient._mk_request, attempt 1 / 3' in caplog.messages
+    assert 'got NewConnectionError on BaseJsonHttpClient._mk_request, attempt 2 / 3' in caplog.messages
+    assert 'got NewConnectionError on BaseJsonHttpClient._mk_request, attempt 3 / 3' in caplog.messages
+    assert api.get_stats()['retries']['retries'] == 2
+
+
+def test_no_retries_on_client_error(caplog):
     api = Generated(base_url=SECURED_BASE_URL, max_retries=3, retry_timeout=0.1, logger=logging.getLogger())
     with pytest.raises(RuntimeError):
         with caplog.at_level(logging.WARNING):
             api.ping()
 
-    assert 'got HTTPError on BaseJsonHttpClient._mk_request, attempt 1 / 3' in caplog.messages
-    assert 'got HTTPError on BaseJsonHttpClient._mk_request, attempt 2 / 3' in caplog.messages
-    assert 'got HTTPError on BaseJsonHttpClient._mk_request, attempt 3 / 3' in caplog.messages
+    assert 'got HttpResponseError on BaseJsonHttpClient._mk_request, attempt 1 / 3' in caplog.messages
+    assert 'got HttpResponseError on BaseJsonHttpClient._mk_request, attempt 2 / 3' not in caplog.messages
+
+
+def test_no_retries_of_non_idempotent_request(basic_dto, caplog):
+    api = Generated(base_url=UNREACHABLE_BASE_URL, max_retries=3, retry_timeout=0.1, logger=logging.getLogger())
+    with pytest.raises(RuntimeError):
+        with caplog.at_level(logging.WARNING):
+            api.create_basic_dto(basic_dto)
+
+    assert 'got NewConnectionError on BaseJsonHttpClient._mk_request, attempt 1 / 3' in caplog.messages
+    assert 'got NewConnectionError on BaseJsonHttpClient._mk_request, attempt 2 / 3' not in caplog.messages
+
+
+def test_retry_budget(caplog):
+    policy = RetryPolicy(max_attempts=5, base_timeout=0.01, budget_rate=0.001, budget_burst=2)
+    api = Generated(base_url=UNREACHABLE_BASE_URL, retry_policy=policy, logger=logging.getLogger())
+    with pytest.raises(RuntimeError):
+        with caplog.at_level(logging.WARNING):
+            api.ping()
+
+    assert 'got NewConnectionError on BaseJsonHttpClient._mk_request, attempt 3 / 5' in caplog.messages
+    assert 'got NewConnectionError on BaseJsonHttpClient._mk_request, attempt 4 / 5' not in caplog.messages
+    assert api.get_stats()['retries'] == dict(retries=2, rejected_by_budget=1)
+
+
+def test_retry_policy_delays():
+    class ServerError(Exception):
+        def __init__(self, status: int, headers: dict | None = None):
+            self.status = status
+            self.headers = headers
+
+    policy = RetryPolicy(max_attempts=4, base_timeout=1, max_timeout=3, budget_rate=None)
+
+    # full jitter within exponentially growing bounds
+    assert 0 <= policy.get_delay(ServerError(502), attempt=1) <= 1
+    assert 0 <= policy.get_delay(ConnectionError(), attempt=3) <= 3
+    assert policy.get_delay(ServerError(502), attempt=4) is None
+
+    # client errors are not repeated
+    assert policy.get_delay(ServerError(400), attempt=1) is None
+
+    # non-idempotent requests are repeated only if declined by server
+    assert policy.get_delay(ServerError(502), attempt=1, idempotent=False) is None
+    assert policy.get_delay(ConnectionError(), attempt=1, idempotent=False) is None
+    assert policy.get_delay(ServerError(429, {'Retry-After': '2'}), attempt=1, idempotent=False) == 2
+
+    # too long Retry-After
+    assert policy.get_delay(ServerError(503, {'Retry-After': '120'}), attempt=1) is None
+
+
+def test_circuit_breaker(caplog):
+    breaker = CircuitBreaker(min_calls=2, window_size=2, cool_down=0.2)
+    api = Generated(base_url=UNREACHABLE_BASE_URL, max_retries=1, circuit_breaker=breaker, logger=logging.getLogger())
+    host = urlparse(UNREACHABLE_BASE_URL).netloc
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            api.ping()
+    assert breaker.get_state(host) == 'open'
+
+    # fail fast without sending
+    caplog.clear()
+    with pytest.raises(RuntimeError, match='Circuit breaker is open'):
+        with caplog.at_level(logging.WARNING):
+            api.ping()
+    assert not any('NewConnectionError' in message for message in caplog.messages)
+    assert api.get_stats()['circuits'][host] == dict(state='open', calls=2, failures=2, rejected=1)
+
+    # failed probe after cool-down opens the circuit again
+    time.sleep(0.2)
+    with pytest.raises(RuntimeError, match='Failed to establish a new connection'):
+        api.ping()
+    assert breaker.get_state(host) == 'open'
+
+
+def test_circuit_breaker_ignores_client_errors():
+    breaker = CircuitBreaker(min_calls=2, window_size=2)
+    api = Generated(base_url=SECURED_BASE_URL, max_retries=1, circuit_breaker=breaker)
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match='status code 403'):
+            api.ping()
+
+    assert breaker.get_state(urlparse(SECURED_BASE_URL).netloc) == 'closed'
+
+
+def test_circuit_breaker_disabled():
+    api = Generated(base_url=UNREACHABLE_BASE_URL, max_retries=1, use_circuit_breaker=False)
+    for _ in range(30):
+        with pytest.raises(RuntimeError, match='Failed to establish a new connection'):
+            api.ping()
+
+    assert api.get_stats()['circuits'] == {}
 
 
 def test_user_agent_and_headers():
@@ -156,3 +694,17 @@ def test_callable_header():
         }
     )
     api.ping()
+
+
+def test_schema_cache(basic_dto):
+    api = Generated(base_url=BASE_URL, use_schema_warm_up=True)
+    warmed_up = api.get_stats()['schemas']
+    assert warmed_up['size'] == 2 * len([k for k in vars(dto) if not k.startswith('_')])
+    assert warmed_up['hits'] == 0
+
+    api.create_basic_dto(basic_dto)
+    api.create_basic_dto(basic_dto)
+
+    stats = api.get_stats()['schemas']
+    assert stats['misses'] == warmed_up['misses']
+    assert stats['hits'] > 0
@@ -0,0 +1,37 @@
+import importlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+BASE_URL = os.environ['BASE_URL']
+
+# generated client with single feature (or none) included, options which enable it
+FEATURES = [
+    ('noFeaturesOutput', {}),
+    ('circuitBreakerOutput', {'use_circuit_breaker': True}),
+    ('adaptiveConcurrencyOutput', {'use_adaptive_concurrency': True}),
+    ('httpCacheOutput', {'http_cache': 'HttpCache'}),
+    ('requestCoalescingOutput', {'use_request_coalescing': True}),
+    ('requestHedgingOutput', {'use_request_hedging': True}),
+    ('callTracingOutput', {'on_call': lambda event: None}),
+    ('rateLimitOutput', {'rate_limit': 100}),
+    ('endpointCacheOutput', {'endpoint_cache_max_entries': 10}),
+    ('requestBatchingOutput', {'batch_max_size': 10}),
+]
+
+
+@pytest.mark.parametrize('module_name,options', FEATURES)
+def test_feature_only(module_name, options):
+    module = importlib.import_module(f'generated.features.{module_name}')
+    # classes of feature are created within module of client
+    options = {key: getattr(module, value)() if isinstance(value, str) else value for key, value in options.items()}
+    api = module.Generated(base_url=BASE_URL, **options)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: list(api.get_basic_dto_list()), range(4)))
+
+    assert all(result == results[0] for result in results)
+    assert isinstance(api.get_basic_dto_by_timestamp(datetime.now(tz=timezone.utc)), module.AllDataclassesCollection.BasicDto)
+    api.create_basic_dto(results[0][0])
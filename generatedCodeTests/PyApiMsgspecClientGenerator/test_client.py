@@ -0,0 +1,9 @@
+import pytest
+from msgspec import ValidationError
+
+from model_client_tests import *  # noqa: F401,F403
+
+
+@pytest.fixture()
+def validation_error() -> type[Exception]:
+    return ValidationError
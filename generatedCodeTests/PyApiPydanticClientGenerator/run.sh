@@ -0,0 +1,13 @@
+mkdir -p generated/
+cp ../../src/test/resources/org/codegen/generators/PyApiPydanticClientGenerator/endpointsOutput.py generated/api.py
+cp ../shared/model_client_tests.py .
+
+for image in 'python:3.10-alpine' \
+             'python:3.11-alpine' \
+             'python:3.12-alpine' \
+             'python:3.13-alpine'
+do
+  export IMAGE="$image"
+  export CONTAINER_NAME="py_api_pydantic_client_$(echo "$image" | tr -c '[:alnum:]_-' '-')"
+  docker compose --progress quiet up --build --abort-on-container-exit --no-attach mock_server --no-attach mock_server_secured
+done
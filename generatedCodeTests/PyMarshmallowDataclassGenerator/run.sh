@@ -1,5 +1,6 @@
 mkdir -p generated/
 cp ../../src/test/resources/org/codegen/generators/PyMarshmallowDataclassGenerator/entitiesOutput.py generated/dto.py
+cp ../../src/test/resources/org/codegen/generators/PyMarshmallowDataclassGenerator/entitiesOutputFastCodecs.py generated/dto_fast_codecs.py
 
 for image in 'python:3.10-alpine' \
              'python:3.11-alpine' \
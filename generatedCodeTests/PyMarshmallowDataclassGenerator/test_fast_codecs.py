@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta, timezone
+
+import marshmallow_dataclass
+import pytest
+from marshmallow.exceptions import ValidationError
+
+from generated.dto_fast_codecs import AdvancedDto, BaseSchema, BasicDto, ContainerDto
+
+
+@pytest.fixture()
+def basic_data() -> dict:
+    return {
+        'timestamp': '2024-05-01T10:20:30.123Z',
+        'duration': 'PT1H5M',
+        'enum_value': 'value 2',
+        'json_value': {'foo': [1, 2]},
+        'customName': 2.5,
+        'listValue': [1, '2', 3.0],
+        'nullable_value': None,
+        'unknown_key': 'ignored',
+    }
+
+
+def schema_load(data_class, data):
+    return marshmallow_dataclass.class_schema(data_class, base_schema=BaseSchema)().load(data)
+
+
+def schema_dump(value):
+    return marshmallow_dataclass.class_schema(type(value))().dump(value)
+
+
+def assert_same_result(data_class, data):
+    try:
+        expected = schema_load(data_class, data)
+    except ValidationError:
+        with pytest.raises(ValidationError):
+            data_class.from_dict(data)
+    else:
+        assert data_class.from_dict(data) == expected
+
+
+def test_decode_basic(basic_data):
+    dto = BasicDto.from_dict(basic_data)
+
+    assert dto == schema_load(BasicDto, basic_data)
+    assert dto.duration == timedelta(hours=1, minutes=5)
+    assert dto.list_value == [1, 2, 3]
+    assert dto.optional_value == 0
+    assert dto.optional_list_value == []
+
+
+def test_decode_nested(basic_data):
+    data = {
+        'basic': basic_data,
+        'basics': [basic_data, basic_data],
+        'basic_nullable_list': None,
+    }
+
+    assert ContainerDto.from_dict(data) == schema_load(ContainerDto, data)
+
+
+@pytest.mark.parametrize('key, value', [
+    ('timestamp', 'yesterday'),
+    ('timestamp', None),
+    ('enum_value', 'value 4'),
+    ('enum_value', 1),
+    ('json_value', [1]),
+    ('customName', True),
+    ('customName', 'nan'),
+    ('listValue', 5),
+    ('listValue', [1, None]),
+    ('nullable_value', 'maybe'),
+    ('optional_value', 'zero'),
+])
+def test_decode_invalid_value(basic_data, key, value):
+    basic_data[key] = value
+    assert_same_result(BasicDto, basic_data)
+
+
+def test_decode_missing_required_field(basic_data):
+    del basic_data['customName']
+
+    with pytest.raises(ValidationError) as error:
+        BasicDto.from_dict(basic_data)
+    assert error.value.messages == {'customName': ['Missing data for required field.']}
+
+
+def test_decode_nested_error_path(basic_data):
+    basic_data['listValue'] = [1, 'two']
+    data = {'basic': basic_data, 'basics': [], 'basic_nullable_list': None}
+
+    with pytest.raises(ValidationError) as error:
+        ContainerDto.from_dict(data)
+    assert error.value.messages == {'basic': {'listValue': {1: ['Not a valid integer.']}}}
+
+
+def test_decode_runs_validators():
+    assert AdvancedDto.from_dict({'a': 1, 'b': 2}).sum == 3
+
+    with pytest.raises(ValidationError):
+        AdvancedDto.from_dict({'a': 2, 'b': 1})
+
+    with pytest.raises(ValidationError):
+        AdvancedDto.from_dict([1, 2])
+
+
+def test_encode_basic(basic_data):
+    dto = BasicDto.from_dict(basic_data)
+    expected = schema_dump(dto)
+    expected['timestamp'] = '2024-05-01T10:20:30.123000Z'
+
+    assert dto.to_dict() == expected
+    assert BasicDto.from_dict(dto.to_dict()) == dto
+
+
+def test_encode_formats():
+    dto = BasicDto(
+        timestamp=datetime(2024, 5, 1, 13, 20, 30, tzinfo=timezone(timedelta(hours=3))),
+        duration=timedelta(0),
+        enum_value='value 1',
+        json_value={},
+        documented_value=1,
+        list_value=[],
+    )
+    data = dto.to_dict()
+
+    assert data['timestamp'] == '2024-05-01T10:20:30Z'
+    assert data['duration'] == 'PT0S'
+    assert data['customName'] == 1.0
+    assert data['nullable_value'] is None
+
+
+def test_encode_nested(basic_data):
+    dto = ContainerDto.from_dict({
+        'basic': basic_data,
+        'basics': [basic_data],
+        'basic_nullable_list': None,
+    })
+    data = dto.to_dict()
+
+    assert data['basic'] == data['basics'][0] == dto.basic_single.to_dict()
+    assert data['basic_nullable_list'] is None
+    assert ContainerDto.from_dict(data) == dto
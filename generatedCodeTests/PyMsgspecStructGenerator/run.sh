@@ -0,0 +1,12 @@
+mkdir -p generated/
+cp ../../src/test/resources/org/codegen/generators/PyMsgspecStructGenerator/entitiesOutput.py generated/dto.py
+
+for image in 'python:3.10-alpine' \
+             'python:3.11-alpine' \
+             'python:3.12-alpine' \
+             'python:3.13-alpine'
+do
+  export IMAGE="$image"
+  export CONTAINER_NAME="py_msgspec_struct_$(echo "$image" | tr -c '[:alnum:]_-' '-')"
+  docker compose --progress quiet up --build --abort-on-container-exit
+done
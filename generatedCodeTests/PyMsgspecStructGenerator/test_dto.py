@@ -0,0 +1,78 @@
+import pytest
+import msgspec
+from msgspec import ValidationError
+
+
+def test_import():
+    from generated.dto import AdvancedDto  # noqa
+
+
+def test_property():
+    from generated.dto import AdvancedDto
+
+    dto = AdvancedDto(a=5, b=10)
+    assert dto.sum == 15
+
+
+def test_validators():
+    from generated.dto import AdvancedDto
+
+    with pytest.raises(ValidationError):
+        AdvancedDto(a=-5, b=10)
+
+    with pytest.raises(ValidationError):
+        msgspec.json.decode(b'{"a": 55, "b": 10}', type=AdvancedDto)
+
+
+def test_decode_renamed_and_default_fields():
+    from generated.dto import BasicDto, EnumValue
+
+    raw = b'''{
+        "timestamp": "2024-01-01T10:00:00Z",
+        "duration": "PT300S",
+        "enum_value": "value 2",
+        "json_value": {"foo": 1},
+        "customName": 2.5,
+        "listValue": [1, 2],
+        "unknown_field": "ignored"
+    }'''
+    dto = msgspec.json.decode(raw, type=BasicDto)
+
+    assert dto.duration.total_seconds() == 300
+    assert dto.enum_value == EnumValue.VALUE_2
+    assert dto.documented_value == 2.5
+    assert dto.list_value == [1, 2]
+    assert dto.optional_value == 0
+    assert dto.nullable_value is None
+    assert dto.optional_list_value == []
+
+
+def test_encode_roundtrip():
+    from generated.dto import ContainerDto
+
+    raw = b'''{
+        "basic": {
+            "timestamp": "2024-01-01T10:00:00Z",
+            "duration": "PT60S",
+            "enum_value": "value 1",
+            "json_value": {},
+            "customName": 1.0,
+            "listValue": []
+        },
+        "basics": [],
+        "basic_nullable_list": null
+    }'''
+    dto = msgspec.json.decode(raw, type=ContainerDto)
+    encoded = msgspec.json.decode(msgspec.json.encode(dto))
+
+    assert encoded['basic']['customName'] == 1.0
+    assert encoded['basic']['listValue'] == []
+    assert encoded['basic_nullable_list'] is None
+    assert msgspec.json.decode(msgspec.json.encode(dto), type=ContainerDto) == dto
+
+
+def test_missing_required_field():
+    from generated.dto import AdvancedDto
+
+    with pytest.raises(ValidationError, match='b'):
+        msgspec.json.decode(b'{"a": 1}', type=AdvancedDto)
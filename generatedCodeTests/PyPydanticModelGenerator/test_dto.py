@@ -0,0 +1,84 @@
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+
+def test_import():
+    from generated.dto import AdvancedDto  # noqa
+
+
+def test_property():
+    from generated.dto import AdvancedDto
+
+    dto = AdvancedDto(a=5, b=10)
+    assert dto.sum == 15
+
+
+def test_validators():
+    from generated.dto import AdvancedDto
+
+    with pytest.raises(ValidationError):
+        AdvancedDto(a=-5, b=10)
+
+    with pytest.raises(ValidationError):
+        AdvancedDto.model_validate_json(b'{"a": 55, "b": 10}')
+
+
+def test_validate_aliases_and_defaults():
+    from generated.dto import BasicDto, EnumValue
+
+    raw = b'''{
+        "timestamp": "2024-01-01T10:00:00Z",
+        "duration": "PT300S",
+        "enum_value": "value 2",
+        "json_value": {"foo": 1},
+        "customName": 2.5,
+        "listValue": [1, 2],
+        "unknown_field": "ignored"
+    }'''
+    dto = BasicDto.model_validate_json(raw)
+
+    assert dto.duration.total_seconds() == 300
+    assert dto.enum_value == EnumValue.VALUE_2
+    assert dto.documented_value == 2.5
+    assert dto.list_value == [1, 2]
+    assert dto.optional_value == 0
+    assert dto.nullable_value is None
+    assert dto.optional_list_value == []
+
+
+def test_wrong_enum_value():
+    from generated.dto import BasicDto
+
+    with pytest.raises(ValidationError):
+        BasicDto(
+            timestamp='2024-01-01T10:00:00Z',
+            duration='PT1S',
+            enum_value='value 4',
+            json_value={},
+            documented_value=1,
+            list_value=[],
+        )
+
+
+def test_list_roundtrip():
+    from generated.dto import ContainerDto
+
+    raw = b'''[{
+        "basic": {
+            "timestamp": "2024-01-01T10:00:00Z",
+            "duration": "PT60S",
+            "enum_value": "value 1",
+            "json_value": {},
+            "customName": 1.0,
+            "listValue": []
+        },
+        "basics": [],
+        "basic_nullable_list": null
+    }]'''
+    adapter = TypeAdapter(list[ContainerDto])
+    items = adapter.validate_json(raw)
+    encoded = adapter.dump_python(items, by_alias=True, mode='json')
+
+    assert encoded[0]['basic']['customName'] == 1.0
+    assert encoded[0]['basic_nullable_list'] is None
+    assert adapter.validate_json(adapter.dump_json(items, by_alias=True)) == items
@@ -2,8 +2,16 @@ cd PyApiClientGenerator && ./run.sh
 cd ..
 cd PyApiAsyncClientGenerator && ./run.sh
 cd ..
+cd PyApiMsgspecClientGenerator && ./run.sh
+cd ..
+cd PyApiPydanticClientGenerator && ./run.sh
+cd ..
 cd PyDataclassGenerator && ./run.sh
 cd ..
 cd PyDjangoModelGenerator && ./run.sh
 cd ..
 cd PyMarshmallowDataclassGenerator && ./run.sh
+cd ..
+cd PyMsgspecStructGenerator && ./run.sh
+cd ..
+cd PyPydanticModelGenerator && ./run.sh
@@ -0,0 +1,229 @@
+# tests of clients of model libraries (msgspec, pydantic), copied into test directory of each client by run.sh
+import copy
+import logging
+import os
+import types
+from datetime import datetime, timezone, timedelta
+from urllib.parse import urlparse
+
+import pytest
+
+from generated.api import Generated, HttpCache, AllDataclassesCollection as dto, AllConstantsCollection as constants
+
+BASE_URL = os.environ['BASE_URL']
+SECURED_BASE_URL = os.environ['SECURED_BASE_URL']
+UNREACHABLE_BASE_URL = 'http://localhost:1'
+
+
+@pytest.fixture()
+def basic_dto() -> dto.BasicDto:
+    return dto.BasicDto(
+        timestamp=datetime.now(),
+        duration=timedelta(minutes=5),
+        enum_value=constants.EnumValue.VALUE_1,
+        json_value={'foo': 5},
+        documented_value=2.5,
+        list_value=[50, 100, 150]
+    )
+
+
+def test_get():
+    api = Generated(base_url=BASE_URL)
+    result = api.get_container_dto()
+
+    assert isinstance(result, dto.ContainerDto)
+    assert isinstance(result.basic_single, dto.BasicDto)
+    assert isinstance(result.basic_list[0], dto.BasicDto)
+
+
+def test_get_parametrized():
+    api = Generated(base_url=BASE_URL)
+    timestamp = datetime.now(tz=timezone.utc)
+    result = api.get_basic_dto_by_timestamp(timestamp)
+
+    assert isinstance(result, dto.BasicDto)
+
+
+def test_get_list():
+    api = Generated(base_url=BASE_URL)
+    result = api.get_basic_dto_list()
+
+    assert isinstance(result, types.GeneratorType)
+    assert isinstance(next(result), dto.BasicDto)
+
+
+def test_post(basic_dto):
+    api = Generated(base_url=BASE_URL)
+    result = api.create_basic_dto(basic_dto)
+
+    assert isinstance(result, dto.BasicDto)
+
+
+def test_post_list_required_fields_only(basic_dto):
+    api = Generated(base_url=BASE_URL)
+    result = api.create_basic_dto_bulk([basic_dto])
+
+    assert isinstance(result, types.GeneratorType)
+    assert isinstance(next(result), dto.BasicDto)
+
+
+def test_post_empty_list():
+    api = Generated(base_url=BASE_URL)
+    result = api.create_basic_dto_bulk([])
+
+    assert isinstance(result, types.GeneratorType)
+    with pytest.raises(StopIteration):
+        next(result)
+
+
+def test_streamed_request(basic_dto):
+    api = Generated(base_url=BASE_URL, use_request_streaming=True)
+    result = list(api.create_basic_dto_bulk(basic_dto for _ in range(1000)))
+
+    assert len(result) == 1000
+    assert isinstance(result[0], dto.BasicDto)
+
+
+def test_http_cache_reuse_objects():
+    api = Generated(base_url=BASE_URL, http_cache=HttpCache(reuse_objects=True))
+    first = list(api.get_basic_dto_list())
+    second = list(api.get_basic_dto_list())
+    third = list(api.get_basic_dto_list())
+
+    assert first == second == third
+    assert second[0] is third[0]
+    assert api.get_stats()['http_cache']['hits'] == 2
+
+
+def test_endpoint_cache():
+    api = Generated(base_url=BASE_URL)
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    first = api.get_cached_basic_dto_by_timestamp(timestamp)
+    second = api.get_cached_basic_dto_by_timestamp(timestamp)
+
+    assert first is second
+    stats = api.get_stats()['endpoint_cache']
+    assert stats['hits'] == 1
+    assert stats['bytes'] > 0
+
+
+def test_endpoint_cache_key(basic_dto):
+    make_key = Generated(base_url=BASE_URL)._endpoint_cache._make_key
+    key = make_key('create_basic_dto', basic_dto)
+
+    # arguments are compared by value rather than by identity
+    assert key == make_key('create_basic_dto', copy.deepcopy(basic_dto))
+    assert ' at 0x' not in key[1]
+    assert make_key('get_basic_dto_list', {'b': {2, 1}, 'a': 1}) == make_key('get_basic_dto_list', {'a': 1, 'b': {1, 2}})
+
+    basic_dto.documented_value = 3.5
+    assert make_key('create_basic_dto', basic_dto) != key
+
+
+def test_post_request_wrong_enum_value(basic_dto, validation_error):
+    api = Generated()
+    basic_dto.enum_value = constants.EnumValue.VALUE_1 + 'azaza'
+    payload = [basic_dto]
+
+    with pytest.raises(validation_error):
+        result = api.create_basic_dto_bulk(payload)
+        next(result)
+
+
+def test_403():
+    api = Generated(base_url=SECURED_BASE_URL, max_retries=0)
+    with pytest.raises(RuntimeError):
+        api.ping()
+
+
+def test_retries(caplog):
+    api = Generated(base_url=UNREACHABLE_BASE_URL, max_retries=3, retry_timeout=0.1, logger=logging.getLogger())
+    with pytest.raises(RuntimeError):
+        with caplog.at_level(logging.WARNING):
+            api.ping()
+
+    assert 'got NewConnectionError on BaseJsonHttpClient._mk_request, attempt 1 / 3' in caplog.messages
+    assert 'got NewConnectionError on BaseJsonHttpClient._mk_request, attempt 2 / 3' in caplog.messages
+    assert 'got NewConnectionError on BaseJsonHttpClient._mk_request, attempt 3 / 3' in caplog.messages
+
+
+def test_user_agent_and_headers():
+    api = Generated(
+        base_url=SECURED_BASE_URL,
+        user_agent=os.environ['SECURED_USER_AGENT'],
+        headers={
+            os.environ['SECURED_HEADER_NAME']: os.environ['SECURED_HEADER_VALUE']
+        }
+    )
+    api.ping()
+
+
+def test_keepalive_connection(basic_dto, caplog):
+    with caplog.at_level(logging.DEBUG):
+        api = Generated(base_url=BASE_URL)
+        api.create_basic_dto(basic_dto)
+        api.create_basic_dto(basic_dto)
+        api.create_basic_dto(basic_dto)
+        list(api.get_basic_dto_list())
+
+    location = urlparse(BASE_URL).netloc
+    location = location + ':80' if ':' not in location else location
+
+    message = f'Starting new HTTP connection (1): {location}'
+    assert message in caplog.messages
+    assert caplog.messages.count(message) == 1
+
+
+def test_use_debug_curl():
+    api = Generated(base_url="http://none", use_debug_curl=True, max_retries=0)
+    with pytest.raises(RuntimeError) as e:
+        api.ping()
+
+    assert 'curl "http://none/api/v1/ping"' in str(e)
+
+
+def test_custom_exception_class():
+    class ApiError(Exception):
+        pass
+
+    api = Generated(base_url="http://none", max_retries=0, exception_class=ApiError)
+    with pytest.raises(ApiError):
+        api.ping()
+
+
+def test_callable_header():
+    def get_header() -> str:
+        return os.environ['SECURED_HEADER_VALUE']
+
+    api = Generated(
+        base_url=SECURED_BASE_URL,
+        user_agent=os.environ['SECURED_USER_AGENT'],
+        headers={
+            os.environ['SECURED_HEADER_NAME']: get_header
+        }
+    )
+    api.ping()
+
+
+def test_schema_cache(basic_dto):
+    api = Generated(base_url=BASE_URL, use_schema_warm_up=True)
+    warmed_up = api.get_stats()['schemas']
+    assert warmed_up['size'] == 2 * len([k for k in vars(dto) if not k.startswith('_')])
+    assert warmed_up['hits'] == 0
+
+    api.create_basic_dto(basic_dto)
+    api.create_basic_dto(basic_dto)
+
+    stats = api.get_stats()['schemas']
+    assert stats['misses'] == warmed_up['misses']
+    assert stats['hits'] > 0
+
+
+def test_get_list_of_objects():
+    api = Generated(base_url=BASE_URL)
+    result = list(api.get_basic_dto_list())
+
+    assert result
+    assert all(isinstance(item, dto.BasicDto) for item in result)
+    assert isinstance(result[0].enum_value, constants.EnumValue)
+    assert isinstance(result[0].duration, timedelta)
@@ -1,9 +1,76 @@
+import gzip
+import io
+import time
+
 from flask import Flask, request
 
 from utils import item_factory, auth_required, item_container_factory
 
 app = Flask(__name__)
 
+# responses below this size are sent uncompressed
+COMPRESSION_MIN_SIZE = 1024
+
+# keys of requests which have been slowed down already
+delayed_keys = set()
+
+
+def decompress_request(wsgi_app):
+    """
+    WSGI middleware which decodes gzip-encoded request bodies.
+    """
+    def wrapper(environ, start_response):
+        if environ.get('HTTP_CONTENT_ENCODING') == 'gzip':
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+            data = gzip.decompress(environ['wsgi.input'].read(length))
+            environ['wsgi.input'] = io.BytesIO(data)
+            environ['CONTENT_LENGTH'] = str(len(data))
+            del environ['HTTP_CONTENT_ENCODING']
+        return wsgi_app(environ, start_response)
+    return wrapper
+
+
+app.wsgi_app = decompress_request(app.wsgi_app)
+
+
+@app.before_request
+def delay_response():
+    # slow response down on demand (to test concurrent requests), only the first one of requests sharing a key
+    key = request.headers.get('x-delay-key')
+    if key is not None:
+        if key in delayed_keys:
+            return
+        delayed_keys.add(key)
+    time.sleep(float(request.headers.get('x-delay', 0)))
+
+
+@app.before_request
+def respond_with_status():
+    # simulate overloaded server on demand
+    if 'x-status' in request.headers:
+        return '', int(request.headers['x-status'])
+
+
+@app.after_request
+def compress_response(response):
+    if (
+        'gzip' in request.headers.get('accept-encoding', '')
+        and response.is_json
+        and response.content_length >= COMPRESSION_MIN_SIZE
+    ):
+        response.set_data(gzip.compress(response.get_data()))
+        response.headers['content-encoding'] = 'gzip'
+    return response
+
+
+# runs before compression (hooks are called in reverse order)
+@app.after_request
+def make_conditional(response):
+    if request.method == 'GET' and response.is_json:
+        response.add_etag()
+        response.make_conditional(request)
+    return response
+
 
 @app.get("/api/v1/ping")
 @auth_required
@@ -3,6 +3,7 @@ package org.codegen
 import com.beust.jcommander.Parameter
 import com.beust.jcommander.Parameters
 import org.codegen.generators.AllGeneratorsEnum
+import org.codegen.generators.ClientFeaturesEnum
 
 @Parameters(commandDescription = "Console tool which generates language-specific data classes and validators from OpenApi schema")
 class Args {
@@ -57,6 +58,14 @@ class Args {
     )
     var insecureRequests = false
 
+    @Parameter(
+        names = ["-f", "--feature"],
+        description = "Include optional runtime features into generated client (features required by schema are included anyway)",
+        variableArity = true,
+        order = 14,
+    )
+    var features: List<ClientFeaturesEnum> = listOf()
+
     @Parameter(
         names = ["--help"],
         description = "Show help usage and exit",
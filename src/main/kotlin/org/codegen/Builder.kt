@@ -1,6 +1,7 @@
 package org.codegen
 
 import org.codegen.generators.AbstractCodeGenerator
+import org.codegen.generators.PyBaseClientGenerator
 import org.codegen.parser.ParserRegistry
 import org.codegen.schema.Entity
 import org.codegen.schema.Extension
@@ -25,6 +26,9 @@ class Builder(
         val documents = inputFiles.associateWith { ParserRegistry.parseFileOrResourceOrUrl(it) }
         val generatorClass = params.target.generatorClass
         val generator = generatorClass.createInstance()
+        if (generator is PyBaseClientGenerator) {
+            params.features.forEach { generator.addFeature(it) }
+        }
         val rootEntityName =
             params.name
                 .ifEmpty { documents.values.map { it.name }.sortedBy { it.length }.reversed().first() }
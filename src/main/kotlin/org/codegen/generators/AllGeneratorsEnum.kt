@@ -12,8 +12,12 @@ enum class AllGeneratorsEnum(val generatorClass: KClass<out AbstractCodeGenerato
     PY_API_ASYNC_CLIENT(PyApiAsyncClientGenerator::class),
     PY_AMQP_BLOCKING_CLIENT(PyAmqpBlockingClientGenerator::class),
     PY_AMQP_GEVENT_CLIENT(PyAmqpGeventClientGenerator::class),
+    PY_API_MSGSPEC_CLIENT(PyApiMsgspecClientGenerator::class),
+    PY_API_PYDANTIC_CLIENT(PyApiPydanticClientGenerator::class),
     PY_MARSHMALLOW_DATACLASS(PyMarshmallowDataclassGenerator::class),
     PY_DATACLASS(PyDataclassGenerator::class),
+    PY_MSGSPEC_STRUCT(PyMsgspecStructGenerator::class),
+    PY_PYDANTIC_MODEL(PyPydanticModelGenerator::class),
     ;
 
     /**
@@ -28,6 +32,10 @@ enum class AllGeneratorsEnum(val generatorClass: KClass<out AbstractCodeGenerato
             PY_AMQP_BLOCKING_CLIENT -> PY_MARSHMALLOW_DATACLASS
             PY_AMQP_GEVENT_CLIENT -> PY_AMQP_BLOCKING_CLIENT
             PY_MARSHMALLOW_DATACLASS -> PY_DATACLASS
+            PY_API_MSGSPEC_CLIENT -> PY_MSGSPEC_STRUCT
+            PY_MSGSPEC_STRUCT -> PY_DATACLASS
+            PY_API_PYDANTIC_CLIENT -> PY_PYDANTIC_MODEL
+            PY_PYDANTIC_MODEL -> PY_DATACLASS
             else -> null
         }
 
@@ -0,0 +1,19 @@
+package org.codegen.generators
+
+/**
+ * Optional runtime features of generated clients.
+ * Code of feature is included only if it is enabled by generator options or required by schema
+ * (template blocks between '# feature: <lowercase name>' and '# end feature' lines).
+ */
+enum class ClientFeaturesEnum {
+    CIRCUIT_BREAKER,
+    ADAPTIVE_CONCURRENCY,
+    HTTP_CACHE,
+    REQUEST_COALESCING,
+    REQUEST_HEDGING,
+    CALL_TRACING,
+    RATE_LIMIT, // also required by endpoints with rate limit
+    ENDPOINT_CACHE, // also required by cacheable endpoints
+    REQUEST_BATCHING, // also required by batched endpoints
+    REQUEST_STREAMING, // always included into HTTP clients
+}
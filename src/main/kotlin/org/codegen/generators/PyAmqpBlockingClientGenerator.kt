@@ -54,8 +54,10 @@ open class PyAmqpBlockingClientGenerator(proxy: AbstractCodeGenerator? = null) :
             lines.add(payloadArgs.joinToString(", ", prefix = "args = (", postfix = ",)"))
         }
 
+        val rateLimiterArg = endpoint.rateLimit?.let { ", rate_limiter=self._get_rate_limiter('${endpoint.name.snakeCase()}', $it)" } ?: ""
+
         // prepare '_mk_request' method call
-        "raw_data = self._client.mk_request($routingKey, '${endpoint.name.snakeCase()}', *args).get()".let {
+        "raw_data = self._client.mk_request($routingKey, '${endpoint.name.snakeCase()}', *args$rateLimiterArg).get()".let {
             if (payloadArgs.isEmpty()) {
                 // exclude empty args
                 it.replace(", *args", "")
@@ -93,6 +95,7 @@ open class PyAmqpBlockingClientGenerator(proxy: AbstractCodeGenerator? = null) :
             "import io",
             "import os",
             "import json",
+            "import importlib.util",
             "from dataclasses import is_dataclass",
             "from dataclasses import astuple",
             "from dataclasses import dataclass",
@@ -103,10 +106,11 @@ open class PyAmqpBlockingClientGenerator(proxy: AbstractCodeGenerator? = null) :
             "from datetime import timezone",
             "from decimal import Decimal",
             "import marshmallow",
-            "import ijson",
             "import logging",
             "import time",
-            "from funcy import memoize",
+            "import random",
+            "import threading",
+            "from email.utils import parsedate_to_datetime",
             "from uuid import uuid4",
             "from threading import Lock",
             "from urllib.parse import urlparse",
@@ -118,13 +122,20 @@ open class PyAmqpBlockingClientGenerator(proxy: AbstractCodeGenerator? = null) :
         return super.renderHeaders()
     }
 
-    override fun getMainApiClassBody() = Reader.readFileOrResourceOrUrl("resource:/templates/python/amqpClientBody.py").trimEnd()
+    override fun getMainApiClassBody() = renderFeatures(Reader.readFileOrResourceOrUrl("resource:/templates/python/amqpClientBody.py")).trimEnd()
 
     override fun getBodyIncludedFiles() =
-        listOf(
+        listOfNotNull(
             "resource:/templates/python/baseJsonAmqpBlockingClient.py",
+            "resource:/templates/python/jsonCodec.py",
             "resource:/templates/python/baseSerializer.py",
             "resource:/templates/python/baseDeserializer.py",
+            "resource:/templates/python/baseSchemaRegistry.py",
+            "resource:/templates/python/schemaRegistry.py",
+            "resource:/templates/python/retryPolicy.py",
+            getFeatureFile(ClientFeaturesEnum.ENDPOINT_CACHE, "resource:/templates/python/endpointCache.py"),
+            getFeatureFile(ClientFeaturesEnum.REQUEST_BATCHING, "resource:/templates/python/requestBatcher.py"),
+            getFeatureFile(ClientFeaturesEnum.RATE_LIMIT, "resource:/templates/python/rateLimiter.py"),
             "resource:/templates/python/failsafeCall.py",
         )
 
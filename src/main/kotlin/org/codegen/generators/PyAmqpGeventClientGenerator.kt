@@ -5,12 +5,15 @@ class PyAmqpGeventClientGenerator(proxy: AbstractCodeGenerator? = null) : PyAmqp
         listOf(
             "from dataclasses import asdict",
             "import gevent",
-            "from gevent._semaphore import Semaphore",
             "from gevent.event import AsyncResult",
+            "from gevent.event import Event",
+            "from gevent.local import local",
+            "from gevent.lock import Semaphore",
         ).forEach { headers.add(it) }
 
         return super.renderHeaders()
             .replace("\nfrom threading import Lock", "")
+            .replace("\nimport threading", "")
     }
 
     override fun getMainApiClassBody() =
@@ -28,6 +31,16 @@ class PyAmqpGeventClientGenerator(proxy: AbstractCodeGenerator? = null) : PyAmqp
         return original
     }
 
+    // included code locks and waits in greenlets rather than in threads
+    override fun readIncludedFile(path: String) =
+        super.readIncludedFile(path)
+            .replace("threading.Lock()", "Semaphore()")
+            .replace("threading.Event()", "Event()")
+            .replace("threading.local()", "local()")
+            .replace("(lambda func: threading.Thread(target=func, daemon=True).start())", "gevent.spawn")
+            .replace("in a new daemon thread", "in a new greenlet")
+            .replace("time.sleep(", "gevent.sleep(")
+
     override fun renderBodyPrefix(): String {
         definedNames.add("AmqpApiWithLazyListener") // make listener class accessible from outside
         return super.renderBodyPrefix()
@@ -31,13 +31,35 @@ class PyApiAsyncClientGenerator(proxy: AbstractCodeGenerator? = null) : PyApiCli
             .replace("self._client.fetch", "await self._client.fetch")
             .let {
                 if ("yield from" in it) {
-                    it.replace("yield from", "for item in") + ":\n    yield item"
+                    // parse response stream item by item
+                    it
+                        .replace("\n)\n", "\n    stream=True,\n)\n")
+                        .replace("yield from self._deserializer.deserialize(", "async for item in self._deserializer.deserialize_async(") +
+                        ":\n    yield item"
                 } else {
                     it
                 }
             }
     }
 
+    override fun renderCachedEndpointBody(
+        endpoint: Endpoint,
+        body: String,
+    ): String {
+        return super.renderCachedEndpointBody(endpoint, body)
+            .replace("def load(", "async def load(")
+            .replace("return self._endpoint_cache.call(", "return await self._endpoint_cache.call_async(")
+    }
+
+    override fun renderBatchedEndpointBody(
+        endpoint: Endpoint,
+        bulkEndpoint: Endpoint,
+        body: String,
+    ): String {
+        return super.renderBatchedEndpointBody(endpoint, bulkEndpoint, body)
+            .replace("return self._request_batcher.call(", "return await self._request_batcher.call_async(")
+    }
+
     override fun renderHeaders(): String {
         listOf(
             "import asyncio",
@@ -45,17 +67,39 @@ class PyApiAsyncClientGenerator(proxy: AbstractCodeGenerator? = null) : PyApiCli
         ).forEach { headers.add(it) }
 
         return super.renderHeaders()
-            .replace("\nimport ijson", "")
             .replace("\nimport urllib3", "")
             .replace("\nfrom time import sleep", "")
-            .replace("\nimport io", "")
-            .replace("\nimport json", "")
+            .replace("\nimport concurrent.futures", "")
+            .replace("\nimport itertools", "")
     }
 
     override fun getMainApiClassBody() =
-        Reader.readFileOrResourceOrUrl("resource:/templates/python/apiClientBody.py")
-            .replace("BaseJsonHttpClient", "BaseJsonHttpAsyncClient")
-            .trimEnd()
+        listOf(
+            renderFeatures(Reader.readFileOrResourceOrUrl("resource:/templates/python/apiClientBody.py"))
+                .replace("BaseJsonHttpClient", "BaseJsonHttpAsyncClient")
+                .replace("BaseDeserializer(", "BaseAsyncDeserializer(")
+                .replace("EndpointCache(", "AsyncEndpointCache(")
+                .replace("SingleFlight(", "AsyncSingleFlight(")
+                .replace("RequestBatcher(", "AsyncRequestBatcher(")
+                .replace("ConcurrencyLimiter(", "AsyncConcurrencyLimiter(")
+                .replace("'ConcurrencyLimiter | None'", "'AsyncConcurrencyLimiter | None'"),
+            Reader.readFileOrResourceOrUrl("resource:/templates/python/apiAsyncClientSession.py"),
+            Reader.readFileOrResourceOrUrl("resource:/templates/python/apiAsyncClientGather.py"),
+        ).joinToString("\n\n") { it.trimEnd() }
+
+    override fun renderBodyPrefix(): String {
+        val clientBody = super.renderBodyPrefix()
+        if (ClientFeaturesEnum.ADAPTIVE_CONCURRENCY in features) {
+            definedNames.add("AsyncConcurrencyLimiter") // coroutine-friendly concurrency limiter for customization
+        }
+        return clientBody
+    }
+
+    override fun getFeatureHeaders() =
+        super.getFeatureHeaders().toMutableMap().also {
+            it[ClientFeaturesEnum.CALL_TRACING] = it.getValue(ClientFeaturesEnum.CALL_TRACING) + "import contextlib"
+            it[ClientFeaturesEnum.ENDPOINT_CACHE] = it.getValue(ClientFeaturesEnum.ENDPOINT_CACHE) + "import contextlib"
+        }
 
     override fun getBodyIncludedFiles(): List<String> {
         val original = super.getBodyIncludedFiles().toMutableList()
@@ -63,8 +107,25 @@ class PyApiAsyncClientGenerator(proxy: AbstractCodeGenerator? = null) : PyApiCli
             mapOf(
                 "resource:/templates/python/baseJsonHttpClient.py" to "resource:/templates/python/baseJsonHttpAsyncClient.py",
                 "resource:/templates/python/failsafeCall.py" to "resource:/templates/python/failsafeCallAsync.py",
+                "resource:/templates/python/mapConcurrently.py" to "resource:/templates/python/gatherConcurrently.py",
             ).getOrDefault(it, it)
         }
+        original.add(
+            original.indexOf("resource:/templates/python/baseDeserializer.py") + 1,
+            "resource:/templates/python/baseAsyncDeserializer.py",
+        )
+        // async counterparts of templates of included features
+        mapOf(
+            "resource:/templates/python/concurrencyLimiter.py" to "resource:/templates/python/concurrencyLimiterAsync.py",
+            "resource:/templates/python/endpointCache.py" to "resource:/templates/python/endpointCacheAsync.py",
+            "resource:/templates/python/singleFlight.py" to "resource:/templates/python/singleFlightAsync.py",
+            "resource:/templates/python/requestBatcher.py" to "resource:/templates/python/requestBatcherAsync.py",
+        ).forEach { (sync, async) ->
+            val index = original.indexOf(sync)
+            if (index >= 0) {
+                original.add(index + 1, async)
+            }
+        }
         return original
     }
 }
@@ -8,7 +8,10 @@ import org.codegen.schema.MethodArgument
 import org.codegen.utils.Reader
 import org.codegen.utils.snakeCase
 
-open class PyApiClientGenerator(proxy: AbstractCodeGenerator? = null) : PyBaseClientGenerator(proxy) {
+open class PyApiClientGenerator(
+    proxy: AbstractCodeGenerator? = null,
+    includedEntityType: AllGeneratorsEnum = AllGeneratorsEnum.PY_MARSHMALLOW_DATACLASS,
+) : PyBaseClientGenerator(proxy, includedEntityType) {
     private fun buildArgumentDefaultValue(argument: MethodArgument): String {
         val dtypeProps = getDtype(argument.dtype)
         return if (argument.default == UNSET) {
@@ -25,6 +28,21 @@ open class PyApiClientGenerator(proxy: AbstractCodeGenerator? = null) : PyBaseCl
         }
     }
 
+    private fun isPayloadArgument(
+        endpoint: Endpoint,
+        argument: MethodArgument,
+    ): Boolean {
+        val isAtomicType = getDtype(argument.dtype).definition in atomicJsonTypes
+        val isPathVariable = "{%s}".format(argument.name) in endpoint.path
+        return !isPathVariable && endpoint.verb != EndpointVerb.GET && !isAtomicType
+    }
+
+    // sequence payloads may be streamed, so any iterable is accepted
+    override fun renderArgumentCollectionType(
+        endpoint: Endpoint,
+        argument: MethodArgument,
+    ) = if (isPayloadArgument(endpoint, argument)) "t.Iterable" else super.renderArgumentCollectionType(endpoint, argument)
+
     override fun renderEndpointBody(endpoint: Endpoint): String {
         val returnDtypeProps = getDtype(endpoint.dtype)
         val returnType = returnDtypeProps.definition
@@ -42,8 +60,8 @@ open class PyApiClientGenerator(proxy: AbstractCodeGenerator? = null) : PyBaseCl
             val isAtomicType = argBaseType in atomicJsonTypes
             val pathName = "{%s}".format(argument.name)
             val isPathVariable = pathName in endpointPath
-            val isQueryVariable = !isPathVariable && (endpoint.verb == EndpointVerb.GET || isAtomicType)
-            val isPayload = !isPathVariable && !isQueryVariable
+            val isPayload = isPayloadArgument(endpoint, argument)
+            val isQueryVariable = !isPathVariable && !isPayload
 
             if (!isAtomicType) {
                 if (isPayload) {
@@ -105,6 +123,8 @@ open class PyApiClientGenerator(proxy: AbstractCodeGenerator? = null) : PyBaseCl
             lines.add("    url='$endpointPath',")
         }
 
+        lines.add("    endpoint='${endpoint.name.snakeCase()}',")
+
         if (endpoint.verb != EndpointVerb.GET) {
             lines.add("    method='${endpoint.verb}',")
         }
@@ -120,11 +140,15 @@ open class PyApiClientGenerator(proxy: AbstractCodeGenerator? = null) : PyBaseCl
             }
         }
 
+        if (endpoint.rateLimit != null) {
+            lines.add("    rate_limiter=self._get_rate_limiter('${endpoint.name.snakeCase()}', ${endpoint.rateLimit}),")
+        }
+
         lines.add(")") // end of 'self._fetch('
 
         // prepare return statement
         if (endpoint.many) {
-            if (endpoint.cacheable) {
+            if (isCached(endpoint)) {
                 lines.add("return list(self._deserializer.deserialize(raw_data, $returnType, many=True))")
             } else {
                 lines.add("yield from self._deserializer.deserialize(raw_data, $returnType, many=True)")
@@ -147,10 +171,17 @@ open class PyApiClientGenerator(proxy: AbstractCodeGenerator? = null) : PyBaseCl
             "import typing as t",
             "import logging",
             "import json",
-            "import ijson",
+            "import importlib.util",
+            "import gzip",
             "import urllib3",
             "from urllib.parse import urljoin, urlencode",
             "from time import sleep",
+            "import time",
+            "import random",
+            "import threading",
+            "import concurrent.futures",
+            "import itertools",
+            "from email.utils import parsedate_to_datetime",
             "import marshmallow",
             "import marshmallow_dataclass",
             "from dataclasses import is_dataclass",
@@ -164,13 +195,50 @@ open class PyApiClientGenerator(proxy: AbstractCodeGenerator? = null) : PyBaseCl
     }
 
     override fun getBodyIncludedFiles() =
-        listOf(
+        listOfNotNull(
             "resource:/templates/python/baseJsonHttpClient.py",
+            "resource:/templates/python/jsonArrayStream.py",
+            "resource:/templates/python/jsonCodec.py",
             "resource:/templates/python/baseSerializer.py",
             "resource:/templates/python/baseDeserializer.py",
+            "resource:/templates/python/baseSchemaRegistry.py",
+            "resource:/templates/python/schemaRegistry.py",
+            "resource:/templates/python/retryPolicy.py",
+            getFeatureFile(ClientFeaturesEnum.CIRCUIT_BREAKER, "resource:/templates/python/circuitBreaker.py"),
+            getFeatureFile(ClientFeaturesEnum.ADAPTIVE_CONCURRENCY, "resource:/templates/python/concurrencyLimiter.py"),
+            getFeatureFile(setOf(ClientFeaturesEnum.HTTP_CACHE, ClientFeaturesEnum.REQUEST_COALESCING), "resource:/templates/python/cachedResponse.py"),
+            getFeatureFile(ClientFeaturesEnum.HTTP_CACHE, "resource:/templates/python/httpCache.py"),
+            getFeatureFile(ClientFeaturesEnum.ENDPOINT_CACHE, "resource:/templates/python/endpointCache.py"),
+            getFeatureFile(ClientFeaturesEnum.REQUEST_COALESCING, "resource:/templates/python/singleFlight.py"),
+            getFeatureFile(ClientFeaturesEnum.REQUEST_HEDGING, "resource:/templates/python/hedgePolicy.py"),
+            getFeatureFile(ClientFeaturesEnum.CALL_TRACING, "resource:/templates/python/callTracer.py"),
+            getFeatureFile(ClientFeaturesEnum.REQUEST_BATCHING, "resource:/templates/python/requestBatcher.py"),
+            getFeatureFile(ClientFeaturesEnum.RATE_LIMIT, "resource:/templates/python/rateLimiter.py"),
             "resource:/templates/python/failsafeCall.py",
+            "resource:/templates/python/compressRequestBody.py",
             "resource:/templates/python/buildCurlCommand.py",
+            "resource:/templates/python/mapConcurrently.py",
         )
 
-    override fun getMainApiClassBody() = Reader.readFileOrResourceOrUrl("resource:/templates/python/apiClientBody.py").trimEnd()
+    override fun getSupportedFeatures() = ClientFeaturesEnum.entries.toSet()
+
+    override fun getDefaultFeatures() = setOf(ClientFeaturesEnum.REQUEST_STREAMING)
+
+    override fun renderBodyPrefix(): String {
+        val clientBody = super.renderBodyPrefix()
+        mapOf(
+            ClientFeaturesEnum.CIRCUIT_BREAKER to "CircuitBreaker", // make circuit breaker class accessible for sharing between clients
+            ClientFeaturesEnum.HTTP_CACHE to "HttpCache", // HTTP cache is opt-in, so it is created by user
+            ClientFeaturesEnum.ADAPTIVE_CONCURRENCY to "ConcurrencyLimiter", // make concurrency limiter accessible for tuning and sharing between clients
+            ClientFeaturesEnum.REQUEST_HEDGING to "HedgePolicy", // make hedge policy accessible for tuning and sharing between clients
+            ClientFeaturesEnum.CALL_TRACING to "CallEvent", // type of phase timings passed to call hook
+        ).filterKeys { it in features }.values.forEach { definedNames.add(it) }
+        return clientBody
+    }
+
+    override fun getMainApiClassBody() =
+        listOf(
+            renderFeatures(Reader.readFileOrResourceOrUrl("resource:/templates/python/apiClientBody.py")),
+            Reader.readFileOrResourceOrUrl("resource:/templates/python/apiClientMap.py"),
+        ).joinToString("\n\n") { it.trimEnd() }
 }
@@ -0,0 +1,43 @@
+package org.codegen.generators
+
+// client of classes validated by model library (msgspec structs, pydantic models) instead of marshmallow
+abstract class PyApiModelClientGenerator(
+    proxy: AbstractCodeGenerator?,
+    includedEntityType: AllGeneratorsEnum,
+    // name of imported module, also prefix of its schema registry template
+    private val library: String,
+) : PyApiClientGenerator(proxy, includedEntityType) {
+    override fun renderHeaders(): String {
+        headers.add("import $library")
+
+        return super.renderHeaders()
+            .replace("\nimport marshmallow_dataclass", "")
+            .replace("\nimport marshmallow", "")
+    }
+
+    // no marshmallow schema is needed
+    override fun getBodyPrefixIncludedFiles() = listOf<String>()
+
+    override fun getMainApiClassBody() =
+        super.getMainApiClassBody()
+            .replace("BaseSerializer(", "ModelSerializer(")
+            .replace("BaseDeserializer(", "ModelDeserializer(")
+
+    override fun getBodyIncludedFiles(): List<String> {
+        val original = super.getBodyIncludedFiles().toMutableList()
+        original.replaceAll {
+            mapOf(
+                "resource:/templates/python/schemaRegistry.py" to "resource:/templates/python/${library}SchemaRegistry.py",
+            ).getOrDefault(it, it)
+        }
+        original.add(
+            original.indexOf("resource:/templates/python/baseSerializer.py") + 1,
+            "resource:/templates/python/modelSerializer.py",
+        )
+        original.add(
+            original.indexOf("resource:/templates/python/baseDeserializer.py") + 1,
+            "resource:/templates/python/modelDeserializer.py",
+        )
+        return original
+    }
+}
@@ -0,0 +1,7 @@
+package org.codegen.generators
+
+class PyApiMsgspecClientGenerator(proxy: AbstractCodeGenerator? = null) : PyApiModelClientGenerator(
+    proxy,
+    AllGeneratorsEnum.PY_MSGSPEC_STRUCT,
+    "msgspec",
+)
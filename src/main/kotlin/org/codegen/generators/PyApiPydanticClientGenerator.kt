@@ -0,0 +1,7 @@
+package org.codegen.generators
+
+class PyApiPydanticClientGenerator(proxy: AbstractCodeGenerator? = null) : PyApiModelClientGenerator(
+    proxy,
+    AllGeneratorsEnum.PY_PYDANTIC_MODEL,
+    "pydantic",
+)
@@ -9,9 +9,12 @@ import org.codegen.utils.CodeFormatRules
 import org.codegen.utils.Reader
 import org.codegen.utils.snakeCase
 
-abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : AbstractCodeGenerator(
+abstract class PyBaseClientGenerator(
+    proxy: AbstractCodeGenerator? = null,
+    includedEntityType: AllGeneratorsEnum = AllGeneratorsEnum.PY_MARSHMALLOW_DATACLASS,
+) : AbstractCodeGenerator(
     CodeFormatRules.PYTHON,
-    AllGeneratorsEnum.PY_MARSHMALLOW_DATACLASS,
+    includedEntityType,
     proxy,
 ) {
     protected val atomicJsonTypes = listOf("str", "float", "int", "None", "bool")
@@ -22,6 +25,13 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
     protected val definedExceptions = mutableSetOf<String>()
     private val definedConstants = mutableSetOf<String>()
 
+    // runtime features included into client (requested by options, required by schema or included by default)
+    protected val features = mutableSetOf<ClientFeaturesEnum>()
+
+    fun addFeature(feature: ClientFeaturesEnum) {
+        features.add(feature)
+    }
+
     private fun buildArgumentDefaultValue(argument: MethodArgument): String {
         val dtypeProps = getDtype(argument.dtype)
         return if (argument.default == UNSET) {
@@ -42,7 +52,7 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
         body: String,
         vararg names: String,
     ) {
-        if (body.startsWith("@dataclass")) {
+        if (body.startsWith("@dataclass") || names.any { isEntityName(it) }) {
             definedDataclasses.addAll(names)
         } else if (body.contains("Enum):")) {
             definedConstants.addAll(names)
@@ -52,6 +62,8 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
         super.addCodePart(body, *names)
     }
 
+    private fun isEntityName(name: String) = entities.any { renderEntityName(it.name) == name }
+
     protected open fun buildMethodDefinition(
         name: String,
         arguments: List<String>,
@@ -81,6 +93,11 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
         }
     }
 
+    protected open fun renderArgumentCollectionType(
+        endpoint: Endpoint,
+        argument: MethodArgument,
+    ) = "t.Sequence"
+
     protected open fun renderEndpointHeader(endpoint: Endpoint): String {
         val name = endpoint.name.snakeCase()
         val returnDtypeProps = getDtype(endpoint.dtype)
@@ -97,7 +114,7 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
                 .let {
                     if (endpoint.many) {
                         headers.add("import typing as t")
-                        if (endpoint.cacheable) "list[$it]" else "t.Iterator[$it]"
+                        if (isCached(endpoint)) "list[$it]" else "t.Iterator[$it]"
                     } else if (endpoint.nullable) {
                         "$it | None"
                     } else {
@@ -131,7 +148,7 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
                     .let {
                         if (argument.many) {
                             headers.add("import typing as t")
-                            "t.Sequence[$it]"
+                            "${renderArgumentCollectionType(endpoint, argument)}[$it]"
                         } else {
                             it
                         }
@@ -155,11 +172,6 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
 
         val lines = mutableListOf<String>()
 
-        if (endpoint.cacheable) {
-            headers.add("from funcy import memoize")
-            lines.add("@memoize")
-        }
-
         val singleLine =
             if (arguments.any { "\n" in it }) {
                 false
@@ -180,22 +192,84 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
 
     abstract fun renderEndpointBody(endpoint: Endpoint): String
 
-    private fun renderEndpoint(endpoint: Endpoint) =
-        renderEndpointHeader(endpoint) +
-            renderEndpointBody(endpoint)
+    // wrap request into loader function called by client's endpoint cache (which may also refresh result in background)
+    protected open fun renderCachedEndpointBody(
+        endpoint: Endpoint,
+        body: String,
+    ): String {
+        // iterators of "many" endpoints are materialised by renderEndpointBody, so result is a single return
+        val argNames = endpoint.argumentsSortedByDefaults.map { it.name.snakeCase() }
+        val callArgs = listOf("'${endpoint.name.snakeCase()}'", "load") + argNames + listOfNotNull(endpoint.cacheTtl?.let { "ttl=$it" })
+
+        return listOf(
+            "def load(${argNames.joinToString(", ")}):",
+            body.prependIndent("    "),
+            "",
+            "return self._endpoint_cache.call(${callArgs.joinToString(", ")})",
+        ).joinToString(separator = "\n")
+    }
+
+    // pass item to client's request batcher which calls bulk endpoint for items of concurrent calls,
+    // single-item request is sent if batching is disabled
+    protected open fun renderBatchedEndpointBody(
+        endpoint: Endpoint,
+        bulkEndpoint: Endpoint,
+        body: String,
+    ): String {
+        val argName = endpoint.arguments.first().name.snakeCase()
+        return listOf(
+            "if self._request_batcher is None:",
+            body.prependIndent("    "),
+            "return self._request_batcher.call('${endpoint.name.snakeCase()}', self.${bulkEndpoint.name.snakeCase()}, $argName)",
+        ).joinToString(separator = "\n")
+    }
+
+    private fun findBulkEndpoint(
+        endpoint: Endpoint,
+        endpoints: List<Endpoint>,
+    ): Endpoint {
+        val bulkEndpoint = endpoints.firstOrNull { it.name == endpoint.batchWith }
+        requireNotNull(bulkEndpoint) { "Endpoint '${endpoint.name}' is batched with unknown endpoint '${endpoint.batchWith}'" }
+        require(
+            endpoint.arguments.size == 1 &&
+                bulkEndpoint.arguments.size == 1 &&
+                bulkEndpoint.arguments.first().many &&
+                bulkEndpoint.arguments.first().dtype == endpoint.arguments.first().dtype &&
+                bulkEndpoint.many &&
+                bulkEndpoint.dtype == endpoint.dtype,
+        ) { "Endpoint '${endpoint.name}' must take single item and '${bulkEndpoint.name}' must take and return many of the same type" }
+        return bulkEndpoint
+    }
+
+    private fun renderEndpoint(
+        endpoint: Endpoint,
+        endpoints: List<Endpoint>,
+    ): String {
+        val header = renderEndpointHeader(endpoint)
+        val body =
+            if (endpoint.batchWith != null) {
+                renderBatchedEndpointBody(endpoint, findBulkEndpoint(endpoint, endpoints), renderEndpointBody(endpoint))
+            } else {
+                renderEndpointBody(endpoint)
+                    .let { if (isCached(endpoint)) renderCachedEndpointBody(endpoint, it) else it }
+            }
+
+        return header +
+            body
                 .prependIndent("    ")
                 .let { if (it.isNotEmpty()) "\n$it" else it }
+    }
 
     override fun renderEntity(entity: Entity): String {
         if (entity.fields.isNotEmpty()) {
-            return PyMarshmallowDataclassGenerator(this).renderEntity(entity)
+            return includedEntityGenerator.renderEntity(entity)
         }
 
         // client class with endpoints
         val className = renderEntityName(entity.name)
         val classDefinition = "class $className:"
         val classBody = getMainApiClassBody()
-        val classMethods = entity.endpoints.map { renderEndpoint(it) }
+        val classMethods = entity.endpoints.map { renderEndpoint(it, entity.endpoints) }
         return classMethods.joinToString(
             separator = "\n\n",
             prefix = "${classDefinition}\n${classBody}\n\n",
@@ -208,12 +282,20 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
     }
 
     override fun renderBodyPrefix(): String {
-        listOf(
-            "resource:/templates/python/baseSchema.py",
-        )
-            .map { Reader.readFileOrResourceOrUrl(it) }
+        // entities are cleared below, so features required by endpoints are collected first
+        collectFeatures(entities.flatMap { it.endpoints })
+
+        getBodyPrefixIncludedFiles()
+            .map { readIncludedFile(it) }
             .map { addCodePart(it) }
 
+        definedNames.add("RetryPolicy") // make retry policy class accessible for customization
+        definedNames.add("JsonCodec") // make JSON library choice accessible for customization
+        if (ClientFeaturesEnum.ENDPOINT_CACHE in features) {
+            definedNames.add("SqliteEndpointCacheBackend") // shared endpoint cache is opt-in, so it is created by user
+            definedNames.add("EndpointCacheBackend") // base class for custom shared stores (e.g. Redis)
+        }
+
         // put main client class on top of the file
         val clientEntity = entities.first { it.endpoints.isNotEmpty() }
         val clientBody = renderEntity(clientEntity)
@@ -224,9 +306,17 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
         return clientBody
     }
 
+    override fun renderHeaders(): String {
+        getFeatureHeaders()
+            .filterKeys { it in features }
+            .values
+            .forEach { headers.addAll(it) }
+        return super.renderHeaders()
+    }
+
     override fun renderBody(): String {
         getBodyIncludedFiles()
-            .map { Reader.readFileOrResourceOrUrl(it) }
+            .map { readIncludedFile(it) }
             .map { addCodePart(it) }
 
         if (definedConstants.isNotEmpty()) {
@@ -239,15 +329,15 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
             )
         }
 
-        if (definedDataclasses.isNotEmpty()) {
-            addCodePart(
-                "class AllDataclassesCollection:\n" +
-                    definedDataclasses
-                        .sorted()
-                        .joinToString("\n") { "    $it = $it" },
-                "AllDataclassesCollection",
-            )
-        }
+        // always defined since client constructor refers to it (schema warm-up)
+        addCodePart(
+            "class AllDataclassesCollection:\n" +
+                definedDataclasses
+                    .sorted()
+                    .joinToString("\n") { "    $it = $it" }
+                    .ifEmpty { "    pass" },
+            "AllDataclassesCollection",
+        )
 
         if (definedExceptions.isNotEmpty()) {
             addCodePart(
@@ -273,4 +363,112 @@ abstract class PyBaseClientGenerator(proxy: AbstractCodeGenerator? = null) : Abs
     abstract fun getMainApiClassBody(): String
 
     abstract fun getBodyIncludedFiles(): List<String>
+
+    // features which client implements, the others are not included even if requested
+    protected open fun getSupportedFeatures() =
+        setOf(
+            ClientFeaturesEnum.RATE_LIMIT,
+            ClientFeaturesEnum.ENDPOINT_CACHE,
+            ClientFeaturesEnum.REQUEST_BATCHING,
+        )
+
+    protected open fun getDefaultFeatures() = setOf<ClientFeaturesEnum>()
+
+    // imports used by code of features only
+    protected open fun getFeatureHeaders() =
+        mapOf(
+            ClientFeaturesEnum.CIRCUIT_BREAKER to listOf("import collections", "from urllib.parse import urlparse"),
+            ClientFeaturesEnum.HTTP_CACHE to listOf("import collections", "import contextlib", "import hashlib"),
+            ClientFeaturesEnum.REQUEST_COALESCING to listOf("import hashlib"),
+            ClientFeaturesEnum.REQUEST_HEDGING to listOf("import collections"),
+            ClientFeaturesEnum.CALL_TRACING to listOf("import contextvars"),
+            ClientFeaturesEnum.ENDPOINT_CACHE to
+                listOf("import collections", "import hashlib", "import pickle", "import sqlite3", "import sys", "from enum import Enum"),
+        )
+
+    private fun collectFeatures(endpoints: List<Endpoint>) {
+        features.addAll(getDefaultFeatures())
+        endpoints
+            .filter { it.cacheable && !isCached(it) }
+            .forEach { System.err.println("Warning: endpoint '${it.name}' returns no value, so it is not cached") }
+        if (endpoints.any { isCached(it) }) {
+            features.add(ClientFeaturesEnum.ENDPOINT_CACHE)
+        }
+        if (endpoints.any { it.batchWith != null }) {
+            features.add(ClientFeaturesEnum.REQUEST_BATCHING)
+        }
+        if (endpoints.any { it.rateLimit != null }) {
+            features.add(ClientFeaturesEnum.RATE_LIMIT)
+        }
+        features.retainAll(getSupportedFeatures())
+    }
+
+    // void endpoints have no result to memoize, so they are called as usual even if marked as cacheable
+    protected fun isCached(endpoint: Endpoint) = endpoint.cacheable && (endpoint.many || endpoint.dtype != "void")
+
+    // path of template which is included along with feature only
+    protected fun getFeatureFile(
+        feature: ClientFeaturesEnum,
+        path: String,
+    ) = path.takeIf { feature in features }
+
+    // path of template which is included along with any of given features
+    protected fun getFeatureFile(
+        anyOf: Set<ClientFeaturesEnum>,
+        path: String,
+    ) = path.takeIf { anyOf.any { it in features } }
+
+    // keep template blocks of included features, drop the others:
+    // '# feature: <name> [or <name>...]' ... ['# else feature' ...] '# end feature'
+    protected fun renderFeatures(code: String): String {
+        val included = ArrayDeque<Boolean>()
+        var hasMarkers = false
+        val lines =
+            code.lines().filter { line ->
+                val marker = line.trim()
+                when {
+                    marker.startsWith("# feature: ") -> {
+                        val names = marker.removePrefix("# feature: ").split(" or ")
+                        included.addLast(names.any { parseFeature(it) in features })
+                        hasMarkers = true
+                        false
+                    }
+                    marker == "# else feature" -> {
+                        require(included.isNotEmpty()) { "Template has '$marker' line outside of feature block" }
+                        included.addLast(!included.removeLast())
+                        false
+                    }
+                    marker == "# end feature" -> {
+                        require(included.isNotEmpty()) { "Template has '$marker' line outside of feature block" }
+                        included.removeLast()
+                        false
+                    }
+                    else -> included.all { it }
+                }
+            }
+        require(included.isEmpty()) { "Template has feature block without '# end feature' line" }
+
+        if (!hasMarkers) {
+            return code
+        }
+        return lines
+            .joinToString("\n")
+            // drop blank lines left around removed blocks
+            .replace(Regex(":\n\n+"), ":\n")
+            .replace(Regex("\n{3,}(?=[ ]+\\S)"), "\n\n")
+            .replace(Regex("\n{4,}"), "\n\n\n")
+    }
+
+    private fun parseFeature(name: String) =
+        requireNotNull(ClientFeaturesEnum.entries.firstOrNull { it.name == name.uppercase() }) {
+            "Template refers to unknown feature '$name'"
+        }
+
+    // contents of included file, subclasses adapt it to their runtime
+    protected open fun readIncludedFile(path: String) = renderFeatures(Reader.readFileOrResourceOrUrl(path))
+
+    protected open fun getBodyPrefixIncludedFiles() =
+        listOf(
+            "resource:/templates/python/baseSchema.py",
+        )
 }
@@ -0,0 +1,181 @@
+package org.codegen.generators
+
+import org.codegen.schema.Constants.Companion.EMPTY
+import org.codegen.schema.Constants.Companion.UNSET
+import org.codegen.schema.Entity
+import org.codegen.utils.Reader
+import org.codegen.utils.snakeCase
+
+// classes validated by a library on construction (msgspec structs, pydantic models),
+// subclasses declare how class, field options, constraints and validators are written
+abstract class PyBaseModelGenerator(
+    includedEntityType: AllGeneratorsEnum,
+    proxy: AbstractCodeGenerator? = null,
+) : PyDataclassGenerator(
+    includedEntityType,
+    proxy,
+) {
+    // module imported by generated classes
+    protected abstract val libraryImport: String
+
+    // function declaring field options, e.g. msgspec.field
+    protected abstract val fieldFunction: String
+
+    // field option with serialized name
+    protected abstract val serializedNameOption: String
+
+    // field metadata keys which are passed into library constraints
+    protected abstract val constraintKeys: List<String>
+
+    // exception raised by failed validator
+    protected abstract val validationError: String
+
+    // class definition line followed by description
+    protected abstract fun renderClassDefinition(
+        className: String,
+        parentClassName: String?,
+    ): String
+
+    // lines of class body put before fields (e.g. config of base class)
+    protected open fun renderClassOptions(entity: Entity) = listOf<String>()
+
+    // field type with constraints applied to items, if library declares them that way
+    protected open fun renderConstrainedType(
+        definition: String,
+        constraints: Map<String, String>,
+    ) = definition
+
+    // field options with constraints, if library declares them that way
+    protected open fun addConstraintOptions(
+        attrs: MutableMap<String, String>,
+        constraints: Map<String, String>,
+    ) {}
+
+    // lines wrapping calls of validators
+    protected abstract fun renderValidatorHeader(): List<String>
+
+    protected open fun renderValidatorFooter() = listOf<String>()
+
+    override fun renderEntity(entity: Entity): String {
+        val preLines = mutableListOf<String>()
+        val className = renderEntityName(entity.name)
+        val lines = mutableListOf<String>()
+
+        headers.add(libraryImport)
+
+        lines.add(renderClassDefinition(className, entity.parent?.let { renderEntityName(it) }))
+
+        entity.description?.also {
+            lines.add("    \"\"\"")
+            lines.add("    " + entity.description)
+            lines.add("    \"\"\"")
+        }
+
+        lines.addAll(renderClassOptions(entity))
+
+        for (field in entity.fieldsSortedByDefaults) {
+            val dtypeProps = getDtype(field.dtype)
+            val fieldName = field.name.snakeCase()
+            val attrs = mutableMapOf<String, String>()
+            var definition = dtypeProps.definition
+
+            if (field.isEnum) {
+                headers.add("from enum import Enum")
+                val choices = field.enum!!.keys.associate { key -> buildEnumFieldName(key) to dtypeProps.toGeneratedValue(key) }
+                val choicesDefinition = choices.map { entry -> "    ${entry.key} = ${entry.value}" }.joinToString(separator = "\n")
+                val enumName = renderEnumName(field, "${entity.name} ${field.name}")
+                assignEnumName(field, enumName)
+                addCodePart(Reader.readFileOrResourceOrUrl("resource:/templates/python/strEnum.py"))
+                addCodePart("class $enumName(StrEnum):\n$choicesDefinition", enumName)
+                definition = enumName
+            }
+
+            val constraints =
+                field.metadata
+                    .filterKeys { it.snakeCase() in constraintKeys }
+                    .toSortedMap()
+                    .mapKeys { entry -> entry.key.snakeCase() }
+
+            definition = renderConstrainedType(definition, constraints)
+
+            if (field.many) {
+                definition = "list[$definition]"
+            }
+
+            if (field.nullable) {
+                definition = "$definition | None"
+            }
+
+            field.serializedName?.let {
+                if (it != fieldName) {
+                    attrs[serializedNameOption] = "\"$it\""
+                }
+            }
+
+            if (field.default != UNSET) {
+                when {
+                    field.default == EMPTY -> {
+                        attrs["default_factory"] = if (field.many) "list" else dtypeProps.definition
+                    }
+                    field.default == null -> {
+                        attrs["default"] = "None"
+                    }
+                    field.default.isNotEmpty() && "[{".contains(field.default[0]) -> {
+                        // complex value (list/map/etc) should be inserted via function above class
+                        val callableName = "default_$fieldName"
+                        preLines.add("def $callableName():")
+                        preLines.add("    return ${field.default}\n\n")
+                        attrs["default_factory"] = callableName
+                    }
+                    else -> {
+                        // simple value -> insert inline
+                        attrs["default"] = dtypeProps.toGeneratedValue(field.default)
+                    }
+                }
+            }
+
+            addConstraintOptions(attrs, constraints)
+
+            field.description?.let {
+                lines.add("    # $it")
+            }
+
+            field.longDescription?.let {
+                lines.add("    # $it")
+            }
+
+            val expression =
+                when {
+                    attrs.isEmpty() -> ""
+                    attrs.size == 1 && attrs.containsKey("default") -> " = ${attrs.getValue("default")}"
+                    else -> " = $fieldFunction(${attrs.map { entry -> "${entry.key}=${entry.value}" }.joinToString()})"
+                }
+
+            lines.add("    $fieldName: $definition$expression")
+        }
+
+        if (entity.validators.isNotEmpty()) {
+            lines.add("")
+            lines.addAll(renderValidatorHeader())
+        }
+
+        entity.validators
+            .map { buildValidator(it, entity, validationError) }
+            .map { it.replace("\n", "\n        ") }
+            .forEach { lines.add("        $it") }
+
+        if (entity.validators.isNotEmpty()) {
+            lines.addAll(renderValidatorFooter())
+        }
+
+        entity.properties
+            .map { buildProperty(it, entity) }
+            .map { it.replace("\n", "\n    ") }
+            .forEach {
+                lines.add("")
+                lines.add("    $it")
+            }
+
+        return (preLines + lines).joinToString("\n")
+    }
+}
@@ -5,6 +5,7 @@ import org.codegen.schema.Constants.Companion.UNSET
 import org.codegen.schema.DataType
 import org.codegen.schema.Entity
 import org.codegen.schema.Property
+import org.codegen.schema.Validator
 import org.codegen.utils.CodeFormatRules
 import org.codegen.utils.EnvironmentUtils.Companion.getEnvVariable
 import org.codegen.utils.camelCase
@@ -168,12 +169,46 @@ open class PyDataclassGenerator(includedEntityType: AllGeneratorsEnum = AllGener
         .replace(" \n", "\n")
         .trim()
 
+    protected fun buildValidator(
+        validator: Validator,
+        entity: Entity,
+        exceptionClass: String,
+    ): String {
+        return validator.conditions
+            .map { buildExpression(it, entity) }
+            .joinToString("\n  ") { "if not($it):\n    raise $exceptionClass('${validator.message.replace("'", "\\'")}')" }
+    }
+
     protected open fun buildPrimitive(
         key: String,
         entity: Entity,
         dataType: DataType? = null,
-    ): String =
-        when {
+    ): String {
+        // interpret "field|attribute" syntax
+        if ("|" in key) {
+            val (fieldName, attribute) = key.split('|', limit = 2)
+            val field = entity.fields.find { it.name == fieldName }
+
+            // detect field|enum_val and convert appropriately
+            if (field?.enum?.contains(attribute) == true) {
+                // add right indent
+                return buildEnumFieldName(attribute) + ' '
+            } else if (field != null && attribute == "COUNT") {
+                // array length detected
+                val name = field.name.snakeCase()
+                return "len(self.$name) "
+            } else if (field != null && attribute == "UNIQUE_COUNT") {
+                // set length detected
+                val name = field.name.snakeCase()
+                return "len(set(self.$name)) "
+            } else if (field != null && attribute == "SORTED_ASC") {
+                // sorted list detected
+                val name = field.name.snakeCase()
+                return "sorted(self.$name) "
+            }
+        }
+
+        return when {
             key == "IF" -> "if "
             key == "THEN" -> ":\n    "
             key == "ELSE" -> "\nelse:\n    "
@@ -190,6 +225,9 @@ open class PyDataclassGenerator(includedEntityType: AllGeneratorsEnum = AllGener
             key in entity.attributeNames -> "self.${key.snakeCase()} "
             else -> throw RuntimeException("Unrecognized primitive: $key (${key.first().category})")
         }
+    }
+
+    protected fun buildEnumFieldName(key: String) = key.snakeCase().uppercase()
 
     override fun renderBodySuffix(): String {
         return StringJoiner("")
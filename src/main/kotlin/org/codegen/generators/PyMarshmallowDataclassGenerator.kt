@@ -2,10 +2,11 @@ package org.codegen.generators
 
 import org.codegen.schema.Constants.Companion.EMPTY
 import org.codegen.schema.Constants.Companion.UNSET
-import org.codegen.schema.DataType
 import org.codegen.schema.Entity
+import org.codegen.schema.Field
 import org.codegen.schema.Validator
 import org.codegen.utils.*
+import org.codegen.utils.EnvironmentUtils.Companion.getEnvFlag
 import org.codegen.utils.EnvironmentUtils.Companion.getEnvVariable
 import kotlin.jvm.optionals.getOrNull
 
@@ -13,6 +14,9 @@ class PyMarshmallowDataclassGenerator(proxy: AbstractCodeGenerator? = null) : Py
     AllGeneratorsEnum.PY_MARSHMALLOW_DATACLASS,
     proxy,
 ) {
+    // generate marshmallow-free from_dict()/to_dict() for dataclasses (used by clients instead of schema load/dump)
+    private val useFastCodecs = getEnvFlag("USE_FAST_CODECS")
+
     override fun renderBodyPrefix(): String {
         headers.add("import typing as t")
 
@@ -205,49 +209,148 @@ class PyMarshmallowDataclassGenerator(proxy: AbstractCodeGenerator? = null) : Py
                 lines.add("    $it")
             }
 
+        if (useFastCodecs && supportsFastCodecs(entity)) {
+            headers.add("import marshmallow")
+            headers.add("from datetime import timezone")
+            addCodePart(Reader.readFileOrResourceOrUrl("resource:/templates/python/fastCodecs.py"))
+            lines.add("")
+            lines.add("    " + buildFastDecoder(entity).replace("\n", "\n    "))
+            lines.add("")
+            lines.add("    " + buildFastEncoder(entity).replace("\n", "\n    "))
+        }
+
         return (preLines + lines).joinToString("\n")
     }
 
-    private fun buildValidator(
-        validator: Validator,
-        entity: Entity,
-    ): String {
-        headers.add("import marshmallow")
-        return validator.conditions
-            .map { buildExpression(it, entity) }
-            .joinToString("\n  ") { "if not($it):\n    raise marshmallow.ValidationError('${validator.message.replace("'", "\\'")}')" }
+    /**
+     * Fields of entity including inherited ones, paired with declaring entity.
+     */
+    private fun fieldsWithOwners(entity: Entity): List<Pair<Entity, Field>> {
+        val parentFields = entity.parent?.let { findEntity(it) }?.let { fieldsWithOwners(it) } ?: listOf()
+        return parentFields + entity.fieldsSortedByDefaults.map { entity to it }
     }
 
-    override fun buildPrimitive(
-        key: String,
+    /**
+     * Entity (and every nested one) should consist of fields with known decoders and encoders.
+     */
+    private fun supportsFastCodecs(
         entity: Entity,
-        dataType: DataType?,
+        visited: MutableSet<String> = mutableSetOf(),
+    ): Boolean {
+        if (!visited.add(entity.name)) {
+            return true
+        }
+        if (entity.parent != null && findEntity(entity.parent) == null) {
+            return false
+        }
+        return fieldsWithOwners(entity).all { (_, field) ->
+            val dtypeProps = getDtype(field.dtype)
+            if (dtypeProps.requiredEntities.contains(field.dtype)) {
+                findEntity(field.dtype)?.let { supportsFastCodecs(it, visited) } ?: false
+            } else {
+                dtypeProps.decoder != null && dtypeProps.encoder != null
+            }
+        }
+    }
+
+    private fun buildFastDecoder(entity: Entity): String {
+        val className = renderEntityName(entity.name)
+        val fields = fieldsWithOwners(entity)
+        val requiredFields = fields.filter { (_, field) -> field.default == UNSET }
+        val optionalFields = fields.filter { (_, field) -> field.default != UNSET }
+        val lines =
+            mutableListOf(
+                "@classmethod",
+                "def from_dict(cls, data: t.Mapping[str, t.Any]) -> '$className':",
+                "    check_input_mapping(data)",
+            )
+
+        if (requiredFields.isNotEmpty()) {
+            lines.add("    try:")
+            lines.add("        kwargs = dict(")
+            requiredFields.forEach { (owner, field) ->
+                lines.add("            ${field.name.snakeCase()}=${buildFieldDecoder(owner, field)},")
+            }
+            lines.add("        )")
+            lines.add("    except KeyError as error:")
+            lines.add("        raise missing_field_error(error) from None")
+        } else {
+            lines.add("    kwargs = {}")
+        }
+
+        optionalFields.forEach { (owner, field) ->
+            lines.add("    if \"${serializedKey(field)}\" in data:")
+            lines.add("        kwargs[\"${field.name.snakeCase()}\"] = ${buildFieldDecoder(owner, field)}")
+        }
+
+        lines.add("    return cls(**kwargs)")
+        return lines.joinToString("\n")
+    }
+
+    private fun buildFieldDecoder(
+        owner: Entity,
+        field: Field,
     ): String {
-        // interpret "field|attribute" syntax
-        if ("|" in key) {
-            val (fieldName, attribute) = key.split('|', limit = 2)
-            val field = entity.fields.find { it.name == fieldName }
-
-            // detect field|enum_val and convert appropriately
-            if (field?.enum?.contains(attribute) == true) {
-                // add right indent
-                return buildEnumFieldName(attribute) + ' '
-            } else if (field != null && attribute == "COUNT") {
-                // array length detected
-                val name = field.name.snakeCase()
-                return "len(self.$name) "
-            } else if (field != null && attribute == "UNIQUE_COUNT") {
-                // set length detected
-                val name = field.name.snakeCase()
-                return "len(set(self.$name)) "
-            } else if (field != null && attribute == "SORTED_ASC") {
-                // sorted list detected
-                val name = field.name.snakeCase()
-                return "sorted(self.$name) "
+        val key = serializedKey(field)
+        val dtypeProps = getDtype(field.dtype)
+        val (decoder, decoderArguments) =
+            when {
+                dtypeProps.requiredEntities.contains(field.dtype) -> "decode_nested" to listOf(dtypeProps.definition)
+                field.isEnum -> "decode_enum" to listOf(renderEnumName(field, "${owner.name} ${field.name}"))
+                else -> dtypeProps.decoder!! to listOf()
             }
+        val arguments = mutableListOf("data[\"$key\"]", "\"$key\"")
+
+        if (field.many) {
+            arguments.add(decoder)
         }
-        return super.buildPrimitive(key, entity, dataType)
+        arguments.addAll(decoderArguments)
+
+        // same as marshmallow: None is accepted for nullable fields and fields with None by default
+        if (field.nullable || field.default == null) {
+            arguments.add("allow_none=True")
+        }
+
+        val function = if (field.many) "decode_list" else decoder
+        return "$function(${arguments.joinToString()})"
+    }
+
+    private fun buildFastEncoder(entity: Entity): String {
+        val lines =
+            mutableListOf(
+                "def to_dict(self) -> dict[str, t.Any]:",
+                "    return {",
+            )
+
+        fieldsWithOwners(entity)
+            .filter { (_, field) -> !field.excludeFromSerialization }
+            .forEach { (_, field) ->
+                lines.add("        \"${serializedKey(field)}\": ${buildFieldEncoder(field)},")
+            }
+
+        lines.add("    }")
+        return lines.joinToString("\n")
+    }
+
+    private fun buildFieldEncoder(field: Field): String {
+        val dtypeProps = getDtype(field.dtype)
+        val encoder =
+            when {
+                dtypeProps.requiredEntities.contains(field.dtype) -> "encode_nested"
+                field.isEnum -> "encode_str"
+                else -> dtypeProps.encoder!!
+            }
+        val value = "self.${field.name.snakeCase()}"
+        return if (field.many) "encode_list($value, $encoder)" else "$encoder($value)"
     }
 
-    private fun buildEnumFieldName(key: String) = key.snakeCase().uppercase()
+    private fun serializedKey(field: Field) = field.serializedName ?: field.name.snakeCase()
+
+    private fun buildValidator(
+        validator: Validator,
+        entity: Entity,
+    ): String {
+        headers.add("import marshmallow")
+        return buildValidator(validator, entity, "marshmallow.ValidationError")
+    }
 }
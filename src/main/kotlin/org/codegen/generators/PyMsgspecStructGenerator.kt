@@ -0,0 +1,45 @@
+package org.codegen.generators
+
+import org.codegen.utils.EnvironmentUtils.Companion.getEnvVariable
+import kotlin.jvm.optionals.getOrNull
+
+class PyMsgspecStructGenerator(proxy: AbstractCodeGenerator? = null) : PyBaseModelGenerator(
+    AllGeneratorsEnum.PY_MSGSPEC_STRUCT,
+    proxy,
+) {
+    override val libraryImport = "import msgspec"
+    override val fieldFunction = "msgspec.field"
+    override val serializedNameOption = "name"
+
+    // passed into msgspec.Meta
+    override val constraintKeys = listOf("gt", "ge", "lt", "le", "multiple_of", "pattern", "min_length", "max_length", "tz")
+
+    // raised errors are reported as msgspec.ValidationError during decoding as well
+    override val validationError = "msgspec.ValidationError"
+
+    override fun renderClassDefinition(
+        className: String,
+        parentClassName: String?,
+    ): String {
+        // keyword-only structs allow required fields after optional ones (e.g. in child classes)
+        val structArgs =
+            listOfNotNull(
+                "kw_only=True",
+                getEnvVariable("DECORATOR_ARGS").getOrNull(),
+            ).joinToString()
+        return "class $className(${parentClassName ?: "msgspec.Struct"}, $structArgs):"
+    }
+
+    override fun renderConstrainedType(
+        definition: String,
+        constraints: Map<String, String>,
+    ): String {
+        if (constraints.isEmpty()) {
+            return definition
+        }
+        headers.add("import typing as t")
+        return "t.Annotated[$definition, msgspec.Meta(${constraints.map { entry -> "${entry.key}=${entry.value}" }.joinToString()})]"
+    }
+
+    override fun renderValidatorHeader() = listOf("    def __post_init__(self):")
+}
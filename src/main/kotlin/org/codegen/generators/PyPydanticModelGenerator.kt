@@ -0,0 +1,53 @@
+package org.codegen.generators
+
+import org.codegen.schema.Entity
+import org.codegen.utils.EnvironmentUtils.Companion.getEnvVariable
+import kotlin.jvm.optionals.getOrNull
+
+class PyPydanticModelGenerator(proxy: AbstractCodeGenerator? = null) : PyBaseModelGenerator(
+    AllGeneratorsEnum.PY_PYDANTIC_MODEL,
+    proxy,
+) {
+    override val libraryImport = "import pydantic"
+    override val fieldFunction = "pydantic.Field"
+    override val serializedNameOption = "alias"
+
+    // passed into pydantic.Field
+    override val constraintKeys = listOf("gt", "ge", "lt", "le", "multiple_of", "pattern", "min_length", "max_length")
+
+    // raised ValueError is reported as pydantic.ValidationError
+    override val validationError = "ValueError"
+
+    override fun renderClassDefinition(
+        className: String,
+        parentClassName: String?,
+    ) = "class $className(${parentClassName ?: "pydantic.BaseModel"}):"
+
+    override fun renderClassOptions(entity: Entity): List<String> {
+        if (entity.parent != null) {
+            return listOf()
+        }
+        // allow to construct models by python names as well as by aliases (config is inherited by child classes)
+        val configArgs =
+            listOfNotNull(
+                "populate_by_name=True",
+                getEnvVariable("DECORATOR_ARGS").getOrNull(),
+            ).joinToString()
+        return listOf("    model_config = pydantic.ConfigDict($configArgs)")
+    }
+
+    override fun addConstraintOptions(
+        attrs: MutableMap<String, String>,
+        constraints: Map<String, String>,
+    ) {
+        attrs.putAll(constraints)
+    }
+
+    override fun renderValidatorHeader() =
+        listOf(
+            "    @pydantic.model_validator(mode=\"after\")",
+            "    def check_conditions(self):",
+        )
+
+    override fun renderValidatorFooter() = listOf("        return self")
+}
@@ -13,6 +13,10 @@ data class DataType(
     // list of related entity names. If entities aren't present in target file, they will be included (if found in included schemas)
     val requiredEntities: List<String> = listOf(),
     val includeFiles: List<String> = listOf(),
+    // name of function which converts raw JSON value into definition type (PY_MARSHMALLOW_DATACLASS fast codecs)
+    val decoder: String? = null,
+    // name of function which converts definition type into JSON-ready value (PY_MARSHMALLOW_DATACLASS fast codecs)
+    val encoder: String? = null,
     // Original file path. Should be filled during initialization
     val sourcePath: String = "",
 ) {
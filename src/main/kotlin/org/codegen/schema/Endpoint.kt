@@ -18,6 +18,12 @@ data class Endpoint(
     val many: Boolean = false,
     // whether return data can be memoized
     val cacheable: Boolean = false,
+    // seconds before memoized data expires (never if omitted)
+    val cacheTtl: Int? = null,
+    // name of bulk endpoint which concurrent calls are batched into (it takes many items and returns results in the same order)
+    val batchWith: String? = null,
+    // max requests per second (in addition to client-wide limit, may be overridden by client)
+    val rateLimit: Double? = null,
     val verb: EndpointVerb = EndpointVerb.GET,
     val encoding: EndpointEncoding? = EndpointEncoding.JSON,
 ) {
@@ -10,11 +10,36 @@
         api_keys: dict = None,
         high_priority: bool = False,
         request_timeout: int = 3600,
+        retry_policy: 'RetryPolicy | None' = None,
+        json_codec: 'JsonCodec | None' = None,
+        # feature: endpoint_cache
+        endpoint_cache_max_entries: int = int(os.environ.get('AMQP_CLIENT_ENDPOINT_CACHE_MAX_ENTRIES', 1024)),
+        endpoint_cache_max_bytes: int = int(os.environ.get('AMQP_CLIENT_ENDPOINT_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+        endpoint_cache_max_staleness: float = float(os.environ.get('AMQP_CLIENT_ENDPOINT_CACHE_MAX_STALENESS', 0)),
+        endpoint_cache_backend: 'EndpointCacheBackend | None' = None,
+        # end feature
+        # feature: request_batching
+        batch_max_size: int = int(os.environ.get('AMQP_CLIENT_BATCH_MAX_SIZE', 1)),
+        batch_max_delay: float = float(os.environ.get('AMQP_CLIENT_BATCH_MAX_DELAY', 0.005)),
+        # end feature
+        # feature: rate_limit
+        rate_limit: float = float(os.environ.get('AMQP_CLIENT_RATE_LIMIT', 0)),
+        rate_limit_burst: int = int(os.environ.get('AMQP_CLIENT_RATE_LIMIT_BURST', 1)),
+        endpoint_rate_limits: dict[str, float] | None = None,
+        # end feature
         use_request_payload_validation: bool = bool(int(os.environ.get('AMQP_CLIENT_USE_REQUEST_PAYLOAD_VALIDATION', 1))),
+        use_schema_warm_up: bool = bool(int(os.environ.get('AMQP_CLIENT_USE_SCHEMA_WARM_UP', 0))),
     ):
         """
         AMQP client constructor and configuration method.
         """
+        self._json_codec = json_codec or JsonCodec()
+        # feature: rate_limit
+        self._rate_limit_burst = rate_limit_burst
+        self._rate_limiter = RateLimiter(rate_limit, burst=rate_limit_burst) if rate_limit else None
+        self._endpoint_rate_limits = endpoint_rate_limits or {}
+        self._endpoint_rate_limiters: dict[str, RateLimiter | None] = {}
+        # end feature
         self._client = AmqpApiWithBlockingListener(
             amqp_url=amqp_url,
             read_exchange_name=read_exchange_name,
@@ -24,14 +49,84 @@
             logger=logger,
             api_keys=api_keys,
             high_priority=high_priority,
-            request_timeout=request_timeout
+            request_timeout=request_timeout,
+            retry_policy=retry_policy,
+            json_codec=self._json_codec,
+            # feature: rate_limit
+            rate_limiter=self._rate_limiter,
+            # end feature
         )
+        # feature: endpoint_cache
+        self._endpoint_cache = EndpointCache(
+            max_entries=endpoint_cache_max_entries,
+            max_bytes=endpoint_cache_max_bytes,
+            max_staleness=endpoint_cache_max_staleness,
+            backend=endpoint_cache_backend,
+            spawn=self._client.spawn,
+        )
+        # end feature
+        # feature: request_batching
+        self._request_batcher = RequestBatcher(max_size=batch_max_size, max_delay=batch_max_delay) if batch_max_size > 1 else None
+        # end feature
+
+        self._schema_registry = SchemaRegistry()
+        if use_schema_warm_up:
+            self._schema_registry.warm_up(AllDataclassesCollection)
 
         self._deserializer = BaseDeserializer(
-            use_response_streaming=False
+            use_response_streaming=False,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
         )
 
         self._serializer = BaseSerializer(
             self._deserializer,
-            use_request_payload_validation=use_request_payload_validation
+            use_request_payload_validation=use_request_payload_validation,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
+        )
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        Internal counters of client components (for diagnostics and metrics export).
+        """
+        return dict(
+            schemas=self._schema_registry.stats(),
+            retries=self._client.retry_policy.stats(),
+            json=self._json_codec.stats(),
+            # feature: endpoint_cache
+            endpoint_cache=self._endpoint_cache.stats(),
+            # end feature
+            # feature: request_batching
+            batches=self._request_batcher.stats() if self._request_batcher else {},
+            # end feature
+            # feature: rate_limit
+            rate_limit=self._rate_limiter.stats() if self._rate_limiter else {},
+            endpoint_rate_limits={
+                endpoint: limiter.stats()
+                for endpoint, limiter in list(self._endpoint_rate_limiters.items())
+                if limiter is not None
+            },
+            # end feature
         )
+
+    # feature: endpoint_cache
+    def invalidate_cache(self, endpoint: str | None = None):
+        """
+        Drop stored results of cacheable endpoint (method name, e.g. 'get_item') or all of them.
+        """
+        self._endpoint_cache.invalidate(endpoint)
+    # end feature
+
+    # feature: rate_limit
+    def _get_rate_limiter(self, endpoint: str, rate: float) -> 'RateLimiter | None':
+        """
+        Rate limiter of endpoint (method name), limit from schema may be overridden by client argument.
+        """
+        if endpoint not in self._endpoint_rate_limiters:
+            rate = self._endpoint_rate_limits.get(endpoint, rate)
+            limiter = RateLimiter(rate, burst=self._rate_limit_burst) if rate else None
+            # concurrent callers share the first created limiter
+            self._endpoint_rate_limiters.setdefault(endpoint, limiter)
+        return self._endpoint_rate_limiters[endpoint]
+    # end feature
@@ -0,0 +1,24 @@
+    def gather(
+        self,
+        endpoint: str | t.Callable[..., t.Any],
+        kwargs_iter: t.Iterable[dict[str, t.Any]] | t.AsyncIterable[dict[str, t.Any]],
+        concurrency: int | None = None,
+        ordered: bool = True,
+        return_exceptions: bool = True,
+    ) -> t.AsyncIterator[tuple[dict[str, t.Any], t.Any]]:
+        """
+        Call endpoint concurrently with each of given keyword arguments, yield (kwargs, result) pairs.
+
+        :param endpoint: method name (e.g. 'get_item') or the method itself
+        :param kwargs_iter: keyword arguments of calls (sync or async iterable), consumed lazily
+        :param concurrency: max number of calls running at once (connection limit by default)
+        :param ordered: yield results in order of arguments (otherwise as soon as calls complete)
+        :param return_exceptions: yield exception of failed call as its result (other calls go on), otherwise raise it and cancel calls in progress
+        """
+        return gather_concurrently(
+            getattr(self, endpoint) if isinstance(endpoint, str) else endpoint,
+            kwargs_iter,
+            concurrency=concurrency or self._client.max_connections,
+            ordered=ordered,
+            return_exceptions=return_exceptions,
+        )
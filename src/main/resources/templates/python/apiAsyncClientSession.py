@@ -0,0 +1,11 @@
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close HTTP session and release pooled connections.
+        """
+        await self._client.aclose()
@@ -6,10 +6,56 @@
         logger: t.Union[logging.Logger, t.Callable[[str], None], None] = None,
         max_retries: int = int(os.environ.get('API_CLIENT_MAX_RETRIES', 5)),
         retry_timeout: float = float(os.environ.get('API_CLIENT_RETRY_TIMEOUT', 3)),
+        retry_max_timeout: float = float(os.environ.get('API_CLIENT_RETRY_MAX_TIMEOUT', 60)),
+        retry_budget: float = float(os.environ.get('API_CLIENT_RETRY_BUDGET', 10)),
+        retry_policy: 'RetryPolicy | None' = None,
+        # feature: circuit_breaker
+        use_circuit_breaker: bool = bool(int(os.environ.get('API_CLIENT_USE_CIRCUIT_BREAKER', 0))),
+        circuit_breaker: 'CircuitBreaker | None' = None,
+        # end feature
+        # feature: adaptive_concurrency
+        use_adaptive_concurrency: bool = bool(int(os.environ.get('API_CLIENT_USE_ADAPTIVE_CONCURRENCY', 0))),
+        concurrency_limiter: 'ConcurrencyLimiter | None' = None,
+        # end feature
+        # feature: http_cache
+        http_cache: 'HttpCache | None' = None,
+        # end feature
+        # feature: request_coalescing
+        use_request_coalescing: bool = bool(int(os.environ.get('API_CLIENT_USE_REQUEST_COALESCING', 0))),
+        # end feature
+        # feature: request_hedging
+        use_request_hedging: bool = bool(int(os.environ.get('API_CLIENT_USE_REQUEST_HEDGING', 0))),
+        hedge_budget: float = float(os.environ.get('API_CLIENT_HEDGE_BUDGET', 10)),
+        hedge_policy: 'HedgePolicy | None' = None,
+        # end feature
+        # feature: endpoint_cache
+        endpoint_cache_max_entries: int = int(os.environ.get('API_CLIENT_ENDPOINT_CACHE_MAX_ENTRIES', 1024)),
+        endpoint_cache_max_bytes: int = int(os.environ.get('API_CLIENT_ENDPOINT_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+        endpoint_cache_max_staleness: float = float(os.environ.get('API_CLIENT_ENDPOINT_CACHE_MAX_STALENESS', 0)),
+        endpoint_cache_backend: 'EndpointCacheBackend | None' = None,
+        # end feature
+        # feature: request_batching
+        batch_max_size: int = int(os.environ.get('API_CLIENT_BATCH_MAX_SIZE', 1)),
+        batch_max_delay: float = float(os.environ.get('API_CLIENT_BATCH_MAX_DELAY', 0.005)),
+        # end feature
+        # feature: rate_limit
+        rate_limit: float = float(os.environ.get('API_CLIENT_RATE_LIMIT', 0)),
+        rate_limit_burst: int = int(os.environ.get('API_CLIENT_RATE_LIMIT_BURST', 1)),
+        endpoint_rate_limits: dict[str, float] | None = None,
+        # end feature
         user_agent: str | None = os.environ.get('API_CLIENT_USER_AGENT'),
         use_response_streaming = bool(int(os.environ.get('API_CLIENT_USE_STREAMING', 1))),
+        use_response_compression: bool = bool(int(os.environ.get('API_CLIENT_USE_RESPONSE_COMPRESSION', 1))),
+        request_compression: str | None = os.environ.get('API_CLIENT_REQUEST_COMPRESSION'),
+        request_compression_min_size: int = int(os.environ.get('API_CLIENT_REQUEST_COMPRESSION_MIN_SIZE', 1024)),
         use_request_payload_validation: bool = bool(int(os.environ.get('API_CLIENT_USE_REQUEST_PAYLOAD_VALIDATION', 1))),
+        use_request_streaming: bool = bool(int(os.environ.get('API_CLIENT_USE_REQUEST_STREAMING', 0))),
+        json_codec: 'JsonCodec | None' = None,
+        use_schema_warm_up: bool = bool(int(os.environ.get('API_CLIENT_USE_SCHEMA_WARM_UP', 0))),
         use_debug_curl: bool = bool(int(os.environ.get('API_CLIENT_USE_DEBUG_CURL', 0))),
+        # feature: call_tracing
+        on_call: t.Callable[['CallEvent'], None] | None = None,
+        # end feature
         request_kwargs: dict[str, t.Any] | None = None,
         connection_pool_kwargs: dict[str, t.Any] | None = None,
         exception_class: t.Type[Exception] = RuntimeError,
@@ -21,34 +67,224 @@
         :param headers: dict of HTTP headers (e.g. tokens)
         :param logger: logger instance (or callable like print()) for requests diagnostics
         :param max_retries: number of request attempts before Exception defined in `exception_class` raised
-        :param retry_timeout: seconds between attempts
+        :param retry_timeout: max seconds before second attempt, doubled for each next one (actual delay is random)
+        :param retry_max_timeout: max seconds between attempts (longer 'Retry-After' delays are not awaited)
+        :param retry_budget: max number of retries per second for all requests of the client
+        :param retry_policy: custom retry policy (overrides max_retries and retry_* arguments)
+        # feature: circuit_breaker
+        :param use_circuit_breaker: reject requests to a host without sending while most of recent requests to it fail
+        :param circuit_breaker: custom circuit breaker (e.g. shared between clients), enables it regardless of use_circuit_breaker
+        # end feature
+        # feature: adaptive_concurrency
+        :param use_adaptive_concurrency: limit concurrent requests, raise limit while latency is low and cut it on 429/503 and timeouts
+        :param concurrency_limiter: custom adaptive concurrency limiter (e.g. shared between clients)
+        # end feature
+        # feature: http_cache
+        :param http_cache: store of GET responses revalidated by ETag/Last-Modified (no caching by default)
+        # end feature
+        # feature: request_coalescing
+        :param use_request_coalescing: share one response between identical concurrent requests of idempotent methods
+        # end feature
+        # feature: request_hedging
+        :param use_request_hedging: send identical GET request if response is slower than p95 latency of endpoint (the first response wins)
+        :param hedge_budget: max number of hedged requests, percent of GET requests
+        :param hedge_policy: custom hedge policy (overrides hedge_budget)
+        # end feature
+        # feature: endpoint_cache
+        :param endpoint_cache_max_entries: max number of stored results of cacheable endpoints
+        :param endpoint_cache_max_bytes: max approximate memory footprint of stored results of cacheable endpoints
+        :param endpoint_cache_max_staleness: seconds while expired result of cacheable endpoint is returned and refreshed in background
+        :param endpoint_cache_backend: shared store of results of cacheable endpoints (e.g. between worker processes)
+        # end feature
+        # feature: request_batching
+        :param batch_max_size: max number of concurrent calls of batched endpoint sent as one bulk request (1 disables batching, each call is sent on its own)
+        :param batch_max_delay: max seconds to wait for more calls of batched endpoint before bulk request is sent
+        # end feature
+        # feature: rate_limit
+        :param rate_limit: max average number of requests per second sent by client (0 disables limit)
+        :param rate_limit_burst: max number of requests sent at once after idle period (for client-wide and endpoint limits)
+        :param endpoint_rate_limits: requests per second of endpoints (method names) overriding limits of schema (0 disables limit)
+        # end feature
         :param user_agent: request header
         :param use_response_streaming: enable alternative JSON library for deserialization (lower latency and memory footprint)
+        :param use_response_compression: ask server for compressed responses (decompressed on the fly while parsed)
+        :param request_compression: Content-Encoding of JSON request bodies, gzip or zstd (server has to support it)
+        :param request_compression_min_size: min size of JSON request body (in bytes) to be compressed
         :param use_request_payload_validation: enable client-side validation of serialized data before send
+        :param use_request_streaming: send sequence payloads (including iterators) item by item with chunked transfer encoding
+        :param json_codec: custom JSON library choice (the fastest installed one is used by default)
+        :param use_schema_warm_up: build serialization schemas for all dataclasses in advance (instead of first use)
         :param use_debug_curl: include curl-formatted data for requests diagnostics
+        # feature: call_tracing
+        :param on_call: hook receiving phase timings of each endpoint call, e.g. to export OpenTelemetry spans (not collected by default)
+        # end feature
         :param request_kwargs: optional request arguments
-        :param connection_pool_kwargs: optional arguments for internal connection pool
+        :param connection_pool_kwargs: optional arguments for internal connection pool (urllib3.PoolManager or aiohttp.TCPConnector)
         :param exception_class: exception class for irrecoverable API errors
         """
+        self._retry_policy = retry_policy or RetryPolicy(
+            max_attempts=max_retries,
+            base_timeout=retry_timeout,
+            max_timeout=retry_max_timeout,
+            budget_rate=retry_budget,
+        )
+
+        self._json_codec = json_codec or JsonCodec()
+        # feature: circuit_breaker
+        self._circuit_breaker = circuit_breaker or (CircuitBreaker() if use_circuit_breaker else None)
+        # end feature
+        # feature: adaptive_concurrency
+        self._concurrency_limiter = (concurrency_limiter or ConcurrencyLimiter()) if use_adaptive_concurrency else None
+        # end feature
+        # feature: http_cache
+        self._http_cache = http_cache
+        # end feature
+        # feature: request_coalescing
+        self._single_flight = SingleFlight() if use_request_coalescing else None
+        # end feature
+        # feature: request_hedging
+        self._hedge_policy = (hedge_policy or HedgePolicy(budget_percent=hedge_budget)) if use_request_hedging else None
+        # end feature
+        # feature: endpoint_cache
+        self._endpoint_cache = EndpointCache(
+            max_entries=endpoint_cache_max_entries,
+            max_bytes=endpoint_cache_max_bytes,
+            max_staleness=endpoint_cache_max_staleness,
+            backend=endpoint_cache_backend,
+        )
+        # end feature
+        # feature: request_batching
+        self._request_batcher = RequestBatcher(max_size=batch_max_size, max_delay=batch_max_delay) if batch_max_size > 1 else None
+        # end feature
+        # feature: rate_limit
+        self._rate_limit_burst = rate_limit_burst
+        self._rate_limiter = RateLimiter(rate_limit, burst=rate_limit_burst) if rate_limit else None
+        self._endpoint_rate_limits = endpoint_rate_limits or {}
+        self._endpoint_rate_limiters: dict[str, RateLimiter | None] = {}
+        # end feature
+        # feature: call_tracing
+        self._tracer = CallTracer(on_call) if on_call is not None else None
+        # end feature
+
         self._client = BaseJsonHttpClient(
             base_url=base_url,
             logger=logger,
-            max_retries=max_retries,
-            retry_timeout=retry_timeout,
+            retry_policy=self._retry_policy,
+            json_codec=self._json_codec,
+            # feature: circuit_breaker
+            circuit_breaker=self._circuit_breaker,
+            # end feature
+            # feature: http_cache
+            http_cache=self._http_cache,
+            # end feature
+            # feature: request_coalescing
+            single_flight=self._single_flight,
+            # end feature
+            # feature: rate_limit
+            rate_limiter=self._rate_limiter,
+            # end feature
+            # feature: adaptive_concurrency
+            concurrency_limiter=self._concurrency_limiter,
+            # end feature
+            # feature: request_hedging
+            hedge_policy=self._hedge_policy,
+            # end feature
+            # feature: call_tracing
+            tracer=self._tracer,
+            # end feature
             user_agent=user_agent,
             headers=headers,
             use_response_streaming=use_response_streaming,
+            use_response_compression=use_response_compression,
+            request_compression=request_compression,
+            request_compression_min_size=request_compression_min_size,
             use_debug_curl=use_debug_curl,
             request_kwargs=request_kwargs or {},
             connection_pool_kwargs=connection_pool_kwargs or {},
             exception_class=exception_class,
         )
 
+        self._schema_registry = SchemaRegistry()
+        if use_schema_warm_up:
+            self._schema_registry.warm_up(AllDataclassesCollection)
+
         self._deserializer = BaseDeserializer(
-            use_response_streaming=use_response_streaming
+            use_response_streaming=use_response_streaming,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
+            # feature: call_tracing
+            tracer=self._tracer,
+            # end feature
         )
 
         self._serializer = BaseSerializer(
             self._deserializer,
-            use_request_payload_validation=use_request_payload_validation
+            use_request_payload_validation=use_request_payload_validation,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
+            use_request_streaming=use_request_streaming,
+            # feature: call_tracing
+            tracer=self._tracer,
+            # end feature
+        )
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        Internal counters of client components (for diagnostics and metrics export).
+        """
+        return dict(
+            schemas=self._schema_registry.stats(),
+            retries=self._retry_policy.stats(),
+            # feature: circuit_breaker
+            circuits=self._circuit_breaker.stats() if self._circuit_breaker else {},
+            # end feature
+            # feature: adaptive_concurrency
+            concurrency=self._concurrency_limiter.stats() if self._concurrency_limiter else {},
+            # end feature
+            # feature: http_cache
+            http_cache=self._http_cache.stats() if self._http_cache else {},
+            # end feature
+            # feature: request_coalescing
+            single_flight=self._single_flight.stats() if self._single_flight else {},
+            # end feature
+            # feature: request_hedging
+            hedges=self._hedge_policy.stats() if self._hedge_policy else {},
+            # end feature
+            # feature: endpoint_cache
+            endpoint_cache=self._endpoint_cache.stats(),
+            # end feature
+            # feature: request_batching
+            batches=self._request_batcher.stats() if self._request_batcher else {},
+            # end feature
+            # feature: rate_limit
+            rate_limit=self._rate_limiter.stats() if self._rate_limiter else {},
+            endpoint_rate_limits={
+                endpoint: limiter.stats()
+                for endpoint, limiter in list(self._endpoint_rate_limiters.items())
+                if limiter is not None
+            },
+            # end feature
+            traffic=self._client.get_traffic_stats(),
+            json=self._json_codec.stats(),
         )
+
+    # feature: endpoint_cache
+    def invalidate_cache(self, endpoint: str | None = None):
+        """
+        Drop stored results of cacheable endpoint (method name, e.g. 'get_item') or all of them.
+        """
+        self._endpoint_cache.invalidate(endpoint)
+    # end feature
+
+    # feature: rate_limit
+    def _get_rate_limiter(self, endpoint: str, rate: float) -> 'RateLimiter | None':
+        """
+        Rate limiter of endpoint (method name), limit from schema may be overridden by client argument.
+        """
+        if endpoint not in self._endpoint_rate_limiters:
+            rate = self._endpoint_rate_limits.get(endpoint, rate)
+            limiter = RateLimiter(rate, burst=self._rate_limit_burst) if rate else None
+            # concurrent callers share the first created limiter
+            self._endpoint_rate_limiters.setdefault(endpoint, limiter)
+        return self._endpoint_rate_limiters[endpoint]
+    # end feature
@@ -0,0 +1,25 @@
+    def map(
+        self,
+        endpoint: str | t.Callable[..., t.Any],
+        kwargs_iter: t.Iterable[dict[str, t.Any]],
+        max_workers: int | None = None,
+        ordered: bool = True,
+        return_exceptions: bool = True,
+    ) -> t.Iterator[tuple[dict[str, t.Any], t.Any]]:
+        """
+        Call endpoint concurrently (in client's thread pool) with each of given keyword arguments, yield (kwargs, result) pairs.
+
+        :param endpoint: method name (e.g. 'get_item') or the method itself
+        :param kwargs_iter: keyword arguments of calls, consumed lazily
+        :param max_workers: max number of calls running at once (size of connection pool by default)
+        :param ordered: yield results in order of arguments (otherwise as soon as calls complete)
+        :param return_exceptions: yield exception of failed call as its result (other calls go on), otherwise raise it and drop calls not started yet
+        """
+        return map_concurrently(
+            getattr(self, endpoint) if isinstance(endpoint, str) else endpoint,
+            kwargs_iter,
+            executor=self._client.get_executor(),
+            max_workers=max_workers or self._client.max_connections,
+            ordered=ordered,
+            return_exceptions=return_exceptions,
+        )
@@ -0,0 +1,27 @@
+class BaseAsyncDeserializer(BaseDeserializer):
+    async def deserialize_async(self, raw_data: RESPONSE_BODY, data_class: t.Type | None = None, many: bool = False) -> t.AsyncIterator[t.Any]:
+        if not isinstance(raw_data, aiohttp.ClientResponse):
+            # response has been already read
+            for item in self.deserialize(raw_data, data_class, many=many):
+                yield item
+            return
+
+        # feature: call_tracing
+        if self._tracer is not None:
+            event = self._tracer.take_event(raw_data)
+            if event is not None:
+                # nested call only parses JSON (it is not traced since event has been taken), objects are constructed apart
+                items = self._tracer.trace_items_async(event, self.deserialize_async(raw_data, many=many), self._get_loader(data_class))
+                async with contextlib.aclosing(items):
+                    async for item in items:
+                        yield item
+                return
+        # end feature
+
+        load = self._get_loader(data_class)
+        try:
+            # parse JSON array item by item as soon as response chunks arrive
+            async for item in self._json_codec.items_async(raw_data.content):
+                yield load(item)
+        finally:
+            raw_data.release()
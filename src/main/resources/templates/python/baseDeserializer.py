@@ -1,49 +1,97 @@
 class BaseDeserializer:
-    def __init__(self, use_response_streaming: bool):
+    def __init__(
+        self,
+        use_response_streaming: bool,
+        schema_registry: 'SchemaRegistry',
+        json_codec: 'JsonCodec',
+        # feature: call_tracing
+        tracer: 'CallTracer | None' = None,
+        # end feature
+    ):
         self._use_response_streaming = use_response_streaming
+        self._schema_registry = schema_registry
+        self._json_codec = json_codec
+        # feature: call_tracing
+        self._tracer = tracer
+        # end feature
 
     def deserialize(self, raw_data: RESPONSE_BODY, data_class: t.Type | None = None, many: bool = False) -> t.Iterator[t.Any]:
+        # feature: call_tracing
+        if self._tracer is not None:
+            event = self._tracer.take_event(raw_data)
+            if event is not None:
+                yield from self._deserialize_traced(event, raw_data, data_class, many)
+                return
+        # end feature
+
+        # feature: http_cache
+        cached_objects = getattr(raw_data, 'cached_objects', None)
+        if cached_objects is not None:
+            # response from HTTP cache has not been modified, reuse objects deserialized from it before
+            key = (data_class, many)
+            if key not in cached_objects:
+                cached_objects[key] = list(self.deserialize(io.BytesIO(raw_data.getvalue()), data_class, many=many))
+            yield from cached_objects[key]
+            return
+        # end feature
+
+        yield from self._load_items(raw_data, data_class, many)
+
+    def _load_items(self, raw_data: RESPONSE_BODY, data_class: t.Type | None, many: bool) -> t.Iterator[t.Any]:
+        """
+        Parse JSON of response, then construct objects of it.
+        """
         if hasattr(raw_data, 'read'):
             # read singular JSON objects at once and multiple objects in stream to reduce memory footprint
             if many and self._use_response_streaming:
-                raw_data = ijson.items(raw_data, 'item', use_float=True)
+                raw_data = self._json_codec.items(raw_data)
             else:
-                raw_data = json.loads(raw_data.read())
+                raw_data = self._json_codec.loads(raw_data.read())
 
         if raw_data == '':
             # blank response means null
             yield None
             return
 
+        load = self._get_loader(data_class)
+        if many:
+            yield from map(load, raw_data)
+        else:
+            yield load(raw_data)
+
+    # feature: call_tracing
+    def _deserialize_traced(self, event: 'CallEvent', raw_data: RESPONSE_BODY, data_class: t.Type | None, many: bool) -> t.Iterator[t.Any]:
+        # feature: http_cache
+        if getattr(raw_data, 'cached_objects', None) is not None:
+            # objects deserialized before are reused
+            return self._tracer.trace_items(event, self.deserialize(raw_data, data_class, many=many), many)
+        # end feature
+
+        # nested call only parses JSON (it is not traced since event has been taken), objects are constructed apart
+        return self._tracer.trace_items(event, self.deserialize(raw_data, many=many), many, load=self._get_loader(data_class))
+    # end feature
+
+    def _get_loader(self, data_class: t.Type | None) -> t.Callable[[t.Any], t.Any]:
         if data_class is None:
             # skip further deserialization
-            if many:
-                yield from raw_data
-            else:
-                yield raw_data
-            return
+            return lambda value: value
 
         # pick built-in deserializer if specified for class
         method_name = '_deserialize_{type}'.format(type=data_class.__name__.lower())
         if hasattr(self, method_name):
-            method = getattr(self, method_name)
-            if many:
-                yield from map(method, raw_data)
-            else:
-                yield method(raw_data)
-        else:
-            try:
-                # use marshmallow in other cases
-                schema = marshmallow_dataclass.class_schema(data_class, base_schema=BaseSchema)()
-            except TypeError:
-                # fallback to default constructor
-                yield data_class(raw_data)
-                return
+            return getattr(self, method_name)
 
-            if many:
-                yield from map(schema.load, raw_data)
-            else:
-                yield schema.load(raw_data)
+        # use generated decoder if available (USE_FAST_CODECS=1)
+        decoder = getattr(data_class, 'from_dict', None)
+        if decoder is not None:
+            return decoder
+
+        try:
+            # use marshmallow in other cases
+            return self._schema_registry.get(data_class).load
+        except TypeError:
+            # fallback to default constructor
+            return data_class
 
     @classmethod
     def _deserialize_datetime(cls, raw: str) -> datetime:
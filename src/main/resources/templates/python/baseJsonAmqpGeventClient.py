@@ -19,30 +19,20 @@ def _verbose_amqp_url(amqp_url: str) -> str:
     return f'{parsed.hostname}:{parsed.port}'
 
 
-def _clear_instance_memoized_data(memory_dict: dict, instance):
-    """
-    Clear memoized values of @funcy.memoize only for given instance.
-    It is useful because build-in 'memory' dict stores memoized data for all instances.
-    """
-    keys_to_delete = []
-    for key in memory_dict.keys():
-        if key[0] is instance:
-            keys_to_delete.append(key)
-
-    for key in keys_to_delete:
-        del memory_dict[key]
-
-
 class AmqpWrapper:
 
     def __init__(self, amqp_url: str, read_exchange_name: str, read_queue_name: str, write_exchange_name: str = None,
-                 prefetch_count: int = 30, logger: logging.Logger = None):
+                 prefetch_count: int = 30, logger: logging.Logger = None, retry_policy: 'RetryPolicy' = None,
+                 json_codec: 'JsonCodec' = None):
         self.amqp_url = amqp_url
         self.read_exchange_name = read_exchange_name
         self.read_queue_name = read_queue_name
         self.write_exchange_name = write_exchange_name
         self.prefetch_count = prefetch_count
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        # at most 5 seconds between attempts, so connecting is given up within ~45 seconds
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=10, base_timeout=5, max_timeout=5, budget_rate=None)
+        self.json_codec = json_codec or JsonCodec()
 
         self.connection = None
         self.write_exchange = None
@@ -51,6 +41,7 @@ class AmqpWrapper:
         self.is_stopped = False
         self.producer = None
         self._incoming_message_handlers = []
+        self._read_queues: dict[str, Queue] = {}  # declared on current connection
 
     def connect(self, force=False):
         """attempts to connect. If fails, will throw an exception"""
@@ -59,14 +50,15 @@ class AmqpWrapper:
 
         self.is_connected = False
         self.is_listening = False
-        # clear memoized values (only for current instance)
-        _clear_instance_memoized_data(self.declare_read_queue.memory, self)
+        # queues are declared again on new connection
+        self._read_queues.clear()
         self.connection = Connection(self.amqp_url)
         _check_amqp_alive(self.connection, raise_exception=True)
 
         if self.write_exchange_name:
             self.write_exchange = Exchange(self.write_exchange_name, 'direct', durable=True)
-            self.producer = self.connection.Producer(serializer='json', on_return=self._handle_undelivered)
+            # messages are encoded by JSON codec instead of kombu serializer
+            self.producer = self.connection.Producer(on_return=self._handle_undelivered)
 
         # as soon as we tested connection and made the producer, switch the flag ON
         self.is_connected = True
@@ -79,13 +71,14 @@ class AmqpWrapper:
             self._try_reconnect()
 
     def _try_reconnect(self):
-        """makes 10 attempts to connect to the message broker every 5 sec, after than will throw an exception"""
+        """makes attempts to connect to the message broker with growing random delays, after than will throw an exception"""
         failsafe_call(
             self.connect,
             kwargs=dict(force=True),
             exceptions=RECOVERABLE_EXCEPTIONS,
+            retry_policy=self.retry_policy,
             logger=self.logger,
-            on_transitional_fail=lambda exc, info: time.sleep(5)
+            on_transitional_fail=lambda exc, info: gevent.sleep(info['delay'])
         )
 
     def listen(self, timeout=None, *args, **kwargs):
@@ -97,7 +90,7 @@ class AmqpWrapper:
                 read_queue = self.declare_read_queue(*args, **kwargs)
                 with self.connection.Consumer(
                     read_queue,
-                    callbacks=[self.handle],
+                    on_message=self._on_message,
                     prefetch_count=self.prefetch_count,
                     auto_declare=None,
                 ):
@@ -122,6 +115,14 @@ class AmqpWrapper:
         """Apply 'observer' pattern for listeners"""
         self._incoming_message_handlers.append(func)
 
+    def _on_message(self, message: Message):
+        if message.content_type == 'application/json' and not message.headers.get('compression'):
+            # decode by JSON codec instead of kombu serializer
+            body = self.json_codec.loads(message.body)
+        else:
+            body = message.decode()
+        self.handle(body, message)
+
     def handle(self, body: list, message: Message):
         if not self.is_connected:
             # prevents processing of downloaded messages after connection.close()
@@ -139,19 +140,44 @@ class AmqpWrapper:
         while True:
             try:
                 self.logger.debug(f'send msg to {self.write_exchange} {kwargs}: {data}')
-                return self.producer.publish(data, exchange=self.write_exchange, *args, **kwargs)
+                return self.producer.publish(
+                    self.json_codec.dumps(data),
+                    content_type='application/json',
+                    content_encoding='utf-8',
+                    exchange=self.write_exchange,
+                    *args,
+                    **kwargs,
+                )
             except RECOVERABLE_EXCEPTIONS:
                 self._try_reconnect()
 
-    @memoize
     def declare_read_queue(self, *args, **kwargs) -> Queue:
         assert self.read_queue_name, 'read_queue_name must not be empty'  # prevent assigning random name by amqp
         self.connect()
+        key = repr((args, sorted(kwargs.items())))
+        if key in self._read_queues:
+            return self._read_queues[key]
+
         read_exchange = Exchange(self.read_exchange_name, 'direct', durable=True)
         read_queue = Queue(self.read_queue_name, exchange=read_exchange, *args, **kwargs)
         read_queue(self.connection).declare()
+        self._read_queues[key] = read_queue
         return read_queue
 
+    def spawn(self, func: t.Callable[[], None]):
+        """
+        Run function in background (in a greenlet).
+        """
+        gevent.spawn(func)
+
+    # feature: rate_limit
+    def sleep(self, seconds: float):
+        """
+        Pause current greenlet (while waiting for rate limit).
+        """
+        gevent.sleep(seconds)
+    # end feature
+
     # noinspection PyUnusedLocal
     def _handle_undelivered(self, exception, exchange, routing_key: str, message):
         """
@@ -222,12 +248,20 @@ class BaseAmqpApiClient(AmqpWrapper):
     Wrapper for asynchronous interaction with AMQP instance through queues.
     """
 
+    # feature: rate_limit
+    def __init__(self, api_keys: dict = None, high_priority: bool = False,
+                 request_timeout: int = 3600, rate_limiter: 'RateLimiter | None' = None, *args, **kwargs):
+    # else feature
     def __init__(self, api_keys: dict = None, high_priority: bool = False,
                  request_timeout: int = 3600, *args, **kwargs):
+    # end feature
         super().__init__(*args, **kwargs)
         self.api_keys = api_keys
         self.high_priority = high_priority
         self.request_timeout = request_timeout
+        # feature: rate_limit
+        self.rate_limiter = rate_limiter
+        # end feature
 
         self.pending_async_results = {}
         self.add_incoming_message_handler(self._process_async_result)
@@ -259,7 +293,18 @@ class BaseAmqpApiClient(AmqpWrapper):
             auto_delete=True,  # incoming queue is one-off (only for this client)
         )
 
+    # feature: rate_limit
+    def mk_request(self, routing_key: str, func: str, *args, rate_limiter: 'RateLimiter | None' = None) -> AsyncAmqpResult:
+        """
+        Publish request, wait for its turn first if client-wide or endpoint rate limit is exceeded.
+        """
+        delay = max([limiter.reserve() for limiter in (self.rate_limiter, rate_limiter) if limiter is not None], default=0)
+        if delay:
+            self.sleep(delay)
+
+    # else feature
     def mk_request(self, routing_key: str, func: str, *args) -> AsyncAmqpResult:
+    # end feature
         request = AmqpRequest(
             id=str(uuid4()),
             api_keys=self.api_keys or {},
@@ -326,6 +371,12 @@ class AmqpApiWithLazyListener(BaseAmqpApiClient):
             self._listener_greenlet.kill()
         super().stop()
 
+    # feature: rate_limit
+    def mk_request(self, routing_key: str, func: str, *args, rate_limiter: 'RateLimiter | None' = None) -> AsyncAmqpResult:
+        self.ensure_listen()
+        return super().mk_request(routing_key, func, *args, rate_limiter=rate_limiter)
+    # else feature
     def mk_request(self, routing_key: str, func: str, *args) -> AsyncAmqpResult:
         self.ensure_listen()
-        return super().mk_request(routing_key, func, *args)
\ No newline at end of file
+        return super().mk_request(routing_key, func, *args)
+    # end feature
\ No newline at end of file
@@ -1,5 +1,5 @@
 JSON_PAYLOAD = t.Union[dict, str, int, float, list]
-RESPONSE_BODY = JSON_PAYLOAD
+RESPONSE_BODY = t.Union[JSON_PAYLOAD, aiohttp.ClientResponse, io.BytesIO]
 
 
 class BaseJsonHttpAsyncClient:
@@ -7,96 +7,576 @@ class BaseJsonHttpAsyncClient:
         self,
         base_url: str,
         logger: t.Union[logging.Logger, t.Callable[[str], None], None],
-        max_retries: int,
-        retry_timeout: float,
+        retry_policy: 'RetryPolicy',
+        json_codec: 'JsonCodec',
+        # feature: circuit_breaker
+        circuit_breaker: 'CircuitBreaker | None',
+        # end feature
+        # feature: http_cache
+        http_cache: 'HttpCache | None',
+        # end feature
+        # feature: request_coalescing
+        single_flight: 'SingleFlight | None',
+        # end feature
+        # feature: rate_limit
+        rate_limiter: 'RateLimiter | None',
+        # end feature
+        # feature: adaptive_concurrency
+        concurrency_limiter: 'AsyncConcurrencyLimiter | None',
+        # end feature
+        # feature: request_hedging
+        hedge_policy: 'HedgePolicy | None',
+        # end feature
+        # feature: call_tracing
+        tracer: 'CallTracer | None',
+        # end feature
         user_agent: str | None,
         headers: dict[str, str | t.Callable[[], str]] | None,
         use_response_streaming: bool,
+        use_response_compression: bool,
+        request_compression: str | None,
+        request_compression_min_size: int,
         use_debug_curl: bool,
         request_kwargs: dict,
         connection_pool_kwargs: dict,
         exception_class: t.Type[Exception],
     ):
+        self._connection_pool_kwargs = connection_pool_kwargs
+        # aiohttp default, 0 stands for no limit
+        self.max_connections = connection_pool_kwargs.get('limit', 100) or 100
+        self._session = None
+        self._session_loop = None
         self._base_url = base_url
         self._logger = logger
-        self._max_retries = max_retries
-        self._retry_timeout = retry_timeout
+        self._retry_policy = retry_policy
+        self._json_codec = json_codec
+        # feature: circuit_breaker
+        self._circuit_breaker = circuit_breaker
+        # end feature
+        # feature: http_cache
+        self._http_cache = http_cache
+        # end feature
+        # feature: request_coalescing
+        self._single_flight = single_flight
+        # end feature
+        # feature: rate_limit
+        self._rate_limiter = rate_limiter
+        # end feature
+        # feature: adaptive_concurrency
+        self._concurrency_limiter = concurrency_limiter
+        # end feature
+        # feature: request_hedging
+        self._hedge_policy = hedge_policy
+        # end feature
+        # feature: call_tracing
+        self._tracer = tracer
+        # end feature
         self._user_agent = user_agent
         self._headers = headers
+        self._use_response_streaming = use_response_streaming
+        self._use_response_compression = use_response_compression
+        self._request_compression = request_compression
+        self._request_compression_min_size = request_compression_min_size
+        if request_compression is not None:
+            # fail early on unsupported or not installed codec
+            compress_request_body(b'', request_compression)
         self._use_debug_curl = use_debug_curl
         self._request_kwargs = request_kwargs
         self._exception_class = exception_class
+        self._traffic = dict(wire_bytes=0, decoded_bytes=0)
 
     async def fetch(
         self,
         url: str,
         method: str = 'get',
         query_params: dict | None = None,
-        json_body: JSON_PAYLOAD | None = None,
+        json_body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None' = None,
         form_fields: dict[str, str] | None = None,
+        endpoint: str | None = None,
+        # feature: rate_limit
+        rate_limiter: 'RateLimiter | None' = None,
+        # end feature
+        stream: bool = False,
     ) -> RESPONSE_BODY:
         """
         Retrieve JSON response from remote API request.
 
-        Repeats request in case of network errors.
+        Repeats request in case of network and server errors according to retry policy.
+        JSON body is compressed if request compression is enabled and body is large enough.
+        # feature: http_cache
+        Responses of GET requests are revalidated by conditional requests if HTTP cache is enabled.
+        # end feature
+        # feature: request_coalescing
+        Identical concurrent requests of idempotent methods share one response if request coalescing is enabled.
+        # end feature
+        # feature: rate_limit
+        Each attempt waits for its turn if client-wide or endpoint rate limit is exceeded.
+        # end feature
+        # feature: adaptive_concurrency
+        Concurrent requests beyond adaptive concurrency limit (if enabled) wait for a free slot.
+        # end feature
+        # feature: request_hedging
+        Slow GET requests are hedged by identical ones if request hedging is enabled (the first response wins).
+        # end feature
+        # feature: call_tracing
+        Phase timings of the call are collected if tracer is set.
+        # end feature
 
         :param url: target url (relative to base url)
         :param method: HTTP verb, e.g. get/post
         :param query_params: key-value arguments like ?param1=11&param2=22
-        :param json_body: JSON-encoded HTTP body
-        :param form_fields: form-encoded HTTP body
+        :param json_body: JSON-encoded HTTP body (stream is sent with chunked transfer encoding and is never compressed)
+        :param form_fields: form-encoded HTTP body (never compressed)
+        :param endpoint: name of called endpoint for its latency tracking and tracing (url is used if omitted)
+        # feature: rate_limit
+        :param rate_limiter: rate limit of endpoint (in addition to client-wide one)
+        # end feature
+        :param stream: return unread JSON response for incremental parsing (if response streaming is enabled)
         :return: decoded JSON from server
         """
         full_url = self._get_full_url(url, query_params)
         headers = self._build_headers()
+        # feature: http_cache
+        cache_entry = None
+        if self._http_cache is not None and method.upper() == 'GET':
+            cache_entry = self._http_cache.lookup(full_url)
+            if cache_entry is not None:
+                headers.update(self._http_cache.get_conditional_headers(cache_entry))
+        # end feature
+        body = None
         if json_body is not None:
+            # payload may be pre-encoded (or streamed) by serializer
+            body = json_body if isinstance(json_body, (bytes, JsonArrayStream)) else self._json_codec.dumps(json_body)
             headers['content-type'] = 'application/json'
         if form_fields is not None:
-            json_body = urlencode(form_fields)
+            body = urlencode(form_fields)
             headers['content-type'] = 'application/x-www-form-urlencoded'
 
+        request_headers, request_body = headers, body
+        if json_body is not None:
+            request_body, request_headers = self._compress_body(body, headers)
+
+        # feature: call_tracing
+        call_event = None
+        if self._tracer is not None:
+            call_event = self._tracer.start_request(endpoint or url, method, full_url, request_body)
+        # end feature
+
         request_kwargs = self._request_kwargs.copy()
         request_kwargs.update(
             full_url=full_url,
             method=method,
-            headers=headers,
-            body=json_body,
+            headers=request_headers,
+            body=request_body,
+            # feature: http_cache
+            cache_entry=cache_entry,
+            # end feature
+            # feature: rate_limit
+            rate_limiter=rate_limiter,
+            # end feature
+            stream=stream,
+            # feature: call_tracing
+            call_event=call_event,
+            # end feature
         )
 
-        try:
+        # feature: call_tracing
+        async def send(event: 'CallEvent | None' = call_event) -> RESPONSE_BODY:
+        # else feature
+        async def send() -> RESPONSE_BODY:
+        # end feature
             return await failsafe_call_async(
                 self._mk_request,
+                # feature: call_tracing
+                kwargs=dict(request_kwargs, call_event=event),
+                # else feature
                 kwargs=request_kwargs,
+                # end feature
                 exceptions=(aiohttp.ClientConnectorError, aiohttp.ClientResponseError, ConnectionRefusedError),
+                retry_policy=self._get_retry_policy(json_body),
                 logger=self._logger,
-                max_attempts=self._max_retries,
-                on_transitional_fail=lambda exc, info: asyncio.sleep(self._retry_timeout)
+                idempotent=self._retry_policy.is_idempotent(method),
+                on_transitional_fail=lambda exc, info: asyncio.sleep(info['delay'])
             )
+
+        # feature: request_hedging
+        async def send_hedged() -> RESPONSE_BODY:
+            # feature: call_tracing
+            return await self._send_hedged(endpoint or url, send, call_event)
+            # else feature
+            return await self._send_hedged(endpoint or url, send)
+            # end feature
+
+        request = send_hedged if self._is_hedged(method) else send
+        # else feature
+        request = send
+        # end feature
+        try:
+            # feature: request_coalescing
+            if self._is_coalesced(method, body):
+                response = await self._single_flight.call_async(self._single_flight.get_key(method, full_url, body), request)
+            else:
+                response = await request()
+            # else feature
+            response = await request()
+            # end feature
         except Exception as e:
+            # feature: call_tracing
+            if call_event is not None:
+                self._tracer.finish(call_event, error=e)
+            # end feature
             if self._use_debug_curl:
+                # uncompressed body is shown, curl can not compress request itself
                 curl_cmd = build_curl_command(
                     url=full_url,
                     method=method,
                     headers=headers,
-                    body=json_body,
+                    body=body,
                 )
                 raise self._exception_class(f'Failed to {curl_cmd}: {e}') from e
             raise self._exception_class(f'Failed to {method} {full_url}: {e}') from e
 
-    @classmethod
-    async def _mk_request(cls, full_url: str, method: str, body: JSON_PAYLOAD | None, headers: dict | None) -> RESPONSE_BODY:
-        async with aiohttp.request(
+        # feature: call_tracing
+        if call_event is not None:
+            self._tracer.set_response(call_event, response)
+        # end feature
+        return response
+
+    async def aclose(self):
+        """
+        Close HTTP session and release pooled connections.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return long-lived session (keep-alive connections, TLS sessions and DNS cache are reused between requests).
+        Session is bound to event loop, so it is created lazily inside the running one.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is not loop:
+            self._close_stale_session()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**self._connection_pool_kwargs),
+                # feature: call_tracing
+                trace_configs=[self._build_trace_config()] if self._tracer is not None else None,
+                # end feature
+            )
+            self._session_loop = loop
+        return self._session
+
+    def _close_stale_session(self):
+        """
+        Close session of previous event loop (e.g. of finished asyncio.run()), it cannot be used by the current one.
+        """
+        session, loop = self._session, self._session_loop
+        self._session = None
+        if session.closed:
+            return
+        if loop.is_running() and not loop.is_closed():
+            # connections belong to that loop (e.g. of another thread), so they are closed by it
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            # stopped or closed loop would never run closing, so connections are abandoned along with it
+            session.detach()
+
+    # feature: rate_limit
+    async def _mk_request(self, full_url: str, *args, rate_limiter: 'RateLimiter | None' = None, **kwargs) -> RESPONSE_BODY:
+    # else feature
+    async def _mk_request(self, full_url: str, *args, **kwargs) -> RESPONSE_BODY:
+    # end feature
+        # feature: circuit_breaker
+        host = urlparse(full_url).netloc
+        if self._circuit_breaker is not None and not self._circuit_breaker.allow(host):
+            raise CircuitOpenError(f'Circuit breaker is open for {host}')
+        # end feature
+
+        # feature: rate_limit
+        delay = self._reserve_rate_limit(rate_limiter)
+        if delay:
+            await asyncio.sleep(delay)
+        # end feature
+
+        # feature: circuit_breaker or adaptive_concurrency
+        # feature: adaptive_concurrency
+        limiter = self._concurrency_limiter
+        started_at = await limiter.acquire_async() if limiter is not None else None
+        # end feature
+        try:
+            response = await self._send_request(full_url, *args, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionRefusedError) as e:
+            # feature: circuit_breaker
+            # timeouts count as failures of the host, as they do for sync client
+            if self._circuit_breaker is not None:
+                self._circuit_breaker.record(host, e)
+            # end feature
+            # feature: adaptive_concurrency
+            if limiter is not None:
+                # including aiohttp.ServerTimeoutError
+                limiter.release(started_at, limiter.get_outcome(e, is_timeout=isinstance(e, asyncio.TimeoutError)))
+            # end feature
+            raise
+        # feature: adaptive_concurrency
+        except BaseException as e:
+            if limiter is not None:
+                limiter.release(started_at, limiter.get_outcome(e))
+            raise
+        # end feature
+
+        # feature: circuit_breaker
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.record(host)
+        # end feature
+        # feature: adaptive_concurrency
+        if limiter is not None:
+            limiter.release(started_at, limiter.SUCCESS)
+        # end feature
+        return response
+        # else feature
+        return await self._send_request(full_url, *args, **kwargs)
+        # end feature
+
+    async def _send_request(
+        self,
+        full_url: str,
+        method: str,
+        body: 'str | bytes | JsonArrayStream | None',
+        headers: dict | None,
+        stream: bool = False,
+        # feature: http_cache
+        cache_entry: dict | None = None,
+        # end feature
+        # feature: call_tracing
+        call_event: 'CallEvent | None' = None,
+        # end feature
+    ) -> RESPONSE_BODY:
+        # feature: call_tracing
+        if call_event is not None:
+            call_event.attempts += 1
+        # end feature
+        response = await self._get_session().request(
             url=full_url,
             method=method,
             headers=headers,
-            json=body,
-        ) as response:
+            data=body,
+            # feature: call_tracing
+            # phases of request are measured by trace config
+            trace_request_ctx=call_event,
+            # end feature
+        )
+        # feature: call_tracing
+        if call_event is not None:
+            call_event.status = response.status
+        # end feature
+
+        # feature: http_cache
+        if response.status == 304 and cache_entry is not None:
+            response.release()
+            cached_response = self._http_cache.replay(cache_entry)
+            if cached_response is None:
+                # stored body has been evicted by another process
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message='Not Modified',
+                    headers=response.headers,
+                )
+            return cached_response
+
+        if self._http_cache is not None and method.upper() == 'GET' and response.ok and self._http_cache.accepts(response.headers):
+            # read whole response to store it for further conditional requests
+            async with response:
+                # feature: call_tracing
+                started_at = time.perf_counter()
+                data = await response.read()
+                self._count_traffic(response.content, call_event, time.perf_counter() - started_at)
+                # else feature
+                data = await response.read()
+                self._count_traffic(response.content)
+                # end feature
+            return self._http_cache.store(full_url, response.headers, data)
+        # end feature
+
+        if stream and self._use_response_streaming and response.ok and 'json' in response.headers.get('content-type', ''):
+            # keep response open, it is parsed (and decompressed on the fly) and released by deserializer
+            # feature: call_tracing
+            response.content.on_eof(lambda: self._count_traffic(response.content, call_event))
+            # else feature
+            response.content.on_eof(lambda: self._count_traffic(response.content))
+            # end feature
+            return response
+
+        async with response:
             response.raise_for_status()
 
+            # feature: call_tracing
+            started_at = time.perf_counter()
             if 'json' in response.headers.get('content-type', ''):
-                return await response.json()
+                raw_data = await response.read()
+                read_at = time.perf_counter()
+                data = self._json_codec.loads(raw_data)
+            else:
+                data = await response.text()
+                read_at = time.perf_counter()
+
+            self._count_traffic(response.content, call_event, read_at - started_at)
+            if call_event is not None and not isinstance(data, str):
+                call_event.add('parse', time.perf_counter() - read_at)
+            # else feature
+            if 'json' in response.headers.get('content-type', ''):
+                data = self._json_codec.loads(await response.read())
+            else:
+                data = await response.text()
+
+            self._count_traffic(response.content)
+            # end feature
+            return data
 
-            return await response.text()
+    # feature: request_hedging
+    # feature: call_tracing
+    async def _send_hedged(
+        self,
+        endpoint: str,
+        send: t.Callable[['CallEvent | None'], t.Awaitable[RESPONSE_BODY]],
+        call_event: 'CallEvent | None' = None,
+    ) -> RESPONSE_BODY:
+        """
+        Send request, then identical one if response is slower than usual for endpoint.
+        The first response wins, the other request is cancelled.
+        Each request is traced separately, only the returned one is merged into call event.
+        """
+        async def attempt(event: 'CallEvent | None') -> RESPONSE_BODY:
+            started_at = time.monotonic()
+            response = await send(event)
+            self._hedge_policy.record(endpoint, time.monotonic() - started_at)
+            return response
+
+        delay = self._hedge_policy.get_delay(endpoint)
+        if delay is None:
+            return await attempt(call_event)
+
+        events = {}
+
+        def submit() -> asyncio.Future:
+            event = call_event.fork() if call_event is not None else None
+            task = asyncio.ensure_future(attempt(event))
+            events[task] = event
+            return task
+    # else feature
+    async def _send_hedged(self, endpoint: str, send: t.Callable[[], t.Awaitable[RESPONSE_BODY]]) -> RESPONSE_BODY:
+        """
+        Send request, then identical one if response is slower than usual for endpoint.
+        The first response wins, the other request is cancelled.
+        """
+        async def attempt() -> RESPONSE_BODY:
+            started_at = time.monotonic()
+            response = await send()
+            self._hedge_policy.record(endpoint, time.monotonic() - started_at)
+            return response
+
+        delay = self._hedge_policy.get_delay(endpoint)
+        if delay is None:
+            return await attempt()
+
+        def submit() -> asyncio.Future:
+            return asyncio.ensure_future(attempt())
+    # end feature
+
+        primary = submit()
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done and self._hedge_policy.try_hedge():
+                pending.add(submit())
+
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                returned = succeeded[0] if succeeded else next(iter(done))
+                # feature: call_tracing
+                if call_event is not None and (succeeded or not pending):
+                    call_event.merge(events[returned])
+                # end feature
+                if succeeded:
+                    if returned is not primary:
+                        self._hedge_policy.count_win()
+                    for task in succeeded[1:]:
+                        self._discard_response(task.result())
+                    return returned.result()
+                if not pending:
+                    # raise error of the last failed request
+                    return returned.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _discard_response(response: RESPONSE_BODY):
+        # unread response of losing request must not occupy its connection
+        if isinstance(response, aiohttp.ClientResponse):
+            response.close()
+    # end feature
+
+    # feature: call_tracing
+    def _count_traffic(self, content: aiohttp.StreamReader, call_event: 'CallEvent | None' = None, read_seconds: float | None = None):
+        # size before decompression is tracked by aiohttp >= 3.12 only
+        wire_bytes = getattr(content, 'total_raw_bytes', content.total_bytes)
+        self._traffic['wire_bytes'] += wire_bytes
+        self._traffic['decoded_bytes'] += content.total_bytes
+        if call_event is not None:
+            call_event.count_read(read_seconds, wire_bytes)
+    # else feature
+    def _count_traffic(self, content: aiohttp.StreamReader):
+        # size before decompression is tracked by aiohttp >= 3.12 only
+        self._traffic['wire_bytes'] += getattr(content, 'total_raw_bytes', content.total_bytes)
+        self._traffic['decoded_bytes'] += content.total_bytes
+    # end feature
+
+    # feature: call_tracing
+    @staticmethod
+    def _build_trace_config() -> aiohttp.TraceConfig:
+        """
+        Hooks of aiohttp which measure connection acquire, send and time to first byte of traced request.
+        """
+        async def on_request_start(session, context, params):
+            context.started_at = context.connected_at = context.sent_at = time.perf_counter()
+
+        async def on_connection_acquired(session, context, params):
+            # new or reused connection, including time spent in queue for a free one
+            context.connected_at = context.sent_at = time.perf_counter()
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx.connect = context.connected_at - context.started_at
+
+        async def on_request_sent(session, context, params):
+            # headers and each chunk of body
+            context.sent_at = time.perf_counter()
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx.send = context.sent_at - context.connected_at
+
+        async def on_request_end(session, context, params):
+            # response headers have arrived
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx.ttfb = time.perf_counter() - context.sent_at
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_acquired)
+        trace_config.on_connection_reuseconn.append(on_connection_acquired)
+        trace_config.on_request_headers_sent.append(on_request_sent)
+        trace_config.on_request_chunk_sent.append(on_request_sent)
+        trace_config.on_request_end.append(on_request_end)
+        return trace_config
+    # end feature
+
+    def get_traffic_stats(self) -> dict[str, int]:
+        """
+        Size of response bodies read so far: received over network (compressed) and decoded.
+        """
+        return self._traffic.copy()
 
     def _get_full_url(self, url: str, query_params: dict | None = None) -> str:
         if self._base_url:
@@ -134,4 +614,47 @@ class BaseJsonHttpAsyncClient:
         if self._user_agent:
             headers['user-agent'] = self._user_agent
 
-        return headers
\ No newline at end of file
+        if not self._use_response_compression:
+            # aiohttp advertises and decodes available codecs by default (gzip and deflate, br and zstd if installed)
+            headers['accept-encoding'] = 'identity'
+
+        return headers
+
+    # feature: rate_limit
+    def _reserve_rate_limit(self, rate_limiter: 'RateLimiter | None') -> float:
+        """
+        Take tokens of client-wide and endpoint rate limits, return seconds to wait before request is sent.
+        """
+        return max([limiter.reserve() for limiter in (self._rate_limiter, rate_limiter) if limiter is not None], default=0)
+    # end feature
+
+    # feature: request_hedging
+    def _is_hedged(self, method: str) -> bool:
+        return self._hedge_policy is not None and method.upper() == 'GET'
+    # end feature
+
+    # feature: request_coalescing
+    def _is_coalesced(self, method: str, body: 'str | bytes | JsonArrayStream | None') -> bool:
+        # streamed payload can not be hashed (and shared) without being consumed
+        return (
+            self._single_flight is not None
+            and method.upper() in RetryPolicy.IDEMPOTENT_METHODS
+            and not isinstance(body, JsonArrayStream)
+        )
+    # end feature
+
+    def _get_retry_policy(self, json_body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None') -> 'RetryPolicy':
+        if isinstance(json_body, JsonArrayStream) and not json_body.replayable:
+            # payload iterator is consumed by the first attempt
+            return RetryPolicy(max_attempts=1)
+        return self._retry_policy
+
+    def _compress_body(self, body: 'bytes | JsonArrayStream', headers: dict[str, str]) -> tuple['bytes | JsonArrayStream', dict[str, str]]:
+        """
+        Compress JSON body (if enabled and large enough), return it along with updated copy of headers.
+        """
+        if self._request_compression is None or isinstance(body, JsonArrayStream) or len(body) < self._request_compression_min_size:
+            return body, headers
+
+        body = compress_request_body(body, self._request_compression)
+        return body, {**headers, 'content-encoding': self._request_compression}
\ No newline at end of file
@@ -2,88 +2,302 @@ JSON_PAYLOAD = t.Union[dict, str, int, float, list]
 RESPONSE_BODY = [str, io.IOBase]
 
 
+class HttpResponseError(urllib3.exceptions.HTTPError):
+    """
+    Server responded with error status code (status and headers are used by retry policy).
+    """
+
+    def __init__(self, status: int, headers: t.Mapping[str, str], data: bytes):
+        super().__init__('Server respond with status code {status}: {data}'.format(status=status, data=data))
+        self.status = status
+        self.headers = headers
+
+
+class MeteredResponse(io.RawIOBase):
+    """
+    File-like JSON response, decompressed on the fly while being read.
+    Reports number of received (possibly compressed) and decoded bytes.
+    """
+
+    # feature: call_tracing
+    def __init__(self, response: urllib3.BaseHTTPResponse, on_read: t.Callable[[int, int], None], call_event: 'CallEvent | None' = None):
+    # else feature
+    def __init__(self, response: urllib3.BaseHTTPResponse, on_read: t.Callable[[int, int], None]):
+    # end feature
+        self._response = response
+        self._on_read = on_read
+        # feature: call_tracing
+        self._call_event = call_event
+        # end feature
+        self.headers = response.headers
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        # feature: call_tracing
+        started_at = time.perf_counter() if self._call_event is not None else None
+        # end feature
+        wire_bytes = self._response.tell()
+        data = self._response.read(None if size is None or size < 0 else size)
+        wire_bytes = self._response.tell() - wire_bytes
+        self._on_read(wire_bytes, len(data))
+        # feature: call_tracing
+        if self._call_event is not None:
+            self._call_event.count_read(time.perf_counter() - started_at, wire_bytes)
+        # end feature
+        return data
+
+    # feature: request_hedging
+    def discard(self):
+        """
+        Drop unread response, its connection is closed instead of being reused.
+        """
+        self._response.close()
+        self._response.release_conn()
+    # end feature
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
 class BaseJsonHttpClient:
     def __init__(
         self,
         base_url: str,
         logger: t.Union[logging.Logger, t.Callable[[str], None], None],
-        max_retries: int,
-        retry_timeout: float,
+        retry_policy: 'RetryPolicy',
+        json_codec: 'JsonCodec',
+        # feature: circuit_breaker
+        circuit_breaker: 'CircuitBreaker | None',
+        # end feature
+        # feature: http_cache
+        http_cache: 'HttpCache | None',
+        # end feature
+        # feature: request_coalescing
+        single_flight: 'SingleFlight | None',
+        # end feature
+        # feature: rate_limit
+        rate_limiter: 'RateLimiter | None',
+        # end feature
+        # feature: adaptive_concurrency
+        concurrency_limiter: 'ConcurrencyLimiter | None',
+        # end feature
+        # feature: request_hedging
+        hedge_policy: 'HedgePolicy | None',
+        # end feature
+        # feature: call_tracing
+        tracer: 'CallTracer | None',
+        # end feature
         user_agent: str | None,
         headers: dict[str, str | t.Callable[[], str]] | None,
         use_response_streaming: bool,
+        use_response_compression: bool,
+        request_compression: str | None,
+        request_compression_min_size: int,
         use_debug_curl: bool,
         request_kwargs: dict,
         connection_pool_kwargs: dict,
         exception_class: t.Type[Exception],
     ):
         connection_pool_kwargs.update(retries=False)
+        # keep as many connections per host as there may be concurrent requests in thread pool
+        connection_pool_kwargs.setdefault('maxsize', 10)
 
         self._pool = urllib3.PoolManager(**connection_pool_kwargs)
         self._base_url = base_url
         self._logger = logger
-        self._max_retries = max_retries
-        self._retry_timeout = retry_timeout
+        self._retry_policy = retry_policy
+        self._json_codec = json_codec
+        # feature: circuit_breaker
+        self._circuit_breaker = circuit_breaker
+        # end feature
+        # feature: http_cache
+        self._http_cache = http_cache
+        # end feature
+        # feature: request_coalescing
+        self._single_flight = single_flight
+        # end feature
+        # feature: rate_limit
+        self._rate_limiter = rate_limiter
+        # end feature
+        # feature: adaptive_concurrency
+        self._concurrency_limiter = concurrency_limiter
+        # end feature
+        # feature: request_hedging
+        self._hedge_policy = hedge_policy
+        # end feature
+        # feature: call_tracing
+        self._tracer = tracer
+        # end feature
         self._user_agent = user_agent
         self._headers = headers
         self._use_response_streaming = use_response_streaming
+        self._use_response_compression = use_response_compression
+        self._request_compression = request_compression
+        self._request_compression_min_size = request_compression_min_size
+        if request_compression is not None:
+            # fail early on unsupported or not installed codec
+            compress_request_body(b'', request_compression)
         self._use_debug_curl = use_debug_curl
         self._request_kwargs = request_kwargs
         self._exception_class = exception_class
 
+        self._traffic_lock = threading.Lock()
+        self._traffic = dict(wire_bytes=0, decoded_bytes=0)
+
+        self.max_connections = connection_pool_kwargs['maxsize']
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        # feature: request_hedging
+        self._hedge_executor: concurrent.futures.ThreadPoolExecutor | None = None
+        # end feature
+        self._executor_lock = threading.Lock()
+
     def fetch(
         self,
         url: str,
         method: str = 'get',
         query_params: dict | None = None,
-        json_body: JSON_PAYLOAD | None = None,
+        json_body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None' = None,
         form_fields: dict[str, str] | None = None,
+        endpoint: str | None = None,
+        # feature: rate_limit
+        rate_limiter: 'RateLimiter | None' = None,
+        # end feature
     ) -> RESPONSE_BODY:
         """
         Retrieve JSON response from remote API request.
 
-        Repeats request in case of network errors.
+        Repeats request in case of network and server errors according to retry policy.
+        JSON body is compressed if request compression is enabled and body is large enough.
+        # feature: http_cache
+        Responses of GET requests are revalidated by conditional requests if HTTP cache is enabled.
+        # end feature
+        # feature: request_coalescing
+        Identical concurrent requests of idempotent methods share one response if request coalescing is enabled.
+        # end feature
+        # feature: rate_limit
+        Each attempt waits for its turn if client-wide or endpoint rate limit is exceeded.
+        # end feature
+        # feature: adaptive_concurrency
+        Concurrent requests beyond adaptive concurrency limit (if enabled) wait for a free slot.
+        # end feature
+        # feature: request_hedging
+        Slow GET requests are hedged by identical ones if request hedging is enabled (the first response wins).
+        # end feature
+        # feature: call_tracing
+        Phase timings of the call are collected if tracer is set.
+        # end feature
 
         :param url: target url (relative to base url)
         :param method: HTTP verb, e.g. get/post
         :param query_params: key-value arguments like ?param1=11&param2=22
-        :param json_body: JSON-encoded HTTP body
-        :param form_fields: form-encoded HTTP body
+        :param json_body: JSON-encoded HTTP body (stream is sent with chunked transfer encoding and is never compressed)
+        :param form_fields: form-encoded HTTP body (never compressed)
+        :param endpoint: name of called endpoint for its latency tracking and tracing (url is used if omitted)
+        # feature: rate_limit
+        :param rate_limiter: rate limit of endpoint (in addition to client-wide one)
+        # end feature
         :return: decoded JSON from server
         """
         full_url = self._get_full_url(url, query_params)
         headers = self._build_headers()
+        # feature: http_cache
+        cache_entry = None
+        if self._http_cache is not None and method.upper() == 'GET':
+            cache_entry = self._http_cache.lookup(full_url)
+            if cache_entry is not None:
+                headers.update(self._http_cache.get_conditional_headers(cache_entry))
+        # end feature
         body = None
         if json_body is not None:
-            body = json.dumps(json_body).encode('utf8')
+            # payload may be pre-encoded (or streamed) by serializer
+            body = json_body if isinstance(json_body, (bytes, JsonArrayStream)) else self._json_codec.dumps(json_body)
             headers['content-type'] = 'application/json'
         if form_fields is not None:
             body = urlencode(form_fields)
             headers['content-type'] = 'application/x-www-form-urlencoded'
 
+        request_headers, request_body = headers, body
+        if json_body is not None:
+            request_body, request_headers = self._compress_body(body, headers)
+
+        # feature: call_tracing
+        call_event = None
+        if self._tracer is not None:
+            call_event = self._tracer.start_request(endpoint or url, method, full_url, request_body)
+        # end feature
+
         request_kwargs = self._request_kwargs.copy()
         request_kwargs.update(
             url=full_url,
             method=method,
-            headers=headers,
-            body=body,
+            headers=request_headers,
+            body=request_body,
+            # feature: http_cache
+            cache_entry=cache_entry,
+            # end feature
+            # feature: rate_limit
+            rate_limiter=rate_limiter,
+            # end feature
+            # feature: call_tracing
+            call_event=call_event,
+            # end feature
         )
 
-        try:
+        # feature: call_tracing
+        def send(event: 'CallEvent | None' = call_event) -> RESPONSE_BODY:
+        # else feature
+        def send() -> RESPONSE_BODY:
+        # end feature
             return failsafe_call(
                 self._mk_request,
+                # feature: call_tracing
+                kwargs=dict(request_kwargs, call_event=event),
+                # else feature
                 kwargs=request_kwargs,
+                # end feature
                 exceptions=(urllib3.exceptions.HTTPError,),  # include connection errors, HTTP >= 400
+                retry_policy=self._get_retry_policy(json_body),
                 logger=self._logger,
-                max_attempts=self._max_retries,
-                on_transitional_fail=lambda exc, info: sleep(self._retry_timeout)
+                idempotent=self._retry_policy.is_idempotent(method),
+                on_transitional_fail=lambda exc, info: sleep(info['delay'])
             )
+
+        # feature: request_hedging
+        def send_hedged() -> RESPONSE_BODY:
+            # feature: call_tracing
+            return self._send_hedged(endpoint or url, send, call_event)
+            # else feature
+            return self._send_hedged(endpoint or url, send)
+            # end feature
+
+        request = send_hedged if self._is_hedged(method) else send
+        # else feature
+        request = send
+        # end feature
+        try:
+            # feature: request_coalescing
+            if self._is_coalesced(method, body):
+                response = self._single_flight.call(self._single_flight.get_key(method, full_url, body), request)
+            else:
+                response = request()
+            # else feature
+            response = request()
+            # end feature
         except Exception as e:
+            # feature: call_tracing
+            if call_event is not None:
+                self._tracer.finish(call_event, error=e)
+            # end feature
             error_verbose = str(e)
             if ' at 0x' in error_verbose:
                 # reduce noise in error description, e.g. in case of NewConnectionError
                 error_verbose = error_verbose.split(':', maxsplit=1)[-1].strip()
             if self._use_debug_curl:
+                # uncompressed body is shown, curl can not compress request itself
                 curl_cmd = build_curl_command(
                     url=full_url,
                     method=method,
@@ -94,20 +308,272 @@ class BaseJsonHttpClient:
 
             raise self._exception_class(f'Failed to {method} {full_url}: {error_verbose}') from e
 
+        # feature: call_tracing
+        if call_event is not None:
+            self._tracer.set_response(call_event, response)
+        # end feature
+        return response
+
+    # feature: rate_limit
+    def _mk_request(self, *args, rate_limiter: 'RateLimiter | None' = None, **kwargs) -> RESPONSE_BODY:
+    # else feature
     def _mk_request(self, *args, **kwargs) -> RESPONSE_BODY:
+    # end feature
+        # feature: circuit_breaker
+        host = urlparse(kwargs['url']).netloc
+        if self._circuit_breaker is not None and not self._circuit_breaker.allow(host):
+            raise CircuitOpenError(f'Circuit breaker is open for {host}')
+        # end feature
+
+        # feature: rate_limit
+        delay = self._reserve_rate_limit(rate_limiter)
+        if delay:
+            sleep(delay)
+        # end feature
+
+        # feature: circuit_breaker or adaptive_concurrency
+        # feature: adaptive_concurrency
+        limiter = self._concurrency_limiter
+        started_at = limiter.acquire() if limiter is not None else None
+        # end feature
+        try:
+            response = self._send_request(*args, **kwargs)
+        except urllib3.exceptions.HTTPError as e:
+            # feature: circuit_breaker
+            if self._circuit_breaker is not None:
+                self._circuit_breaker.record(host, e)
+            # end feature
+            # feature: adaptive_concurrency
+            if limiter is not None:
+                limiter.release(started_at, limiter.get_outcome(e, is_timeout=isinstance(e, urllib3.exceptions.TimeoutError)))
+            # end feature
+            raise
+        # feature: adaptive_concurrency
+        except BaseException as e:
+            if limiter is not None:
+                limiter.release(started_at, limiter.get_outcome(e))
+            raise
+        # end feature
+
+        # feature: circuit_breaker
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.record(host)
+        # end feature
+        # feature: adaptive_concurrency
+        if limiter is not None:
+            limiter.release(started_at, limiter.SUCCESS)
+        # end feature
+        return response
+        # else feature
+        return self._send_request(*args, **kwargs)
+        # end feature
+
+    def _send_request(
+        self,
+        *args,
+        # feature: http_cache
+        cache_entry: dict | None = None,
+        # end feature
+        # feature: call_tracing
+        call_event: 'CallEvent | None' = None,
+        # end feature
+        **kwargs,
+    ) -> RESPONSE_BODY:
+        # feature: call_tracing
+        if call_event is not None:
+            call_event.attempts += 1
+            started_at = time.perf_counter()
+        # end feature
         response = self._pool.request(*args, **kwargs, preload_content=False)
+        # feature: call_tracing
+        if call_event is not None:
+            # urllib3 has no hooks for connection and sending, they are included in time to first byte
+            call_event.status = response.status
+            call_event.ttfb = time.perf_counter() - started_at
+        # end feature
+
+        # feature: http_cache
+        if response.status == 304 and cache_entry is not None:
+            response.drain_conn()
+            cached_response = self._http_cache.replay(cache_entry)
+            if cached_response is None:
+                # stored body has been evicted by another process
+                raise HttpResponseError(status=response.status, headers=response.headers, data=b'')
+            return cached_response
+        # end feature
+
         if response.status >= 400:
-            raise urllib3.exceptions.HTTPError('Server respond with status code {status}: {data}'.format(
+            raise HttpResponseError(
                 status=response.status,
+                headers=response.headers,
                 data=response.data,
-            ))
+            )
+
+        # feature: http_cache
+        if self._http_cache is not None and kwargs['method'].upper() == 'GET' and self._http_cache.accepts(response.headers):
+            # read whole response to store it for further conditional requests
+            # feature: call_tracing
+            data = self._read_data(response, call_event)
+            # else feature
+            data = self._read_data(response)
+            # end feature
+            return self._http_cache.store(kwargs['url'], response.headers, data)
+        # end feature
 
         if 'json' in response.headers.get('content-type', ''):
             # provide Bytes I/O for file-like JSON read
-            return response
+            # feature: call_tracing
+            return MeteredResponse(response, on_read=self._count_traffic, call_event=call_event)
+            # else feature
+            return MeteredResponse(response, on_read=self._count_traffic)
+            # end feature
 
         # decode whole non-json response into string
-        return response.data.decode()
+        # feature: call_tracing
+        return self._read_data(response, call_event).decode()
+        # else feature
+        return self._read_data(response).decode()
+        # end feature
+
+    # feature: call_tracing
+    def _read_data(self, response: urllib3.BaseHTTPResponse, call_event: 'CallEvent | None') -> bytes:
+        """
+        Read whole response body, count its size in traffic stats (and in call event if traced).
+        """
+        started_at = time.perf_counter() if call_event is not None else None
+        data = response.data
+        self._count_traffic(response.tell(), len(data))
+        if call_event is not None:
+            call_event.count_read(time.perf_counter() - started_at, response.tell())
+        return data
+    # else feature
+    def _read_data(self, response: urllib3.BaseHTTPResponse) -> bytes:
+        """
+        Read whole response body, count its size in traffic stats.
+        """
+        data = response.data
+        self._count_traffic(response.tell(), len(data))
+        return data
+    # end feature
+
+    def get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Thread pool for concurrent requests (created on first use), as large as connection pool per host.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_connections, thread_name_prefix='api-client')
+            return self._executor
+
+    # feature: request_hedging
+    def _get_hedge_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Thread pool for hedged requests, separate from get_executor() since its workers may be waiting for them.
+        """
+        with self._executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2 * self.max_connections, thread_name_prefix='api-client-hedge')
+            return self._hedge_executor
+
+    # feature: call_tracing
+    def _send_hedged(
+        self,
+        endpoint: str,
+        send: t.Callable[['CallEvent | None'], RESPONSE_BODY],
+        call_event: 'CallEvent | None' = None,
+    ) -> RESPONSE_BODY:
+        """
+        Send request, then identical one if response is slower than usual for endpoint. The first response wins.
+        Each request is traced separately, only the returned one is merged into call event.
+        """
+        def attempt(event: 'CallEvent | None') -> RESPONSE_BODY:
+            started_at = time.monotonic()
+            response = send(event)
+            self._hedge_policy.record(endpoint, time.monotonic() - started_at)
+            return response
+    # else feature
+    def _send_hedged(self, endpoint: str, send: t.Callable[[], RESPONSE_BODY]) -> RESPONSE_BODY:
+        """
+        Send request, then identical one if response is slower than usual for endpoint. The first response wins.
+        """
+        def attempt() -> RESPONSE_BODY:
+            started_at = time.monotonic()
+            response = send()
+            self._hedge_policy.record(endpoint, time.monotonic() - started_at)
+            return response
+    # end feature
+
+        delay = self._hedge_policy.get_delay(endpoint)
+        if delay is None:
+            # feature: call_tracing
+            return attempt(call_event)
+            # else feature
+            return attempt()
+            # end feature
+
+        # both requests run in thread pool, so that caller gets the first response
+        executor = self._get_hedge_executor()
+        # feature: call_tracing
+        events = {}
+
+        def submit() -> concurrent.futures.Future:
+            event = call_event.fork() if call_event is not None else None
+            future = executor.submit(attempt, event)
+            events[future] = event
+            return future
+        # else feature
+
+        def submit() -> concurrent.futures.Future:
+            return executor.submit(attempt)
+        # end feature
+
+        primary = submit()
+        pending = {primary}
+        done, _ = concurrent.futures.wait(pending, timeout=delay)
+        if not done and self._hedge_policy.try_hedge():
+            pending.add(submit())
+
+        try:
+            while True:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                succeeded = [future for future in done if future.exception() is None]
+                returned = succeeded[0] if succeeded else next(iter(done))
+                # feature: call_tracing
+                if call_event is not None and (succeeded or not pending):
+                    call_event.merge(events[returned])
+                # end feature
+                if succeeded:
+                    if returned is not primary:
+                        self._hedge_policy.count_win()
+                    for future in succeeded[1:]:
+                        self._discard_response(future)
+                    return returned.result()
+                if not pending:
+                    # raise error of the last failed request
+                    return returned.result()
+        finally:
+            for future in pending:
+                future.cancel()
+                future.add_done_callback(self._discard_response)
+
+    @staticmethod
+    def _discard_response(future: concurrent.futures.Future):
+        # unread response of losing request must not occupy its connection
+        if not future.cancelled() and future.exception() is None and isinstance(future.result(), MeteredResponse):
+            future.result().discard()
+    # end feature
+
+    def _count_traffic(self, wire_bytes: int, decoded_bytes: int):
+        with self._traffic_lock:
+            self._traffic['wire_bytes'] += wire_bytes
+            self._traffic['decoded_bytes'] += decoded_bytes
+
+    def get_traffic_stats(self) -> dict[str, int]:
+        """
+        Size of response bodies read so far: received over network (compressed) and decoded.
+        """
+        with self._traffic_lock:
+            return self._traffic.copy()
 
     def _get_full_url(self, url: str, query_params: dict | None = None) -> str:
         if self._base_url:
@@ -145,4 +611,47 @@ class BaseJsonHttpClient:
         if self._user_agent:
             headers['user-agent'] = self._user_agent
 
-        return headers
\ No newline at end of file
+        if self._use_response_compression:
+            # advertise codecs available for urllib3 (gzip and deflate, br and zstd if installed)
+            headers.setdefault('accept-encoding', urllib3.util.make_headers(accept_encoding=True)['accept-encoding'])
+
+        return headers
+
+    # feature: rate_limit
+    def _reserve_rate_limit(self, rate_limiter: 'RateLimiter | None') -> float:
+        """
+        Take tokens of client-wide and endpoint rate limits, return seconds to wait before request is sent.
+        """
+        return max([limiter.reserve() for limiter in (self._rate_limiter, rate_limiter) if limiter is not None], default=0)
+    # end feature
+
+    # feature: request_hedging
+    def _is_hedged(self, method: str) -> bool:
+        return self._hedge_policy is not None and method.upper() == 'GET'
+    # end feature
+
+    # feature: request_coalescing
+    def _is_coalesced(self, method: str, body: 'str | bytes | JsonArrayStream | None') -> bool:
+        # streamed payload can not be hashed (and shared) without being consumed
+        return (
+            self._single_flight is not None
+            and method.upper() in RetryPolicy.IDEMPOTENT_METHODS
+            and not isinstance(body, JsonArrayStream)
+        )
+    # end feature
+
+    def _get_retry_policy(self, json_body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None') -> 'RetryPolicy':
+        if isinstance(json_body, JsonArrayStream) and not json_body.replayable:
+            # payload iterator is consumed by the first attempt
+            return RetryPolicy(max_attempts=1)
+        return self._retry_policy
+
+    def _compress_body(self, body: 'bytes | JsonArrayStream', headers: dict[str, str]) -> tuple['bytes | JsonArrayStream', dict[str, str]]:
+        """
+        Compress JSON body (if enabled and large enough), return it along with updated copy of headers.
+        """
+        if self._request_compression is None or isinstance(body, JsonArrayStream) or len(body) < self._request_compression_min_size:
+            return body, headers
+
+        body = compress_request_body(body, self._request_compression)
+        return body, {**headers, 'content-encoding': self._request_compression}
\ No newline at end of file
@@ -0,0 +1,55 @@
+class BaseSchemaRegistry:
+    """
+    Cache of codecs of model library, built once per class and variant (e.g. load/dump or single/many).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, data_class: t.Type | None, variant: bool = False) -> t.Any:
+        key = (data_class, variant)
+        schema = self._schemas.get(key)
+        if schema is not None:
+            with self._lock:
+                self._hits += 1
+            return schema
+
+        with self._lock:
+            # other thread might have built it while we were waiting
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._hits += 1
+                return schema
+
+            self._misses += 1
+            schema = self._schemas[key] = self._build(data_class, variant)
+            return schema
+
+    def _build(self, data_class: t.Type | None, variant: bool) -> t.Any:
+        raise NotImplementedError
+
+    def is_model(self, value: t.Any) -> bool:
+        """
+        Whether value is a class handled by model library.
+        """
+        raise NotImplementedError
+
+    def warm_up(self, collection: type):
+        """
+        Build codecs for all classes of given collection (e.g. AllDataclassesCollection) in advance.
+        """
+        for value in vars(collection).values():
+            if self.is_model(value):
+                self.get(value, False)
+                self.get(value, True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                size=len(self._schemas),
+                hits=self._hits,
+                misses=self._misses,
+            )
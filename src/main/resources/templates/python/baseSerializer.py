@@ -1,9 +1,58 @@
 class BaseSerializer:
-    def __init__(self, deserializer: 'BaseDeserializer', use_request_payload_validation: bool):
+    def __init__(
+        self,
+        deserializer: 'BaseDeserializer',
+        use_request_payload_validation: bool,
+        schema_registry: 'SchemaRegistry',
+        json_codec: 'JsonCodec',
+        # feature: request_streaming
+        use_request_streaming: bool = False,
+        # end feature
+        # feature: call_tracing
+        tracer: 'CallTracer | None' = None,
+        # end feature
+    ):
         self._use_request_payload_validation = use_request_payload_validation
+        # feature: request_streaming
+        self._use_request_streaming = use_request_streaming
+        # end feature
         self._deserializer = deserializer
+        self._schema_registry = schema_registry
+        self._json_codec = json_codec
+        # feature: call_tracing
+        self._tracer = tracer
+        # end feature
+
+    # feature: request_streaming
+    # feature: call_tracing
+    def serialize(self, value: t.Any, is_payload=False) -> 'JSON_PAYLOAD | bytes | JsonArrayStream | None':
+        if self._tracer is not None:
+            return self._tracer.measure('serialize', self._serialize, value, is_payload)
+        return self._serialize(value, is_payload)
+
+    def _serialize(self, value: t.Any, is_payload: bool) -> 'JSON_PAYLOAD | bytes | JsonArrayStream | None':
+    # else feature
+    def serialize(self, value: t.Any, is_payload=False) -> 'JSON_PAYLOAD | bytes | JsonArrayStream | None':
+    # end feature
+        if is_payload and self._use_request_streaming and isinstance(value, (list, tuple, set, t.Iterator)):
+            # encode items one at a time while request is being sent
+            return JsonArrayStream(value, encode=self._encode_payload_item)
+    # else feature
+    # feature: call_tracing
+    def serialize(self, value: t.Any, is_payload=False) -> 'JSON_PAYLOAD | bytes | None':
+        if self._tracer is not None:
+            return self._tracer.measure('serialize', self._serialize, value, is_payload)
+        return self._serialize(value, is_payload)
+
+    def _serialize(self, value: t.Any, is_payload: bool) -> 'JSON_PAYLOAD | bytes | None':
+    # else feature
+    def serialize(self, value: t.Any, is_payload=False) -> 'JSON_PAYLOAD | bytes | None':
+    # end feature
+    # end feature
+
+        if isinstance(value, t.Iterator):
+            value = list(value)
 
-    def serialize(self, value: t.Any, is_payload=False) -> JSON_PAYLOAD | None:
         # auto-detect collections
         many = False
         _type = type(value)
@@ -20,17 +69,8 @@ class BaseSerializer:
                 return list(map(method, value))
             return method(value)
 
-        # use marshmallow in case of dataclass
-        if is_dataclass(_type):
-            schema = marshmallow_dataclass.class_schema(_type)()
-            func = schema.dump if is_payload else schema.dumps
-            serialized_data = func(value, many=many)
-
-            if self._use_request_payload_validation:
-                gen = self._deserializer.deserialize(serialized_data, _type, many=many)
-                for _ in gen:
-                    pass
-
+        serialized_data = self._serialize_model(value, _type, many, is_payload)
+        if serialized_data is not None:
             return serialized_data
 
         if isinstance(value, t.get_args(JSON_PAYLOAD)):
@@ -44,6 +84,41 @@ class BaseSerializer:
 
         raise ValueError('Unable to serialize object of type {0}: {1}'.format(type(value), value))
 
+    def _serialize_model(self, value: t.Any, _type: t.Type, many: bool, is_payload: bool) -> 'JSON_PAYLOAD | bytes | None':
+        """
+        Serialized dataclass (or list of them), None for values of other types.
+        """
+        if not is_dataclass(_type):
+            return None
+
+        encoder = getattr(_type, 'to_dict', None)
+        if is_payload and encoder is not None:
+            # use generated encoder if available (USE_FAST_CODECS=1)
+            serialized_data = list(map(encoder, value)) if many else encoder(value)
+        else:
+            # use marshmallow in other cases
+            schema = self._schema_registry.get(_type, dump=True)
+            func = schema.dump if is_payload else schema.dumps
+            serialized_data = func(value, many=many)
+
+        if self._use_request_payload_validation:
+            self._validate(serialized_data, _type, many)
+
+        return serialized_data
+
+    def _validate(self, serialized_data: 'JSON_PAYLOAD | bytes', _type: t.Type, many: bool):
+        for _ in self._deserializer.deserialize(serialized_data, _type, many=many):
+            pass
+
+    # feature: request_streaming
+    def _encode_payload_item(self, item: t.Any) -> bytes:
+        serialized_data = self.serialize(item, is_payload=True)
+        if isinstance(serialized_data, bytes):
+            # encoded by model library already
+            return serialized_data
+        return self._json_codec.dumps(serialized_data)
+    # end feature
+
     @classmethod
     def _serialize_datetime(cls, value: datetime) -> str:
         # use ISO format: YYYY-MM-DDTHH:mm:ss[.ms]Z
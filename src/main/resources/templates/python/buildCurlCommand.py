@@ -1,8 +1,17 @@
-def build_curl_command(url: str, method: str, headers: dict[str, str], body: str) -> str:
+def build_curl_command(url: str, method: str, headers: dict[str, str], body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None') -> str:
     """
     >>> build_curl_command('https://example.com', 'get', {}, '')
     'curl "https://example.com"'
 
+    >>> build_curl_command('https://example.com', 'get', {'accept-encoding': 'gzip,deflate'}, '')
+    'curl "https://example.com" --compressed'
+
+    >>> build_curl_command('https://example.com', 'put', {}, b'[1, 2]')
+    'curl "https://example.com" -X PUT -d "[1, 2]"'
+
+    >>> build_curl_command('https://example.com', 'put', {}, [1, 2])
+    'curl "https://example.com" -X PUT -d "[1, 2]"'
+
     >>> build_curl_command('https://example.com?param1=value1&param2=value2', 'post', {'content-type': 'application/json'}, '{"foo": "bar"}')
     'curl "https://example.com?param1=value1&param2=value2" -X POST -H "content-type: application/json" -d "{\"foo\": \"bar\"}"'
     """
@@ -13,7 +22,18 @@ def build_curl_command(url: str, method: str, headers: dict[str, str], body: str
     else:
         method = ''
 
-    headers = ''.join(f' -H "{k}: {v}"' for k, v in headers.items())
+    # let curl negotiate and decode compressed response itself
+    compressed = ' --compressed' if any(k.lower() == 'accept-encoding' for k in headers) else ''
+    headers = ''.join(f' -H "{k}: {v}"' for k, v in headers.items() if k.lower() != 'accept-encoding') + compressed
+
+    if isinstance(body, JsonArrayStream):
+        # do not consume payload iterator
+        body = b''.join(body) if body.replayable else b'[...]'
+
+    if isinstance(body, bytes):
+        body = body.decode('utf8', errors='replace')
+    elif body is not None and not isinstance(body, str):
+        body = json.dumps(body)
 
     if body:
         body = body.replace('"', '\"')
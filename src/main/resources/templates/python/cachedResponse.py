@@ -0,0 +1,9 @@
+class CachedResponse(io.BytesIO):
+    """
+    JSON response body replayed from memory (stored by HTTP cache or shared between coalesced requests).
+    """
+
+    def __init__(self, body: bytes, cached_objects: dict | None):
+        super().__init__(body)
+        # objects deserialized from the body, shared between calls (if enabled)
+        self.cached_objects = cached_objects
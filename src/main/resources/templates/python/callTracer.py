@@ -0,0 +1,239 @@
+class CallEvent:
+    """
+    Outcome of endpoint call along with durations of its phases (in seconds, None if phase has not happened).
+
+    Phases which HTTP library does not tell apart are reported as the enclosing one, e.g. connection
+    and send are included in time to first byte by urllib3, read of streamed response is included in parsing.
+    Construction of objects is included in parsing by deserializers which do both in one native call.
+    """
+
+    PHASES = ('serialize', 'connect', 'send', 'ttfb', 'read', 'parse', 'construct')
+
+    def __init__(self):
+        self.endpoint: str | None = None
+        self.method: str | None = None
+        self.url: str | None = None
+        self.status: int | None = None
+        self.error: Exception | None = None
+        self.attempts = 0
+        self.request_bytes: int | None = None
+        self.response_bytes: int | None = None
+        self.items: int | None = None
+
+        self.serialize: float | None = None
+        self.connect: float | None = None
+        self.send: float | None = None
+        self.ttfb: float | None = None
+        self.read: float | None = None
+        self.parse: float | None = None
+        self.construct: float | None = None
+        self.duration: float | None = None
+
+        # wall clock time for exported spans, monotonic one for durations
+        self.timestamp = time.time()
+        self.started_at = time.perf_counter()
+
+        self.responded = False
+        self.response: t.Any = None
+        self._merged_into: CallEvent | None = None
+
+    def add(self, phase: str, seconds: float):
+        setattr(self, phase, (getattr(self, phase) or 0.0) + seconds)
+
+    def count_read(self, seconds: float | None, wire_bytes: int):
+        if self._merged_into is not None:
+            # response of the winning attempt is read after it has been merged
+            self._merged_into.count_read(seconds, wire_bytes)
+            return
+        if seconds is not None:
+            # read of streamed response is measured by parser
+            self.add('read', seconds)
+        self.response_bytes = (self.response_bytes or 0) + wire_bytes
+
+    def fork(self) -> 'CallEvent':
+        """
+        Separate event for one of concurrent attempts of the call (e.g. hedged requests), see merge().
+        """
+        return CallEvent()
+
+    def merge(self, attempt: 'CallEvent'):
+        """
+        Take request phases of the attempt whose outcome is returned, other attempts are not reported.
+        """
+        self.attempts += attempt.attempts
+        self.status = attempt.status
+        for phase in ('connect', 'send', 'ttfb', 'read', 'parse'):
+            seconds = getattr(attempt, phase)
+            if seconds is not None:
+                self.add(phase, seconds)
+        if attempt.response_bytes is not None:
+            self.response_bytes = (self.response_bytes or 0) + attempt.response_bytes
+        attempt._merged_into = self
+
+    def phases(self) -> dict[str, float]:
+        """
+        Durations of phases which have happened.
+        """
+        return {phase: getattr(self, phase) for phase in self.PHASES if getattr(self, phase) is not None}
+
+    def __repr__(self) -> str:
+        return '<CallEvent {} {} status={} duration={}>'.format(self.endpoint, self.method, self.status, self.duration)
+
+
+class CallTracer:
+    """
+    Collects phase timings of endpoint calls and passes each finished call to hook (e.g. to export OpenTelemetry span).
+
+    Call starts with serialization of its arguments or with request, and is finished once its response
+    is deserialized (or request fails, or non-JSON response is read). JSON response which is not
+    deserialized (e.g. of endpoint returning nothing) is reported when the next call starts.
+    Phases are tied by context variable, so calls of concurrent threads and tasks do not mix up.
+    """
+
+    def __init__(self, hook: t.Callable[[CallEvent], None]):
+        """
+        :param hook: callable receiving each finished call (invoked synchronously, so it should be fast)
+        """
+        self.hook = hook
+        self._current: contextvars.ContextVar[CallEvent | None] = contextvars.ContextVar('api_call_event', default=None)
+
+    def measure(self, phase: str, func: t.Callable, *args, **kwargs) -> t.Any:
+        """
+        Call function, add its duration to phase of current call.
+        """
+        event = self._open_event()
+        started_at = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            event.add(phase, time.perf_counter() - started_at)
+
+    def start_request(self, endpoint: str, method: str, url: str, body: 'str | bytes | JsonArrayStream | None') -> CallEvent:
+        """
+        Request of current call is about to be sent.
+        """
+        event = self._open_event()
+        event.endpoint = endpoint
+        event.method = method.upper()
+        event.url = url
+        if isinstance(body, (str, bytes)):
+            event.request_bytes = len(body)
+        return event
+
+    def set_response(self, event: CallEvent, response: t.Any):
+        """
+        Request has succeeded, its response waits for deserializer (non-JSON one has been read already).
+        """
+        if isinstance(response, str):
+            self.finish(event)
+            return
+        event.responded = True
+        event.response = response
+
+    def take_event(self, raw_data: t.Any) -> CallEvent | None:
+        """
+        Call which response is about to be deserialized (None for other data, e.g. validated request payload).
+        """
+        event = self._current.get()
+        if event is None or not event.responded or event.response is not raw_data:
+            return None
+        # calls started while response is being deserialized (e.g. of other lazy iterators) get their own events
+        self._current.set(None)
+        event.response = None
+        return event
+
+    def trace_items(self, event: CallEvent, items: t.Iterator, many: bool, load: t.Callable | None = None) -> t.Iterator:
+        """
+        Yield deserialized items of call response, measure JSON parsing (except for read of response)
+        and construction of objects by loader (if given). Call is finished once all items are yielded,
+        single object is reported before it is returned.
+        """
+        read = event.read or 0.0
+        parse = construct = 0.0
+        count = 0
+        item = None
+        error = None
+        try:
+            while True:
+                started_at = time.perf_counter()
+                item = next(items, self)
+                parsed_at = time.perf_counter()
+                parse += parsed_at - started_at
+                if item is self:
+                    break
+                if load is not None:
+                    item = load(item)
+                    construct += time.perf_counter() - parsed_at
+                count += 1
+                if not many:
+                    break
+                yield item
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._finish_deserialization(event, parse - ((event.read or 0.0) - read), construct if load is not None else None, count, error)
+
+        if not many and count:
+            yield item
+
+    async def trace_items_async(self, event: CallEvent, items: t.AsyncIterator, load: t.Callable) -> t.AsyncIterator:
+        """
+        Yield objects of streamed call response (read and parsed item by item) as trace_items() does.
+        """
+        parse = construct = 0.0
+        count = 0
+        error = None
+        try:
+            while True:
+                started_at = time.perf_counter()
+                try:
+                    item = await items.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    parse += time.perf_counter() - started_at
+                parsed_at = time.perf_counter()
+                item = load(item)
+                construct += time.perf_counter() - parsed_at
+                count += 1
+                yield item
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._finish_deserialization(event, parse, construct, count, error)
+            # release response if caller stops early
+            await items.aclose()
+
+    def finish(self, event: CallEvent, error: Exception | None = None):
+        """
+        Report finished call to hook.
+        """
+        if self._current.get() is event:
+            self._current.set(None)
+        event.error = error
+        event.duration = time.perf_counter() - event.started_at
+        event.response = None
+        self.hook(event)
+
+    def _finish_deserialization(self, event: CallEvent, parse: float, construct: float | None, items: int, error: Exception | None):
+        event.add('parse', parse)
+        if construct is not None:
+            event.add('construct', construct)
+        event.items = items
+        self.finish(event, error)
+
+    def _open_event(self) -> CallEvent:
+        """
+        Event of current call, new one if there is no call in progress.
+        """
+        event = self._current.get()
+        if event is not None and event.responded:
+            # response of previous call has not been deserialized
+            self.finish(event)
+            event = None
+        if event is None:
+            event = CallEvent()
+            self._current.set(event)
+        return event
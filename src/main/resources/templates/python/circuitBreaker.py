@@ -0,0 +1,120 @@
+class CircuitOpenError(Exception):
+    """
+    Call is rejected without sending because the host keeps failing.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    Circuit of a host opens when the share of failed calls among the recent ones exceeds the threshold,
+    so further calls fail fast instead of waiting for timeouts and retries.
+    After cool-down a single probe call is let through (half-open state):
+    its success closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 50,
+        min_calls: int = 20,
+        cool_down: float = 30,
+    ):
+        """
+        :param failure_rate_threshold: share of failed calls (0..1) in the window which opens the circuit
+        :param window_size: number of recent calls of a host taken into account
+        :param min_calls: min number of calls in the window to evaluate failure rate
+        :param cool_down: seconds before the open circuit lets a probe call through
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.cool_down = cool_down
+
+        self._lock = threading.Lock()
+        self._circuits: dict[str, dict] = {}
+
+    def _get_circuit(self, host: str) -> dict:
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = dict(
+                state=self.CLOSED,
+                outcomes=collections.deque(maxlen=self.window_size),  # True for failed calls
+                opened_at=0.0,
+                rejected=0,
+            )
+        return circuit
+
+    def allow(self, host: str) -> bool:
+        """
+        Whether a call to the host may be sent now (should be followed by `record`).
+        """
+        with self._lock:
+            circuit = self._get_circuit(host)
+            if circuit['state'] == self.CLOSED:
+                return True
+
+            if time.monotonic() - circuit['opened_at'] >= self.cool_down:
+                # let a probe call through (and another one if the previous probe has not reported back in time)
+                circuit['state'] = self.HALF_OPEN
+                circuit['opened_at'] = time.monotonic()
+                return True
+
+            circuit['rejected'] += 1
+            return False
+
+    def record(self, host: str, error: Exception | None = None):
+        """
+        Report outcome of allowed call. Client errors (HTTP 4xx except 429) mean that the host is alive.
+        """
+        status = getattr(error, 'status', None)
+        if error is None or (status is not None and status < 500 and status != 429):
+            self.record_success(host)
+        else:
+            self.record_failure(host)
+
+    def record_success(self, host: str):
+        with self._lock:
+            circuit = self._get_circuit(host)
+            if circuit['state'] == self.HALF_OPEN:
+                circuit['state'] = self.CLOSED
+                circuit['outcomes'].clear()
+            circuit['outcomes'].append(False)
+
+    def record_failure(self, host: str):
+        with self._lock:
+            circuit = self._get_circuit(host)
+            outcomes = circuit['outcomes']
+            outcomes.append(True)
+
+            if circuit['state'] == self.HALF_OPEN:
+                # probe has failed
+                self._open(circuit)
+            elif circuit['state'] == self.CLOSED and len(outcomes) >= self.min_calls:
+                if sum(outcomes) / len(outcomes) >= self.failure_rate_threshold:
+                    self._open(circuit)
+
+    def _open(self, circuit: dict):
+        circuit['state'] = self.OPEN
+        circuit['opened_at'] = time.monotonic()
+
+    def get_state(self, host: str) -> str:
+        with self._lock:
+            return self._get_circuit(host)['state']
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                host: dict(
+                    state=circuit['state'],
+                    calls=len(circuit['outcomes']),
+                    failures=sum(circuit['outcomes']),
+                    rejected=circuit['rejected'],
+                )
+                for host, circuit in self._circuits.items()
+            }
@@ -0,0 +1,23 @@
+REQUEST_COMPRESSION_ENCODINGS = ('gzip', 'zstd')
+
+
+def compress_request_body(body: bytes, encoding: str) -> bytes:
+    """
+    Compress request body according to Content-Encoding.
+
+    >>> gzip.decompress(compress_request_body(b'{"foo": "bar"}', 'gzip'))
+    b'{"foo": "bar"}'
+    """
+    if encoding == 'gzip':
+        # fast level is enough for repetitive JSON
+        return gzip.compress(body, compresslevel=1)
+
+    if encoding == 'zstd':
+        try:
+            from compression import zstd  # python >= 3.14
+            return zstd.compress(body)
+        except ImportError:
+            import zstandard  # optional dependency
+            return zstandard.ZstdCompressor().compress(body)
+
+    raise ValueError(f'Unsupported request compression: {encoding}, expected one of {REQUEST_COMPRESSION_ENCODINGS}')
@@ -0,0 +1,114 @@
+class ConcurrencyLimiter:
+    """
+    Adaptive limit of concurrent requests (additive increase, multiplicative decrease).
+
+    Limit starts low and grows by one per window of responses while it is reached and latency
+    stays near the baseline (the lowest latency seen recently). It is cut by backoff ratio when server
+    is overloaded (429/503 response or timeout). Requests beyond the limit wait for a free slot.
+    """
+
+    SUCCESS = 'success'
+    OVERLOAD = 'overload'
+    FAILURE = 'failure'
+
+    OVERLOAD_STATUSES = (429, 503)
+
+    # weight of new latency sample in smoothed latency
+    LATENCY_SMOOTHING = 0.2
+    # weight of higher latency sample in baseline (so that it follows slower upstream eventually)
+    BASELINE_DRIFT = 0.01
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        tolerance: float = 2.0,
+        backoff_ratio: float = 0.5,
+    ):
+        """
+        :param initial_limit: number of concurrent requests allowed at start
+        :param min_limit: lowest limit kept while server is overloaded
+        :param max_limit: highest limit reached while latency is low
+        :param tolerance: max ratio of latency to baseline while limit grows
+        :param backoff_ratio: multiplier of limit when server is overloaded
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff_ratio = backoff_ratio
+
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._latency: float | None = None
+        self._baseline: float | None = None
+        self._decreased_at = 0.0
+        self._waits = 0
+        self._decreases = 0
+
+    def acquire(self) -> float:
+        """
+        Wait for a free slot (blocking), return start time of request to be passed to release().
+        """
+        with self._lock:
+            if not self._has_slot():
+                self._waits += 1
+                self._released.wait_for(self._has_slot)
+            self._in_flight += 1
+        return time.monotonic()
+
+    def release(self, started_at: float, outcome: str):
+        """
+        Free the slot of finished request and adjust limit according to its outcome (latency for success).
+        """
+        with self._lock:
+            self._in_flight -= 1
+            if outcome == self.SUCCESS:
+                self._on_success(time.monotonic() - started_at)
+            elif outcome == self.OVERLOAD and started_at >= self._decreased_at:
+                # requests sent before previous decrease do not cut limit again
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                self._decreased_at = time.monotonic()
+                self._decreases += 1
+            self._released.notify_all()
+
+    def get_outcome(self, exc: BaseException, is_timeout: bool = False) -> str:
+        """
+        Outcome of failed request by its error.
+        """
+        if is_timeout or getattr(exc, 'status', None) in self.OVERLOAD_STATUSES:
+            return self.OVERLOAD
+        return self.FAILURE
+
+    def _has_slot(self) -> bool:
+        return self._in_flight < int(self._limit)
+
+    def _on_success(self, latency: float):
+        if self._latency is None:
+            self._latency = self._baseline = latency
+        self._latency += (latency - self._latency) * self.LATENCY_SMOOTHING
+        self._baseline = latency if latency < self._baseline else self._baseline + (latency - self._baseline) * self.BASELINE_DRIFT
+
+        # idle slots tell nothing about higher concurrency
+        if self._in_flight + 1 >= int(self._limit) and self._get_gradient() * self.tolerance >= 1:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _get_gradient(self) -> float:
+        """
+        Ratio of baseline to current latency: 1 while server keeps up, lower when requests queue up.
+        """
+        return self._baseline / self._latency if self._latency else 1.0
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            return dict(
+                limit=round(self._limit, 2),
+                in_flight=self._in_flight,
+                gradient=round(self._get_gradient(), 3),
+                latency=round(self._latency or 0, 4),
+                baseline_latency=round(self._baseline or 0, 4),
+                waits=self._waits,
+                decreases=self._decreases,
+            )
@@ -0,0 +1,34 @@
+class AsyncConcurrencyLimiter(ConcurrencyLimiter):
+    """
+    Adaptive concurrency limit for coroutines: waiting for a free slot does not block event loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._waiters: list[asyncio.Future] = []
+
+    async def acquire_async(self) -> float:
+        """
+        Wait for a free slot, return start time of request to be passed to release().
+        """
+        waited = False
+        while True:
+            with self._lock:
+                if self._has_slot():
+                    self._in_flight += 1
+                    return time.monotonic()
+                if not waited:
+                    self._waits += 1
+                    waited = True
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+            await waiter
+
+    def release(self, started_at: float, outcome: str):
+        super().release(started_at, outcome)
+        # all waiters check for a free slot again (limit may have grown by more than one)
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
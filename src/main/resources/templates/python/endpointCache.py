@@ -0,0 +1,415 @@
+class EndpointCache:
+    """
+    Per-client store of results of cacheable endpoints.
+
+    Results expire after TTL (if specified for endpoint). Least recently used ones are evicted
+    when the number of entries or their approximate total size exceeds the limit.
+    Missing result is loaded by a single caller at once, others wait until it is stored.
+
+    In stale-while-revalidate mode (max_staleness > 0) expired result is returned immediately
+    while a single background refresh replaces it. Result older than max staleness is loaded by caller.
+
+    With shared backend results are kept (encoded) in it instead of memory, so that processes
+    using the same backend share stored results, their loading and refresh.
+    """
+
+    FRESH = 'fresh'
+    STALE = 'stale'
+    MISSING = 'missing'
+
+    LOCK_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_staleness: float = 0,
+        spawn: t.Callable[[t.Callable[[], None]], t.Any] | None = None,
+        backend: 'EndpointCacheBackend | None' = None,
+        lock_timeout: float = 10,
+    ):
+        """
+        :param max_entries: max number of stored results (in memory)
+        :param max_bytes: max approximate memory footprint of stored results
+        :param max_staleness: seconds after expiry while result is still returned (and refreshed in background)
+        :param spawn: runs background refresh (in a new daemon thread by default)
+        :param backend: shared store of results (e.g. between worker processes)
+        :param lock_timeout: max seconds to wait for result loaded by another caller
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_staleness = max_staleness
+        self._spawn = spawn or (lambda func: threading.Thread(target=func, daemon=True).start())
+        self.backend = backend
+        self.lock_timeout = lock_timeout
+
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[tuple[str, str], dict] = collections.OrderedDict()
+        # keys being loaded by this process along with callbacks waking up their waiters
+        self._loading: dict[tuple[str, str], list[t.Callable[[], None]]] = {}
+        self._size = 0
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._lock_waits = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+
+    def call(self, endpoint: str, load: t.Callable, *args, ttl: float | None = None) -> t.Any:
+        """
+        Return stored result of endpoint call with given arguments or load (and store) it.
+
+        :param endpoint: method name
+        :param load: performs actual call with given arguments
+        :param ttl: seconds before result expires (never if omitted)
+        """
+        key = self._make_key(endpoint, *args)
+        state, value = self._lookup(key)
+        if state == self.FRESH:
+            return value
+
+        if state == self.STALE:
+            if self._try_lock(key):
+                self._spawn(lambda: self._refresh(key, load, args, ttl))
+            return value
+
+        locked = self._try_lock(key)
+        if not locked:
+            self._count_lock_wait()
+            deadline = time.monotonic() + self.lock_timeout
+            while not locked:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    # lock holder is too slow (or has crashed), do not wait any longer
+                    return self._load(key, load, args, ttl)
+                self._wait_for_unlock(key, timeout)
+                locked = self._try_lock(key)
+
+        try:
+            # result may have been loaded by previous lock holder
+            state, value = self._lookup(key, count=False)
+            if state == self.FRESH:
+                return value
+            return self._load(key, load, args, ttl)
+        finally:
+            self._unlock(key)
+
+    def invalidate(self, endpoint: str | None = None):
+        """
+        Drop stored results of given endpoint (method name) or all of them.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if endpoint is None or key[0] == endpoint]:
+                self._remove(key)
+
+        if self.backend is not None:
+            self.backend.delete(f'{endpoint}:' if endpoint else '')
+
+    @classmethod
+    def _make_key(cls, endpoint: str, *args) -> tuple[str, str]:
+        """
+        Key of endpoint call: method name along with canonical JSON of arguments.
+
+        Arguments are compared by value and may be unhashable: keys of dicts are sorted, items of sets are ordered,
+        dataclasses and models are encoded as their fields, dates as ISO strings, enums as their values.
+        Other objects are encoded by repr(), so it should not depend on object identity.
+        Key is the same in every process, so results of shared backend are found by other clients.
+        """
+        try:
+            return endpoint, json.dumps(args, sort_keys=True, separators=(',', ':'), default=cls._encode_key_arg)
+        except (TypeError, ValueError):
+            # e.g. dict with keys of different types
+            return endpoint, repr(args)
+
+    @staticmethod
+    def _encode_key_arg(value: t.Any) -> t.Any:
+        if hasattr(value, 'model_dump'):
+            return value.model_dump(mode='json')
+        if hasattr(value, '__dataclass_fields__') or hasattr(value, '__struct_fields__'):
+            fields = getattr(value, '__struct_fields__', None) or value.__dataclass_fields__
+            return {name: getattr(value, name) for name in fields}
+        if isinstance(value, Enum):
+            return value.value
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        if isinstance(value, (set, frozenset)):
+            return sorted(value, key=repr)
+        if isinstance(value, bytes):
+            return value.hex()
+        return repr(value)
+
+    @staticmethod
+    def _get_backend_key(key: tuple[str, str]) -> str:
+        return '{}:{}'.format(key[0], hashlib.sha256(key[1].encode()).hexdigest())
+
+    def _get_state(self, expires_at: float | None, now: float) -> str:
+        if expires_at is None or now < expires_at:
+            return self.FRESH
+        if now < expires_at + self.max_staleness:
+            return self.STALE
+        return self.MISSING
+
+    def _lookup(self, key: tuple[str, str], count: bool = True) -> tuple[str, t.Any]:
+        if self.backend is not None:
+            stored = self.backend.get(self._get_backend_key(key))
+            state = self.MISSING if stored is None else self._get_state(stored[1], time.time())
+            value = pickle.loads(stored[0]) if state != self.MISSING else None
+            expired = stored is not None and state == self.MISSING
+        else:
+            with self._lock:
+                entry = self._entries.get(key)
+                state = self.MISSING if entry is None else self._get_state(entry['expires_at'], time.monotonic())
+                value = entry['value'] if state != self.MISSING else None
+                expired = entry is not None and state == self.MISSING
+                if expired:
+                    self._remove(key)
+                elif entry is not None:
+                    self._entries.move_to_end(key)
+
+        if count:
+            with self._lock:
+                self._expirations += expired
+                if state == self.FRESH:
+                    self._hits += 1
+                elif state == self.STALE:
+                    self._stale_hits += 1
+                else:
+                    self._misses += 1
+
+        return state, value
+
+    def _try_lock(self, key: tuple[str, str]) -> bool:
+        """
+        Whether caller should load result (no one else is loading it).
+        """
+        if self.backend is not None:
+            locked = self.backend.try_lock(self._get_backend_key(key), lease=self.lock_timeout)
+        with self._lock:
+            if self.backend is None:
+                locked = key not in self._loading
+            if locked:
+                self._loading.setdefault(key, [])
+        return locked
+
+    def _add_waiter(self, key: tuple[str, str], wake: t.Callable[[], None]) -> bool:
+        """
+        Call wake once key is unlocked, False if it is not locked by this process.
+        """
+        with self._lock:
+            waiters = self._loading.get(key)
+            if waiters is None:
+                return False
+            waiters.append(wake)
+            return True
+
+    def _wait_for_unlock(self, key: tuple[str, str], timeout: float):
+        if self.backend is not None:
+            # lock holder may be another process which can not wake us up, so backend is polled
+            timeout = min(timeout, self.LOCK_POLL_INTERVAL)
+        unlocked = threading.Event()
+        if self._add_waiter(key, unlocked.set):
+            unlocked.wait(timeout)
+        elif self.backend is not None:
+            time.sleep(timeout)
+
+    def _count_lock_wait(self):
+        with self._lock:
+            self._lock_waits += 1
+
+    def _unlock(self, key: tuple[str, str]):
+        if self.backend is not None:
+            self.backend.unlock(self._get_backend_key(key))
+        with self._lock:
+            waiters = self._loading.pop(key, [])
+        for wake in waiters:
+            wake()
+
+    def _load(self, key: tuple[str, str], load: t.Callable, args: tuple, ttl: float | None) -> t.Any:
+        value = load(*args)
+        self._store(key, value, ttl)
+        return value
+
+    def _refresh(self, key: tuple[str, str], load: t.Callable, args: tuple, ttl: float | None):
+        try:
+            self._load(key, load, args, ttl)
+        except Exception:
+            # stale result is kept until max staleness is exceeded
+            with self._lock:
+                self._refresh_failures += 1
+        else:
+            with self._lock:
+                self._refreshes += 1
+        finally:
+            self._unlock(key)
+
+    def _store(self, key: tuple[str, str], value: t.Any, ttl: float | None):
+        if self.backend is not None:
+            expires_at = None if ttl is None else time.time() + ttl
+            self.backend.set(
+                self._get_backend_key(key),
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                expires_at=expires_at,
+                keep_until=None if expires_at is None else expires_at + self.max_staleness,
+            )
+            return
+
+        size = self._get_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = dict(
+                value=value,
+                size=size,
+                expires_at=None if ttl is None else time.monotonic() + ttl,
+            )
+            self._size += size
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: tuple[str, str]):
+        self._size -= self._entries.pop(key)['size']
+
+    @staticmethod
+    def _get_size(value: t.Any) -> int:
+        """
+        Approximate memory footprint of value along with nested objects.
+        """
+        size = 0
+        seen = set()
+        stack = [value]
+        while stack:
+            item = stack.pop()
+            if id(item) in seen or isinstance(item, type):
+                continue
+            seen.add(id(item))
+            size += sys.getsizeof(item)
+
+            if isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            elif isinstance(item, (list, tuple, set, frozenset)):
+                stack.extend(item)
+            elif hasattr(item, '__dict__'):
+                stack.append(item.__dict__)
+            elif hasattr(item, '__slots__'):
+                stack.extend(getattr(item, name) for name in item.__slots__ if hasattr(item, name))
+
+        return size
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                stale_hits=self._stale_hits,
+                misses=self._misses,
+                lock_waits=self._lock_waits,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                refreshes=self._refreshes,
+                refresh_failures=self._refresh_failures,
+                entries=len(self._entries),
+                bytes=self._size,
+            )
+
+
+class EndpointCacheBackend:
+    """
+    Store of encoded results of cacheable endpoints shared between clients (e.g. worker processes of a host).
+    Subclass it to keep results elsewhere (e.g. in Redis).
+    """
+
+    def get(self, key: str) -> tuple[bytes, float | None] | None:
+        """
+        Encoded result along with its expiry time (unix timestamp, None if it never expires).
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, expires_at: float | None, keep_until: float | None):
+        """
+        :param keep_until: unix timestamp after which expired result may be deleted (never if None)
+        """
+        raise NotImplementedError
+
+    def delete(self, prefix: str):
+        """
+        Delete results with keys starting with prefix (all if it is empty).
+        """
+        raise NotImplementedError
+
+    def try_lock(self, key: str, lease: float) -> bool:
+        """
+        Acquire exclusive right to load result, it is released after lease seconds if holder has failed to unlock.
+        """
+        raise NotImplementedError
+
+    def unlock(self, key: str):
+        raise NotImplementedError
+
+
+class SqliteEndpointCacheBackend(EndpointCacheBackend):
+    """
+    Endpoint cache backend in SQLite database file shared by processes of a host.
+    Results are stored pickled, so the file must be writable by trusted processes only.
+    """
+
+    def __init__(self, path: str, namespace: str = '', timeout: float = 5):
+        """
+        :param path: database file (created if missing)
+        :param namespace: prefix of keys (for different APIs sharing the same file)
+        :param timeout: max seconds to wait for database lock held by another process
+        """
+        self.path = path
+        self.namespace = namespace
+        self.timeout = timeout
+        self._local = threading.local()
+
+        connection = self._get_connection()
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, keep_until REAL)')
+        connection.execute('CREATE INDEX IF NOT EXISTS results_keep_until ON results (keep_until)')
+        connection.execute('CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, locked_until REAL NOT NULL)')
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # connections are not shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        return connection
+
+    def get(self, key: str) -> tuple[bytes, float | None] | None:
+        return self._get_connection().execute(
+            'SELECT value, expires_at FROM results WHERE key = ?',
+            (self.namespace + key,),
+        ).fetchone()
+
+    def set(self, key: str, value: bytes, expires_at: float | None, keep_until: float | None):
+        connection = self._get_connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO results (key, value, expires_at, keep_until) VALUES (?, ?, ?, ?)',
+            (self.namespace + key, value, expires_at, keep_until),
+        )
+        connection.execute('DELETE FROM results WHERE keep_until < ?', (time.time(),))
+
+    def delete(self, prefix: str):
+        prefix = self.namespace + prefix
+        self._get_connection().execute('DELETE FROM results WHERE substr(key, 1, ?) = ?', (len(prefix), prefix))
+
+    def try_lock(self, key: str, lease: float) -> bool:
+        now = time.time()
+        cursor = self._get_connection().execute(
+            'INSERT INTO locks (key, locked_until) VALUES (?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET locked_until = excluded.locked_until WHERE locks.locked_until < ?',
+            (self.namespace + key, now + lease, now),
+        )
+        return cursor.rowcount == 1
+
+    def unlock(self, key: str):
+        self._get_connection().execute('DELETE FROM locks WHERE key = ?', (self.namespace + key,))
@@ -0,0 +1,85 @@
+class AsyncEndpointCache(EndpointCache):
+    """
+    Endpoint cache for coroutine endpoints, background refresh runs in a task of the current event loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    async def call_async(self, endpoint: str, load: t.Callable[..., t.Awaitable], *args, ttl: float | None = None) -> t.Any:
+        """
+        Return stored result of endpoint call with given arguments or load (and store) it.
+
+        :param endpoint: method name
+        :param load: coroutine function which performs actual call with given arguments
+        :param ttl: seconds before result expires (never if omitted)
+        """
+        key = self._make_key(endpoint, *args)
+        state, value = self._lookup(key)
+        if state == self.FRESH:
+            return value
+
+        if state == self.STALE:
+            if self._try_lock(key):
+                task = asyncio.ensure_future(self._refresh_async(key, load, args, ttl))
+                # keep reference until task is done
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return value
+
+        locked = self._try_lock(key)
+        if not locked:
+            self._count_lock_wait()
+            deadline = time.monotonic() + self.lock_timeout
+            while not locked:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    # lock holder is too slow (or has crashed), do not wait any longer
+                    return await self._load_async(key, load, args, ttl)
+                await self._wait_for_unlock_async(key, timeout)
+                locked = self._try_lock(key)
+
+        try:
+            # result may have been loaded by previous lock holder
+            state, value = self._lookup(key, count=False)
+            if state == self.FRESH:
+                return value
+            return await self._load_async(key, load, args, ttl)
+        finally:
+            self._unlock(key)
+
+    async def _wait_for_unlock_async(self, key: tuple[str, str], timeout: float):
+        if self.backend is not None:
+            # lock holder may be another process which can not wake us up, so backend is polled
+            timeout = min(timeout, self.LOCK_POLL_INTERVAL)
+        loop = asyncio.get_running_loop()
+        unlocked = loop.create_future()
+
+        def wake():
+            # lock holder may run in another thread (or event loop)
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(lambda: unlocked.done() or unlocked.set_result(None))
+
+        if self._add_waiter(key, wake):
+            await asyncio.wait([unlocked], timeout=timeout)
+        elif self.backend is not None:
+            await asyncio.sleep(timeout)
+
+    async def _load_async(self, key: tuple[str, str], load: t.Callable[..., t.Awaitable], args: tuple, ttl: float | None) -> t.Any:
+        value = await load(*args)
+        self._store(key, value, ttl)
+        return value
+
+    async def _refresh_async(self, key: tuple[str, str], load: t.Callable[..., t.Awaitable], args: tuple, ttl: float | None):
+        try:
+            await self._load_async(key, load, args, ttl)
+        except Exception:
+            # stale result is kept until max staleness is exceeded
+            with self._lock:
+                self._refresh_failures += 1
+        else:
+            with self._lock:
+                self._refreshes += 1
+        finally:
+            self._unlock(key)
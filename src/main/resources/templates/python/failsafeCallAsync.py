@@ -11,45 +11,44 @@ def _get_func_name_verbose(func: t.Callable) -> str:
 async def failsafe_call_async(
     func: t.Callable,
     exceptions: t.Iterable[t.Type[Exception]],
+    retry_policy: 'RetryPolicy',
     args=None,
     kwargs=None,
     logger: t.Union[logging.Logger, t.Callable[[str], None]] = None,
-    attempt=1,
-    max_attempts=10,
+    idempotent: bool = True,
     on_transitional_fail: t.Callable[[Exception, dict], t.Any] = None,
 ):
+    """
+    Call function and repeat the call on given exceptions while retry policy allows it.
+
+    :param on_transitional_fail: callback which is expected to wait for `info['delay']` seconds before next attempt
+    """
     args = args or tuple()
     kwargs = kwargs or dict()
     func_name_verbose = _get_func_name_verbose(func)
+    attempt = 1
 
-    try:
-        return await func(*args, **kwargs)
-    except exceptions as e:
-        if logger:
-            message = 'got %s on %s, attempt %d / %d' % (
-                e.__class__.__name__,
-                func_name_verbose,
-                attempt,
-                max_attempts
-            )
-            if hasattr(logger, 'warning'):
-                logger.warning(message)
-            else:
-                logger(message)
+    while True:
+        try:
+            return await func(*args, **kwargs)
+        except exceptions as e:
+            if logger:
+                message = 'got %s on %s, attempt %d / %d' % (
+                    e.__class__.__name__,
+                    func_name_verbose,
+                    attempt,
+                    retry_policy.max_attempts
+                )
+                if hasattr(logger, 'warning'):
+                    logger.warning(message)
+                else:
+                    logger(message)
 
-        if attempt >= max_attempts:
-            raise e from None   # suppress context and multiple tracebacks of same error
+            delay = retry_policy.get_delay(e, attempt, idempotent=idempotent)
+            if delay is None:
+                raise e from None   # suppress context and multiple tracebacks of same error
 
-        if on_transitional_fail:
-            await on_transitional_fail(e, dict(max_attempts=max_attempts, attempt=attempt))
+            if on_transitional_fail:
+                await on_transitional_fail(e, dict(max_attempts=retry_policy.max_attempts, attempt=attempt, delay=delay))
 
-        return await failsafe_call_async(
-            func,
-            exceptions,
-            args,
-            kwargs,
-            logger,
-            attempt + 1,
-            max_attempts,
-            on_transitional_fail
-        )
+            attempt += 1
@@ -0,0 +1,204 @@
+def _validation_error(key: str | int, message: str) -> marshmallow.ValidationError:
+    return marshmallow.ValidationError({key: [message]})
+
+
+def _not_null(value: t.Any, key: str | int, allow_none: bool) -> bool:
+    if value is not None:
+        return True
+    if allow_none:
+        return False
+    raise _validation_error(key, 'Field may not be null.')
+
+
+def check_input_mapping(data: t.Any):
+    """
+    Decoders counterpart of marshmallow schema input type check.
+    """
+    if not isinstance(data, t.Mapping):
+        raise _validation_error('_schema', 'Invalid input type.')
+
+
+def missing_field_error(error: KeyError) -> marshmallow.ValidationError:
+    return _validation_error(error.args[0], 'Missing data for required field.')
+
+
+def decode_str(value: t.Any, key: str | int, allow_none: bool = False) -> str | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            raise _validation_error(key, 'Not a valid utf-8 string.')
+    raise _validation_error(key, 'Not a valid string.')
+
+
+def decode_enum(value: t.Any, key: str | int, enum_class: t.Type, allow_none: bool = False) -> t.Any:
+    value = decode_str(value, key, allow_none)
+    if value is None:
+        return None
+    try:
+        return enum_class(value)
+    except ValueError:
+        raise _validation_error(key, 'Must be one of: {}.'.format(', '.join(map(str, enum_class))))
+
+
+def decode_int(value: t.Any, key: str | int, allow_none: bool = False) -> int | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    if value is True or value is False:
+        raise _validation_error(key, 'Not a valid integer.')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise _validation_error(key, 'Not a valid integer.')
+    except OverflowError:
+        raise _validation_error(key, 'Number too large.')
+
+
+def decode_float(value: t.Any, key: str | int, allow_none: bool = False) -> float | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    if value is True or value is False:
+        raise _validation_error(key, 'Not a valid number.')
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise _validation_error(key, 'Not a valid number.')
+    except OverflowError:
+        raise _validation_error(key, 'Number too large.')
+    if value != value or value in (float('inf'), float('-inf')):
+        raise _validation_error(key, 'Special numeric values (nan or infinity) are not permitted.')
+    return value
+
+
+def decode_decimal(value: t.Any, key: str | int, allow_none: bool = False) -> 'Decimal | None':
+    if not _not_null(value, key, allow_none):
+        return None
+    if value is True or value is False:
+        raise _validation_error(key, 'Not a valid number.')
+    try:
+        value = Decimal(str(value))
+    except ArithmeticError:
+        raise _validation_error(key, 'Not a valid number.')
+    if not value.is_finite():
+        raise _validation_error(key, 'Special numeric values (nan or infinity) are not permitted.')
+    return value
+
+
+def decode_bool(value: t.Any, key: str | int, allow_none: bool = False) -> bool | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    try:
+        if value in marshmallow.fields.Boolean.truthy:
+            return True
+        if value in marshmallow.fields.Boolean.falsy:
+            return False
+    except TypeError:
+        pass
+    raise _validation_error(key, 'Not a valid boolean.')
+
+
+def decode_datetime(value: t.Any, key: str | int, allow_none: bool = False) -> 'datetime | None':
+    if not _not_null(value, key, allow_none):
+        return None
+    try:
+        return marshmallow.fields.DateTime.DESERIALIZATION_FUNCS['iso'](value)
+    except (TypeError, AttributeError, ValueError):
+        raise _validation_error(key, 'Not a valid datetime.')
+
+
+def decode_java_duration(value: t.Any, key: str | int, allow_none: bool = False) -> 'timedelta | None':
+    if not _not_null(value, key, allow_none):
+        return None
+    try:
+        return str_java_duration_to_timedelta(value)
+    except ValueError as error:
+        raise _validation_error(key, str(error))
+
+
+def decode_dict(value: t.Any, key: str | int, allow_none: bool = False) -> dict | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    if not isinstance(value, t.Mapping):
+        raise _validation_error(key, 'Not a valid mapping type.')
+    return dict(value)
+
+
+def decode_nested(value: t.Any, key: str | int, data_class: t.Type, allow_none: bool = False) -> t.Any:
+    if not _not_null(value, key, allow_none):
+        return None
+    try:
+        return data_class.from_dict(value)
+    except marshmallow.ValidationError as error:
+        raise marshmallow.ValidationError({key: error.messages})
+
+
+def decode_list(value: t.Any, key: str | int, decode_item: t.Callable, *args, allow_none: bool = False) -> list | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    if not marshmallow.utils.is_collection(value):
+        raise _validation_error(key, 'Not a valid list.')
+    try:
+        return [decode_item(item, index, *args) for index, item in enumerate(value)]
+    except marshmallow.ValidationError as error:
+        raise marshmallow.ValidationError({key: error.messages})
+
+
+def encode_value(value: t.Any) -> t.Any:
+    return value
+
+
+def encode_str(value: t.Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def encode_int(value: t.Any) -> int | None:
+    return None if value is None else int(value)
+
+
+def encode_float(value: t.Any) -> float | None:
+    return None if value is None else float(value)
+
+
+def encode_bool(value: t.Any) -> bool | None:
+    if value is None:
+        return None
+    try:
+        if value in marshmallow.fields.Boolean.truthy:
+            return True
+        if value in marshmallow.fields.Boolean.falsy:
+            return False
+    except TypeError:
+        pass
+    return bool(value)
+
+
+def encode_datetime(value: 'datetime | None') -> str | None:
+    if value is None:
+        return None
+    # use ISO format: YYYY-MM-DDTHH:mm:ss[.ms]Z
+    value = value.astimezone(timezone.utc).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def encode_java_duration(value: 'timedelta | None') -> str | None:
+    if value is None:
+        return None
+    return timedelta_to_java_duration(value) if value else "PT0S"
+
+
+def encode_dict(value: t.Any) -> dict | None:
+    return None if value is None else dict(value)
+
+
+def encode_nested(value: t.Any) -> dict | None:
+    return None if value is None else value.to_dict()
+
+
+def encode_list(value: t.Any, encode_item: t.Callable) -> list | None:
+    return None if value is None else [encode_item(item) for item in value]
@@ -0,0 +1,67 @@
+async def gather_concurrently(
+    func: t.Callable[..., t.Any],
+    kwargs_iter: t.Iterable[dict[str, t.Any]] | t.AsyncIterable[dict[str, t.Any]],
+    concurrency: int,
+    ordered: bool = True,
+    return_exceptions: bool = True,
+) -> t.AsyncIterator[tuple[dict[str, t.Any], t.Any]]:
+    """
+    Await func(**kwargs) in tasks for each item of kwargs_iter, yield (kwargs, result) pairs.
+    Arguments are consumed lazily, no more than `concurrency` tasks run at once.
+
+    :param ordered: yield results in order of arguments (otherwise as soon as calls complete)
+    :param return_exceptions: yield exception of failed call as its result (other calls go on), otherwise raise it and cancel calls in progress
+    """
+    async def call(kwargs: dict[str, t.Any]) -> t.Any:
+        result = func(**kwargs)
+        if isinstance(result, t.AsyncIterator):
+            # streamed results are read in task as well
+            return [item async for item in result]
+        return await result
+
+    async def iterate() -> t.AsyncIterator[dict[str, t.Any]]:
+        if isinstance(kwargs_iter, t.AsyncIterable):
+            async for kwargs in kwargs_iter:
+                yield kwargs
+        else:
+            for kwargs in kwargs_iter:
+                yield kwargs
+
+    kwargs_aiter = iterate()
+    exhausted = False
+    pending: list[tuple[dict[str, t.Any], asyncio.Task]] = []
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                kwargs = await anext(kwargs_aiter, None)
+                if kwargs is None:
+                    exhausted = True
+                else:
+                    pending.append((kwargs, asyncio.ensure_future(call(kwargs))))
+            if not pending:
+                return
+
+            awaited = [pending[0][1]] if ordered else [task for _, task in pending]
+            await asyncio.wait(awaited, return_when=asyncio.FIRST_COMPLETED)
+
+            if ordered:
+                finished = []
+                while pending and pending[0][1].done():
+                    finished.append(pending.pop(0))
+            else:
+                done = [task.done() for _, task in pending]
+                finished = [item for item, is_done in zip(pending, done) if is_done]
+                pending = [item for item, is_done in zip(pending, done) if not is_done]
+
+            for kwargs, task in finished:
+                error = task.exception()
+                if error is None:
+                    yield kwargs, task.result()
+                elif return_exceptions:
+                    yield kwargs, error
+                else:
+                    raise error
+    finally:
+        # calls in progress are dropped (e.g. on error or when caller stops iteration)
+        for _, task in pending:
+            task.cancel()
@@ -0,0 +1,77 @@
+class HedgePolicy:
+    """
+    Decides when to hedge request: send second identical one if response has not arrived within rolling
+    percentile of recent latencies of endpoint. Extra load is capped by budget (percent of requests).
+    """
+
+    # max number of hedges sent at once after a period of fast responses
+    MAX_BUDGET = 10
+
+    def __init__(self, percentile: float = 95, budget_percent: float = 10, window: int = 100, min_samples: int = 20):
+        """
+        :param percentile: percentile of recent latencies of endpoint after which request is hedged
+        :param budget_percent: max number of hedges, percent of hedgeable requests
+        :param window: number of recent latencies kept per endpoint
+        :param min_samples: number of latencies of endpoint needed before its requests are hedged
+        """
+        self.percentile = percentile
+        self.budget_percent = budget_percent
+        self.window = window
+        self.min_samples = min_samples
+
+        self._lock = threading.Lock()
+        self._latencies: dict[str, collections.deque[float]] = {}
+        self._budget = 0.0
+        self._requests = 0
+        self._hedges = 0
+        self._hedges_won = 0
+
+    def get_delay(self, endpoint: str) -> float | None:
+        """
+        Count request of endpoint, return seconds after which it is hedged (None while latency is not known).
+        """
+        with self._lock:
+            self._requests += 1
+            self._budget = min(self.MAX_BUDGET, self._budget + self.budget_percent / 100)
+
+            latencies = self._latencies.get(endpoint)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+
+    def try_hedge(self) -> bool:
+        """
+        Whether hedge may be sent (budget allows it).
+        """
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            self._hedges += 1
+            return True
+
+    def record(self, endpoint: str, latency: float):
+        """
+        Save latency of successful request of endpoint.
+        """
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = collections.deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def count_win(self):
+        """
+        Hedge has responded before original request.
+        """
+        with self._lock:
+            self._hedges_won += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                requests=self._requests,
+                hedges=self._hedges,
+                hedges_won=self._hedges_won,
+            )
@@ -0,0 +1,151 @@
+class HttpCache:
+    """
+    Bounded store of JSON responses of GET requests along with their validators (ETag, Last-Modified).
+
+    Stored responses are revalidated by conditional requests, so unchanged body is not downloaded again
+    (304 Not Modified). Bodies are kept in memory or in files of given directory (which survive restarts);
+    least recently used ones are evicted when total size exceeds the limit.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, directory: str | None = None, reuse_objects: bool = False):
+        """
+        :param max_bytes: max total size of stored bodies
+        :param directory: path to store bodies on disk instead of memory
+        :param reuse_objects: return the same deserialized objects while response is not modified (they must not be changed by caller)
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.reuse_objects = reuse_objects
+
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[str, dict] = collections.OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._load_entries()
+
+    def accepts(self, headers: t.Mapping[str, str]) -> bool:
+        """
+        Whether response with given headers may be stored.
+        """
+        content_length = headers.get('content-length')
+        return (
+            'json' in headers.get('content-type', '')
+            and bool(headers.get('etag') or headers.get('last-modified'))
+            and (content_length is None or int(content_length) <= self.max_bytes)
+        )
+
+    def lookup(self, url: str) -> dict | None:
+        with self._lock:
+            return self._entries.get(url)
+
+    @staticmethod
+    def get_conditional_headers(entry: dict) -> dict[str, str]:
+        headers = {}
+        if entry['etag']:
+            headers['if-none-match'] = entry['etag']
+        if entry['last_modified']:
+            headers['if-modified-since'] = entry['last_modified']
+        return headers
+
+    def replay(self, entry: dict) -> CachedResponse | None:
+        """
+        Stored body of response which is not modified (or None if it has been lost).
+        """
+        body = entry['body']
+        if body is None:
+            try:
+                with open(self._get_path(entry['url'], '.body'), 'rb') as f:
+                    body = f.read()
+            except FileNotFoundError:
+                return None
+
+        with self._lock:
+            if entry['url'] in self._entries:
+                self._entries.move_to_end(entry['url'])
+            self._hits += 1
+
+        return CachedResponse(body, entry['cached_objects'])
+
+    def store(self, url: str, headers: t.Mapping[str, str], body: bytes) -> CachedResponse:
+        """
+        Save downloaded response (if it fits), return its body for deserialization.
+        """
+        entry = dict(
+            url=url,
+            etag=headers.get('etag'),
+            last_modified=headers.get('last-modified'),
+            size=len(body),
+            body=None if self.directory else body,
+            cached_objects={} if self.reuse_objects else None,
+        )
+
+        if entry['size'] <= self.max_bytes:
+            if self.directory is not None:
+                self._write_entry(entry, body)
+
+            with self._lock:
+                previous = self._entries.pop(url, None)
+                if previous is not None:
+                    self._size -= previous['size']
+                self._entries[url] = entry
+                self._size += entry['size']
+                self._evict()
+
+        with self._lock:
+            self._misses += 1
+
+        return CachedResponse(body, entry['cached_objects'])
+
+    def clear(self):
+        with self._lock:
+            while self._entries:
+                self._remove(self._entries.popitem(last=False)[1])
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._size,
+            )
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            self._remove(self._entries.popitem(last=False)[1])
+            self._evictions += 1
+
+    def _remove(self, entry: dict):
+        self._size -= entry['size']
+        if self.directory is not None:
+            for suffix in ('.meta', '.body'):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self._get_path(entry['url'], suffix))
+
+    def _get_path(self, url: str, suffix: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest() + suffix)
+
+    def _write_entry(self, entry: dict, body: bytes):
+        meta = {key: entry[key] for key in ('url', 'etag', 'last_modified', 'size')}
+        # write atomically, body first (entry without meta file is ignored)
+        for suffix, data in (('.body', body), ('.meta', json.dumps(meta).encode())):
+            path = self._get_path(entry['url'], suffix)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(path + '.tmp', path)
+
+    def _load_entries(self):
+        meta_paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.meta')]
+        for path in sorted(meta_paths, key=os.path.getmtime):
+            with open(path, 'rb') as f:
+                meta = json.loads(f.read())
+            entry = dict(meta, body=None, cached_objects={} if self.reuse_objects else None)
+            self._entries[entry['url']] = entry
+            self._size += entry['size']
+        self._evict()
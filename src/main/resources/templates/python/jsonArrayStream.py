@@ -0,0 +1,39 @@
+class JsonArrayStream:
+    """
+    Request payload which is encoded into JSON array item by item while being sent (chunked transfer encoding),
+    so sequence of any length (or one-off iterator) takes constant memory.
+
+    >>> b''.join(JsonArrayStream([1, 2, 3], encode=lambda item: str(item).encode()))
+    b'[1,2,3]'
+    """
+
+    # encoded items are sent in chunks of about this size (bytes)
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, items: t.Iterable[t.Any], encode: t.Callable[[t.Any], bytes]):
+        self._items = items
+        self._encode = encode
+
+    @property
+    def replayable(self) -> bool:
+        """
+        Whether payload can be sent again (e.g. on retry), which is not the case for iterators.
+        """
+        return not isinstance(self._items, t.Iterator)
+
+    def __iter__(self) -> t.Iterator[bytes]:
+        chunk = bytearray(b'[')
+        for index, item in enumerate(self._items):
+            if index:
+                chunk += b','
+            chunk += self._encode(item)
+            if len(chunk) >= self.CHUNK_SIZE:
+                yield bytes(chunk)
+                chunk.clear()
+
+        chunk += b']'
+        yield bytes(chunk)
+
+    async def __aiter__(self) -> t.AsyncIterator[bytes]:
+        for chunk in self:
+            yield chunk
@@ -0,0 +1,62 @@
+class JsonCodec:
+    """
+    JSON encoder and decoder working with bytes, backed by the fastest installed library (orjson, ujson or stdlib json).
+    Streaming parser is ijson (optional, required for response streaming only) with its fastest available backend.
+
+    >>> JsonCodec('json').dumps({'foo': [1, 2]})
+    b'{"foo": [1, 2]}'
+    >>> JsonCodec('json').loads(b'{"foo": [1, 2]}')
+    {'foo': [1, 2]}
+    """
+
+    BACKENDS = ('orjson', 'ujson', 'json')
+
+    def __init__(self, backend: str | None = None, streaming_backend: str | None = None):
+        """
+        :param backend: one of BACKENDS (auto-selected if omitted)
+        :param streaming_backend: ijson backend name, e.g. yajl2_c or python (the fastest compiled one if omitted)
+        """
+        self.backend = backend or next(name for name in self.BACKENDS if importlib.util.find_spec(name) is not None)
+        if self.backend == 'orjson':
+            import orjson  # optional dependency
+            self.dumps = orjson.dumps
+            self.loads = orjson.loads
+        elif self.backend == 'ujson':
+            import ujson  # optional dependency
+            self.dumps = lambda value: ujson.dumps(value, ensure_ascii=False, escape_forward_slashes=False).encode('utf8')
+            self.loads = ujson.loads
+        elif self.backend == 'json':
+            self.dumps = lambda value: json.dumps(value).encode('utf8')
+            self.loads = json.loads
+        else:
+            raise ValueError(f'Unsupported JSON backend: {self.backend}, expected one of {self.BACKENDS}')
+
+        self.streaming_backend = streaming_backend
+
+    @property
+    def _ijson(self) -> t.Any:
+        import ijson  # optional dependency
+        return ijson.get_backend(self.streaming_backend) if self.streaming_backend else ijson
+
+    def items(self, file: t.Any) -> t.Iterator[t.Any]:
+        """
+        Parse items of JSON array one by one while reading file-like object.
+        """
+        return self._ijson.items(file, 'item', use_float=True)
+
+    def items_async(self, file: t.Any) -> t.AsyncIterator[t.Any]:
+        """
+        Parse items of JSON array one by one while reading async file-like object.
+        """
+        return self._ijson.items_async(file, 'item', use_float=True)
+
+    def stats(self) -> dict[str, str | None]:
+        try:
+            streaming_backend = self._ijson.backend
+        except ImportError:
+            streaming_backend = None
+
+        return dict(
+            backend=self.backend,
+            streaming_backend=streaming_backend,
+        )
@@ -0,0 +1,53 @@
+def map_concurrently(
+    func: t.Callable[..., t.Any],
+    kwargs_iter: t.Iterable[dict[str, t.Any]],
+    executor: concurrent.futures.Executor,
+    max_workers: int,
+    ordered: bool = True,
+    return_exceptions: bool = True,
+) -> t.Iterator[tuple[dict[str, t.Any], t.Any]]:
+    """
+    Call func(**kwargs) in executor for each item of kwargs_iter, yield (kwargs, result) pairs.
+    Arguments are consumed lazily, no more than max_workers calls are submitted at once.
+
+    :param ordered: yield results in order of arguments (otherwise as soon as calls complete)
+    :param return_exceptions: yield exception of failed call as its result (other calls go on), otherwise raise it and drop calls not started yet
+    """
+    def call(kwargs: dict[str, t.Any]) -> t.Any:
+        result = func(**kwargs)
+        # streamed results are read in worker thread as well
+        return list(result) if isinstance(result, t.Iterator) else result
+
+    kwargs_iter = iter(kwargs_iter)
+    pending: list[tuple[dict[str, t.Any], concurrent.futures.Future]] = []
+    try:
+        while True:
+            for kwargs in itertools.islice(kwargs_iter, max(max_workers - len(pending), 0)):
+                pending.append((kwargs, executor.submit(call, kwargs)))
+            if not pending:
+                return
+
+            awaited = [pending[0][1]] if ordered else [future for _, future in pending]
+            concurrent.futures.wait(awaited, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            if ordered:
+                finished = []
+                while pending and pending[0][1].done():
+                    finished.append(pending.pop(0))
+            else:
+                done = [future.done() for _, future in pending]
+                finished = [item for item, is_done in zip(pending, done) if is_done]
+                pending = [item for item, is_done in zip(pending, done) if not is_done]
+
+            for kwargs, future in finished:
+                error = future.exception()
+                if error is None:
+                    yield kwargs, future.result()
+                elif return_exceptions:
+                    yield kwargs, error
+                else:
+                    raise error
+    finally:
+        # calls not started yet are dropped (e.g. on error or when caller stops iteration)
+        for _, future in pending:
+            future.cancel()
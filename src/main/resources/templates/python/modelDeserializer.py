@@ -0,0 +1,44 @@
+class ModelDeserializer(BaseDeserializer):
+    """
+    Deserializer of classes which model library decodes from JSON in one native call, so streaming is not used
+    and objects are constructed while JSON is decoded (including nested objects, enums and dates).
+    """
+
+    # dates are decoded by model library
+    _deserialize_datetime = None
+
+    # feature: call_tracing
+    def _deserialize_traced(self, event: 'CallEvent', raw_data: RESPONSE_BODY, data_class: t.Type | None, many: bool) -> t.Iterator[t.Any]:
+        # nested call is not traced since event has been taken
+        return self._tracer.trace_items(event, self.deserialize(raw_data, data_class, many=many), many)
+    # end feature
+
+    def _load_items(self, raw_data: RESPONSE_BODY, data_class: t.Type | None, many: bool) -> t.Iterator[t.Any]:
+        if hasattr(raw_data, 'read'):
+            raw_data = raw_data.read()
+        elif isinstance(raw_data, str):
+            # non-JSON response
+            if raw_data == '':
+                # blank response means null
+                yield None
+            elif data_class is None:
+                yield raw_data
+            else:
+                yield self._schema_registry.convert(raw_data, data_class)
+            return
+
+        # pick built-in deserializer if specified for class
+        method = getattr(self, '_deserialize_{type}'.format(type=getattr(data_class, '__name__', '').lower()), None)
+        if method is not None:
+            decoded = self._schema_registry.decode(raw_data, None, many=many)
+            if many:
+                yield from map(method, decoded)
+            else:
+                yield method(decoded)
+            return
+
+        decoded = self._schema_registry.decode(raw_data, data_class, many=many)
+        if many:
+            yield from decoded
+        else:
+            yield decoded
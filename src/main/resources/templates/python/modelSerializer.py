@@ -0,0 +1,17 @@
+class ModelSerializer(BaseSerializer):
+    """
+    Serializer of classes which model library encodes into JSON bytes at once (including nested objects, enums and dates).
+    """
+
+    def _serialize_model(self, value: t.Any, _type: t.Type, many: bool, is_payload: bool) -> 'JSON_PAYLOAD | bytes | None':
+        if is_payload and value is not None:
+            serialized_data = self._schema_registry.encode(value, _type, many=many)
+            if self._use_request_payload_validation and self._schema_registry.is_model(_type):
+                self._validate(serialized_data, _type, many)
+            return serialized_data
+
+        if self._schema_registry.is_model(_type) and not many:
+            # e.g. query parameter
+            return self._schema_registry.encode(value, _type).decode()
+
+        return None
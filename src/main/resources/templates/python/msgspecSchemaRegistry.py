@@ -0,0 +1,27 @@
+class SchemaRegistry(BaseSchemaRegistry):
+    """
+    Cache of msgspec JSON decoders, built once per type (single object or list of objects).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._encoder = msgspec.json.Encoder()
+
+    def get(self, data_class: t.Type | None, many: bool = False) -> msgspec.json.Decoder:
+        return super().get(data_class, many)
+
+    def _build(self, data_class: t.Type | None, many: bool) -> msgspec.json.Decoder:
+        data_type = t.Any if data_class is None else data_class
+        return msgspec.json.Decoder(list[data_type] if many else data_type)
+
+    def is_model(self, value: t.Any) -> bool:
+        return isinstance(value, type) and issubclass(value, msgspec.Struct)
+
+    def encode(self, value: t.Any, data_class: t.Type, many: bool = False) -> bytes:
+        return self._encoder.encode(value)
+
+    def decode(self, raw: bytes, data_class: t.Type | None, many: bool = False) -> t.Any:
+        return self.get(data_class, many=many).decode(raw)
+
+    def convert(self, value: t.Any, data_class: t.Type) -> t.Any:
+        return msgspec.convert(value, data_class, strict=False)
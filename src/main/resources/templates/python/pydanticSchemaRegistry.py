@@ -0,0 +1,23 @@
+class SchemaRegistry(BaseSchemaRegistry):
+    """
+    Cache of pydantic type adapters, built once per type (single object or list of objects).
+    """
+
+    def get(self, data_class: t.Type | None, many: bool = False) -> pydantic.TypeAdapter:
+        return super().get(data_class, many)
+
+    def _build(self, data_class: t.Type | None, many: bool) -> pydantic.TypeAdapter:
+        data_type = t.Any if data_class is None else data_class
+        return pydantic.TypeAdapter(list[data_type] if many else data_type)
+
+    def is_model(self, value: t.Any) -> bool:
+        return isinstance(value, type) and issubclass(value, pydantic.BaseModel)
+
+    def encode(self, value: t.Any, data_class: t.Type, many: bool = False) -> bytes:
+        return self.get(data_class, many=many).dump_json(list(value) if many else value, by_alias=True, warnings=False)
+
+    def decode(self, raw: bytes, data_class: t.Type | None, many: bool = False) -> t.Any:
+        return self.get(data_class, many=many).validate_json(raw)
+
+    def convert(self, value: t.Any, data_class: t.Type) -> t.Any:
+        return self.get(data_class).validate_python(value)
@@ -0,0 +1,50 @@
+class RateLimiter:
+    """
+    Token bucket which limits average rate of requests while allowing short bursts.
+
+    Each request takes a token, tokens are refilled at constant rate up to burst size.
+    Missing token is reserved in advance, so callers are served in order of arrival and wait
+    for their turn outside of the lock (in a thread, coroutine or greenlet, whatever caller is).
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        :param rate: average number of requests per second
+        :param burst: max number of requests sent at once after idle period
+        """
+        if rate <= 0:
+            raise ValueError(f'Rate limit must be positive, got {rate}')
+        self.rate = rate
+        self.burst = max(1, burst)
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._requests = 0
+        self._delayed = 0
+        self._wait_seconds = 0.0
+
+    def reserve(self) -> float:
+        """
+        Take a token, return seconds to wait before request may be sent.
+        """
+        with self._lock:
+            now = time.monotonic()
+            # negative balance stands for tokens reserved by waiting callers
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate) - 1
+            self._updated_at = now
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            self._requests += 1
+            if delay:
+                self._delayed += 1
+                self._wait_seconds += delay
+            return delay
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            return dict(
+                requests=self._requests,
+                delayed=self._delayed,
+                wait_seconds=round(self._wait_seconds, 3),
+            )
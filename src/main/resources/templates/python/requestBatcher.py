@@ -0,0 +1,85 @@
+class RequestBatcher:
+    """
+    Collects concurrent calls of single-item endpoint into batches sent as one call of its bulk counterpart.
+    Batch is sent when it is full or when its first call has waited for max delay,
+    results of bulk call are split back to callers by position.
+    """
+
+    def __init__(self, max_size: int = 100, max_delay: float = 0.005):
+        """
+        :param max_size: max number of items in batch (1 disables batching)
+        :param max_delay: max seconds to wait for other calls before batch is sent
+        """
+        self.max_size = max_size
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._batches: dict[str, dict] = {}
+        self._calls = 0
+        self._requests = 0
+
+    def call(self, endpoint: str, load_many: t.Callable[[list], t.Iterable], item: t.Any) -> t.Any:
+        """
+        Return result of bulk call for given item.
+
+        :param endpoint: method name
+        :param load_many: bulk endpoint, takes list of items and returns their results in the same order
+        """
+        if self.max_size <= 1:
+            return self._load(load_many, [item])[0]
+
+        with self._lock:
+            batch = self._batches.get(endpoint)
+            leader = batch is None
+            if leader:
+                # first caller sends the batch
+                batch = self._batches[endpoint] = dict(items=[], full=threading.Event(), done=threading.Event(), results=None, error=None)
+            index = len(batch['items'])
+            batch['items'].append(item)
+            if len(batch['items']) >= self.max_size:
+                self._close(endpoint, batch)
+
+        if not leader:
+            batch['done'].wait()
+        else:
+            batch['full'].wait(self.max_delay)
+            with self._lock:
+                self._close(endpoint, batch)
+            try:
+                batch['results'] = self._load(load_many, batch['items'])
+            except BaseException as e:
+                batch['error'] = e
+            batch['done'].set()
+
+        if batch['error'] is not None:
+            raise batch['error']
+        return batch['results'][index]
+
+    def _close(self, endpoint: str, batch: dict):
+        """
+        Stop collecting items into batch (callers coming next start a new one).
+        """
+        if self._batches.get(endpoint) is batch:
+            del self._batches[endpoint]
+            batch['full'].set()
+
+    def _load(self, load_many: t.Callable[[list], t.Iterable], items: list) -> list:
+        results = list(load_many(items))
+        return self._check_results(items, results)
+
+    def _check_results(self, items: list, results: list) -> list:
+        if len(results) != len(items):
+            raise ValueError(f'Bulk call returned {len(results)} results for {len(items)} items')
+
+        with self._lock:
+            self._calls += len(items)
+            self._requests += 1
+        return results
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                calls=self._calls,
+                requests=self._requests,
+                pending=sum(len(batch['items']) for batch in self._batches.values()),
+            )
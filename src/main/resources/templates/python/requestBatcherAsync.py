@@ -0,0 +1,68 @@
+class AsyncRequestBatcher(RequestBatcher):
+    """
+    Request batcher for coroutine endpoints, batches are sent by tasks of the current event loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tasks: set[asyncio.Task] = set()
+
+    async def call_async(self, endpoint: str, load_many: t.Callable[[list], t.AsyncIterable], item: t.Any) -> t.Any:
+        """
+        Return result of bulk call for given item.
+
+        :param endpoint: method name
+        :param load_many: bulk endpoint, takes list of items and returns their results in the same order
+        """
+        if self.max_size <= 1:
+            return (await self._load_async(load_many, [item]))[0]
+
+        loop = asyncio.get_running_loop()
+        # futures are bound to event loop, so coroutines of different loops do not share batches
+        key = f'{id(loop)} {endpoint}'
+        future = loop.create_future()
+        with self._lock:
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = dict(items=[], futures=[])
+                batch['timer'] = loop.call_later(self.max_delay, self._send, key, batch, load_many)
+            batch['items'].append(item)
+            batch['futures'].append(future)
+            full = len(batch['items']) >= self.max_size
+
+        if full:
+            batch['timer'].cancel()
+            self._send(key, batch, load_many)
+        return await future
+
+    def _send(self, key: str, batch: dict, load_many: t.Callable[[list], t.AsyncIterable]):
+        with self._lock:
+            if self._batches.get(key) is not batch:
+                # already sent
+                return
+            del self._batches[key]
+
+        task = asyncio.ensure_future(self._resolve(batch, load_many))
+        # keep reference until task is done
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: dict, load_many: t.Callable[[list], t.AsyncIterable]):
+        error: Exception = RuntimeError('Bulk call has been cancelled')
+        try:
+            results = await self._load_async(load_many, batch['items'])
+            for future, result in zip(batch['futures'], results):
+                # skip callers which have been cancelled
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            error = e
+        finally:
+            # callers must not wait forever, even if this task is cancelled
+            for future in batch['futures']:
+                if not future.done():
+                    future.set_exception(error)
+
+    async def _load_async(self, load_many: t.Callable[[list], t.AsyncIterable], items: list) -> list:
+        results = [result async for result in load_many(items)]
+        return self._check_results(items, results)
@@ -0,0 +1,121 @@
+class RetryPolicy:
+    """
+    Decides whether failed call should be repeated and how long to wait before next attempt.
+
+    Uses exponential backoff with full jitter and a retry budget (token bucket) shared by all calls of the client,
+    so that retries of many concurrent calls are spread in time and limited during outages.
+    Non-idempotent requests (e.g. POST) are repeated only if the server declined them (429, 503).
+    Delay from 'Retry-After' response header is respected.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'TRACE', 'PUT', 'DELETE'))
+    RETRYABLE_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+    DECLINED_STATUSES = frozenset((429, 503))
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_timeout: float = 1,
+        max_timeout: float = 60,
+        budget_rate: float | None = 10,
+        budget_burst: int = 20,
+        retry_non_idempotent: bool = False,
+    ):
+        """
+        :param max_attempts: number of attempts (including the first one) before error is raised
+        :param base_timeout: upper bound of delay before second attempt (seconds), doubled for each next one
+        :param max_timeout: upper bound of any delay, including the one requested by 'Retry-After' (seconds)
+        :param budget_rate: number of retries per second allowed for all calls together (None for unlimited)
+        :param budget_burst: max number of retries allowed at once after a quiet period
+        :param retry_non_idempotent: repeat non-idempotent requests after network and server errors too
+        """
+        self.max_attempts = max_attempts
+        self.base_timeout = base_timeout
+        self.max_timeout = max_timeout
+        self.budget_rate = budget_rate
+        self.budget_burst = budget_burst
+        self.retry_non_idempotent = retry_non_idempotent
+
+        self._lock = threading.Lock()
+        self._tokens = float(budget_burst)
+        self._tokens_updated_at = time.monotonic()
+        self._retries = 0
+        self._rejected_by_budget = 0
+
+    def is_idempotent(self, method: str) -> bool:
+        return self.retry_non_idempotent or method.upper() in self.IDEMPOTENT_METHODS
+
+    def get_delay(self, error: Exception, attempt: int, idempotent: bool = True) -> float | None:
+        """
+        Seconds to wait before next attempt, or None if error should be raised.
+
+        :param error: exception of failed attempt (HTTP errors are expected to have `status` and `headers` attributes)
+        :param attempt: number of failed attempt, starting from 1
+        :param idempotent: whether repeated call is safe in case of the first one has reached the server
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        status = getattr(error, 'status', None)
+        if status is not None and status not in self.RETRYABLE_STATUSES:
+            # client errors are not fixed by repeating
+            return None
+
+        if not idempotent and status not in self.DECLINED_STATUSES:
+            return None
+
+        retry_after = self._get_retry_after(error) if status in self.DECLINED_STATUSES else None
+        if retry_after is not None and retry_after > self.max_timeout:
+            # server asks to come back too late
+            return None
+
+        if not self._acquire_budget():
+            return None
+
+        if retry_after is not None:
+            return retry_after
+
+        # full jitter
+        return random.uniform(0, min(self.max_timeout, self.base_timeout * 2 ** (attempt - 1)))
+
+    def _acquire_budget(self) -> bool:
+        with self._lock:
+            if self.budget_rate is not None:
+                now = time.monotonic()
+                elapsed = now - self._tokens_updated_at
+                self._tokens = min(float(self.budget_burst), self._tokens + elapsed * self.budget_rate)
+                self._tokens_updated_at = now
+
+                if self._tokens < 1:
+                    self._rejected_by_budget += 1
+                    return False
+
+                self._tokens -= 1
+
+            self._retries += 1
+            return True
+
+    @staticmethod
+    def _get_retry_after(error: Exception) -> float | None:
+        headers = getattr(error, 'headers', None) or {}
+        value = headers.get('Retry-After')
+        if not value:
+            return None
+
+        try:
+            # delay in seconds
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            # HTTP date
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> dict[str, int]:
+        return dict(
+            retries=self._retries,
+            rejected_by_budget=self._rejected_by_budget,
+        )
@@ -0,0 +1,15 @@
+class SchemaRegistry(BaseSchemaRegistry):
+    """
+    Cache of marshmallow schemas, built once per dataclass and direction (load/dump).
+    """
+
+    def get(self, data_class: t.Type, dump: bool = False) -> marshmallow.Schema:
+        return super().get(data_class, dump)
+
+    def _build(self, data_class: t.Type, dump: bool) -> marshmallow.Schema:
+        if dump:
+            return marshmallow_dataclass.class_schema(data_class)()
+        return marshmallow_dataclass.class_schema(data_class, base_schema=BaseSchema)()
+
+    def is_model(self, value: t.Any) -> bool:
+        return is_dataclass(value)
@@ -0,0 +1,90 @@
+class SingleFlight:
+    """
+    Coalesces identical concurrent requests: the first caller sends the request, others wait for its response.
+    Streamed response is read once (only if someone is waiting for it), then each caller gets its own copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, dict] = {}
+        self._requests = 0
+        self._coalesced = 0
+
+    @staticmethod
+    def get_key(method: str, url: str, body: str | bytes | None) -> str:
+        if isinstance(body, str):
+            body = body.encode()
+        return '{} {} {}'.format(method.upper(), url, hashlib.sha256(body or b'').hexdigest())
+
+    def call(self, key: str, func: t.Callable[[], t.Any]) -> t.Any:
+        """
+        Return result of func() called by the first of concurrent callers with the same key.
+        """
+        call, leader = self._join(key, done=threading.Event())
+        if not leader:
+            call['done'].wait()
+            return self._get_result(call)
+
+        try:
+            result = func()
+        except BaseException as e:
+            if self._leave(key, call):
+                call['error'] = e
+                call['done'].set()
+            raise
+
+        if not self._leave(key, call):
+            # no one is waiting, so response is not buffered
+            return result
+
+        try:
+            call['result'] = self._buffer(result)
+        except BaseException as e:
+            call['error'] = e
+        call['done'].set()
+        return self._get_result(call)
+
+    def _join(self, key: str, **call) -> tuple[dict, bool]:
+        with self._lock:
+            if key in self._calls:
+                self._calls[key]['followers'] += 1
+                self._coalesced += 1
+                return self._calls[key], False
+
+            self._calls[key] = dict(call, followers=0, result=None, error=None)
+            self._requests += 1
+            return self._calls[key], True
+
+    def _leave(self, key: str, call: dict) -> bool:
+        """
+        Finish call (callers coming next send new request), return whether someone is waiting for its result.
+        """
+        with self._lock:
+            del self._calls[key]
+            return call['followers'] > 0
+
+    @staticmethod
+    def _buffer(result: t.Any) -> t.Any:
+        if isinstance(result, io.IOBase) and not isinstance(result, CachedResponse):
+            # read response stream into memory to be replayed to every caller
+            return CachedResponse(result.read(), cached_objects=None)
+        return result
+
+    @staticmethod
+    def _get_result(call: dict) -> t.Any:
+        if call['error'] is not None:
+            raise call['error']
+
+        result = call['result']
+        if isinstance(result, CachedResponse):
+            # file-like response is consumed by deserializer, so each caller reads its own one
+            return CachedResponse(result.getvalue(), result.cached_objects)
+        return result
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                requests=self._requests,
+                coalesced=self._coalesced,
+                in_flight=len(self._calls),
+            )
@@ -0,0 +1,45 @@
+class AsyncSingleFlight(SingleFlight):
+    """
+    Request coalescing for coroutines, requests are shared within the same event loop only.
+    """
+
+    async def call_async(self, key: str, func: t.Callable[[], t.Awaitable]) -> t.Any:
+        """
+        Return result of func() awaited by the first of concurrent callers with the same key.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = f'{id(loop)} {key}'
+        call, leader = self._join(loop_key, done=loop.create_future())
+        if not leader:
+            await asyncio.shield(call['done'])
+            if isinstance(call['error'], asyncio.CancelledError):
+                # first caller has been cancelled, send request again
+                return await self.call_async(key, func)
+            return self._get_result(call)
+
+        try:
+            result = await func()
+        except BaseException as e:
+            if self._leave(loop_key, call):
+                call['error'] = e
+                call['done'].set_result(None)
+            raise
+
+        if not self._leave(loop_key, call):
+            # no one is waiting, so response is not buffered
+            return result
+
+        try:
+            call['result'] = await self._buffer_async(result)
+        except BaseException as e:
+            call['error'] = e
+        call['done'].set_result(None)
+        return self._get_result(call)
+
+    @staticmethod
+    async def _buffer_async(result: t.Any) -> t.Any:
+        if isinstance(result, aiohttp.ClientResponse):
+            # read response stream into memory to be replayed to every caller
+            async with result:
+                return CachedResponse(await result.read(), cached_objects=None)
+        return result
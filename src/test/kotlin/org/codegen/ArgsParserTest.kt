@@ -1,6 +1,7 @@
 package org.codegen
 
 import org.codegen.generators.AllGeneratorsEnum
+import org.codegen.generators.ClientFeaturesEnum
 import org.junit.jupiter.api.Assertions.*
 import org.junit.jupiter.api.Test
 
@@ -16,6 +17,14 @@ class ArgsParserTest {
         assertEquals(AllGeneratorsEnum.KT_DATACLASS, args.target)
     }
 
+    @Test
+    fun parseFeatures() {
+        val parser = ArgsParser(arrayOf("file1.json", "-t", "PY_API_CLIENT", "-f", "CIRCUIT_BREAKER", "CALL_TRACING"))
+        val args = parser.parse()
+
+        assertEquals(listOf(ClientFeaturesEnum.CIRCUIT_BREAKER, ClientFeaturesEnum.CALL_TRACING), args!!.features)
+    }
+
     @Test
     fun parseHelp() {
         val parser = ArgsParser(arrayOf("--help"))
@@ -1,7 +1,9 @@
 package org.codegen
 
 import org.codegen.generators.AllGeneratorsEnum
+import org.junit.jupiter.api.Assertions.assertFalse
 import org.junit.jupiter.api.Assertions.assertThrows
+import org.junit.jupiter.api.Assertions.assertTrue
 import org.junit.jupiter.api.Test
 import java.io.FileNotFoundException
 import java.text.ParseException
@@ -63,4 +65,20 @@ class BuilderTest {
         val builder = Builder(args)
         assertThrows(IllegalArgumentException::class.java) { builder.build() }
     }
+
+    @Test
+    fun shouldNotCacheEndpointWithoutResult() {
+        val args =
+            Args().also {
+                it.target = AllGeneratorsEnum.PY_API_CLIENT
+                it.inputPaths =
+                    listOf(
+                        this.javaClass.getResource("/input/cacheableVoidEndpoint.json")!!.path,
+                    )
+            }
+        val output = Builder(args).build()
+        assertTrue(output.contains("def ping(self):"))
+        assertFalse(output.contains("_endpoint_cache"))
+        assertFalse(output.contains("class EndpointCache:"))
+    }
 }
@@ -23,6 +23,55 @@ class PyAmqpBlockingClientGeneratorTest {
         Assertions.assertEquals(expectedOutput, output)
     }
 
+    @Test
+    fun endpointsWithFeatures() {
+        val args =
+            Args().also {
+                it.target = AllGeneratorsEnum.PY_AMQP_BLOCKING_CLIENT
+                it.inputPaths =
+                    listOf(
+                        this.javaClass.getResource("/input/entities.json")!!.path,
+                        this.javaClass.getResource("/input/endpoints.json")!!.path,
+                        this.javaClass.getResource("/input/endpointFeatures.json")!!.path,
+                    )
+            }
+
+        val output = Builder(args).build()
+        val expectedOutput = File(this.javaClass.getResource("PyAmqpBlockingClientGenerator/endpointFeaturesOutput.py")!!.path).readText()
+        Assertions.assertEquals(expectedOutput, output)
+    }
+
+    @Test
+    fun endpointsWithRateLimit() {
+        Assertions.assertEquals(readOutput("features/rateLimitOutput.py"), buildWithFeatures(ClientFeaturesEnum.RATE_LIMIT))
+    }
+
+    @Test
+    fun endpointsWithEndpointCache() {
+        Assertions.assertEquals(readOutput("features/endpointCacheOutput.py"), buildWithFeatures(ClientFeaturesEnum.ENDPOINT_CACHE))
+    }
+
+    @Test
+    fun endpointsWithRequestBatching() {
+        Assertions.assertEquals(readOutput("features/requestBatchingOutput.py"), buildWithFeatures(ClientFeaturesEnum.REQUEST_BATCHING))
+    }
+
+    private fun buildWithFeatures(vararg features: ClientFeaturesEnum): String {
+        val args =
+            Args().also {
+                it.target = AllGeneratorsEnum.PY_AMQP_BLOCKING_CLIENT
+                it.inputPaths =
+                    listOf(
+                        this.javaClass.getResource("/input/entities.json")!!.path,
+                        this.javaClass.getResource("/input/endpoints.json")!!.path,
+                    )
+                it.features = features.toList()
+            }
+        return Builder(args).build()
+    }
+
+    private fun readOutput(name: String) = File(this.javaClass.getResource("PyAmqpBlockingClientGenerator/$name")!!.path).readText()
+
     companion object {
         @JvmStatic
         @BeforeAll
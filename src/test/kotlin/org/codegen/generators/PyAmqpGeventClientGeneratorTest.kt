@@ -24,6 +24,27 @@ class PyAmqpGeventClientGeneratorTest {
         Assertions.assertEquals(expectedOutput, output)
     }
 
+    @Test
+    fun endpointsWithFeatures() {
+        val args =
+            Args().also {
+                it.target = AllGeneratorsEnum.PY_AMQP_GEVENT_CLIENT
+                it.inputPaths =
+                    listOf(
+                        this.javaClass.getResource("/input/entities.json")!!.path,
+                        this.javaClass.getResource("/input/endpoints.json")!!.path,
+                        this.javaClass.getResource("/input/endpointFeatures.json")!!.path,
+                    )
+            }
+
+        val output = Builder(args).build()
+        val expectedOutput = File(this.javaClass.getResource("PyAmqpGeventClientGenerator/endpointFeaturesOutput.py")!!.path).readText()
+        Assertions.assertEquals(expectedOutput, output)
+        // included code must not block other greenlets
+        Assertions.assertFalse(output.contains("threading."))
+        Assertions.assertFalse(output.contains("time.sleep"))
+    }
+
     companion object {
         @JvmStatic
         @BeforeAll
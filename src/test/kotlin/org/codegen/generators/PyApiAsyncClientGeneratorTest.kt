@@ -15,7 +15,9 @@ class PyApiAsyncClientGeneratorTest {
                     listOf(
                         this.javaClass.getResource("/input/entities.json")!!.path,
                         this.javaClass.getResource("/input/endpoints.json")!!.path,
+                        this.javaClass.getResource("/input/endpointFeatures.json")!!.path,
                     )
+                it.features = ClientFeaturesEnum.entries
             }
 
         val output = Builder(args).build()
@@ -24,6 +26,72 @@ class PyApiAsyncClientGeneratorTest {
         Assertions.assertEquals(expectedOutput, output)
     }
 
+    @Test
+    fun endpointsWithoutFeatures() {
+        Assertions.assertEquals(readOutput("features/noFeaturesOutput.py"), buildWithFeatures())
+    }
+
+    @Test
+    fun endpointsWithCircuitBreaker() {
+        Assertions.assertEquals(readOutput("features/circuitBreakerOutput.py"), buildWithFeatures(ClientFeaturesEnum.CIRCUIT_BREAKER))
+    }
+
+    @Test
+    fun endpointsWithAdaptiveConcurrency() {
+        Assertions.assertEquals(readOutput("features/adaptiveConcurrencyOutput.py"), buildWithFeatures(ClientFeaturesEnum.ADAPTIVE_CONCURRENCY))
+    }
+
+    @Test
+    fun endpointsWithHttpCache() {
+        Assertions.assertEquals(readOutput("features/httpCacheOutput.py"), buildWithFeatures(ClientFeaturesEnum.HTTP_CACHE))
+    }
+
+    @Test
+    fun endpointsWithRequestCoalescing() {
+        Assertions.assertEquals(readOutput("features/requestCoalescingOutput.py"), buildWithFeatures(ClientFeaturesEnum.REQUEST_COALESCING))
+    }
+
+    @Test
+    fun endpointsWithRequestHedging() {
+        Assertions.assertEquals(readOutput("features/requestHedgingOutput.py"), buildWithFeatures(ClientFeaturesEnum.REQUEST_HEDGING))
+    }
+
+    @Test
+    fun endpointsWithCallTracing() {
+        Assertions.assertEquals(readOutput("features/callTracingOutput.py"), buildWithFeatures(ClientFeaturesEnum.CALL_TRACING))
+    }
+
+    @Test
+    fun endpointsWithRateLimit() {
+        Assertions.assertEquals(readOutput("features/rateLimitOutput.py"), buildWithFeatures(ClientFeaturesEnum.RATE_LIMIT))
+    }
+
+    @Test
+    fun endpointsWithEndpointCache() {
+        Assertions.assertEquals(readOutput("features/endpointCacheOutput.py"), buildWithFeatures(ClientFeaturesEnum.ENDPOINT_CACHE))
+    }
+
+    @Test
+    fun endpointsWithRequestBatching() {
+        Assertions.assertEquals(readOutput("features/requestBatchingOutput.py"), buildWithFeatures(ClientFeaturesEnum.REQUEST_BATCHING))
+    }
+
+    private fun buildWithFeatures(vararg features: ClientFeaturesEnum): String {
+        val args =
+            Args().also {
+                it.target = AllGeneratorsEnum.PY_API_ASYNC_CLIENT
+                it.inputPaths =
+                    listOf(
+                        this.javaClass.getResource("/input/entities.json")!!.path,
+                        this.javaClass.getResource("/input/endpoints.json")!!.path,
+                    )
+                it.features = features.toList()
+            }
+        return Builder(args).build()
+    }
+
+    private fun readOutput(name: String) = File(this.javaClass.getResource("PyApiAsyncClientGenerator/$name")!!.path).readText()
+
     companion object {
         @JvmStatic
         @BeforeAll
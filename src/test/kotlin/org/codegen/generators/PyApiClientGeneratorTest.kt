@@ -16,7 +16,9 @@ class PyApiClientGeneratorTest {
                     listOf(
                         this.javaClass.getResource("/input/entities.json")!!.path,
                         this.javaClass.getResource("/input/endpoints.json")!!.path,
+                        this.javaClass.getResource("/input/endpointFeatures.json")!!.path,
                     )
+                it.features = ClientFeaturesEnum.entries
             }
 
         val output = Builder(args).build()
@@ -24,6 +26,73 @@ class PyApiClientGeneratorTest {
         assertEquals(expectedOutput, output)
     }
 
+    @Test
+    fun endpointsWithoutFeatures() {
+        assertEquals(readOutput("features/noFeaturesOutput.py"), buildWithFeatures())
+    }
+
+    @Test
+    fun endpointsWithCircuitBreaker() {
+        assertEquals(readOutput("features/circuitBreakerOutput.py"), buildWithFeatures(ClientFeaturesEnum.CIRCUIT_BREAKER))
+    }
+
+    @Test
+    fun endpointsWithAdaptiveConcurrency() {
+        assertEquals(readOutput("features/adaptiveConcurrencyOutput.py"), buildWithFeatures(ClientFeaturesEnum.ADAPTIVE_CONCURRENCY))
+    }
+
+    @Test
+    fun endpointsWithHttpCache() {
+        assertEquals(readOutput("features/httpCacheOutput.py"), buildWithFeatures(ClientFeaturesEnum.HTTP_CACHE))
+    }
+
+    @Test
+    fun endpointsWithRequestCoalescing() {
+        assertEquals(readOutput("features/requestCoalescingOutput.py"), buildWithFeatures(ClientFeaturesEnum.REQUEST_COALESCING))
+    }
+
+    @Test
+    fun endpointsWithRequestHedging() {
+        assertEquals(readOutput("features/requestHedgingOutput.py"), buildWithFeatures(ClientFeaturesEnum.REQUEST_HEDGING))
+    }
+
+    @Test
+    fun endpointsWithCallTracing() {
+        assertEquals(readOutput("features/callTracingOutput.py"), buildWithFeatures(ClientFeaturesEnum.CALL_TRACING))
+    }
+
+    @Test
+    fun endpointsWithRateLimit() {
+        assertEquals(readOutput("features/rateLimitOutput.py"), buildWithFeatures(ClientFeaturesEnum.RATE_LIMIT))
+    }
+
+    @Test
+    fun endpointsWithEndpointCache() {
+        assertEquals(readOutput("features/endpointCacheOutput.py"), buildWithFeatures(ClientFeaturesEnum.ENDPOINT_CACHE))
+    }
+
+    @Test
+    fun endpointsWithRequestBatching() {
+        assertEquals(readOutput("features/requestBatchingOutput.py"), buildWithFeatures(ClientFeaturesEnum.REQUEST_BATCHING))
+    }
+
+    @Test
+    fun cacheableEndpointsWithoutEnums() {
+        val args =
+            Args().also {
+                it.target = AllGeneratorsEnum.PY_API_CLIENT
+                it.inputPaths =
+                    listOf(
+                        this.javaClass.getResource("/input/cacheableEndpoints.json")!!.path,
+                    )
+            }
+
+        val output = Builder(args).build()
+        // endpoint cache encodes enum arguments, so Enum is imported even if schema has no enums
+        assertTrue(output.contains("from enum import Enum"))
+        assertEquals(readOutput("cacheableEndpointsOutput.py"), output)
+    }
+
     @Test
     fun openApiJson() {
         val args =
@@ -95,6 +164,84 @@ class PyApiClientGeneratorTest {
         assertFalse(output.contains("basic/{entity", ignoreCase = true))
     }
 
+    @Test
+    fun endpointsWithRequiredFeaturesOnly() {
+        val args =
+            Args().also {
+                it.target = AllGeneratorsEnum.PY_API_CLIENT
+                it.inputPaths =
+                    listOf(
+                        this.javaClass.getResource("/input/entities.json")!!.path,
+                        this.javaClass.getResource("/input/endpoints.json")!!.path,
+                        this.javaClass.getResource("/input/endpointFeatures.json")!!.path,
+                    )
+                it.features = listOf(ClientFeaturesEnum.CIRCUIT_BREAKER)
+            }
+
+        val output = Builder(args).build()
+        // requested by options
+        assertTrue(output.contains("class CircuitBreaker:"))
+        // required by cacheable, batched and rate limited endpoints
+        assertTrue(output.contains("class EndpointCache:"))
+        assertTrue(output.contains("class RequestBatcher:"))
+        assertTrue(output.contains("class RateLimiter:"))
+        // neither requested nor required
+        assertFalse(output.contains("class HttpCache:"))
+        assertFalse(output.contains("class HedgePolicy:"))
+        assertFalse(output.contains("class CallTracer:"))
+        assertFalse(output.contains("http_cache"))
+        assertFalse(output.contains("import contextvars"))
+    }
+
+    @Test
+    fun renderFeatures() {
+        val template =
+            "a\n# feature: circuit_breaker\nb\n# else feature\nc\n# end feature\n" +
+                "# feature: http_cache\nd\n# end feature\n# feature: http_cache or circuit_breaker\nf\n# end feature\ne"
+        assertEquals("a\nb\nf\ne", FeaturesRenderer().render(template))
+    }
+
+    @Test
+    fun shouldFailOnUnclosedFeatureBlock() {
+        assertThrows(IllegalArgumentException::class.java) { FeaturesRenderer().render("a\n# feature: circuit_breaker\nb") }
+    }
+
+    @Test
+    fun shouldFailOnUnbalancedFeatureMarkers() {
+        assertThrows(IllegalArgumentException::class.java) { FeaturesRenderer().render("a\n# end feature\nb") }
+        assertThrows(IllegalArgumentException::class.java) { FeaturesRenderer().render("a\n# else feature\nb") }
+    }
+
+    @Test
+    fun shouldFailOnUnknownFeature() {
+        assertThrows(IllegalArgumentException::class.java) { FeaturesRenderer().render("# feature: circuit_breakers\na\n# end feature") }
+    }
+
+    private fun buildWithFeatures(vararg features: ClientFeaturesEnum): String {
+        val args =
+            Args().also {
+                it.target = AllGeneratorsEnum.PY_API_CLIENT
+                it.inputPaths =
+                    listOf(
+                        this.javaClass.getResource("/input/entities.json")!!.path,
+                        this.javaClass.getResource("/input/endpoints.json")!!.path,
+                    )
+                it.features = features.toList()
+            }
+        return Builder(args).build()
+    }
+
+    private fun readOutput(name: String) = File(this.javaClass.getResource("PyApiClientGenerator/$name")!!.path).readText()
+
+    // exposes rendering of feature blocks of templates
+    private class FeaturesRenderer : PyApiClientGenerator() {
+        init {
+            addFeature(ClientFeaturesEnum.CIRCUIT_BREAKER)
+        }
+
+        fun render(code: String) = renderFeatures(code)
+    }
+
     companion object {
         @JvmStatic
         @BeforeAll
@@ -0,0 +1,42 @@
+package org.codegen.generators
+
+import org.codegen.Args
+import org.codegen.Builder
+import org.junit.jupiter.api.*
+import org.junit.jupiter.api.Assertions.assertEquals
+import java.io.File
+
+class PyApiMsgspecClientGeneratorTest {
+    @Test
+    fun endpoints() {
+        val args =
+            Args().also {
+                it.target = AllGeneratorsEnum.PY_API_MSGSPEC_CLIENT
+                it.inputPaths =
+                    listOf(
+                        this.javaClass.getResource("/input/entities.json")!!.path,
+                        this.javaClass.getResource("/input/endpoints.json")!!.path,
+                        this.javaClass.getResource("/input/endpointFeatures.json")!!.path,
+                    )
+                it.features = ClientFeaturesEnum.entries
+            }
+
+        val output = Builder(args).build()
+        val expectedOutput = File(this.javaClass.getResource("PyApiMsgspecClientGenerator/endpointsOutput.py")!!.path).readText()
+        assertEquals(expectedOutput, output)
+    }
+
+    companion object {
+        @JvmStatic
+        @BeforeAll
+        fun setup() {
+            System.setProperty("DECORATOR_ARGS", "")
+        }
+
+        @JvmStatic
+        @AfterAll
+        fun teardown() {
+            System.clearProperty("DECORATOR_ARGS")
+        }
+    }
+}
@@ -25,6 +25,18 @@ class PyMarshmallowDataclassGeneratorTest {
         assertEquals(expectedOutput, output)
     }
 
+    @Test
+    fun entitiesFastCodecs() {
+        System.setProperty("USE_FAST_CODECS", "true")
+        val output = Builder(args).build()
+        System.clearProperty("USE_FAST_CODECS")
+        val expectedOutput =
+            File(
+                this.javaClass.getResource("PyMarshmallowDataclassGenerator/entitiesOutputFastCodecs.py")!!.path,
+            ).readText()
+        assertEquals(expectedOutput, output)
+    }
+
     companion object {
         @JvmStatic
         @BeforeAll
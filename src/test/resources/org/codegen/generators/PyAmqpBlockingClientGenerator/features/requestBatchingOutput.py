@@ -0,0 +1,1165 @@
+# Auto-generated by ez-codegen TEST_VERSION, do not edit
+# flake8: noqa
+from amqp.exceptions import RecoverableConnectionError, ConnectionForced
+from dataclasses import astuple
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import is_dataclass
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from decimal import Decimal
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from kombu import Connection, Exchange, Queue, Message
+from socket import timeout as SocketTimeout
+from threading import Lock
+from typeguard import typechecked
+from urllib.parse import urlparse
+from uuid import uuid4
+import importlib.util
+import io
+import json
+import logging
+import marshmallow
+import marshmallow_dataclass
+import os
+import random
+import re
+import threading
+import time
+import typing as t
+
+
+class Generated:
+    @typechecked
+    def __init__(
+        self,
+        amqp_url: str,
+        read_exchange_name: str,
+        read_queue_name: str,
+        write_exchange_name: str = None,
+        prefetch_count: int = 30,
+        logger: logging.Logger = None,
+        api_keys: dict = None,
+        high_priority: bool = False,
+        request_timeout: int = 3600,
+        retry_policy: 'RetryPolicy | None' = None,
+        json_codec: 'JsonCodec | None' = None,
+        batch_max_size: int = int(os.environ.get('AMQP_CLIENT_BATCH_MAX_SIZE', 1)),
+        batch_max_delay: float = float(os.environ.get('AMQP_CLIENT_BATCH_MAX_DELAY', 0.005)),
+        use_request_payload_validation: bool = bool(int(os.environ.get('AMQP_CLIENT_USE_REQUEST_PAYLOAD_VALIDATION', 1))),
+        use_schema_warm_up: bool = bool(int(os.environ.get('AMQP_CLIENT_USE_SCHEMA_WARM_UP', 0))),
+    ):
+        """
+        AMQP client constructor and configuration method.
+        """
+        self._json_codec = json_codec or JsonCodec()
+        self._client = AmqpApiWithBlockingListener(
+            amqp_url=amqp_url,
+            read_exchange_name=read_exchange_name,
+            read_queue_name=read_queue_name,
+            write_exchange_name=write_exchange_name,
+            prefetch_count=prefetch_count,
+            logger=logger,
+            api_keys=api_keys,
+            high_priority=high_priority,
+            request_timeout=request_timeout,
+            retry_policy=retry_policy,
+            json_codec=self._json_codec,
+        )
+        self._request_batcher = RequestBatcher(max_size=batch_max_size, max_delay=batch_max_delay) if batch_max_size > 1 else None
+
+        self._schema_registry = SchemaRegistry()
+        if use_schema_warm_up:
+            self._schema_registry.warm_up(AllDataclassesCollection)
+
+        self._deserializer = BaseDeserializer(
+            use_response_streaming=False,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
+        )
+
+        self._serializer = BaseSerializer(
+            self._deserializer,
+            use_request_payload_validation=use_request_payload_validation,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
+        )
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        Internal counters of client components (for diagnostics and metrics export).
+        """
+        return dict(
+            schemas=self._schema_registry.stats(),
+            retries=self._client.retry_policy.stats(),
+            json=self._json_codec.stats(),
+            batches=self._request_batcher.stats() if self._request_batcher else {},
+        )
+
+    def get_container_dto(self) -> 'ContainerDto':
+        raw_data = self._client.mk_request(f'/api/v1/container', 'get_container_dto').get()
+        gen = self._deserializer.deserialize(raw_data, ContainerDto)
+        return next(gen)
+
+    def some_action(self, enum: 'EnumValue'):
+        self._client.mk_request(f'api/v1/action/{enum}', 'some_action').get()
+
+    def get_basic_dto_list(self) -> list['BasicDto']:
+        """
+        Endpoint description
+
+        Second line
+        """
+        raw_data = self._client.mk_request(f'api/v1/basic', 'get_basic_dto_list').get()
+        return list(self._deserializer.deserialize(raw_data, BasicDto, many=True))
+
+    def create_basic_dto(self, item: 'BasicDto') -> 'BasicDto':
+        item = self._serializer.serialize(item, is_payload=True)
+        args = (item,)
+        raw_data = self._client.mk_request(f'api/v1/basic', 'create_basic_dto', *args).get()
+        gen = self._deserializer.deserialize(raw_data, BasicDto)
+        return next(gen)
+
+    def create_basic_dto_bulk(self, items: t.Sequence['BasicDto']) -> list['BasicDto']:
+        items = self._serializer.serialize(items, is_payload=True)
+        args = (items,)
+        raw_data = self._client.mk_request(f'api/v1/basic/bulk', 'create_basic_dto_bulk', *args).get()
+        return list(self._deserializer.deserialize(raw_data, BasicDto, many=True))
+
+    def get_basic_dto_by_timestamp(self, timestamp: datetime) -> 'BasicDto':
+        timestamp = self._serializer.serialize(timestamp)
+        raw_data = self._client.mk_request(f'api/v1/basic/{timestamp}', 'get_basic_dto_by_timestamp').get()
+        gen = self._deserializer.deserialize(raw_data, BasicDto)
+        return next(gen)
+
+    def ping(self):
+        self._client.mk_request(f'api/v1/ping', 'ping').get()
+
+
+class BaseSchema(marshmallow.Schema):
+    class Meta:
+        # allow backward-compatible changes when new fields have added (simply ignore them)
+        unknown = marshmallow.EXCLUDE
+
+
+class JavaDurationField(marshmallow.fields.Field):
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            return str_java_duration_to_timedelta(value)
+        except ValueError as error:
+            raise marshmallow.ValidationError(str(error)) from error
+
+    def _serialize(self, value: timedelta | None, attr: str, obj, **kwargs):
+        if value is None:
+            return None
+        return timedelta_to_java_duration(value) if value else "PT0S"
+
+
+def str_java_duration_to_timedelta(duration: str) -> timedelta:
+    """
+    >>> str_java_duration_to_timedelta('PT5S')
+    datetime.timedelta(seconds=5)
+
+    >>> str_java_duration_to_timedelta('PT10H59S')
+    datetime.timedelta(seconds=36059)
+
+    >>> str_java_duration_to_timedelta('PT0H5M')
+    datetime.timedelta(seconds=300)
+    """
+    groups = re.findall(r'PT(\d+H)?(\d+M)?([\d.]+S)?', duration)[0]
+    if not groups:
+        raise ValueError('Invalid duration: %s' % duration)
+
+    hours, minutes, seconds = groups
+
+    hours = int((hours or '0H').rstrip('H'))
+    minutes = int((minutes or '0M').rstrip('M'))
+    seconds = float((seconds or '0S').rstrip('S'))
+
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def timedelta_to_java_duration(delta: timedelta) -> str:
+    """
+    Converts a timedelta to java duration string format
+    Milliseconds are discarded
+
+    >>> timedelta_to_java_duration(timedelta(minutes=15))
+    'PT900S'
+
+    >>> timedelta_to_java_duration(timedelta(days=1, minutes=21, seconds=35))
+    'PT87695S'
+
+    >>> timedelta_to_java_duration(timedelta(microseconds=123456))
+    'PT0S'
+    """
+    seconds = delta.total_seconds()
+    return 'PT{}S'.format(int(seconds))
+
+
+class StrEnum(str, Enum):
+    """Enum where members are also (and must be) strings."""
+
+    def __new__(cls, *values):
+        """Values must already be of type `str`"""
+        value = str(*values)
+        member = str.__new__(cls, value)
+        member._value_ = value
+        return member
+
+    def __str__(self):
+        return self._value_
+
+
+class EnumValue(StrEnum):
+    VALUE_1 = "value 1"
+    VALUE_2 = "value 2"
+    VALUE_3 = "value 3"
+
+
+@dataclass
+class BasicDto:
+    timestamp: datetime = field(metadata=dict(marshmallow_field=marshmallow.fields.DateTime()))
+    duration: timedelta = field(metadata=dict(marshmallow_field=JavaDurationField()))
+    enum_value: EnumValue = field(metadata=dict(marshmallow_field=marshmallow.fields.String(validate=[marshmallow.fields.validate.OneOf(list(map(str, EnumValue)))])))
+    json_value: dict = field(metadata=dict(marshmallow_field=marshmallow.fields.Dict()))
+    # short description
+    # very long description lol
+    documented_value: float = field(metadata=dict(marshmallow_field=marshmallow.fields.Float(data_key="customName")))
+    list_value: list[int] = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Integer(), data_key="listValue")))
+    optional_value: float = field(metadata=dict(marshmallow_field=marshmallow.fields.Float()), default=0)
+    nullable_value: bool | None = field(metadata=dict(marshmallow_field=marshmallow.fields.Boolean(allow_none=True)), default=None)
+    optional_list_value: list[int] = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Integer())), default_factory=list)
+
+
+@dataclass
+class ContainerDto:
+    """
+    entity with containers
+    """
+    basic_single: BasicDto = field(metadata=dict(marshmallow_field=marshmallow.fields.Nested(marshmallow_dataclass.class_schema(BasicDto, base_schema=BaseSchema), data_key="basic")))
+    basic_list: list[BasicDto] = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Nested(marshmallow_dataclass.class_schema(BasicDto, base_schema=BaseSchema)), data_key="basics")))
+    basic_optional_list: list[BasicDto] | None = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Nested(marshmallow_dataclass.class_schema(BasicDto, base_schema=BaseSchema)), allow_none=True, data_key="basic_nullable_list")))
+
+
+RECOVERABLE_EXCEPTIONS = (ConnectionError, ConnectionResetError, IOError, ConnectionForced, RecoverableConnectionError)
+
+JSON_PAYLOAD = t.Union[dict, str, int, float, list]
+RESPONSE_BODY = [str, io.IOBase]
+
+
+def _check_amqp_alive(connection: Connection, raise_exception=False) -> bool:
+    try:
+        connection.connect()
+    except Exception as e:
+        if raise_exception:
+            raise ConnectionError('Failed to connect to %s: %s' % (connection.host, e)) from e
+        return False
+    return True
+
+
+def _verbose_amqp_url(amqp_url: str) -> str:
+    parsed = urlparse(amqp_url)
+    return f'{parsed.hostname}:{parsed.port}'
+
+
+class AmqpWrapper:
+    def __init__(self, amqp_url: str, read_exchange_name: str, read_queue_name: str, write_exchange_name: str = None,
+                 prefetch_count: int = 30, logger: logging.Logger = None, retry_policy: 'RetryPolicy' = None,
+                 json_codec: 'JsonCodec' = None):
+        self.amqp_url = amqp_url
+        self.read_exchange_name = read_exchange_name
+        self.read_queue_name = read_queue_name
+        self.write_exchange_name = write_exchange_name
+        self.prefetch_count = prefetch_count
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        # at most 5 seconds between attempts, so connecting is given up within ~45 seconds
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=10, base_timeout=5, max_timeout=5, budget_rate=None)
+        self.json_codec = json_codec or JsonCodec()
+
+        self.connection = None
+        self.write_exchange = None
+        self.is_connected = False  # self.connection could be outdated, refer to this flag
+        self.is_listening = False
+        self.is_stopped = False
+        self.producer = None
+        self._incoming_message_handlers = []
+        self._read_queues: dict[str, Queue] = {}  # declared on current connection
+
+    def connect(self, force=False):
+        """attempts to connect. If fails, will throw an exception"""
+        if self.is_connected and not force:
+            return
+
+        self.is_connected = False
+        self.is_listening = False
+        # queues are declared again on new connection
+        self._read_queues.clear()
+        self.connection = Connection(self.amqp_url)
+        _check_amqp_alive(self.connection, raise_exception=True)
+
+        if self.write_exchange_name:
+            self.write_exchange = Exchange(self.write_exchange_name, 'direct', durable=True)
+            # messages are encoded by JSON codec instead of kombu serializer
+            self.producer = self.connection.Producer(on_return=self._handle_undelivered)
+
+        # as soon as we tested connection and made the producer, switch the flag ON
+        self.is_connected = True
+        self.logger.info('{}: connected to {}'.format(self.__class__.__name__, _verbose_amqp_url(self.amqp_url)))
+
+    def try_connect(self):
+        try:
+            self.connect()
+        except RECOVERABLE_EXCEPTIONS:
+            self._try_reconnect()
+
+    def _try_reconnect(self):
+        """makes attempts to connect to the message broker with growing random delays, after than will throw an exception"""
+        failsafe_call(
+            self.connect,
+            kwargs=dict(force=True),
+            exceptions=RECOVERABLE_EXCEPTIONS,
+            retry_policy=self.retry_policy,
+            logger=self.logger,
+            on_transitional_fail=lambda exc, info: time.sleep(info['delay'])
+        )
+
+    def listen(self, timeout=None, *args, **kwargs):
+        """If timeout is set, listen each message no more than defined seconds. Listen forever otherwise."""
+        self.is_listening = False
+        self.try_connect()
+        while True:
+            try:
+                read_queue = self.declare_read_queue(*args, **kwargs)
+                with self.connection.Consumer(
+                    read_queue,
+                    on_message=self._on_message,
+                    prefetch_count=self.prefetch_count,
+                    auto_declare=None,
+                ):
+                    self.is_connected = True
+                    self.is_listening = True
+                    timeout_verbose = f'(timeout={timeout}s)' if timeout else 'permanently'
+                    self.logger.info(f'listen queue {read_queue.name} {timeout_verbose}')
+
+                    # if connection.close() called, connection.connection set to None
+                    while self.connection.connection is not None:
+                        self.connection.drain_events(timeout=timeout)
+            except SocketTimeout:
+                if timeout:
+                    return
+                self._try_reconnect()
+            except RECOVERABLE_EXCEPTIONS:
+                self._try_reconnect()
+            finally:
+                self.is_listening = False
+
+    def add_incoming_message_handler(self, func: t.Callable[[JSON_PAYLOAD, Message], None]):
+        """Apply 'observer' pattern for listeners"""
+        self._incoming_message_handlers.append(func)
+
+    def _on_message(self, message: Message):
+        if message.content_type == 'application/json' and not message.headers.get('compression'):
+            # decode by JSON codec instead of kombu serializer
+            body = self.json_codec.loads(message.body)
+        else:
+            body = message.decode()
+        self.handle(body, message)
+
+    def handle(self, body: list, message: Message):
+        if not self.is_connected:
+            # prevents processing of downloaded messages after connection.close()
+            # (for some reason another drain_events() cycle will be started)
+            self.logger.warning(f'skip message {message} due to disconnected state')
+            return
+
+        # iterate over all listeners
+        for func in self._incoming_message_handlers:
+            func(body, message)
+
+    def publish(self, data: t.Any, *args, **kwargs):
+        self.try_connect()
+
+        while True:
+            try:
+                self.logger.debug(f'send msg to {self.write_exchange} {kwargs}: {data}')
+                return self.producer.publish(
+                    self.json_codec.dumps(data),
+                    content_type='application/json',
+                    content_encoding='utf-8',
+                    exchange=self.write_exchange,
+                    *args,
+                    **kwargs,
+                )
+            except RECOVERABLE_EXCEPTIONS:
+                self._try_reconnect()
+
+    def declare_read_queue(self, *args, **kwargs) -> Queue:
+        assert self.read_queue_name, 'read_queue_name must not be empty'  # prevent assigning random name by amqp
+        self.connect()
+        key = repr((args, sorted(kwargs.items())))
+        if key in self._read_queues:
+            return self._read_queues[key]
+
+        read_exchange = Exchange(self.read_exchange_name, 'direct', durable=True)
+        read_queue = Queue(self.read_queue_name, exchange=read_exchange, *args, **kwargs)
+        read_queue(self.connection).declare()
+        self._read_queues[key] = read_queue
+        return read_queue
+
+    def spawn(self, func: t.Callable[[], None]):
+        """
+        Run function in background (in a daemon thread).
+        """
+        threading.Thread(target=func, daemon=True).start()
+
+    # noinspection PyUnusedLocal
+    def _handle_undelivered(self, exception, exchange, routing_key: str, message):
+        """
+        When a message was not delivered using producer.publish(), that callback is being called
+        """
+        pass
+
+    def stop(self):
+        self.is_stopped = True
+        self.is_connected = False
+        if self.connection is not None:
+            self.logger.info('{}: close connection {}'.format(self.__class__.__name__, _verbose_amqp_url(self.amqp_url)))
+            self.connection.close()
+
+
+@dataclass(frozen=True)
+class AmqpRequest:
+    id: str
+    api_keys: dict
+    response_routing_key: str
+    func: str
+    args: t.Sequence[JSON_PAYLOAD]
+
+
+@dataclass(frozen=True)
+class AmqpResponse:
+    id: str
+    result: JSON_PAYLOAD
+    error: str | None
+
+
+class FailedAmqpRequestError(Exception):
+    pass
+
+
+class SyncAmqpResult:
+    """Simple, single-threaded implementation without gevent."""
+    def __init__(self, request: AmqpRequest, timeout: int):
+        self.request = request
+        self._val = None
+        self._exc = None
+
+    def set_exception(self, exc: Exception):
+        """Put error for failure request."""
+        self._exc = exc
+
+    def set(self, value: JSON_PAYLOAD):
+        """Put result for successful request."""
+        self._val = value
+
+    def get(self) -> JSON_PAYLOAD:
+        """Retrieve result or throw exception."""
+        if self._exc:
+            raise self._exc
+        return self._val
+
+
+class BaseAmqpApiClient(AmqpWrapper):
+    """
+    Wrapper for asynchronous interaction with AMQP instance through queues.
+    """
+
+    def __init__(self, api_keys: dict = None, high_priority: bool = False,
+                 request_timeout: int = 3600, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.api_keys = api_keys
+        self.high_priority = high_priority
+        self.request_timeout = request_timeout
+
+        self.pending_async_results = {}
+        self.add_incoming_message_handler(self._process_async_result)
+
+    def _process_async_result(self, body: JSON_PAYLOAD, message: Message):
+        try:
+            parsed_body = AmqpResponse(*body)
+        except TypeError:
+            # message does not fit signature, skip
+            return
+
+        result = self.pending_async_results.pop(parsed_body.id, None)
+        message.ack()
+
+        if result is None:
+            # skip a response which was not requested
+            # (most probably was requested by previous instance within same queue)
+            self.logger.warning('skip message from %s: %s' % (self.read_queue_name, parsed_body.id))
+        elif parsed_body.error:
+            result.set_exception(FailedAmqpRequestError(parsed_body.error))
+        else:
+            self.logger.debug('process message from %s: %s' % (self.read_queue_name, parsed_body.id))
+            result.set(parsed_body.result)
+
+    @property
+    def _read_queue_kwargs(self) -> dict:
+        return dict(
+            routing_key=self.read_queue_name,
+            auto_delete=True,  # incoming queue is one-off (only for this client)
+        )
+
+    def mk_request(self, routing_key: str, func: str, *args) -> SyncAmqpResult:
+        request = AmqpRequest(
+            id=str(uuid4()),
+            api_keys=self.api_keys or {},
+            response_routing_key=self.read_queue_name,
+            func=func,
+            args=args
+        )
+        result = SyncAmqpResult(request=request, timeout=self.request_timeout)
+
+        kwargs = {
+            'routing_key': routing_key,
+        }
+        if self.high_priority:
+            kwargs['priority'] = 1
+
+        self.pending_async_results[request.id] = result
+        # declare incoming queue (if not yet done) before making of request, otherwise response may be lost
+        self.declare_read_queue(**self._read_queue_kwargs)
+        self.publish(astuple(request), **kwargs)
+        return result
+
+
+class AmqpApiWithBlockingListener(BaseAmqpApiClient):
+    """
+    Synchronous (blocking), gevent-free version of GatewayApi. Listens messages in the same thread.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = Lock()
+
+    def _process_async_result(self, body: list, message: Message):
+        """
+        Compares length of pending requests list before and after response processing.
+        Stops queue listening if it was 1 and became 0 (that means desired response has been received)
+        """
+        before = len(self.pending_async_results)
+        super()._process_async_result(body, message)
+        after = len(self.pending_async_results)
+
+        if before and not after:
+            raise StopIteration
+
+    def mk_request(self, routing_key: str, func: str, *args) -> SyncAmqpResult:
+        with self._lock:
+            ret = super().mk_request(routing_key, func, *args)
+
+            # listen to queue and interrupt after first message
+            try:
+                self.listen(**self._read_queue_kwargs)
+            except StopIteration:
+                # desired answer should have been received
+                return ret
+
+
+class JsonCodec:
+    """
+    JSON encoder and decoder working with bytes, backed by the fastest installed library (orjson, ujson or stdlib json).
+    Streaming parser is ijson (optional, required for response streaming only) with its fastest available backend.
+
+    >>> JsonCodec('json').dumps({'foo': [1, 2]})
+    b'{"foo": [1, 2]}'
+    >>> JsonCodec('json').loads(b'{"foo": [1, 2]}')
+    {'foo': [1, 2]}
+    """
+
+    BACKENDS = ('orjson', 'ujson', 'json')
+
+    def __init__(self, backend: str | None = None, streaming_backend: str | None = None):
+        """
+        :param backend: one of BACKENDS (auto-selected if omitted)
+        :param streaming_backend: ijson backend name, e.g. yajl2_c or python (the fastest compiled one if omitted)
+        """
+        self.backend = backend or next(name for name in self.BACKENDS if importlib.util.find_spec(name) is not None)
+        if self.backend == 'orjson':
+            import orjson  # optional dependency
+            self.dumps = orjson.dumps
+            self.loads = orjson.loads
+        elif self.backend == 'ujson':
+            import ujson  # optional dependency
+            self.dumps = lambda value: ujson.dumps(value, ensure_ascii=False, escape_forward_slashes=False).encode('utf8')
+            self.loads = ujson.loads
+        elif self.backend == 'json':
+            self.dumps = lambda value: json.dumps(value).encode('utf8')
+            self.loads = json.loads
+        else:
+            raise ValueError(f'Unsupported JSON backend: {self.backend}, expected one of {self.BACKENDS}')
+
+        self.streaming_backend = streaming_backend
+
+    @property
+    def _ijson(self) -> t.Any:
+        import ijson  # optional dependency
+        return ijson.get_backend(self.streaming_backend) if self.streaming_backend else ijson
+
+    def items(self, file: t.Any) -> t.Iterator[t.Any]:
+        """
+        Parse items of JSON array one by one while reading file-like object.
+        """
+        return self._ijson.items(file, 'item', use_float=True)
+
+    def items_async(self, file: t.Any) -> t.AsyncIterator[t.Any]:
+        """
+        Parse items of JSON array one by one while reading async file-like object.
+        """
+        return self._ijson.items_async(file, 'item', use_float=True)
+
+    def stats(self) -> dict[str, str | None]:
+        try:
+            streaming_backend = self._ijson.backend
+        except ImportError:
+            streaming_backend = None
+
+        return dict(
+            backend=self.backend,
+            streaming_backend=streaming_backend,
+        )
+
+
+class BaseSerializer:
+    def __init__(
+        self,
+        deserializer: 'BaseDeserializer',
+        use_request_payload_validation: bool,
+        schema_registry: 'SchemaRegistry',
+        json_codec: 'JsonCodec',
+    ):
+        self._use_request_payload_validation = use_request_payload_validation
+        self._deserializer = deserializer
+        self._schema_registry = schema_registry
+        self._json_codec = json_codec
+
+    def serialize(self, value: t.Any, is_payload=False) -> 'JSON_PAYLOAD | bytes | None':
+        if isinstance(value, t.Iterator):
+            value = list(value)
+
+        # auto-detect collections
+        many = False
+        _type = type(value)
+        if isinstance(value, (list, tuple, set)) and value:
+            # non-empty sequence
+            _type = type(next(iter(value)))
+            many = True
+
+        # pick built-in serializer if specified for class
+        method_name = '_serialize_{type}'.format(type=_type.__name__.lower())
+        if hasattr(self, method_name):
+            method = getattr(self, method_name)
+            if many:
+                return list(map(method, value))
+            return method(value)
+
+        serialized_data = self._serialize_model(value, _type, many, is_payload)
+        if serialized_data is not None:
+            return serialized_data
+
+        if isinstance(value, t.get_args(JSON_PAYLOAD)):
+            return value
+
+        if value is None:
+            if not is_payload:
+                # special case for null values in URL
+                return ''
+            return None
+
+        raise ValueError('Unable to serialize object of type {0}: {1}'.format(type(value), value))
+
+    def _serialize_model(self, value: t.Any, _type: t.Type, many: bool, is_payload: bool) -> 'JSON_PAYLOAD | bytes | None':
+        """
+        Serialized dataclass (or list of them), None for values of other types.
+        """
+        if not is_dataclass(_type):
+            return None
+
+        encoder = getattr(_type, 'to_dict', None)
+        if is_payload and encoder is not None:
+            # use generated encoder if available (USE_FAST_CODECS=1)
+            serialized_data = list(map(encoder, value)) if many else encoder(value)
+        else:
+            # use marshmallow in other cases
+            schema = self._schema_registry.get(_type, dump=True)
+            func = schema.dump if is_payload else schema.dumps
+            serialized_data = func(value, many=many)
+
+        if self._use_request_payload_validation:
+            self._validate(serialized_data, _type, many)
+
+        return serialized_data
+
+    def _validate(self, serialized_data: 'JSON_PAYLOAD | bytes', _type: t.Type, many: bool):
+        for _ in self._deserializer.deserialize(serialized_data, _type, many=many):
+            pass
+
+    @classmethod
+    def _serialize_datetime(cls, value: datetime) -> str:
+        # use ISO format: YYYY-MM-DDTHH:mm:ss[.ms]Z
+        value = value.astimezone(timezone.utc).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    @classmethod
+    def _serialize_timestamp(cls, value) -> str:
+        # for pandas.Timestamp
+        return cls._serialize_datetime(value.to_pydatetime())
+
+    @classmethod
+    def _serialize_timedelta(cls, value: timedelta) -> str:
+        return '{seconds}s'.format(seconds=int(value.total_seconds()))
+
+    @classmethod
+    def _serialize_decimal(cls, value: Decimal) -> str:
+        return str(value)
+
+
+class BaseDeserializer:
+    def __init__(
+        self,
+        use_response_streaming: bool,
+        schema_registry: 'SchemaRegistry',
+        json_codec: 'JsonCodec',
+    ):
+        self._use_response_streaming = use_response_streaming
+        self._schema_registry = schema_registry
+        self._json_codec = json_codec
+
+    def deserialize(self, raw_data: RESPONSE_BODY, data_class: t.Type | None = None, many: bool = False) -> t.Iterator[t.Any]:
+        yield from self._load_items(raw_data, data_class, many)
+
+    def _load_items(self, raw_data: RESPONSE_BODY, data_class: t.Type | None, many: bool) -> t.Iterator[t.Any]:
+        """
+        Parse JSON of response, then construct objects of it.
+        """
+        if hasattr(raw_data, 'read'):
+            # read singular JSON objects at once and multiple objects in stream to reduce memory footprint
+            if many and self._use_response_streaming:
+                raw_data = self._json_codec.items(raw_data)
+            else:
+                raw_data = self._json_codec.loads(raw_data.read())
+
+        if raw_data == '':
+            # blank response means null
+            yield None
+            return
+
+        load = self._get_loader(data_class)
+        if many:
+            yield from map(load, raw_data)
+        else:
+            yield load(raw_data)
+
+    def _get_loader(self, data_class: t.Type | None) -> t.Callable[[t.Any], t.Any]:
+        if data_class is None:
+            # skip further deserialization
+            return lambda value: value
+
+        # pick built-in deserializer if specified for class
+        method_name = '_deserialize_{type}'.format(type=data_class.__name__.lower())
+        if hasattr(self, method_name):
+            return getattr(self, method_name)
+
+        # use generated decoder if available (USE_FAST_CODECS=1)
+        decoder = getattr(data_class, 'from_dict', None)
+        if decoder is not None:
+            return decoder
+
+        try:
+            # use marshmallow in other cases
+            return self._schema_registry.get(data_class).load
+        except TypeError:
+            # fallback to default constructor
+            return data_class
+
+    @classmethod
+    def _deserialize_datetime(cls, raw: str) -> datetime:
+        if raw.endswith('Z'):
+            raw = raw[:-1] + '+00:00'
+        return datetime.fromisoformat(raw)
+
+    @classmethod
+    def _deserialize_timedelta(cls, raw: str) -> timedelta:
+        if raw.endswith('s'):
+            return timedelta(seconds=int(raw[:-1]))
+        raise NotImplementedError(f'Unsupported value for timedelta deserialization: {raw}')
+
+
+class BaseSchemaRegistry:
+    """
+    Cache of codecs of model library, built once per class and variant (e.g. load/dump or single/many).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, data_class: t.Type | None, variant: bool = False) -> t.Any:
+        key = (data_class, variant)
+        schema = self._schemas.get(key)
+        if schema is not None:
+            with self._lock:
+                self._hits += 1
+            return schema
+
+        with self._lock:
+            # other thread might have built it while we were waiting
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._hits += 1
+                return schema
+
+            self._misses += 1
+            schema = self._schemas[key] = self._build(data_class, variant)
+            return schema
+
+    def _build(self, data_class: t.Type | None, variant: bool) -> t.Any:
+        raise NotImplementedError
+
+    def is_model(self, value: t.Any) -> bool:
+        """
+        Whether value is a class handled by model library.
+        """
+        raise NotImplementedError
+
+    def warm_up(self, collection: type):
+        """
+        Build codecs for all classes of given collection (e.g. AllDataclassesCollection) in advance.
+        """
+        for value in vars(collection).values():
+            if self.is_model(value):
+                self.get(value, False)
+                self.get(value, True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                size=len(self._schemas),
+                hits=self._hits,
+                misses=self._misses,
+            )
+
+
+class SchemaRegistry(BaseSchemaRegistry):
+    """
+    Cache of marshmallow schemas, built once per dataclass and direction (load/dump).
+    """
+
+    def get(self, data_class: t.Type, dump: bool = False) -> marshmallow.Schema:
+        return super().get(data_class, dump)
+
+    def _build(self, data_class: t.Type, dump: bool) -> marshmallow.Schema:
+        if dump:
+            return marshmallow_dataclass.class_schema(data_class)()
+        return marshmallow_dataclass.class_schema(data_class, base_schema=BaseSchema)()
+
+    def is_model(self, value: t.Any) -> bool:
+        return is_dataclass(value)
+
+
+class RetryPolicy:
+    """
+    Decides whether failed call should be repeated and how long to wait before next attempt.
+
+    Uses exponential backoff with full jitter and a retry budget (token bucket) shared by all calls of the client,
+    so that retries of many concurrent calls are spread in time and limited during outages.
+    Non-idempotent requests (e.g. POST) are repeated only if the server declined them (429, 503).
+    Delay from 'Retry-After' response header is respected.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'TRACE', 'PUT', 'DELETE'))
+    RETRYABLE_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+    DECLINED_STATUSES = frozenset((429, 503))
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_timeout: float = 1,
+        max_timeout: float = 60,
+        budget_rate: float | None = 10,
+        budget_burst: int = 20,
+        retry_non_idempotent: bool = False,
+    ):
+        """
+        :param max_attempts: number of attempts (including the first one) before error is raised
+        :param base_timeout: upper bound of delay before second attempt (seconds), doubled for each next one
+        :param max_timeout: upper bound of any delay, including the one requested by 'Retry-After' (seconds)
+        :param budget_rate: number of retries per second allowed for all calls together (None for unlimited)
+        :param budget_burst: max number of retries allowed at once after a quiet period
+        :param retry_non_idempotent: repeat non-idempotent requests after network and server errors too
+        """
+        self.max_attempts = max_attempts
+        self.base_timeout = base_timeout
+        self.max_timeout = max_timeout
+        self.budget_rate = budget_rate
+        self.budget_burst = budget_burst
+        self.retry_non_idempotent = retry_non_idempotent
+
+        self._lock = threading.Lock()
+        self._tokens = float(budget_burst)
+        self._tokens_updated_at = time.monotonic()
+        self._retries = 0
+        self._rejected_by_budget = 0
+
+    def is_idempotent(self, method: str) -> bool:
+        return self.retry_non_idempotent or method.upper() in self.IDEMPOTENT_METHODS
+
+    def get_delay(self, error: Exception, attempt: int, idempotent: bool = True) -> float | None:
+        """
+        Seconds to wait before next attempt, or None if error should be raised.
+
+        :param error: exception of failed attempt (HTTP errors are expected to have `status` and `headers` attributes)
+        :param attempt: number of failed attempt, starting from 1
+        :param idempotent: whether repeated call is safe in case of the first one has reached the server
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        status = getattr(error, 'status', None)
+        if status is not None and status not in self.RETRYABLE_STATUSES:
+            # client errors are not fixed by repeating
+            return None
+
+        if not idempotent and status not in self.DECLINED_STATUSES:
+            return None
+
+        retry_after = self._get_retry_after(error) if status in self.DECLINED_STATUSES else None
+        if retry_after is not None and retry_after > self.max_timeout:
+            # server asks to come back too late
+            return None
+
+        if not self._acquire_budget():
+            return None
+
+        if retry_after is not None:
+            return retry_after
+
+        # full jitter
+        return random.uniform(0, min(self.max_timeout, self.base_timeout * 2 ** (attempt - 1)))
+
+    def _acquire_budget(self) -> bool:
+        with self._lock:
+            if self.budget_rate is not None:
+                now = time.monotonic()
+                elapsed = now - self._tokens_updated_at
+                self._tokens = min(float(self.budget_burst), self._tokens + elapsed * self.budget_rate)
+                self._tokens_updated_at = now
+
+                if self._tokens < 1:
+                    self._rejected_by_budget += 1
+                    return False
+
+                self._tokens -= 1
+
+            self._retries += 1
+            return True
+
+    @staticmethod
+    def _get_retry_after(error: Exception) -> float | None:
+        headers = getattr(error, 'headers', None) or {}
+        value = headers.get('Retry-After')
+        if not value:
+            return None
+
+        try:
+            # delay in seconds
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            # HTTP date
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> dict[str, int]:
+        return dict(
+            retries=self._retries,
+            rejected_by_budget=self._rejected_by_budget,
+        )
+
+
+class RequestBatcher:
+    """
+    Collects concurrent calls of single-item endpoint into batches sent as one call of its bulk counterpart.
+    Batch is sent when it is full or when its first call has waited for max delay,
+    results of bulk call are split back to callers by position.
+    """
+
+    def __init__(self, max_size: int = 100, max_delay: float = 0.005):
+        """
+        :param max_size: max number of items in batch (1 disables batching)
+        :param max_delay: max seconds to wait for other calls before batch is sent
+        """
+        self.max_size = max_size
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._batches: dict[str, dict] = {}
+        self._calls = 0
+        self._requests = 0
+
+    def call(self, endpoint: str, load_many: t.Callable[[list], t.Iterable], item: t.Any) -> t.Any:
+        """
+        Return result of bulk call for given item.
+
+        :param endpoint: method name
+        :param load_many: bulk endpoint, takes list of items and returns their results in the same order
+        """
+        if self.max_size <= 1:
+            return self._load(load_many, [item])[0]
+
+        with self._lock:
+            batch = self._batches.get(endpoint)
+            leader = batch is None
+            if leader:
+                # first caller sends the batch
+                batch = self._batches[endpoint] = dict(items=[], full=threading.Event(), done=threading.Event(), results=None, error=None)
+            index = len(batch['items'])
+            batch['items'].append(item)
+            if len(batch['items']) >= self.max_size:
+                self._close(endpoint, batch)
+
+        if not leader:
+            batch['done'].wait()
+        else:
+            batch['full'].wait(self.max_delay)
+            with self._lock:
+                self._close(endpoint, batch)
+            try:
+                batch['results'] = self._load(load_many, batch['items'])
+            except BaseException as e:
+                batch['error'] = e
+            batch['done'].set()
+
+        if batch['error'] is not None:
+            raise batch['error']
+        return batch['results'][index]
+
+    def _close(self, endpoint: str, batch: dict):
+        """
+        Stop collecting items into batch (callers coming next start a new one).
+        """
+        if self._batches.get(endpoint) is batch:
+            del self._batches[endpoint]
+            batch['full'].set()
+
+    def _load(self, load_many: t.Callable[[list], t.Iterable], items: list) -> list:
+        results = list(load_many(items))
+        return self._check_results(items, results)
+
+    def _check_results(self, items: list, results: list) -> list:
+        if len(results) != len(items):
+            raise ValueError(f'Bulk call returned {len(results)} results for {len(items)} items')
+
+        with self._lock:
+            self._calls += len(items)
+            self._requests += 1
+        return results
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                calls=self._calls,
+                requests=self._requests,
+                pending=sum(len(batch['items']) for batch in self._batches.values()),
+            )
+
+
+def _get_func_name_verbose(func: t.Callable) -> str:
+    if hasattr(func, '__self__'):
+        if hasattr(func.__self__, '__name__'):
+            return '{}.{}'.format(func.__self__.__name__, func.__name__)
+        return '{}.{}'.format(func.__self__.__class__.__name__, func.__name__)
+    elif hasattr(func, '__name__'):
+        return func.__name__
+    return repr(func)
+
+
+def failsafe_call(
+    func: t.Callable,
+    exceptions: t.Iterable[t.Type[Exception]],
+    retry_policy: 'RetryPolicy',
+    args=None,
+    kwargs=None,
+    logger: t.Union[logging.Logger, t.Callable[[str], None]] = None,
+    idempotent: bool = True,
+    on_transitional_fail: t.Callable[[Exception, dict], None] = None,
+):
+    """
+    Call function and repeat the call on given exceptions while retry policy allows it.
+
+    :param on_transitional_fail: callback which is expected to wait for `info['delay']` seconds before next attempt
+    """
+    args = args or tuple()
+    kwargs = kwargs or dict()
+    func_name_verbose = _get_func_name_verbose(func)
+    attempt = 1
+
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except exceptions as e:
+            if logger:
+                message = 'got %s on %s, attempt %d / %d' % (
+                    e.__class__.__name__,
+                    func_name_verbose,
+                    attempt,
+                    retry_policy.max_attempts
+                )
+                if hasattr(logger, 'warning'):
+                    logger.warning(message)
+                else:
+                    logger(message)
+
+            delay = retry_policy.get_delay(e, attempt, idempotent=idempotent)
+            if delay is None:
+                raise e from None   # suppress context and multiple tracebacks of same error
+
+            if on_transitional_fail:
+                on_transitional_fail(e, dict(max_attempts=retry_policy.max_attempts, attempt=attempt, delay=delay))
+
+            attempt += 1
+
+
+class AllConstantsCollection:
+    EnumValue = EnumValue
+
+
+class AllDataclassesCollection:
+    BasicDto = BasicDto
+    ContainerDto = ContainerDto
+
+
+class AllExceptionsCollection:
+    FailedAmqpRequestError = FailedAmqpRequestError
+
+
+__all__ = [
+    "AllConstantsCollection",
+    "AllDataclassesCollection",
+    "AllExceptionsCollection",
+    "Generated",
+    "JsonCodec",
+    "RetryPolicy",
+]
@@ -10,23 +10,26 @@ from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 from decimal import Decimal
+from email.utils import parsedate_to_datetime
 from enum import Enum
-from funcy import memoize
-from gevent._semaphore import Semaphore
 from gevent.event import AsyncResult
+from gevent.event import Event
+from gevent.local import local
+from gevent.lock import Semaphore
 from kombu import Connection, Exchange, Queue, Message
 from socket import timeout as SocketTimeout
 from typeguard import typechecked
 from urllib.parse import urlparse
 from uuid import uuid4
 import gevent
-import ijson
+import importlib.util
 import io
 import json
 import logging
 import marshmallow
 import marshmallow_dataclass
 import os
+import random
 import re
 import time
 import typing as t
@@ -45,11 +48,15 @@ class Generated:
         api_keys: dict = None,
         high_priority: bool = False,
         request_timeout: int = 3600,
+        retry_policy: 'RetryPolicy | None' = None,
+        json_codec: 'JsonCodec | None' = None,
         use_request_payload_validation: bool = bool(int(os.environ.get('AMQP_CLIENT_USE_REQUEST_PAYLOAD_VALIDATION', 1))),
+        use_schema_warm_up: bool = bool(int(os.environ.get('AMQP_CLIENT_USE_SCHEMA_WARM_UP', 0))),
     ):
         """
         AMQP client constructor and configuration method.
         """
+        self._json_codec = json_codec or JsonCodec()
         self._client = AmqpApiWithLazyListener(
             amqp_url=amqp_url,
             read_exchange_name=read_exchange_name,
@@ -59,16 +66,36 @@ class Generated:
             logger=logger,
             api_keys=api_keys,
             high_priority=high_priority,
-            request_timeout=request_timeout
+            request_timeout=request_timeout,
+            retry_policy=retry_policy,
+            json_codec=self._json_codec,
         )
 
+        self._schema_registry = SchemaRegistry()
+        if use_schema_warm_up:
+            self._schema_registry.warm_up(AllDataclassesCollection)
+
         self._deserializer = BaseDeserializer(
-            use_response_streaming=False
+            use_response_streaming=False,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
         )
 
         self._serializer = BaseSerializer(
             self._deserializer,
-            use_request_payload_validation=use_request_payload_validation
+            use_request_payload_validation=use_request_payload_validation,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
+        )
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        Internal counters of client components (for diagnostics and metrics export).
+        """
+        return dict(
+            schemas=self._schema_registry.stats(),
+            retries=self._client.retry_policy.stats(),
+            json=self._json_codec.stats(),
         )
 
     def get_container_dto(self) -> 'ContainerDto':
@@ -239,30 +266,19 @@ def _verbose_amqp_url(amqp_url: str) -> str:
     return f'{parsed.hostname}:{parsed.port}'
 
 
-def _clear_instance_memoized_data(memory_dict: dict, instance):
-    """
-    Clear memoized values of @funcy.memoize only for given instance.
-    It is useful because build-in 'memory' dict stores memoized data for all instances.
-    """
-    keys_to_delete = []
-    for key in memory_dict.keys():
-        if key[0] is instance:
-            keys_to_delete.append(key)
-
-    for key in keys_to_delete:
-        del memory_dict[key]
-
-
 class AmqpWrapper:
-
     def __init__(self, amqp_url: str, read_exchange_name: str, read_queue_name: str, write_exchange_name: str = None,
-                 prefetch_count: int = 30, logger: logging.Logger = None):
+                 prefetch_count: int = 30, logger: logging.Logger = None, retry_policy: 'RetryPolicy' = None,
+                 json_codec: 'JsonCodec' = None):
         self.amqp_url = amqp_url
         self.read_exchange_name = read_exchange_name
         self.read_queue_name = read_queue_name
         self.write_exchange_name = write_exchange_name
         self.prefetch_count = prefetch_count
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        # at most 5 seconds between attempts, so connecting is given up within ~45 seconds
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=10, base_timeout=5, max_timeout=5, budget_rate=None)
+        self.json_codec = json_codec or JsonCodec()
 
         self.connection = None
         self.write_exchange = None
@@ -271,6 +287,7 @@ class AmqpWrapper:
         self.is_stopped = False
         self.producer = None
         self._incoming_message_handlers = []
+        self._read_queues: dict[str, Queue] = {}  # declared on current connection
 
     def connect(self, force=False):
         """attempts to connect. If fails, will throw an exception"""
@@ -279,14 +296,15 @@ class AmqpWrapper:
 
         self.is_connected = False
         self.is_listening = False
-        # clear memoized values (only for current instance)
-        _clear_instance_memoized_data(self.declare_read_queue.memory, self)
+        # queues are declared again on new connection
+        self._read_queues.clear()
         self.connection = Connection(self.amqp_url)
         _check_amqp_alive(self.connection, raise_exception=True)
 
         if self.write_exchange_name:
             self.write_exchange = Exchange(self.write_exchange_name, 'direct', durable=True)
-            self.producer = self.connection.Producer(serializer='json', on_return=self._handle_undelivered)
+            # messages are encoded by JSON codec instead of kombu serializer
+            self.producer = self.connection.Producer(on_return=self._handle_undelivered)
 
         # as soon as we tested connection and made the producer, switch the flag ON
         self.is_connected = True
@@ -299,13 +317,14 @@ class AmqpWrapper:
             self._try_reconnect()
 
     def _try_reconnect(self):
-        """makes 10 attempts to connect to the message broker every 5 sec, after than will throw an exception"""
+        """makes attempts to connect to the message broker with growing random delays, after than will throw an exception"""
         failsafe_call(
             self.connect,
             kwargs=dict(force=True),
             exceptions=RECOVERABLE_EXCEPTIONS,
+            retry_policy=self.retry_policy,
             logger=self.logger,
-            on_transitional_fail=lambda exc, info: time.sleep(5)
+            on_transitional_fail=lambda exc, info: gevent.sleep(info['delay'])
         )
 
     def listen(self, timeout=None, *args, **kwargs):
@@ -317,7 +336,7 @@ class AmqpWrapper:
                 read_queue = self.declare_read_queue(*args, **kwargs)
                 with self.connection.Consumer(
                     read_queue,
-                    callbacks=[self.handle],
+                    on_message=self._on_message,
                     prefetch_count=self.prefetch_count,
                     auto_declare=None,
                 ):
@@ -342,6 +361,14 @@ class AmqpWrapper:
         """Apply 'observer' pattern for listeners"""
         self._incoming_message_handlers.append(func)
 
+    def _on_message(self, message: Message):
+        if message.content_type == 'application/json' and not message.headers.get('compression'):
+            # decode by JSON codec instead of kombu serializer
+            body = self.json_codec.loads(message.body)
+        else:
+            body = message.decode()
+        self.handle(body, message)
+
     def handle(self, body: list, message: Message):
         if not self.is_connected:
             # prevents processing of downloaded messages after connection.close()
@@ -359,19 +386,36 @@ class AmqpWrapper:
         while True:
             try:
                 self.logger.debug(f'send msg to {self.write_exchange} {kwargs}: {data}')
-                return self.producer.publish(data, exchange=self.write_exchange, *args, **kwargs)
+                return self.producer.publish(
+                    self.json_codec.dumps(data),
+                    content_type='application/json',
+                    content_encoding='utf-8',
+                    exchange=self.write_exchange,
+                    *args,
+                    **kwargs,
+                )
             except RECOVERABLE_EXCEPTIONS:
                 self._try_reconnect()
 
-    @memoize
     def declare_read_queue(self, *args, **kwargs) -> Queue:
         assert self.read_queue_name, 'read_queue_name must not be empty'  # prevent assigning random name by amqp
         self.connect()
+        key = repr((args, sorted(kwargs.items())))
+        if key in self._read_queues:
+            return self._read_queues[key]
+
         read_exchange = Exchange(self.read_exchange_name, 'direct', durable=True)
         read_queue = Queue(self.read_queue_name, exchange=read_exchange, *args, **kwargs)
         read_queue(self.connection).declare()
+        self._read_queues[key] = read_queue
         return read_queue
 
+    def spawn(self, func: t.Callable[[], None]):
+        """
+        Run function in background (in a greenlet).
+        """
+        gevent.spawn(func)
+
     # noinspection PyUnusedLocal
     def _handle_undelivered(self, exception, exchange, routing_key: str, message):
         """
@@ -551,12 +595,87 @@ class AmqpApiWithLazyListener(BaseAmqpApiClient):
         return super().mk_request(routing_key, func, *args)
 
 
+class JsonCodec:
+    """
+    JSON encoder and decoder working with bytes, backed by the fastest installed library (orjson, ujson or stdlib json).
+    Streaming parser is ijson (optional, required for response streaming only) with its fastest available backend.
+
+    >>> JsonCodec('json').dumps({'foo': [1, 2]})
+    b'{"foo": [1, 2]}'
+    >>> JsonCodec('json').loads(b'{"foo": [1, 2]}')
+    {'foo': [1, 2]}
+    """
+
+    BACKENDS = ('orjson', 'ujson', 'json')
+
+    def __init__(self, backend: str | None = None, streaming_backend: str | None = None):
+        """
+        :param backend: one of BACKENDS (auto-selected if omitted)
+        :param streaming_backend: ijson backend name, e.g. yajl2_c or python (the fastest compiled one if omitted)
+        """
+        self.backend = backend or next(name for name in self.BACKENDS if importlib.util.find_spec(name) is not None)
+        if self.backend == 'orjson':
+            import orjson  # optional dependency
+            self.dumps = orjson.dumps
+            self.loads = orjson.loads
+        elif self.backend == 'ujson':
+            import ujson  # optional dependency
+            self.dumps = lambda value: ujson.dumps(value, ensure_ascii=False, escape_forward_slashes=False).encode('utf8')
+            self.loads = ujson.loads
+        elif self.backend == 'json':
+            self.dumps = lambda value: json.dumps(value).encode('utf8')
+            self.loads = json.loads
+        else:
+            raise ValueError(f'Unsupported JSON backend: {self.backend}, expected one of {self.BACKENDS}')
+
+        self.streaming_backend = streaming_backend
+
+    @property
+    def _ijson(self) -> t.Any:
+        import ijson  # optional dependency
+        return ijson.get_backend(self.streaming_backend) if self.streaming_backend else ijson
+
+    def items(self, file: t.Any) -> t.Iterator[t.Any]:
+        """
+        Parse items of JSON array one by one while reading file-like object.
+        """
+        return self._ijson.items(file, 'item', use_float=True)
+
+    def items_async(self, file: t.Any) -> t.AsyncIterator[t.Any]:
+        """
+        Parse items of JSON array one by one while reading async file-like object.
+        """
+        return self._ijson.items_async(file, 'item', use_float=True)
+
+    def stats(self) -> dict[str, str | None]:
+        try:
+            streaming_backend = self._ijson.backend
+        except ImportError:
+            streaming_backend = None
+
+        return dict(
+            backend=self.backend,
+            streaming_backend=streaming_backend,
+        )
+
+
 class BaseSerializer:
-    def __init__(self, deserializer: 'BaseDeserializer', use_request_payload_validation: bool):
+    def __init__(
+        self,
+        deserializer: 'BaseDeserializer',
+        use_request_payload_validation: bool,
+        schema_registry: 'SchemaRegistry',
+        json_codec: 'JsonCodec',
+    ):
         self._use_request_payload_validation = use_request_payload_validation
         self._deserializer = deserializer
+        self._schema_registry = schema_registry
+        self._json_codec = json_codec
+
+    def serialize(self, value: t.Any, is_payload=False) -> 'JSON_PAYLOAD | bytes | None':
+        if isinstance(value, t.Iterator):
+            value = list(value)
 
-    def serialize(self, value: t.Any, is_payload=False) -> JSON_PAYLOAD | None:
         # auto-detect collections
         many = False
         _type = type(value)
@@ -573,17 +692,8 @@ class BaseSerializer:
                 return list(map(method, value))
             return method(value)
 
-        # use marshmallow in case of dataclass
-        if is_dataclass(_type):
-            schema = marshmallow_dataclass.class_schema(_type)()
-            func = schema.dump if is_payload else schema.dumps
-            serialized_data = func(value, many=many)
-
-            if self._use_request_payload_validation:
-                gen = self._deserializer.deserialize(serialized_data, _type, many=many)
-                for _ in gen:
-                    pass
-
+        serialized_data = self._serialize_model(value, _type, many, is_payload)
+        if serialized_data is not None:
             return serialized_data
 
         if isinstance(value, t.get_args(JSON_PAYLOAD)):
@@ -597,6 +707,32 @@ class BaseSerializer:
 
         raise ValueError('Unable to serialize object of type {0}: {1}'.format(type(value), value))
 
+    def _serialize_model(self, value: t.Any, _type: t.Type, many: bool, is_payload: bool) -> 'JSON_PAYLOAD | bytes | None':
+        """
+        Serialized dataclass (or list of them), None for values of other types.
+        """
+        if not is_dataclass(_type):
+            return None
+
+        encoder = getattr(_type, 'to_dict', None)
+        if is_payload and encoder is not None:
+            # use generated encoder if available (USE_FAST_CODECS=1)
+            serialized_data = list(map(encoder, value)) if many else encoder(value)
+        else:
+            # use marshmallow in other cases
+            schema = self._schema_registry.get(_type, dump=True)
+            func = schema.dump if is_payload else schema.dumps
+            serialized_data = func(value, many=many)
+
+        if self._use_request_payload_validation:
+            self._validate(serialized_data, _type, many)
+
+        return serialized_data
+
+    def _validate(self, serialized_data: 'JSON_PAYLOAD | bytes', _type: t.Type, many: bool):
+        for _ in self._deserializer.deserialize(serialized_data, _type, many=many):
+            pass
+
     @classmethod
     def _serialize_datetime(cls, value: datetime) -> str:
         # use ISO format: YYYY-MM-DDTHH:mm:ss[.ms]Z
@@ -620,51 +756,62 @@ class BaseSerializer:
 
 
 class BaseDeserializer:
-    def __init__(self, use_response_streaming: bool):
+    def __init__(
+        self,
+        use_response_streaming: bool,
+        schema_registry: 'SchemaRegistry',
+        json_codec: 'JsonCodec',
+    ):
         self._use_response_streaming = use_response_streaming
+        self._schema_registry = schema_registry
+        self._json_codec = json_codec
 
     def deserialize(self, raw_data: RESPONSE_BODY, data_class: t.Type | None = None, many: bool = False) -> t.Iterator[t.Any]:
+        yield from self._load_items(raw_data, data_class, many)
+
+    def _load_items(self, raw_data: RESPONSE_BODY, data_class: t.Type | None, many: bool) -> t.Iterator[t.Any]:
+        """
+        Parse JSON of response, then construct objects of it.
+        """
         if hasattr(raw_data, 'read'):
             # read singular JSON objects at once and multiple objects in stream to reduce memory footprint
             if many and self._use_response_streaming:
-                raw_data = ijson.items(raw_data, 'item', use_float=True)
+                raw_data = self._json_codec.items(raw_data)
             else:
-                raw_data = json.loads(raw_data.read())
+                raw_data = self._json_codec.loads(raw_data.read())
 
         if raw_data == '':
             # blank response means null
             yield None
             return
 
+        load = self._get_loader(data_class)
+        if many:
+            yield from map(load, raw_data)
+        else:
+            yield load(raw_data)
+
+    def _get_loader(self, data_class: t.Type | None) -> t.Callable[[t.Any], t.Any]:
         if data_class is None:
             # skip further deserialization
-            if many:
-                yield from raw_data
-            else:
-                yield raw_data
-            return
+            return lambda value: value
 
         # pick built-in deserializer if specified for class
         method_name = '_deserialize_{type}'.format(type=data_class.__name__.lower())
         if hasattr(self, method_name):
-            method = getattr(self, method_name)
-            if many:
-                yield from map(method, raw_data)
-            else:
-                yield method(raw_data)
-        else:
-            try:
-                # use marshmallow in other cases
-                schema = marshmallow_dataclass.class_schema(data_class, base_schema=BaseSchema)()
-            except TypeError:
-                # fallback to default constructor
-                yield data_class(raw_data)
-                return
+            return getattr(self, method_name)
 
-            if many:
-                yield from map(schema.load, raw_data)
-            else:
-                yield schema.load(raw_data)
+        # use generated decoder if available (USE_FAST_CODECS=1)
+        decoder = getattr(data_class, 'from_dict', None)
+        if decoder is not None:
+            return decoder
+
+        try:
+            # use marshmallow in other cases
+            return self._schema_registry.get(data_class).load
+        except TypeError:
+            # fallback to default constructor
+            return data_class
 
     @classmethod
     def _deserialize_datetime(cls, raw: str) -> datetime:
@@ -679,6 +826,203 @@ class BaseDeserializer:
         raise NotImplementedError(f'Unsupported value for timedelta deserialization: {raw}')
 
 
+class BaseSchemaRegistry:
+    """
+    Cache of codecs of model library, built once per class and variant (e.g. load/dump or single/many).
+    """
+
+    def __init__(self):
+        self._lock = Semaphore()
+        self._schemas = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, data_class: t.Type | None, variant: bool = False) -> t.Any:
+        key = (data_class, variant)
+        schema = self._schemas.get(key)
+        if schema is not None:
+            with self._lock:
+                self._hits += 1
+            return schema
+
+        with self._lock:
+            # other thread might have built it while we were waiting
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._hits += 1
+                return schema
+
+            self._misses += 1
+            schema = self._schemas[key] = self._build(data_class, variant)
+            return schema
+
+    def _build(self, data_class: t.Type | None, variant: bool) -> t.Any:
+        raise NotImplementedError
+
+    def is_model(self, value: t.Any) -> bool:
+        """
+        Whether value is a class handled by model library.
+        """
+        raise NotImplementedError
+
+    def warm_up(self, collection: type):
+        """
+        Build codecs for all classes of given collection (e.g. AllDataclassesCollection) in advance.
+        """
+        for value in vars(collection).values():
+            if self.is_model(value):
+                self.get(value, False)
+                self.get(value, True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                size=len(self._schemas),
+                hits=self._hits,
+                misses=self._misses,
+            )
+
+
+class SchemaRegistry(BaseSchemaRegistry):
+    """
+    Cache of marshmallow schemas, built once per dataclass and direction (load/dump).
+    """
+
+    def get(self, data_class: t.Type, dump: bool = False) -> marshmallow.Schema:
+        return super().get(data_class, dump)
+
+    def _build(self, data_class: t.Type, dump: bool) -> marshmallow.Schema:
+        if dump:
+            return marshmallow_dataclass.class_schema(data_class)()
+        return marshmallow_dataclass.class_schema(data_class, base_schema=BaseSchema)()
+
+    def is_model(self, value: t.Any) -> bool:
+        return is_dataclass(value)
+
+
+class RetryPolicy:
+    """
+    Decides whether failed call should be repeated and how long to wait before next attempt.
+
+    Uses exponential backoff with full jitter and a retry budget (token bucket) shared by all calls of the client,
+    so that retries of many concurrent calls are spread in time and limited during outages.
+    Non-idempotent requests (e.g. POST) are repeated only if the server declined them (429, 503).
+    Delay from 'Retry-After' response header is respected.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'TRACE', 'PUT', 'DELETE'))
+    RETRYABLE_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+    DECLINED_STATUSES = frozenset((429, 503))
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_timeout: float = 1,
+        max_timeout: float = 60,
+        budget_rate: float | None = 10,
+        budget_burst: int = 20,
+        retry_non_idempotent: bool = False,
+    ):
+        """
+        :param max_attempts: number of attempts (including the first one) before error is raised
+        :param base_timeout: upper bound of delay before second attempt (seconds), doubled for each next one
+        :param max_timeout: upper bound of any delay, including the one requested by 'Retry-After' (seconds)
+        :param budget_rate: number of retries per second allowed for all calls together (None for unlimited)
+        :param budget_burst: max number of retries allowed at once after a quiet period
+        :param retry_non_idempotent: repeat non-idempotent requests after network and server errors too
+        """
+        self.max_attempts = max_attempts
+        self.base_timeout = base_timeout
+        self.max_timeout = max_timeout
+        self.budget_rate = budget_rate
+        self.budget_burst = budget_burst
+        self.retry_non_idempotent = retry_non_idempotent
+
+        self._lock = Semaphore()
+        self._tokens = float(budget_burst)
+        self._tokens_updated_at = time.monotonic()
+        self._retries = 0
+        self._rejected_by_budget = 0
+
+    def is_idempotent(self, method: str) -> bool:
+        return self.retry_non_idempotent or method.upper() in self.IDEMPOTENT_METHODS
+
+    def get_delay(self, error: Exception, attempt: int, idempotent: bool = True) -> float | None:
+        """
+        Seconds to wait before next attempt, or None if error should be raised.
+
+        :param error: exception of failed attempt (HTTP errors are expected to have `status` and `headers` attributes)
+        :param attempt: number of failed attempt, starting from 1
+        :param idempotent: whether repeated call is safe in case of the first one has reached the server
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        status = getattr(error, 'status', None)
+        if status is not None and status not in self.RETRYABLE_STATUSES:
+            # client errors are not fixed by repeating
+            return None
+
+        if not idempotent and status not in self.DECLINED_STATUSES:
+            return None
+
+        retry_after = self._get_retry_after(error) if status in self.DECLINED_STATUSES else None
+        if retry_after is not None and retry_after > self.max_timeout:
+            # server asks to come back too late
+            return None
+
+        if not self._acquire_budget():
+            return None
+
+        if retry_after is not None:
+            return retry_after
+
+        # full jitter
+        return random.uniform(0, min(self.max_timeout, self.base_timeout * 2 ** (attempt - 1)))
+
+    def _acquire_budget(self) -> bool:
+        with self._lock:
+            if self.budget_rate is not None:
+                now = time.monotonic()
+                elapsed = now - self._tokens_updated_at
+                self._tokens = min(float(self.budget_burst), self._tokens + elapsed * self.budget_rate)
+                self._tokens_updated_at = now
+
+                if self._tokens < 1:
+                    self._rejected_by_budget += 1
+                    return False
+
+                self._tokens -= 1
+
+            self._retries += 1
+            return True
+
+    @staticmethod
+    def _get_retry_after(error: Exception) -> float | None:
+        headers = getattr(error, 'headers', None) or {}
+        value = headers.get('Retry-After')
+        if not value:
+            return None
+
+        try:
+            # delay in seconds
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            # HTTP date
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> dict[str, int]:
+        return dict(
+            retries=self._retries,
+            rejected_by_budget=self._rejected_by_budget,
+        )
+
+
 def _get_func_name_verbose(func: t.Callable) -> str:
     if hasattr(func, '__self__'):
         if hasattr(func.__self__, '__name__'):
@@ -692,48 +1036,47 @@ def _get_func_name_verbose(func: t.Callable) -> str:
 def failsafe_call(
     func: t.Callable,
     exceptions: t.Iterable[t.Type[Exception]],
+    retry_policy: 'RetryPolicy',
     args=None,
     kwargs=None,
     logger: t.Union[logging.Logger, t.Callable[[str], None]] = None,
-    attempt=1,
-    max_attempts=10,
+    idempotent: bool = True,
     on_transitional_fail: t.Callable[[Exception, dict], None] = None,
 ):
+    """
+    Call function and repeat the call on given exceptions while retry policy allows it.
+
+    :param on_transitional_fail: callback which is expected to wait for `info['delay']` seconds before next attempt
+    """
     args = args or tuple()
     kwargs = kwargs or dict()
     func_name_verbose = _get_func_name_verbose(func)
+    attempt = 1
 
-    try:
-        return func(*args, **kwargs)
-    except exceptions as e:
-        if logger:
-            message = 'got %s on %s, attempt %d / %d' % (
-                e.__class__.__name__,
-                func_name_verbose,
-                attempt,
-                max_attempts
-            )
-            if hasattr(logger, 'warning'):
-                logger.warning(message)
-            else:
-                logger(message)
-
-        if attempt >= max_attempts:
-            raise e from None   # suppress context and multiple tracebacks of same error
-
-        if on_transitional_fail:
-            on_transitional_fail(e, dict(max_attempts=max_attempts, attempt=attempt))
-
-        return failsafe_call(
-            func,
-            exceptions,
-            args,
-            kwargs,
-            logger,
-            attempt + 1,
-            max_attempts,
-            on_transitional_fail
-        )
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except exceptions as e:
+            if logger:
+                message = 'got %s on %s, attempt %d / %d' % (
+                    e.__class__.__name__,
+                    func_name_verbose,
+                    attempt,
+                    retry_policy.max_attempts
+                )
+                if hasattr(logger, 'warning'):
+                    logger.warning(message)
+                else:
+                    logger(message)
+
+            delay = retry_policy.get_delay(e, attempt, idempotent=idempotent)
+            if delay is None:
+                raise e from None   # suppress context and multiple tracebacks of same error
+
+            if on_transitional_fail:
+                on_transitional_fail(e, dict(max_attempts=retry_policy.max_attempts, attempt=attempt, delay=delay))
+
+            attempt += 1
 
 
 class AllConstantsCollection:
@@ -755,4 +1098,6 @@ __all__ = [
     "AllExceptionsCollection",
     "AmqpApiWithLazyListener",
     "Generated",
+    "JsonCodec",
+    "RetryPolicy",
 ]
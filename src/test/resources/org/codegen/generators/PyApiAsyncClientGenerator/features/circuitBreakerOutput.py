@@ -0,0 +1,1471 @@
+# Auto-generated by ez-codegen TEST_VERSION, do not edit
+# flake8: noqa
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import is_dataclass
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from decimal import Decimal
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typeguard import typechecked
+from urllib.parse import urljoin, urlencode
+from urllib.parse import urlparse
+import aiohttp
+import asyncio
+import collections
+import gzip
+import importlib.util
+import io
+import json
+import logging
+import marshmallow
+import marshmallow_dataclass
+import os
+import random
+import re
+import threading
+import time
+import typing as t
+
+
+class Generated:
+    @typechecked
+    def __init__(
+        self,
+        base_url: str = '',
+        headers: dict[str, str | t.Callable[[], str]] | None = None,
+        logger: t.Union[logging.Logger, t.Callable[[str], None], None] = None,
+        max_retries: int = int(os.environ.get('API_CLIENT_MAX_RETRIES', 5)),
+        retry_timeout: float = float(os.environ.get('API_CLIENT_RETRY_TIMEOUT', 3)),
+        retry_max_timeout: float = float(os.environ.get('API_CLIENT_RETRY_MAX_TIMEOUT', 60)),
+        retry_budget: float = float(os.environ.get('API_CLIENT_RETRY_BUDGET', 10)),
+        retry_policy: 'RetryPolicy | None' = None,
+        use_circuit_breaker: bool = bool(int(os.environ.get('API_CLIENT_USE_CIRCUIT_BREAKER', 0))),
+        circuit_breaker: 'CircuitBreaker | None' = None,
+        user_agent: str | None = os.environ.get('API_CLIENT_USER_AGENT'),
+        use_response_streaming = bool(int(os.environ.get('API_CLIENT_USE_STREAMING', 1))),
+        use_response_compression: bool = bool(int(os.environ.get('API_CLIENT_USE_RESPONSE_COMPRESSION', 1))),
+        request_compression: str | None = os.environ.get('API_CLIENT_REQUEST_COMPRESSION'),
+        request_compression_min_size: int = int(os.environ.get('API_CLIENT_REQUEST_COMPRESSION_MIN_SIZE', 1024)),
+        use_request_payload_validation: bool = bool(int(os.environ.get('API_CLIENT_USE_REQUEST_PAYLOAD_VALIDATION', 1))),
+        use_request_streaming: bool = bool(int(os.environ.get('API_CLIENT_USE_REQUEST_STREAMING', 0))),
+        json_codec: 'JsonCodec | None' = None,
+        use_schema_warm_up: bool = bool(int(os.environ.get('API_CLIENT_USE_SCHEMA_WARM_UP', 0))),
+        use_debug_curl: bool = bool(int(os.environ.get('API_CLIENT_USE_DEBUG_CURL', 0))),
+        request_kwargs: dict[str, t.Any] | None = None,
+        connection_pool_kwargs: dict[str, t.Any] | None = None,
+        exception_class: t.Type[Exception] = RuntimeError,
+    ):
+        """
+        API client constructor and configuration method.
+
+        :param base_url: protocol://url[:port]
+        :param headers: dict of HTTP headers (e.g. tokens)
+        :param logger: logger instance (or callable like print()) for requests diagnostics
+        :param max_retries: number of request attempts before Exception defined in `exception_class` raised
+        :param retry_timeout: max seconds before second attempt, doubled for each next one (actual delay is random)
+        :param retry_max_timeout: max seconds between attempts (longer 'Retry-After' delays are not awaited)
+        :param retry_budget: max number of retries per second for all requests of the client
+        :param retry_policy: custom retry policy (overrides max_retries and retry_* arguments)
+        :param use_circuit_breaker: reject requests to a host without sending while most of recent requests to it fail
+        :param circuit_breaker: custom circuit breaker (e.g. shared between clients), enables it regardless of use_circuit_breaker
+        :param user_agent: request header
+        :param use_response_streaming: enable alternative JSON library for deserialization (lower latency and memory footprint)
+        :param use_response_compression: ask server for compressed responses (decompressed on the fly while parsed)
+        :param request_compression: Content-Encoding of JSON request bodies, gzip or zstd (server has to support it)
+        :param request_compression_min_size: min size of JSON request body (in bytes) to be compressed
+        :param use_request_payload_validation: enable client-side validation of serialized data before send
+        :param use_request_streaming: send sequence payloads (including iterators) item by item with chunked transfer encoding
+        :param json_codec: custom JSON library choice (the fastest installed one is used by default)
+        :param use_schema_warm_up: build serialization schemas for all dataclasses in advance (instead of first use)
+        :param use_debug_curl: include curl-formatted data for requests diagnostics
+        :param request_kwargs: optional request arguments
+        :param connection_pool_kwargs: optional arguments for internal connection pool (urllib3.PoolManager or aiohttp.TCPConnector)
+        :param exception_class: exception class for irrecoverable API errors
+        """
+        self._retry_policy = retry_policy or RetryPolicy(
+            max_attempts=max_retries,
+            base_timeout=retry_timeout,
+            max_timeout=retry_max_timeout,
+            budget_rate=retry_budget,
+        )
+
+        self._json_codec = json_codec or JsonCodec()
+        self._circuit_breaker = circuit_breaker or (CircuitBreaker() if use_circuit_breaker else None)
+
+        self._client = BaseJsonHttpAsyncClient(
+            base_url=base_url,
+            logger=logger,
+            retry_policy=self._retry_policy,
+            json_codec=self._json_codec,
+            circuit_breaker=self._circuit_breaker,
+            user_agent=user_agent,
+            headers=headers,
+            use_response_streaming=use_response_streaming,
+            use_response_compression=use_response_compression,
+            request_compression=request_compression,
+            request_compression_min_size=request_compression_min_size,
+            use_debug_curl=use_debug_curl,
+            request_kwargs=request_kwargs or {},
+            connection_pool_kwargs=connection_pool_kwargs or {},
+            exception_class=exception_class,
+        )
+
+        self._schema_registry = SchemaRegistry()
+        if use_schema_warm_up:
+            self._schema_registry.warm_up(AllDataclassesCollection)
+
+        self._deserializer = BaseAsyncDeserializer(
+            use_response_streaming=use_response_streaming,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
+        )
+
+        self._serializer = BaseSerializer(
+            self._deserializer,
+            use_request_payload_validation=use_request_payload_validation,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
+            use_request_streaming=use_request_streaming,
+        )
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        Internal counters of client components (for diagnostics and metrics export).
+        """
+        return dict(
+            schemas=self._schema_registry.stats(),
+            retries=self._retry_policy.stats(),
+            circuits=self._circuit_breaker.stats() if self._circuit_breaker else {},
+            traffic=self._client.get_traffic_stats(),
+            json=self._json_codec.stats(),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Close HTTP session and release pooled connections.
+        """
+        await self._client.aclose()
+
+    def gather(
+        self,
+        endpoint: str | t.Callable[..., t.Any],
+        kwargs_iter: t.Iterable[dict[str, t.Any]] | t.AsyncIterable[dict[str, t.Any]],
+        concurrency: int | None = None,
+        ordered: bool = True,
+        return_exceptions: bool = True,
+    ) -> t.AsyncIterator[tuple[dict[str, t.Any], t.Any]]:
+        """
+        Call endpoint concurrently with each of given keyword arguments, yield (kwargs, result) pairs.
+
+        :param endpoint: method name (e.g. 'get_item') or the method itself
+        :param kwargs_iter: keyword arguments of calls (sync or async iterable), consumed lazily
+        :param concurrency: max number of calls running at once (connection limit by default)
+        :param ordered: yield results in order of arguments (otherwise as soon as calls complete)
+        :param return_exceptions: yield exception of failed call as its result (other calls go on), otherwise raise it and cancel calls in progress
+        """
+        return gather_concurrently(
+            getattr(self, endpoint) if isinstance(endpoint, str) else endpoint,
+            kwargs_iter,
+            concurrency=concurrency or self._client.max_connections,
+            ordered=ordered,
+            return_exceptions=return_exceptions,
+        )
+
+    async def get_container_dto(self) -> 'ContainerDto':
+        raw_data = await self._client.fetch(
+            url='/api/v1/container',
+            endpoint='get_container_dto',
+        )
+        gen = self._deserializer.deserialize(raw_data, ContainerDto)
+        return next(gen)
+
+    async def some_action(self, enum: 'EnumValue'):
+        await self._client.fetch(
+            url=f'api/v1/action/{enum}',
+            endpoint='some_action',
+            method='POST',
+        )
+
+    async def get_basic_dto_list(self) -> t.AsyncIterator['BasicDto']:
+        """
+        Endpoint description
+
+        Second line
+        """
+        raw_data = await self._client.fetch(
+            url='api/v1/basic',
+            endpoint='get_basic_dto_list',
+            stream=True,
+        )
+        async for item in self._deserializer.deserialize_async(raw_data, BasicDto, many=True):
+            yield item
+
+    async def create_basic_dto(self, item: 'BasicDto') -> 'BasicDto':
+        item = self._serializer.serialize(item, is_payload=True)
+        raw_data = await self._client.fetch(
+            url='api/v1/basic',
+            endpoint='create_basic_dto',
+            method='POST',
+            json_body=item,
+        )
+        gen = self._deserializer.deserialize(raw_data, BasicDto)
+        return next(gen)
+
+    async def create_basic_dto_bulk(self, items: t.Iterable['BasicDto']) -> t.AsyncIterator['BasicDto']:
+        items = self._serializer.serialize(items, is_payload=True)
+        raw_data = await self._client.fetch(
+            url='api/v1/basic/bulk',
+            endpoint='create_basic_dto_bulk',
+            method='POST',
+            json_body=items,
+            stream=True,
+        )
+        async for item in self._deserializer.deserialize_async(raw_data, BasicDto, many=True):
+            yield item
+
+    async def get_basic_dto_by_timestamp(self, timestamp: datetime) -> 'BasicDto':
+        timestamp = self._serializer.serialize(timestamp)
+        raw_data = await self._client.fetch(
+            url=f'api/v1/basic/{timestamp}',
+            endpoint='get_basic_dto_by_timestamp',
+        )
+        gen = self._deserializer.deserialize(raw_data, BasicDto)
+        return next(gen)
+
+    async def ping(self):
+        await self._client.fetch(
+            url='api/v1/ping',
+            endpoint='ping',
+        )
+
+
+class BaseSchema(marshmallow.Schema):
+    class Meta:
+        # allow backward-compatible changes when new fields have added (simply ignore them)
+        unknown = marshmallow.EXCLUDE
+
+
+class JavaDurationField(marshmallow.fields.Field):
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            return str_java_duration_to_timedelta(value)
+        except ValueError as error:
+            raise marshmallow.ValidationError(str(error)) from error
+
+    def _serialize(self, value: timedelta | None, attr: str, obj, **kwargs):
+        if value is None:
+            return None
+        return timedelta_to_java_duration(value) if value else "PT0S"
+
+
+def str_java_duration_to_timedelta(duration: str) -> timedelta:
+    """
+    >>> str_java_duration_to_timedelta('PT5S')
+    datetime.timedelta(seconds=5)
+
+    >>> str_java_duration_to_timedelta('PT10H59S')
+    datetime.timedelta(seconds=36059)
+
+    >>> str_java_duration_to_timedelta('PT0H5M')
+    datetime.timedelta(seconds=300)
+    """
+    groups = re.findall(r'PT(\d+H)?(\d+M)?([\d.]+S)?', duration)[0]
+    if not groups:
+        raise ValueError('Invalid duration: %s' % duration)
+
+    hours, minutes, seconds = groups
+
+    hours = int((hours or '0H').rstrip('H'))
+    minutes = int((minutes or '0M').rstrip('M'))
+    seconds = float((seconds or '0S').rstrip('S'))
+
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def timedelta_to_java_duration(delta: timedelta) -> str:
+    """
+    Converts a timedelta to java duration string format
+    Milliseconds are discarded
+
+    >>> timedelta_to_java_duration(timedelta(minutes=15))
+    'PT900S'
+
+    >>> timedelta_to_java_duration(timedelta(days=1, minutes=21, seconds=35))
+    'PT87695S'
+
+    >>> timedelta_to_java_duration(timedelta(microseconds=123456))
+    'PT0S'
+    """
+    seconds = delta.total_seconds()
+    return 'PT{}S'.format(int(seconds))
+
+
+class StrEnum(str, Enum):
+    """Enum where members are also (and must be) strings."""
+
+    def __new__(cls, *values):
+        """Values must already be of type `str`"""
+        value = str(*values)
+        member = str.__new__(cls, value)
+        member._value_ = value
+        return member
+
+    def __str__(self):
+        return self._value_
+
+
+class EnumValue(StrEnum):
+    VALUE_1 = "value 1"
+    VALUE_2 = "value 2"
+    VALUE_3 = "value 3"
+
+
+@dataclass
+class BasicDto:
+    timestamp: datetime = field(metadata=dict(marshmallow_field=marshmallow.fields.DateTime()))
+    duration: timedelta = field(metadata=dict(marshmallow_field=JavaDurationField()))
+    enum_value: EnumValue = field(metadata=dict(marshmallow_field=marshmallow.fields.String(validate=[marshmallow.fields.validate.OneOf(list(map(str, EnumValue)))])))
+    json_value: dict = field(metadata=dict(marshmallow_field=marshmallow.fields.Dict()))
+    # short description
+    # very long description lol
+    documented_value: float = field(metadata=dict(marshmallow_field=marshmallow.fields.Float(data_key="customName")))
+    list_value: list[int] = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Integer(), data_key="listValue")))
+    optional_value: float = field(metadata=dict(marshmallow_field=marshmallow.fields.Float()), default=0)
+    nullable_value: bool | None = field(metadata=dict(marshmallow_field=marshmallow.fields.Boolean(allow_none=True)), default=None)
+    optional_list_value: list[int] = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Integer())), default_factory=list)
+
+
+@dataclass
+class ContainerDto:
+    """
+    entity with containers
+    """
+    basic_single: BasicDto = field(metadata=dict(marshmallow_field=marshmallow.fields.Nested(marshmallow_dataclass.class_schema(BasicDto, base_schema=BaseSchema), data_key="basic")))
+    basic_list: list[BasicDto] = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Nested(marshmallow_dataclass.class_schema(BasicDto, base_schema=BaseSchema)), data_key="basics")))
+    basic_optional_list: list[BasicDto] | None = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Nested(marshmallow_dataclass.class_schema(BasicDto, base_schema=BaseSchema)), allow_none=True, data_key="basic_nullable_list")))
+
+
+JSON_PAYLOAD = t.Union[dict, str, int, float, list]
+RESPONSE_BODY = t.Union[JSON_PAYLOAD, aiohttp.ClientResponse, io.BytesIO]
+
+
+class BaseJsonHttpAsyncClient:
+    def __init__(
+        self,
+        base_url: str,
+        logger: t.Union[logging.Logger, t.Callable[[str], None], None],
+        retry_policy: 'RetryPolicy',
+        json_codec: 'JsonCodec',
+        circuit_breaker: 'CircuitBreaker | None',
+        user_agent: str | None,
+        headers: dict[str, str | t.Callable[[], str]] | None,
+        use_response_streaming: bool,
+        use_response_compression: bool,
+        request_compression: str | None,
+        request_compression_min_size: int,
+        use_debug_curl: bool,
+        request_kwargs: dict,
+        connection_pool_kwargs: dict,
+        exception_class: t.Type[Exception],
+    ):
+        self._connection_pool_kwargs = connection_pool_kwargs
+        # aiohttp default, 0 stands for no limit
+        self.max_connections = connection_pool_kwargs.get('limit', 100) or 100
+        self._session = None
+        self._session_loop = None
+        self._base_url = base_url
+        self._logger = logger
+        self._retry_policy = retry_policy
+        self._json_codec = json_codec
+        self._circuit_breaker = circuit_breaker
+        self._user_agent = user_agent
+        self._headers = headers
+        self._use_response_streaming = use_response_streaming
+        self._use_response_compression = use_response_compression
+        self._request_compression = request_compression
+        self._request_compression_min_size = request_compression_min_size
+        if request_compression is not None:
+            # fail early on unsupported or not installed codec
+            compress_request_body(b'', request_compression)
+        self._use_debug_curl = use_debug_curl
+        self._request_kwargs = request_kwargs
+        self._exception_class = exception_class
+        self._traffic = dict(wire_bytes=0, decoded_bytes=0)
+
+    async def fetch(
+        self,
+        url: str,
+        method: str = 'get',
+        query_params: dict | None = None,
+        json_body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None' = None,
+        form_fields: dict[str, str] | None = None,
+        endpoint: str | None = None,
+        stream: bool = False,
+    ) -> RESPONSE_BODY:
+        """
+        Retrieve JSON response from remote API request.
+
+        Repeats request in case of network and server errors according to retry policy.
+        JSON body is compressed if request compression is enabled and body is large enough.
+
+        :param url: target url (relative to base url)
+        :param method: HTTP verb, e.g. get/post
+        :param query_params: key-value arguments like ?param1=11&param2=22
+        :param json_body: JSON-encoded HTTP body (stream is sent with chunked transfer encoding and is never compressed)
+        :param form_fields: form-encoded HTTP body (never compressed)
+        :param endpoint: name of called endpoint for its latency tracking and tracing (url is used if omitted)
+        :param stream: return unread JSON response for incremental parsing (if response streaming is enabled)
+        :return: decoded JSON from server
+        """
+        full_url = self._get_full_url(url, query_params)
+        headers = self._build_headers()
+        body = None
+        if json_body is not None:
+            # payload may be pre-encoded (or streamed) by serializer
+            body = json_body if isinstance(json_body, (bytes, JsonArrayStream)) else self._json_codec.dumps(json_body)
+            headers['content-type'] = 'application/json'
+        if form_fields is not None:
+            body = urlencode(form_fields)
+            headers['content-type'] = 'application/x-www-form-urlencoded'
+
+        request_headers, request_body = headers, body
+        if json_body is not None:
+            request_body, request_headers = self._compress_body(body, headers)
+
+        request_kwargs = self._request_kwargs.copy()
+        request_kwargs.update(
+            full_url=full_url,
+            method=method,
+            headers=request_headers,
+            body=request_body,
+            stream=stream,
+        )
+
+        async def send() -> RESPONSE_BODY:
+            return await failsafe_call_async(
+                self._mk_request,
+                kwargs=request_kwargs,
+                exceptions=(aiohttp.ClientConnectorError, aiohttp.ClientResponseError, ConnectionRefusedError),
+                retry_policy=self._get_retry_policy(json_body),
+                logger=self._logger,
+                idempotent=self._retry_policy.is_idempotent(method),
+                on_transitional_fail=lambda exc, info: asyncio.sleep(info['delay'])
+            )
+
+        request = send
+        try:
+            response = await request()
+        except Exception as e:
+            if self._use_debug_curl:
+                # uncompressed body is shown, curl can not compress request itself
+                curl_cmd = build_curl_command(
+                    url=full_url,
+                    method=method,
+                    headers=headers,
+                    body=body,
+                )
+                raise self._exception_class(f'Failed to {curl_cmd}: {e}') from e
+            raise self._exception_class(f'Failed to {method} {full_url}: {e}') from e
+
+        return response
+
+    async def aclose(self):
+        """
+        Close HTTP session and release pooled connections.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return long-lived session (keep-alive connections, TLS sessions and DNS cache are reused between requests).
+        Session is bound to event loop, so it is created lazily inside the running one.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._session_loop is not loop:
+            self._close_stale_session()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**self._connection_pool_kwargs),
+            )
+            self._session_loop = loop
+        return self._session
+
+    def _close_stale_session(self):
+        """
+        Close session of previous event loop (e.g. of finished asyncio.run()), it cannot be used by the current one.
+        """
+        session, loop = self._session, self._session_loop
+        self._session = None
+        if session.closed:
+            return
+        if loop.is_running() and not loop.is_closed():
+            # connections belong to that loop (e.g. of another thread), so they are closed by it
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            # stopped or closed loop would never run closing, so connections are abandoned along with it
+            session.detach()
+
+    async def _mk_request(self, full_url: str, *args, **kwargs) -> RESPONSE_BODY:
+        host = urlparse(full_url).netloc
+        if self._circuit_breaker is not None and not self._circuit_breaker.allow(host):
+            raise CircuitOpenError(f'Circuit breaker is open for {host}')
+
+        try:
+            response = await self._send_request(full_url, *args, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionRefusedError) as e:
+            # timeouts count as failures of the host, as they do for sync client
+            if self._circuit_breaker is not None:
+                self._circuit_breaker.record(host, e)
+            raise
+
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.record(host)
+        return response
+
+    async def _send_request(
+        self,
+        full_url: str,
+        method: str,
+        body: 'str | bytes | JsonArrayStream | None',
+        headers: dict | None,
+        stream: bool = False,
+    ) -> RESPONSE_BODY:
+        response = await self._get_session().request(
+            url=full_url,
+            method=method,
+            headers=headers,
+            data=body,
+        )
+
+        if stream and self._use_response_streaming and response.ok and 'json' in response.headers.get('content-type', ''):
+            # keep response open, it is parsed (and decompressed on the fly) and released by deserializer
+            response.content.on_eof(lambda: self._count_traffic(response.content))
+            return response
+
+        async with response:
+            response.raise_for_status()
+
+            if 'json' in response.headers.get('content-type', ''):
+                data = self._json_codec.loads(await response.read())
+            else:
+                data = await response.text()
+
+            self._count_traffic(response.content)
+            return data
+
+    def _count_traffic(self, content: aiohttp.StreamReader):
+        # size before decompression is tracked by aiohttp >= 3.12 only
+        self._traffic['wire_bytes'] += getattr(content, 'total_raw_bytes', content.total_bytes)
+        self._traffic['decoded_bytes'] += content.total_bytes
+
+    def get_traffic_stats(self) -> dict[str, int]:
+        """
+        Size of response bodies read so far: received over network (compressed) and decoded.
+        """
+        return self._traffic.copy()
+
+    def _get_full_url(self, url: str, query_params: dict | None = None) -> str:
+        if self._base_url:
+            url = urljoin(self._base_url, url)
+
+        if query_params:
+            query_tuples = []
+            for key, value in query_params.items():
+                if isinstance(value, (list, tuple)):
+                    for item in value:
+                        query_tuples.append((key, item))
+                else:
+                    query_tuples.append((key, value))
+
+            if '?' in url:
+                url += '&' + urlencode(query_tuples)
+            else:
+                url += '?' + urlencode(query_tuples)
+
+        return url
+
+    def _build_headers(self) -> dict[str, str]:
+        """
+        Render headers dictionary, convert callable headers into strings (if any).
+        """
+        headers = {}
+
+        if self._headers:
+            for key, value in self._headers.items():
+                if callable(value):
+                    headers[key] = value()
+                else:
+                    headers[key] = value
+
+        if self._user_agent:
+            headers['user-agent'] = self._user_agent
+
+        if not self._use_response_compression:
+            # aiohttp advertises and decodes available codecs by default (gzip and deflate, br and zstd if installed)
+            headers['accept-encoding'] = 'identity'
+
+        return headers
+
+    def _get_retry_policy(self, json_body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None') -> 'RetryPolicy':
+        if isinstance(json_body, JsonArrayStream) and not json_body.replayable:
+            # payload iterator is consumed by the first attempt
+            return RetryPolicy(max_attempts=1)
+        return self._retry_policy
+
+    def _compress_body(self, body: 'bytes | JsonArrayStream', headers: dict[str, str]) -> tuple['bytes | JsonArrayStream', dict[str, str]]:
+        """
+        Compress JSON body (if enabled and large enough), return it along with updated copy of headers.
+        """
+        if self._request_compression is None or isinstance(body, JsonArrayStream) or len(body) < self._request_compression_min_size:
+            return body, headers
+
+        body = compress_request_body(body, self._request_compression)
+        return body, {**headers, 'content-encoding': self._request_compression}
+
+
+class JsonArrayStream:
+    """
+    Request payload which is encoded into JSON array item by item while being sent (chunked transfer encoding),
+    so sequence of any length (or one-off iterator) takes constant memory.
+
+    >>> b''.join(JsonArrayStream([1, 2, 3], encode=lambda item: str(item).encode()))
+    b'[1,2,3]'
+    """
+
+    # encoded items are sent in chunks of about this size (bytes)
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, items: t.Iterable[t.Any], encode: t.Callable[[t.Any], bytes]):
+        self._items = items
+        self._encode = encode
+
+    @property
+    def replayable(self) -> bool:
+        """
+        Whether payload can be sent again (e.g. on retry), which is not the case for iterators.
+        """
+        return not isinstance(self._items, t.Iterator)
+
+    def __iter__(self) -> t.Iterator[bytes]:
+        chunk = bytearray(b'[')
+        for index, item in enumerate(self._items):
+            if index:
+                chunk += b','
+            chunk += self._encode(item)
+            if len(chunk) >= self.CHUNK_SIZE:
+                yield bytes(chunk)
+                chunk.clear()
+
+        chunk += b']'
+        yield bytes(chunk)
+
+    async def __aiter__(self) -> t.AsyncIterator[bytes]:
+        for chunk in self:
+            yield chunk
+
+
+class JsonCodec:
+    """
+    JSON encoder and decoder working with bytes, backed by the fastest installed library (orjson, ujson or stdlib json).
+    Streaming parser is ijson (optional, required for response streaming only) with its fastest available backend.
+
+    >>> JsonCodec('json').dumps({'foo': [1, 2]})
+    b'{"foo": [1, 2]}'
+    >>> JsonCodec('json').loads(b'{"foo": [1, 2]}')
+    {'foo': [1, 2]}
+    """
+
+    BACKENDS = ('orjson', 'ujson', 'json')
+
+    def __init__(self, backend: str | None = None, streaming_backend: str | None = None):
+        """
+        :param backend: one of BACKENDS (auto-selected if omitted)
+        :param streaming_backend: ijson backend name, e.g. yajl2_c or python (the fastest compiled one if omitted)
+        """
+        self.backend = backend or next(name for name in self.BACKENDS if importlib.util.find_spec(name) is not None)
+        if self.backend == 'orjson':
+            import orjson  # optional dependency
+            self.dumps = orjson.dumps
+            self.loads = orjson.loads
+        elif self.backend == 'ujson':
+            import ujson  # optional dependency
+            self.dumps = lambda value: ujson.dumps(value, ensure_ascii=False, escape_forward_slashes=False).encode('utf8')
+            self.loads = ujson.loads
+        elif self.backend == 'json':
+            self.dumps = lambda value: json.dumps(value).encode('utf8')
+            self.loads = json.loads
+        else:
+            raise ValueError(f'Unsupported JSON backend: {self.backend}, expected one of {self.BACKENDS}')
+
+        self.streaming_backend = streaming_backend
+
+    @property
+    def _ijson(self) -> t.Any:
+        import ijson  # optional dependency
+        return ijson.get_backend(self.streaming_backend) if self.streaming_backend else ijson
+
+    def items(self, file: t.Any) -> t.Iterator[t.Any]:
+        """
+        Parse items of JSON array one by one while reading file-like object.
+        """
+        return self._ijson.items(file, 'item', use_float=True)
+
+    def items_async(self, file: t.Any) -> t.AsyncIterator[t.Any]:
+        """
+        Parse items of JSON array one by one while reading async file-like object.
+        """
+        return self._ijson.items_async(file, 'item', use_float=True)
+
+    def stats(self) -> dict[str, str | None]:
+        try:
+            streaming_backend = self._ijson.backend
+        except ImportError:
+            streaming_backend = None
+
+        return dict(
+            backend=self.backend,
+            streaming_backend=streaming_backend,
+        )
+
+
+class BaseSerializer:
+    def __init__(
+        self,
+        deserializer: 'BaseDeserializer',
+        use_request_payload_validation: bool,
+        schema_registry: 'SchemaRegistry',
+        json_codec: 'JsonCodec',
+        use_request_streaming: bool = False,
+    ):
+        self._use_request_payload_validation = use_request_payload_validation
+        self._use_request_streaming = use_request_streaming
+        self._deserializer = deserializer
+        self._schema_registry = schema_registry
+        self._json_codec = json_codec
+
+    def serialize(self, value: t.Any, is_payload=False) -> 'JSON_PAYLOAD | bytes | JsonArrayStream | None':
+        if is_payload and self._use_request_streaming and isinstance(value, (list, tuple, set, t.Iterator)):
+            # encode items one at a time while request is being sent
+            return JsonArrayStream(value, encode=self._encode_payload_item)
+
+        if isinstance(value, t.Iterator):
+            value = list(value)
+
+        # auto-detect collections
+        many = False
+        _type = type(value)
+        if isinstance(value, (list, tuple, set)) and value:
+            # non-empty sequence
+            _type = type(next(iter(value)))
+            many = True
+
+        # pick built-in serializer if specified for class
+        method_name = '_serialize_{type}'.format(type=_type.__name__.lower())
+        if hasattr(self, method_name):
+            method = getattr(self, method_name)
+            if many:
+                return list(map(method, value))
+            return method(value)
+
+        serialized_data = self._serialize_model(value, _type, many, is_payload)
+        if serialized_data is not None:
+            return serialized_data
+
+        if isinstance(value, t.get_args(JSON_PAYLOAD)):
+            return value
+
+        if value is None:
+            if not is_payload:
+                # special case for null values in URL
+                return ''
+            return None
+
+        raise ValueError('Unable to serialize object of type {0}: {1}'.format(type(value), value))
+
+    def _serialize_model(self, value: t.Any, _type: t.Type, many: bool, is_payload: bool) -> 'JSON_PAYLOAD | bytes | None':
+        """
+        Serialized dataclass (or list of them), None for values of other types.
+        """
+        if not is_dataclass(_type):
+            return None
+
+        encoder = getattr(_type, 'to_dict', None)
+        if is_payload and encoder is not None:
+            # use generated encoder if available (USE_FAST_CODECS=1)
+            serialized_data = list(map(encoder, value)) if many else encoder(value)
+        else:
+            # use marshmallow in other cases
+            schema = self._schema_registry.get(_type, dump=True)
+            func = schema.dump if is_payload else schema.dumps
+            serialized_data = func(value, many=many)
+
+        if self._use_request_payload_validation:
+            self._validate(serialized_data, _type, many)
+
+        return serialized_data
+
+    def _validate(self, serialized_data: 'JSON_PAYLOAD | bytes', _type: t.Type, many: bool):
+        for _ in self._deserializer.deserialize(serialized_data, _type, many=many):
+            pass
+
+    def _encode_payload_item(self, item: t.Any) -> bytes:
+        serialized_data = self.serialize(item, is_payload=True)
+        if isinstance(serialized_data, bytes):
+            # encoded by model library already
+            return serialized_data
+        return self._json_codec.dumps(serialized_data)
+
+    @classmethod
+    def _serialize_datetime(cls, value: datetime) -> str:
+        # use ISO format: YYYY-MM-DDTHH:mm:ss[.ms]Z
+        value = value.astimezone(timezone.utc).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    @classmethod
+    def _serialize_timestamp(cls, value) -> str:
+        # for pandas.Timestamp
+        return cls._serialize_datetime(value.to_pydatetime())
+
+    @classmethod
+    def _serialize_timedelta(cls, value: timedelta) -> str:
+        return '{seconds}s'.format(seconds=int(value.total_seconds()))
+
+    @classmethod
+    def _serialize_decimal(cls, value: Decimal) -> str:
+        return str(value)
+
+
+class BaseDeserializer:
+    def __init__(
+        self,
+        use_response_streaming: bool,
+        schema_registry: 'SchemaRegistry',
+        json_codec: 'JsonCodec',
+    ):
+        self._use_response_streaming = use_response_streaming
+        self._schema_registry = schema_registry
+        self._json_codec = json_codec
+
+    def deserialize(self, raw_data: RESPONSE_BODY, data_class: t.Type | None = None, many: bool = False) -> t.Iterator[t.Any]:
+        yield from self._load_items(raw_data, data_class, many)
+
+    def _load_items(self, raw_data: RESPONSE_BODY, data_class: t.Type | None, many: bool) -> t.Iterator[t.Any]:
+        """
+        Parse JSON of response, then construct objects of it.
+        """
+        if hasattr(raw_data, 'read'):
+            # read singular JSON objects at once and multiple objects in stream to reduce memory footprint
+            if many and self._use_response_streaming:
+                raw_data = self._json_codec.items(raw_data)
+            else:
+                raw_data = self._json_codec.loads(raw_data.read())
+
+        if raw_data == '':
+            # blank response means null
+            yield None
+            return
+
+        load = self._get_loader(data_class)
+        if many:
+            yield from map(load, raw_data)
+        else:
+            yield load(raw_data)
+
+    def _get_loader(self, data_class: t.Type | None) -> t.Callable[[t.Any], t.Any]:
+        if data_class is None:
+            # skip further deserialization
+            return lambda value: value
+
+        # pick built-in deserializer if specified for class
+        method_name = '_deserialize_{type}'.format(type=data_class.__name__.lower())
+        if hasattr(self, method_name):
+            return getattr(self, method_name)
+
+        # use generated decoder if available (USE_FAST_CODECS=1)
+        decoder = getattr(data_class, 'from_dict', None)
+        if decoder is not None:
+            return decoder
+
+        try:
+            # use marshmallow in other cases
+            return self._schema_registry.get(data_class).load
+        except TypeError:
+            # fallback to default constructor
+            return data_class
+
+    @classmethod
+    def _deserialize_datetime(cls, raw: str) -> datetime:
+        if raw.endswith('Z'):
+            raw = raw[:-1] + '+00:00'
+        return datetime.fromisoformat(raw)
+
+    @classmethod
+    def _deserialize_timedelta(cls, raw: str) -> timedelta:
+        if raw.endswith('s'):
+            return timedelta(seconds=int(raw[:-1]))
+        raise NotImplementedError(f'Unsupported value for timedelta deserialization: {raw}')
+
+
+class BaseAsyncDeserializer(BaseDeserializer):
+    async def deserialize_async(self, raw_data: RESPONSE_BODY, data_class: t.Type | None = None, many: bool = False) -> t.AsyncIterator[t.Any]:
+        if not isinstance(raw_data, aiohttp.ClientResponse):
+            # response has been already read
+            for item in self.deserialize(raw_data, data_class, many=many):
+                yield item
+            return
+
+        load = self._get_loader(data_class)
+        try:
+            # parse JSON array item by item as soon as response chunks arrive
+            async for item in self._json_codec.items_async(raw_data.content):
+                yield load(item)
+        finally:
+            raw_data.release()
+
+
+class BaseSchemaRegistry:
+    """
+    Cache of codecs of model library, built once per class and variant (e.g. load/dump or single/many).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, data_class: t.Type | None, variant: bool = False) -> t.Any:
+        key = (data_class, variant)
+        schema = self._schemas.get(key)
+        if schema is not None:
+            with self._lock:
+                self._hits += 1
+            return schema
+
+        with self._lock:
+            # other thread might have built it while we were waiting
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._hits += 1
+                return schema
+
+            self._misses += 1
+            schema = self._schemas[key] = self._build(data_class, variant)
+            return schema
+
+    def _build(self, data_class: t.Type | None, variant: bool) -> t.Any:
+        raise NotImplementedError
+
+    def is_model(self, value: t.Any) -> bool:
+        """
+        Whether value is a class handled by model library.
+        """
+        raise NotImplementedError
+
+    def warm_up(self, collection: type):
+        """
+        Build codecs for all classes of given collection (e.g. AllDataclassesCollection) in advance.
+        """
+        for value in vars(collection).values():
+            if self.is_model(value):
+                self.get(value, False)
+                self.get(value, True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                size=len(self._schemas),
+                hits=self._hits,
+                misses=self._misses,
+            )
+
+
+class SchemaRegistry(BaseSchemaRegistry):
+    """
+    Cache of marshmallow schemas, built once per dataclass and direction (load/dump).
+    """
+
+    def get(self, data_class: t.Type, dump: bool = False) -> marshmallow.Schema:
+        return super().get(data_class, dump)
+
+    def _build(self, data_class: t.Type, dump: bool) -> marshmallow.Schema:
+        if dump:
+            return marshmallow_dataclass.class_schema(data_class)()
+        return marshmallow_dataclass.class_schema(data_class, base_schema=BaseSchema)()
+
+    def is_model(self, value: t.Any) -> bool:
+        return is_dataclass(value)
+
+
+class RetryPolicy:
+    """
+    Decides whether failed call should be repeated and how long to wait before next attempt.
+
+    Uses exponential backoff with full jitter and a retry budget (token bucket) shared by all calls of the client,
+    so that retries of many concurrent calls are spread in time and limited during outages.
+    Non-idempotent requests (e.g. POST) are repeated only if the server declined them (429, 503).
+    Delay from 'Retry-After' response header is respected.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'TRACE', 'PUT', 'DELETE'))
+    RETRYABLE_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+    DECLINED_STATUSES = frozenset((429, 503))
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_timeout: float = 1,
+        max_timeout: float = 60,
+        budget_rate: float | None = 10,
+        budget_burst: int = 20,
+        retry_non_idempotent: bool = False,
+    ):
+        """
+        :param max_attempts: number of attempts (including the first one) before error is raised
+        :param base_timeout: upper bound of delay before second attempt (seconds), doubled for each next one
+        :param max_timeout: upper bound of any delay, including the one requested by 'Retry-After' (seconds)
+        :param budget_rate: number of retries per second allowed for all calls together (None for unlimited)
+        :param budget_burst: max number of retries allowed at once after a quiet period
+        :param retry_non_idempotent: repeat non-idempotent requests after network and server errors too
+        """
+        self.max_attempts = max_attempts
+        self.base_timeout = base_timeout
+        self.max_timeout = max_timeout
+        self.budget_rate = budget_rate
+        self.budget_burst = budget_burst
+        self.retry_non_idempotent = retry_non_idempotent
+
+        self._lock = threading.Lock()
+        self._tokens = float(budget_burst)
+        self._tokens_updated_at = time.monotonic()
+        self._retries = 0
+        self._rejected_by_budget = 0
+
+    def is_idempotent(self, method: str) -> bool:
+        return self.retry_non_idempotent or method.upper() in self.IDEMPOTENT_METHODS
+
+    def get_delay(self, error: Exception, attempt: int, idempotent: bool = True) -> float | None:
+        """
+        Seconds to wait before next attempt, or None if error should be raised.
+
+        :param error: exception of failed attempt (HTTP errors are expected to have `status` and `headers` attributes)
+        :param attempt: number of failed attempt, starting from 1
+        :param idempotent: whether repeated call is safe in case of the first one has reached the server
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        status = getattr(error, 'status', None)
+        if status is not None and status not in self.RETRYABLE_STATUSES:
+            # client errors are not fixed by repeating
+            return None
+
+        if not idempotent and status not in self.DECLINED_STATUSES:
+            return None
+
+        retry_after = self._get_retry_after(error) if status in self.DECLINED_STATUSES else None
+        if retry_after is not None and retry_after > self.max_timeout:
+            # server asks to come back too late
+            return None
+
+        if not self._acquire_budget():
+            return None
+
+        if retry_after is not None:
+            return retry_after
+
+        # full jitter
+        return random.uniform(0, min(self.max_timeout, self.base_timeout * 2 ** (attempt - 1)))
+
+    def _acquire_budget(self) -> bool:
+        with self._lock:
+            if self.budget_rate is not None:
+                now = time.monotonic()
+                elapsed = now - self._tokens_updated_at
+                self._tokens = min(float(self.budget_burst), self._tokens + elapsed * self.budget_rate)
+                self._tokens_updated_at = now
+
+                if self._tokens < 1:
+                    self._rejected_by_budget += 1
+                    return False
+
+                self._tokens -= 1
+
+            self._retries += 1
+            return True
+
+    @staticmethod
+    def _get_retry_after(error: Exception) -> float | None:
+        headers = getattr(error, 'headers', None) or {}
+        value = headers.get('Retry-After')
+        if not value:
+            return None
+
+        try:
+            # delay in seconds
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            # HTTP date
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> dict[str, int]:
+        return dict(
+            retries=self._retries,
+            rejected_by_budget=self._rejected_by_budget,
+        )
+
+
+class CircuitOpenError(Exception):
+    """
+    Call is rejected without sending because the host keeps failing.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    Circuit of a host opens when the share of failed calls among the recent ones exceeds the threshold,
+    so further calls fail fast instead of waiting for timeouts and retries.
+    After cool-down a single probe call is let through (half-open state):
+    its success closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 50,
+        min_calls: int = 20,
+        cool_down: float = 30,
+    ):
+        """
+        :param failure_rate_threshold: share of failed calls (0..1) in the window which opens the circuit
+        :param window_size: number of recent calls of a host taken into account
+        :param min_calls: min number of calls in the window to evaluate failure rate
+        :param cool_down: seconds before the open circuit lets a probe call through
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.cool_down = cool_down
+
+        self._lock = threading.Lock()
+        self._circuits: dict[str, dict] = {}
+
+    def _get_circuit(self, host: str) -> dict:
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = dict(
+                state=self.CLOSED,
+                outcomes=collections.deque(maxlen=self.window_size),  # True for failed calls
+                opened_at=0.0,
+                rejected=0,
+            )
+        return circuit
+
+    def allow(self, host: str) -> bool:
+        """
+        Whether a call to the host may be sent now (should be followed by `record`).
+        """
+        with self._lock:
+            circuit = self._get_circuit(host)
+            if circuit['state'] == self.CLOSED:
+                return True
+
+            if time.monotonic() - circuit['opened_at'] >= self.cool_down:
+                # let a probe call through (and another one if the previous probe has not reported back in time)
+                circuit['state'] = self.HALF_OPEN
+                circuit['opened_at'] = time.monotonic()
+                return True
+
+            circuit['rejected'] += 1
+            return False
+
+    def record(self, host: str, error: Exception | None = None):
+        """
+        Report outcome of allowed call. Client errors (HTTP 4xx except 429) mean that the host is alive.
+        """
+        status = getattr(error, 'status', None)
+        if error is None or (status is not None and status < 500 and status != 429):
+            self.record_success(host)
+        else:
+            self.record_failure(host)
+
+    def record_success(self, host: str):
+        with self._lock:
+            circuit = self._get_circuit(host)
+            if circuit['state'] == self.HALF_OPEN:
+                circuit['state'] = self.CLOSED
+                circuit['outcomes'].clear()
+            circuit['outcomes'].append(False)
+
+    def record_failure(self, host: str):
+        with self._lock:
+            circuit = self._get_circuit(host)
+            outcomes = circuit['outcomes']
+            outcomes.append(True)
+
+            if circuit['state'] == self.HALF_OPEN:
+                # probe has failed
+                self._open(circuit)
+            elif circuit['state'] == self.CLOSED and len(outcomes) >= self.min_calls:
+                if sum(outcomes) / len(outcomes) >= self.failure_rate_threshold:
+                    self._open(circuit)
+
+    def _open(self, circuit: dict):
+        circuit['state'] = self.OPEN
+        circuit['opened_at'] = time.monotonic()
+
+    def get_state(self, host: str) -> str:
+        with self._lock:
+            return self._get_circuit(host)['state']
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                host: dict(
+                    state=circuit['state'],
+                    calls=len(circuit['outcomes']),
+                    failures=sum(circuit['outcomes']),
+                    rejected=circuit['rejected'],
+                )
+                for host, circuit in self._circuits.items()
+            }
+
+
+def _get_func_name_verbose(func: t.Callable) -> str:
+    if hasattr(func, '__self__'):
+        if hasattr(func.__self__, '__name__'):
+            return '{}.{}'.format(func.__self__.__name__, func.__name__)
+        return '{}.{}'.format(func.__self__.__class__.__name__, func.__name__)
+    elif hasattr(func, '__name__'):
+        return func.__name__
+    return repr(func)
+
+
+async def failsafe_call_async(
+    func: t.Callable,
+    exceptions: t.Iterable[t.Type[Exception]],
+    retry_policy: 'RetryPolicy',
+    args=None,
+    kwargs=None,
+    logger: t.Union[logging.Logger, t.Callable[[str], None]] = None,
+    idempotent: bool = True,
+    on_transitional_fail: t.Callable[[Exception, dict], t.Any] = None,
+):
+    """
+    Call function and repeat the call on given exceptions while retry policy allows it.
+
+    :param on_transitional_fail: callback which is expected to wait for `info['delay']` seconds before next attempt
+    """
+    args = args or tuple()
+    kwargs = kwargs or dict()
+    func_name_verbose = _get_func_name_verbose(func)
+    attempt = 1
+
+    while True:
+        try:
+            return await func(*args, **kwargs)
+        except exceptions as e:
+            if logger:
+                message = 'got %s on %s, attempt %d / %d' % (
+                    e.__class__.__name__,
+                    func_name_verbose,
+                    attempt,
+                    retry_policy.max_attempts
+                )
+                if hasattr(logger, 'warning'):
+                    logger.warning(message)
+                else:
+                    logger(message)
+
+            delay = retry_policy.get_delay(e, attempt, idempotent=idempotent)
+            if delay is None:
+                raise e from None   # suppress context and multiple tracebacks of same error
+
+            if on_transitional_fail:
+                await on_transitional_fail(e, dict(max_attempts=retry_policy.max_attempts, attempt=attempt, delay=delay))
+
+            attempt += 1
+
+
+REQUEST_COMPRESSION_ENCODINGS = ('gzip', 'zstd')
+
+
+def compress_request_body(body: bytes, encoding: str) -> bytes:
+    """
+    Compress request body according to Content-Encoding.
+
+    >>> gzip.decompress(compress_request_body(b'{"foo": "bar"}', 'gzip'))
+    b'{"foo": "bar"}'
+    """
+    if encoding == 'gzip':
+        # fast level is enough for repetitive JSON
+        return gzip.compress(body, compresslevel=1)
+
+    if encoding == 'zstd':
+        try:
+            from compression import zstd  # python >= 3.14
+            return zstd.compress(body)
+        except ImportError:
+            import zstandard  # optional dependency
+            return zstandard.ZstdCompressor().compress(body)
+
+    raise ValueError(f'Unsupported request compression: {encoding}, expected one of {REQUEST_COMPRESSION_ENCODINGS}')
+
+
+def build_curl_command(url: str, method: str, headers: dict[str, str], body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None') -> str:
+    """
+    >>> build_curl_command('https://example.com', 'get', {}, '')
+    'curl "https://example.com"'
+
+    >>> build_curl_command('https://example.com', 'get', {'accept-encoding': 'gzip,deflate'}, '')
+    'curl "https://example.com" --compressed'
+
+    >>> build_curl_command('https://example.com', 'put', {}, b'[1, 2]')
+    'curl "https://example.com" -X PUT -d "[1, 2]"'
+
+    >>> build_curl_command('https://example.com', 'put', {}, [1, 2])
+    'curl "https://example.com" -X PUT -d "[1, 2]"'
+
+    >>> build_curl_command('https://example.com?param1=value1&param2=value2', 'post', {'content-type': 'application/json'}, '{"foo": "bar"}')
+    'curl "https://example.com?param1=value1&param2=value2" -X POST -H "content-type: application/json" -d "{\"foo\": \"bar\"}"'
+    """
+    method = method.upper()
+
+    if method != 'GET':
+        method = f' -X {method}'
+    else:
+        method = ''
+
+    # let curl negotiate and decode compressed response itself
+    compressed = ' --compressed' if any(k.lower() == 'accept-encoding' for k in headers) else ''
+    headers = ''.join(f' -H "{k}: {v}"' for k, v in headers.items() if k.lower() != 'accept-encoding') + compressed
+
+    if isinstance(body, JsonArrayStream):
+        # do not consume payload iterator
+        body = b''.join(body) if body.replayable else b'[...]'
+
+    if isinstance(body, bytes):
+        body = body.decode('utf8', errors='replace')
+    elif body is not None and not isinstance(body, str):
+        body = json.dumps(body)
+
+    if body:
+        body = body.replace('"', '\"')
+        body = f' -d "{body}"'
+    else:
+        body = ''
+
+    return f'curl "{url}"{method}{headers}{body}'
+
+
+async def gather_concurrently(
+    func: t.Callable[..., t.Any],
+    kwargs_iter: t.Iterable[dict[str, t.Any]] | t.AsyncIterable[dict[str, t.Any]],
+    concurrency: int,
+    ordered: bool = True,
+    return_exceptions: bool = True,
+) -> t.AsyncIterator[tuple[dict[str, t.Any], t.Any]]:
+    """
+    Await func(**kwargs) in tasks for each item of kwargs_iter, yield (kwargs, result) pairs.
+    Arguments are consumed lazily, no more than `concurrency` tasks run at once.
+
+    :param ordered: yield results in order of arguments (otherwise as soon as calls complete)
+    :param return_exceptions: yield exception of failed call as its result (other calls go on), otherwise raise it and cancel calls in progress
+    """
+    async def call(kwargs: dict[str, t.Any]) -> t.Any:
+        result = func(**kwargs)
+        if isinstance(result, t.AsyncIterator):
+            # streamed results are read in task as well
+            return [item async for item in result]
+        return await result
+
+    async def iterate() -> t.AsyncIterator[dict[str, t.Any]]:
+        if isinstance(kwargs_iter, t.AsyncIterable):
+            async for kwargs in kwargs_iter:
+                yield kwargs
+        else:
+            for kwargs in kwargs_iter:
+                yield kwargs
+
+    kwargs_aiter = iterate()
+    exhausted = False
+    pending: list[tuple[dict[str, t.Any], asyncio.Task]] = []
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                kwargs = await anext(kwargs_aiter, None)
+                if kwargs is None:
+                    exhausted = True
+                else:
+                    pending.append((kwargs, asyncio.ensure_future(call(kwargs))))
+            if not pending:
+                return
+
+            awaited = [pending[0][1]] if ordered else [task for _, task in pending]
+            await asyncio.wait(awaited, return_when=asyncio.FIRST_COMPLETED)
+
+            if ordered:
+                finished = []
+                while pending and pending[0][1].done():
+                    finished.append(pending.pop(0))
+            else:
+                done = [task.done() for _, task in pending]
+                finished = [item for item, is_done in zip(pending, done) if is_done]
+                pending = [item for item, is_done in zip(pending, done) if not is_done]
+
+            for kwargs, task in finished:
+                error = task.exception()
+                if error is None:
+                    yield kwargs, task.result()
+                elif return_exceptions:
+                    yield kwargs, error
+                else:
+                    raise error
+    finally:
+        # calls in progress are dropped (e.g. on error or when caller stops iteration)
+        for _, task in pending:
+            task.cancel()
+
+
+class AllConstantsCollection:
+    EnumValue = EnumValue
+
+
+class AllDataclassesCollection:
+    BasicDto = BasicDto
+    ContainerDto = ContainerDto
+
+
+__all__ = [
+    "AllConstantsCollection",
+    "AllDataclassesCollection",
+    "CircuitBreaker",
+    "Generated",
+    "JsonCodec",
+    "RetryPolicy",
+]
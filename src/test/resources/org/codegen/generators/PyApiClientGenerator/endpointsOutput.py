@@ -7,18 +7,33 @@ from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 from decimal import Decimal
+from email.utils import parsedate_to_datetime
 from enum import Enum
 from time import sleep
 from typeguard import typechecked
 from urllib.parse import urljoin, urlencode
-import ijson
+from urllib.parse import urlparse
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
+import gzip
+import hashlib
+import importlib.util
 import io
+import itertools
 import json
 import logging
 import marshmallow
 import marshmallow_dataclass
 import os
+import pickle
+import random
 import re
+import sqlite3
+import sys
+import threading
+import time
 import typing as t
 import urllib3
 
@@ -32,10 +47,38 @@ class Generated:
         logger: t.Union[logging.Logger, t.Callable[[str], None], None] = None,
         max_retries: int = int(os.environ.get('API_CLIENT_MAX_RETRIES', 5)),
         retry_timeout: float = float(os.environ.get('API_CLIENT_RETRY_TIMEOUT', 3)),
+        retry_max_timeout: float = float(os.environ.get('API_CLIENT_RETRY_MAX_TIMEOUT', 60)),
+        retry_budget: float = float(os.environ.get('API_CLIENT_RETRY_BUDGET', 10)),
+        retry_policy: 'RetryPolicy | None' = None,
+        use_circuit_breaker: bool = bool(int(os.environ.get('API_CLIENT_USE_CIRCUIT_BREAKER', 0))),
+        circuit_breaker: 'CircuitBreaker | None' = None,
+        use_adaptive_concurrency: bool = bool(int(os.environ.get('API_CLIENT_USE_ADAPTIVE_CONCURRENCY', 0))),
+        concurrency_limiter: 'ConcurrencyLimiter | None' = None,
+        http_cache: 'HttpCache | None' = None,
+        use_request_coalescing: bool = bool(int(os.environ.get('API_CLIENT_USE_REQUEST_COALESCING', 0))),
+        use_request_hedging: bool = bool(int(os.environ.get('API_CLIENT_USE_REQUEST_HEDGING', 0))),
+        hedge_budget: float = float(os.environ.get('API_CLIENT_HEDGE_BUDGET', 10)),
+        hedge_policy: 'HedgePolicy | None' = None,
+        endpoint_cache_max_entries: int = int(os.environ.get('API_CLIENT_ENDPOINT_CACHE_MAX_ENTRIES', 1024)),
+        endpoint_cache_max_bytes: int = int(os.environ.get('API_CLIENT_ENDPOINT_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+        endpoint_cache_max_staleness: float = float(os.environ.get('API_CLIENT_ENDPOINT_CACHE_MAX_STALENESS', 0)),
+        endpoint_cache_backend: 'EndpointCacheBackend | None' = None,
+        batch_max_size: int = int(os.environ.get('API_CLIENT_BATCH_MAX_SIZE', 1)),
+        batch_max_delay: float = float(os.environ.get('API_CLIENT_BATCH_MAX_DELAY', 0.005)),
+        rate_limit: float = float(os.environ.get('API_CLIENT_RATE_LIMIT', 0)),
+        rate_limit_burst: int = int(os.environ.get('API_CLIENT_RATE_LIMIT_BURST', 1)),
+        endpoint_rate_limits: dict[str, float] | None = None,
         user_agent: str | None = os.environ.get('API_CLIENT_USER_AGENT'),
         use_response_streaming = bool(int(os.environ.get('API_CLIENT_USE_STREAMING', 1))),
+        use_response_compression: bool = bool(int(os.environ.get('API_CLIENT_USE_RESPONSE_COMPRESSION', 1))),
+        request_compression: str | None = os.environ.get('API_CLIENT_REQUEST_COMPRESSION'),
+        request_compression_min_size: int = int(os.environ.get('API_CLIENT_REQUEST_COMPRESSION_MIN_SIZE', 1024)),
         use_request_payload_validation: bool = bool(int(os.environ.get('API_CLIENT_USE_REQUEST_PAYLOAD_VALIDATION', 1))),
+        use_request_streaming: bool = bool(int(os.environ.get('API_CLIENT_USE_REQUEST_STREAMING', 0))),
+        json_codec: 'JsonCodec | None' = None,
+        use_schema_warm_up: bool = bool(int(os.environ.get('API_CLIENT_USE_SCHEMA_WARM_UP', 0))),
         use_debug_curl: bool = bool(int(os.environ.get('API_CLIENT_USE_DEBUG_CURL', 0))),
+        on_call: t.Callable[['CallEvent'], None] | None = None,
         request_kwargs: dict[str, t.Any] | None = None,
         connection_pool_kwargs: dict[str, t.Any] | None = None,
         exception_class: t.Type[Exception] = RuntimeError,
@@ -47,41 +90,184 @@ class Generated:
         :param headers: dict of HTTP headers (e.g. tokens)
         :param logger: logger instance (or callable like print()) for requests diagnostics
         :param max_retries: number of request attempts before Exception defined in `exception_class` raised
-        :param retry_timeout: seconds between attempts
+        :param retry_timeout: max seconds before second attempt, doubled for each next one (actual delay is random)
+        :param retry_max_timeout: max seconds between attempts (longer 'Retry-After' delays are not awaited)
+        :param retry_budget: max number of retries per second for all requests of the client
+        :param retry_policy: custom retry policy (overrides max_retries and retry_* arguments)
+        :param use_circuit_breaker: reject requests to a host without sending while most of recent requests to it fail
+        :param circuit_breaker: custom circuit breaker (e.g. shared between clients), enables it regardless of use_circuit_breaker
+        :param use_adaptive_concurrency: limit concurrent requests, raise limit while latency is low and cut it on 429/503 and timeouts
+        :param concurrency_limiter: custom adaptive concurrency limiter (e.g. shared between clients)
+        :param http_cache: store of GET responses revalidated by ETag/Last-Modified (no caching by default)
+        :param use_request_coalescing: share one response between identical concurrent requests of idempotent methods
+        :param use_request_hedging: send identical GET request if response is slower than p95 latency of endpoint (the first response wins)
+        :param hedge_budget: max number of hedged requests, percent of GET requests
+        :param hedge_policy: custom hedge policy (overrides hedge_budget)
+        :param endpoint_cache_max_entries: max number of stored results of cacheable endpoints
+        :param endpoint_cache_max_bytes: max approximate memory footprint of stored results of cacheable endpoints
+        :param endpoint_cache_max_staleness: seconds while expired result of cacheable endpoint is returned and refreshed in background
+        :param endpoint_cache_backend: shared store of results of cacheable endpoints (e.g. between worker processes)
+        :param batch_max_size: max number of concurrent calls of batched endpoint sent as one bulk request (1 disables batching, each call is sent on its own)
+        :param batch_max_delay: max seconds to wait for more calls of batched endpoint before bulk request is sent
+        :param rate_limit: max average number of requests per second sent by client (0 disables limit)
+        :param rate_limit_burst: max number of requests sent at once after idle period (for client-wide and endpoint limits)
+        :param endpoint_rate_limits: requests per second of endpoints (method names) overriding limits of schema (0 disables limit)
         :param user_agent: request header
         :param use_response_streaming: enable alternative JSON library for deserialization (lower latency and memory footprint)
+        :param use_response_compression: ask server for compressed responses (decompressed on the fly while parsed)
+        :param request_compression: Content-Encoding of JSON request bodies, gzip or zstd (server has to support it)
+        :param request_compression_min_size: min size of JSON request body (in bytes) to be compressed
         :param use_request_payload_validation: enable client-side validation of serialized data before send
+        :param use_request_streaming: send sequence payloads (including iterators) item by item with chunked transfer encoding
+        :param json_codec: custom JSON library choice (the fastest installed one is used by default)
+        :param use_schema_warm_up: build serialization schemas for all dataclasses in advance (instead of first use)
         :param use_debug_curl: include curl-formatted data for requests diagnostics
+        :param on_call: hook receiving phase timings of each endpoint call, e.g. to export OpenTelemetry spans (not collected by default)
         :param request_kwargs: optional request arguments
-        :param connection_pool_kwargs: optional arguments for internal connection pool
+        :param connection_pool_kwargs: optional arguments for internal connection pool (urllib3.PoolManager or aiohttp.TCPConnector)
         :param exception_class: exception class for irrecoverable API errors
         """
+        self._retry_policy = retry_policy or RetryPolicy(
+            max_attempts=max_retries,
+            base_timeout=retry_timeout,
+            max_timeout=retry_max_timeout,
+            budget_rate=retry_budget,
+        )
+
+        self._json_codec = json_codec or JsonCodec()
+        self._circuit_breaker = circuit_breaker or (CircuitBreaker() if use_circuit_breaker else None)
+        self._concurrency_limiter = (concurrency_limiter or ConcurrencyLimiter()) if use_adaptive_concurrency else None
+        self._http_cache = http_cache
+        self._single_flight = SingleFlight() if use_request_coalescing else None
+        self._hedge_policy = (hedge_policy or HedgePolicy(budget_percent=hedge_budget)) if use_request_hedging else None
+        self._endpoint_cache = EndpointCache(
+            max_entries=endpoint_cache_max_entries,
+            max_bytes=endpoint_cache_max_bytes,
+            max_staleness=endpoint_cache_max_staleness,
+            backend=endpoint_cache_backend,
+        )
+        self._request_batcher = RequestBatcher(max_size=batch_max_size, max_delay=batch_max_delay) if batch_max_size > 1 else None
+        self._rate_limit_burst = rate_limit_burst
+        self._rate_limiter = RateLimiter(rate_limit, burst=rate_limit_burst) if rate_limit else None
+        self._endpoint_rate_limits = endpoint_rate_limits or {}
+        self._endpoint_rate_limiters: dict[str, RateLimiter | None] = {}
+        self._tracer = CallTracer(on_call) if on_call is not None else None
+
         self._client = BaseJsonHttpClient(
             base_url=base_url,
             logger=logger,
-            max_retries=max_retries,
-            retry_timeout=retry_timeout,
+            retry_policy=self._retry_policy,
+            json_codec=self._json_codec,
+            circuit_breaker=self._circuit_breaker,
+            http_cache=self._http_cache,
+            single_flight=self._single_flight,
+            rate_limiter=self._rate_limiter,
+            concurrency_limiter=self._concurrency_limiter,
+            hedge_policy=self._hedge_policy,
+            tracer=self._tracer,
             user_agent=user_agent,
             headers=headers,
             use_response_streaming=use_response_streaming,
+            use_response_compression=use_response_compression,
+            request_compression=request_compression,
+            request_compression_min_size=request_compression_min_size,
             use_debug_curl=use_debug_curl,
             request_kwargs=request_kwargs or {},
             connection_pool_kwargs=connection_pool_kwargs or {},
             exception_class=exception_class,
         )
 
+        self._schema_registry = SchemaRegistry()
+        if use_schema_warm_up:
+            self._schema_registry.warm_up(AllDataclassesCollection)
+
         self._deserializer = BaseDeserializer(
-            use_response_streaming=use_response_streaming
+            use_response_streaming=use_response_streaming,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
+            tracer=self._tracer,
         )
 
         self._serializer = BaseSerializer(
             self._deserializer,
-            use_request_payload_validation=use_request_payload_validation
+            use_request_payload_validation=use_request_payload_validation,
+            schema_registry=self._schema_registry,
+            json_codec=self._json_codec,
+            use_request_streaming=use_request_streaming,
+            tracer=self._tracer,
+        )
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        Internal counters of client components (for diagnostics and metrics export).
+        """
+        return dict(
+            schemas=self._schema_registry.stats(),
+            retries=self._retry_policy.stats(),
+            circuits=self._circuit_breaker.stats() if self._circuit_breaker else {},
+            concurrency=self._concurrency_limiter.stats() if self._concurrency_limiter else {},
+            http_cache=self._http_cache.stats() if self._http_cache else {},
+            single_flight=self._single_flight.stats() if self._single_flight else {},
+            hedges=self._hedge_policy.stats() if self._hedge_policy else {},
+            endpoint_cache=self._endpoint_cache.stats(),
+            batches=self._request_batcher.stats() if self._request_batcher else {},
+            rate_limit=self._rate_limiter.stats() if self._rate_limiter else {},
+            endpoint_rate_limits={
+                endpoint: limiter.stats()
+                for endpoint, limiter in list(self._endpoint_rate_limiters.items())
+                if limiter is not None
+            },
+            traffic=self._client.get_traffic_stats(),
+            json=self._json_codec.stats(),
+        )
+
+    def invalidate_cache(self, endpoint: str | None = None):
+        """
+        Drop stored results of cacheable endpoint (method name, e.g. 'get_item') or all of them.
+        """
+        self._endpoint_cache.invalidate(endpoint)
+
+    def _get_rate_limiter(self, endpoint: str, rate: float) -> 'RateLimiter | None':
+        """
+        Rate limiter of endpoint (method name), limit from schema may be overridden by client argument.
+        """
+        if endpoint not in self._endpoint_rate_limiters:
+            rate = self._endpoint_rate_limits.get(endpoint, rate)
+            limiter = RateLimiter(rate, burst=self._rate_limit_burst) if rate else None
+            # concurrent callers share the first created limiter
+            self._endpoint_rate_limiters.setdefault(endpoint, limiter)
+        return self._endpoint_rate_limiters[endpoint]
+
+    def map(
+        self,
+        endpoint: str | t.Callable[..., t.Any],
+        kwargs_iter: t.Iterable[dict[str, t.Any]],
+        max_workers: int | None = None,
+        ordered: bool = True,
+        return_exceptions: bool = True,
+    ) -> t.Iterator[tuple[dict[str, t.Any], t.Any]]:
+        """
+        Call endpoint concurrently (in client's thread pool) with each of given keyword arguments, yield (kwargs, result) pairs.
+
+        :param endpoint: method name (e.g. 'get_item') or the method itself
+        :param kwargs_iter: keyword arguments of calls, consumed lazily
+        :param max_workers: max number of calls running at once (size of connection pool by default)
+        :param ordered: yield results in order of arguments (otherwise as soon as calls complete)
+        :param return_exceptions: yield exception of failed call as its result (other calls go on), otherwise raise it and drop calls not started yet
+        """
+        return map_concurrently(
+            getattr(self, endpoint) if isinstance(endpoint, str) else endpoint,
+            kwargs_iter,
+            executor=self._client.get_executor(),
+            max_workers=max_workers or self._client.max_connections,
+            ordered=ordered,
+            return_exceptions=return_exceptions,
         )
 
     def get_container_dto(self) -> 'ContainerDto':
         raw_data = self._client.fetch(
             url='/api/v1/container',
+            endpoint='get_container_dto',
         )
         gen = self._deserializer.deserialize(raw_data, ContainerDto)
         return next(gen)
@@ -89,6 +275,7 @@ class Generated:
     def some_action(self, enum: 'EnumValue'):
         self._client.fetch(
             url=f'api/v1/action/{enum}',
+            endpoint='some_action',
             method='POST',
         )
 
@@ -100,6 +287,7 @@ class Generated:
         """
         raw_data = self._client.fetch(
             url='api/v1/basic',
+            endpoint='get_basic_dto_list',
         )
         yield from self._deserializer.deserialize(raw_data, BasicDto, many=True)
 
@@ -107,16 +295,18 @@ class Generated:
         item = self._serializer.serialize(item, is_payload=True)
         raw_data = self._client.fetch(
             url='api/v1/basic',
+            endpoint='create_basic_dto',
             method='POST',
             json_body=item,
         )
         gen = self._deserializer.deserialize(raw_data, BasicDto)
         return next(gen)
 
-    def create_basic_dto_bulk(self, items: t.Sequence['BasicDto']) -> t.Iterator['BasicDto']:
+    def create_basic_dto_bulk(self, items: t.Iterable['BasicDto']) -> t.Iterator['BasicDto']:
         items = self._serializer.serialize(items, is_payload=True)
         raw_data = self._client.fetch(
             url='api/v1/basic/bulk',
+            endpoint='create_basic_dto_bulk',
             method='POST',
             json_body=items,
         )
@@ -126,6 +316,7 @@ class Generated:
         timestamp = self._serializer.serialize(timestamp)
         raw_data = self._client.fetch(
             url=f'api/v1/basic/{timestamp}',
+            endpoint='get_basic_dto_by_timestamp',
         )
         gen = self._deserializer.deserialize(raw_data, BasicDto)
         return next(gen)
@@ -133,7 +324,41 @@ class Generated:
     def ping(self):
         self._client.fetch(
             url='api/v1/ping',
+            endpoint='ping',
+        )
+
+    def get_limited_basic_dto_list(self) -> t.Iterator['BasicDto']:
+        raw_data = self._client.fetch(
+            url='api/v1/basic',
+            endpoint='get_limited_basic_dto_list',
+            rate_limiter=self._get_rate_limiter('get_limited_basic_dto_list', 100.0),
         )
+        yield from self._deserializer.deserialize(raw_data, BasicDto, many=True)
+
+    def create_batched_basic_dto(self, item: 'BasicDto') -> 'BasicDto':
+        if self._request_batcher is None:
+            item = self._serializer.serialize(item, is_payload=True)
+            raw_data = self._client.fetch(
+                url='api/v1/basic',
+                endpoint='create_batched_basic_dto',
+                method='POST',
+                json_body=item,
+            )
+            gen = self._deserializer.deserialize(raw_data, BasicDto)
+            return next(gen)
+        return self._request_batcher.call('create_batched_basic_dto', self.create_basic_dto_bulk, item)
+
+    def get_cached_basic_dto_by_timestamp(self, timestamp: datetime) -> 'BasicDto':
+        def load(timestamp):
+            timestamp = self._serializer.serialize(timestamp)
+            raw_data = self._client.fetch(
+                url=f'api/v1/basic/{timestamp}',
+                endpoint='get_cached_basic_dto_by_timestamp',
+            )
+            gen = self._deserializer.deserialize(raw_data, BasicDto)
+            return next(gen)
+
+        return self._endpoint_cache.call('get_cached_basic_dto_by_timestamp', load, timestamp, ttl=60)
 
 
 class BaseSchema(marshmallow.Schema):
@@ -247,88 +472,212 @@ JSON_PAYLOAD = t.Union[dict, str, int, float, list]
 RESPONSE_BODY = [str, io.IOBase]
 
 
+class HttpResponseError(urllib3.exceptions.HTTPError):
+    """
+    Server responded with error status code (status and headers are used by retry policy).
+    """
+
+    def __init__(self, status: int, headers: t.Mapping[str, str], data: bytes):
+        super().__init__('Server respond with status code {status}: {data}'.format(status=status, data=data))
+        self.status = status
+        self.headers = headers
+
+
+class MeteredResponse(io.RawIOBase):
+    """
+    File-like JSON response, decompressed on the fly while being read.
+    Reports number of received (possibly compressed) and decoded bytes.
+    """
+
+    def __init__(self, response: urllib3.BaseHTTPResponse, on_read: t.Callable[[int, int], None], call_event: 'CallEvent | None' = None):
+        self._response = response
+        self._on_read = on_read
+        self._call_event = call_event
+        self.headers = response.headers
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        started_at = time.perf_counter() if self._call_event is not None else None
+        wire_bytes = self._response.tell()
+        data = self._response.read(None if size is None or size < 0 else size)
+        wire_bytes = self._response.tell() - wire_bytes
+        self._on_read(wire_bytes, len(data))
+        if self._call_event is not None:
+            self._call_event.count_read(time.perf_counter() - started_at, wire_bytes)
+        return data
+
+    def discard(self):
+        """
+        Drop unread response, its connection is closed instead of being reused.
+        """
+        self._response.close()
+        self._response.release_conn()
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
 class BaseJsonHttpClient:
     def __init__(
         self,
         base_url: str,
         logger: t.Union[logging.Logger, t.Callable[[str], None], None],
-        max_retries: int,
-        retry_timeout: float,
+        retry_policy: 'RetryPolicy',
+        json_codec: 'JsonCodec',
+        circuit_breaker: 'CircuitBreaker | None',
+        http_cache: 'HttpCache | None',
+        single_flight: 'SingleFlight | None',
+        rate_limiter: 'RateLimiter | None',
+        concurrency_limiter: 'ConcurrencyLimiter | None',
+        hedge_policy: 'HedgePolicy | None',
+        tracer: 'CallTracer | None',
         user_agent: str | None,
         headers: dict[str, str | t.Callable[[], str]] | None,
         use_response_streaming: bool,
+        use_response_compression: bool,
+        request_compression: str | None,
+        request_compression_min_size: int,
         use_debug_curl: bool,
         request_kwargs: dict,
         connection_pool_kwargs: dict,
         exception_class: t.Type[Exception],
     ):
         connection_pool_kwargs.update(retries=False)
+        # keep as many connections per host as there may be concurrent requests in thread pool
+        connection_pool_kwargs.setdefault('maxsize', 10)
 
         self._pool = urllib3.PoolManager(**connection_pool_kwargs)
         self._base_url = base_url
         self._logger = logger
-        self._max_retries = max_retries
-        self._retry_timeout = retry_timeout
+        self._retry_policy = retry_policy
+        self._json_codec = json_codec
+        self._circuit_breaker = circuit_breaker
+        self._http_cache = http_cache
+        self._single_flight = single_flight
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._hedge_policy = hedge_policy
+        self._tracer = tracer
         self._user_agent = user_agent
         self._headers = headers
         self._use_response_streaming = use_response_streaming
+        self._use_response_compression = use_response_compression
+        self._request_compression = request_compression
+        self._request_compression_min_size = request_compression_min_size
+        if request_compression is not None:
+            # fail early on unsupported or not installed codec
+            compress_request_body(b'', request_compression)
         self._use_debug_curl = use_debug_curl
         self._request_kwargs = request_kwargs
         self._exception_class = exception_class
 
+        self._traffic_lock = threading.Lock()
+        self._traffic = dict(wire_bytes=0, decoded_bytes=0)
+
+        self.max_connections = connection_pool_kwargs['maxsize']
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._hedge_executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
     def fetch(
         self,
         url: str,
         method: str = 'get',
         query_params: dict | None = None,
-        json_body: JSON_PAYLOAD | None = None,
+        json_body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None' = None,
         form_fields: dict[str, str] | None = None,
+        endpoint: str | None = None,
+        rate_limiter: 'RateLimiter | None' = None,
     ) -> RESPONSE_BODY:
         """
         Retrieve JSON response from remote API request.
 
-        Repeats request in case of network errors.
+        Repeats request in case of network and server errors according to retry policy.
+        JSON body is compressed if request compression is enabled and body is large enough.
+        Responses of GET requests are revalidated by conditional requests if HTTP cache is enabled.
+        Identical concurrent requests of idempotent methods share one response if request coalescing is enabled.
+        Each attempt waits for its turn if client-wide or endpoint rate limit is exceeded.
+        Concurrent requests beyond adaptive concurrency limit (if enabled) wait for a free slot.
+        Slow GET requests are hedged by identical ones if request hedging is enabled (the first response wins).
+        Phase timings of the call are collected if tracer is set.
 
         :param url: target url (relative to base url)
         :param method: HTTP verb, e.g. get/post
         :param query_params: key-value arguments like ?param1=11&param2=22
-        :param json_body: JSON-encoded HTTP body
-        :param form_fields: form-encoded HTTP body
+        :param json_body: JSON-encoded HTTP body (stream is sent with chunked transfer encoding and is never compressed)
+        :param form_fields: form-encoded HTTP body (never compressed)
+        :param endpoint: name of called endpoint for its latency tracking and tracing (url is used if omitted)
+        :param rate_limiter: rate limit of endpoint (in addition to client-wide one)
         :return: decoded JSON from server
         """
         full_url = self._get_full_url(url, query_params)
         headers = self._build_headers()
+        cache_entry = None
+        if self._http_cache is not None and method.upper() == 'GET':
+            cache_entry = self._http_cache.lookup(full_url)
+            if cache_entry is not None:
+                headers.update(self._http_cache.get_conditional_headers(cache_entry))
         body = None
         if json_body is not None:
-            body = json.dumps(json_body).encode('utf8')
+            # payload may be pre-encoded (or streamed) by serializer
+            body = json_body if isinstance(json_body, (bytes, JsonArrayStream)) else self._json_codec.dumps(json_body)
             headers['content-type'] = 'application/json'
         if form_fields is not None:
             body = urlencode(form_fields)
             headers['content-type'] = 'application/x-www-form-urlencoded'
 
+        request_headers, request_body = headers, body
+        if json_body is not None:
+            request_body, request_headers = self._compress_body(body, headers)
+
+        call_event = None
+        if self._tracer is not None:
+            call_event = self._tracer.start_request(endpoint or url, method, full_url, request_body)
+
         request_kwargs = self._request_kwargs.copy()
         request_kwargs.update(
             url=full_url,
             method=method,
-            headers=headers,
-            body=body,
+            headers=request_headers,
+            body=request_body,
+            cache_entry=cache_entry,
+            rate_limiter=rate_limiter,
+            call_event=call_event,
         )
 
-        try:
+        def send(event: 'CallEvent | None' = call_event) -> RESPONSE_BODY:
             return failsafe_call(
                 self._mk_request,
-                kwargs=request_kwargs,
+                kwargs=dict(request_kwargs, call_event=event),
                 exceptions=(urllib3.exceptions.HTTPError,),  # include connection errors, HTTP >= 400
+                retry_policy=self._get_retry_policy(json_body),
                 logger=self._logger,
-                max_attempts=self._max_retries,
-                on_transitional_fail=lambda exc, info: sleep(self._retry_timeout)
+                idempotent=self._retry_policy.is_idempotent(method),
+                on_transitional_fail=lambda exc, info: sleep(info['delay'])
             )
+
+        def send_hedged() -> RESPONSE_BODY:
+            return self._send_hedged(endpoint or url, send, call_event)
+
+        request = send_hedged if self._is_hedged(method) else send
+        try:
+            if self._is_coalesced(method, body):
+                response = self._single_flight.call(self._single_flight.get_key(method, full_url, body), request)
+            else:
+                response = request()
         except Exception as e:
+            if call_event is not None:
+                self._tracer.finish(call_event, error=e)
             error_verbose = str(e)
             if ' at 0x' in error_verbose:
                 # reduce noise in error description, e.g. in case of NewConnectionError
                 error_verbose = error_verbose.split(':', maxsplit=1)[-1].strip()
             if self._use_debug_curl:
+                # uncompressed body is shown, curl can not compress request itself
                 curl_cmd = build_curl_command(
                     url=full_url,
                     method=method,
@@ -339,20 +688,186 @@ class BaseJsonHttpClient:
 
             raise self._exception_class(f'Failed to {method} {full_url}: {error_verbose}') from e
 
-    def _mk_request(self, *args, **kwargs) -> RESPONSE_BODY:
+        if call_event is not None:
+            self._tracer.set_response(call_event, response)
+        return response
+
+    def _mk_request(self, *args, rate_limiter: 'RateLimiter | None' = None, **kwargs) -> RESPONSE_BODY:
+        host = urlparse(kwargs['url']).netloc
+        if self._circuit_breaker is not None and not self._circuit_breaker.allow(host):
+            raise CircuitOpenError(f'Circuit breaker is open for {host}')
+
+        delay = self._reserve_rate_limit(rate_limiter)
+        if delay:
+            sleep(delay)
+
+        limiter = self._concurrency_limiter
+        started_at = limiter.acquire() if limiter is not None else None
+        try:
+            response = self._send_request(*args, **kwargs)
+        except urllib3.exceptions.HTTPError as e:
+            if self._circuit_breaker is not None:
+                self._circuit_breaker.record(host, e)
+            if limiter is not None:
+                limiter.release(started_at, limiter.get_outcome(e, is_timeout=isinstance(e, urllib3.exceptions.TimeoutError)))
+            raise
+        except BaseException as e:
+            if limiter is not None:
+                limiter.release(started_at, limiter.get_outcome(e))
+            raise
+
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.record(host)
+        if limiter is not None:
+            limiter.release(started_at, limiter.SUCCESS)
+        return response
+
+    def _send_request(
+        self,
+        *args,
+        cache_entry: dict | None = None,
+        call_event: 'CallEvent | None' = None,
+        **kwargs,
+    ) -> RESPONSE_BODY:
+        if call_event is not None:
+            call_event.attempts += 1
+            started_at = time.perf_counter()
         response = self._pool.request(*args, **kwargs, preload_content=False)
+        if call_event is not None:
+            # urllib3 has no hooks for connection and sending, they are included in time to first byte
+            call_event.status = response.status
+            call_event.ttfb = time.perf_counter() - started_at
+
+        if response.status == 304 and cache_entry is not None:
+            response.drain_conn()
+            cached_response = self._http_cache.replay(cache_entry)
+            if cached_response is None:
+                # stored body has been evicted by another process
+                raise HttpResponseError(status=response.status, headers=response.headers, data=b'')
+            return cached_response
+
         if response.status >= 400:
-            raise urllib3.exceptions.HTTPError('Server respond with status code {status}: {data}'.format(
+            raise HttpResponseError(
                 status=response.status,
+                headers=response.headers,
                 data=response.data,
-            ))
+            )
+
+        if self._http_cache is not None and kwargs['method'].upper() == 'GET' and self._http_cache.accepts(response.headers):
+            # read whole response to store it for further conditional requests
+            data = self._read_data(response, call_event)
+            return self._http_cache.store(kwargs['url'], response.headers, data)
 
         if 'json' in response.headers.get('content-type', ''):
             # provide Bytes I/O for file-like JSON read
-            return response
+            return MeteredResponse(response, on_read=self._count_traffic, call_event=call_event)
 
         # decode whole non-json response into string
-        return response.data.decode()
+        return self._read_data(response, call_event).decode()
+
+    def _read_data(self, response: urllib3.BaseHTTPResponse, call_event: 'CallEvent | None') -> bytes:
+        """
+        Read whole response body, count its size in traffic stats (and in call event if traced).
+        """
+        started_at = time.perf_counter() if call_event is not None else None
+        data = response.data
+        self._count_traffic(response.tell(), len(data))
+        if call_event is not None:
+            call_event.count_read(time.perf_counter() - started_at, response.tell())
+        return data
+
+    def get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Thread pool for concurrent requests (created on first use), as large as connection pool per host.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_connections, thread_name_prefix='api-client')
+            return self._executor
+
+    def _get_hedge_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Thread pool for hedged requests, separate from get_executor() since its workers may be waiting for them.
+        """
+        with self._executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2 * self.max_connections, thread_name_prefix='api-client-hedge')
+            return self._hedge_executor
+
+    def _send_hedged(
+        self,
+        endpoint: str,
+        send: t.Callable[['CallEvent | None'], RESPONSE_BODY],
+        call_event: 'CallEvent | None' = None,
+    ) -> RESPONSE_BODY:
+        """
+        Send request, then identical one if response is slower than usual for endpoint. The first response wins.
+        Each request is traced separately, only the returned one is merged into call event.
+        """
+        def attempt(event: 'CallEvent | None') -> RESPONSE_BODY:
+            started_at = time.monotonic()
+            response = send(event)
+            self._hedge_policy.record(endpoint, time.monotonic() - started_at)
+            return response
+
+        delay = self._hedge_policy.get_delay(endpoint)
+        if delay is None:
+            return attempt(call_event)
+
+        # both requests run in thread pool, so that caller gets the first response
+        executor = self._get_hedge_executor()
+        events = {}
+
+        def submit() -> concurrent.futures.Future:
+            event = call_event.fork() if call_event is not None else None
+            future = executor.submit(attempt, event)
+            events[future] = event
+            return future
+
+        primary = submit()
+        pending = {primary}
+        done, _ = concurrent.futures.wait(pending, timeout=delay)
+        if not done and self._hedge_policy.try_hedge():
+            pending.add(submit())
+
+        try:
+            while True:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                succeeded = [future for future in done if future.exception() is None]
+                returned = succeeded[0] if succeeded else next(iter(done))
+                if call_event is not None and (succeeded or not pending):
+                    call_event.merge(events[returned])
+                if succeeded:
+                    if returned is not primary:
+                        self._hedge_policy.count_win()
+                    for future in succeeded[1:]:
+                        self._discard_response(future)
+                    return returned.result()
+                if not pending:
+                    # raise error of the last failed request
+                    return returned.result()
+        finally:
+            for future in pending:
+                future.cancel()
+                future.add_done_callback(self._discard_response)
+
+    @staticmethod
+    def _discard_response(future: concurrent.futures.Future):
+        # unread response of losing request must not occupy its connection
+        if not future.cancelled() and future.exception() is None and isinstance(future.result(), MeteredResponse):
+            future.result().discard()
+
+    def _count_traffic(self, wire_bytes: int, decoded_bytes: int):
+        with self._traffic_lock:
+            self._traffic['wire_bytes'] += wire_bytes
+            self._traffic['decoded_bytes'] += decoded_bytes
+
+    def get_traffic_stats(self) -> dict[str, int]:
+        """
+        Size of response bodies read so far: received over network (compressed) and decoded.
+        """
+        with self._traffic_lock:
+            return self._traffic.copy()
 
     def _get_full_url(self, url: str, query_params: dict | None = None) -> str:
         if self._base_url:
@@ -390,15 +905,181 @@ class BaseJsonHttpClient:
         if self._user_agent:
             headers['user-agent'] = self._user_agent
 
+        if self._use_response_compression:
+            # advertise codecs available for urllib3 (gzip and deflate, br and zstd if installed)
+            headers.setdefault('accept-encoding', urllib3.util.make_headers(accept_encoding=True)['accept-encoding'])
+
         return headers
 
+    def _reserve_rate_limit(self, rate_limiter: 'RateLimiter | None') -> float:
+        """
+        Take tokens of client-wide and endpoint rate limits, return seconds to wait before request is sent.
+        """
+        return max([limiter.reserve() for limiter in (self._rate_limiter, rate_limiter) if limiter is not None], default=0)
+
+    def _is_hedged(self, method: str) -> bool:
+        return self._hedge_policy is not None and method.upper() == 'GET'
+
+    def _is_coalesced(self, method: str, body: 'str | bytes | JsonArrayStream | None') -> bool:
+        # streamed payload can not be hashed (and shared) without being consumed
+        return (
+            self._single_flight is not None
+            and method.upper() in RetryPolicy.IDEMPOTENT_METHODS
+            and not isinstance(body, JsonArrayStream)
+        )
+
+    def _get_retry_policy(self, json_body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None') -> 'RetryPolicy':
+        if isinstance(json_body, JsonArrayStream) and not json_body.replayable:
+            # payload iterator is consumed by the first attempt
+            return RetryPolicy(max_attempts=1)
+        return self._retry_policy
+
+    def _compress_body(self, body: 'bytes | JsonArrayStream', headers: dict[str, str]) -> tuple['bytes | JsonArrayStream', dict[str, str]]:
+        """
+        Compress JSON body (if enabled and large enough), return it along with updated copy of headers.
+        """
+        if self._request_compression is None or isinstance(body, JsonArrayStream) or len(body) < self._request_compression_min_size:
+            return body, headers
+
+        body = compress_request_body(body, self._request_compression)
+        return body, {**headers, 'content-encoding': self._request_compression}
+
+
+class JsonArrayStream:
+    """
+    Request payload which is encoded into JSON array item by item while being sent (chunked transfer encoding),
+    so sequence of any length (or one-off iterator) takes constant memory.
+
+    >>> b''.join(JsonArrayStream([1, 2, 3], encode=lambda item: str(item).encode()))
+    b'[1,2,3]'
+    """
+
+    # encoded items are sent in chunks of about this size (bytes)
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, items: t.Iterable[t.Any], encode: t.Callable[[t.Any], bytes]):
+        self._items = items
+        self._encode = encode
+
+    @property
+    def replayable(self) -> bool:
+        """
+        Whether payload can be sent again (e.g. on retry), which is not the case for iterators.
+        """
+        return not isinstance(self._items, t.Iterator)
+
+    def __iter__(self) -> t.Iterator[bytes]:
+        chunk = bytearray(b'[')
+        for index, item in enumerate(self._items):
+            if index:
+                chunk += b','
+            chunk += self._encode(item)
+            if len(chunk) >= self.CHUNK_SIZE:
+                yield bytes(chunk)
+                chunk.clear()
+
+        chunk += b']'
+        yield bytes(chunk)
+
+    async def __aiter__(self) -> t.AsyncIterator[bytes]:
+        for chunk in self:
+            yield chunk
+
+
+class JsonCodec:
+    """
+    JSON encoder and decoder working with bytes, backed by the fastest installed library (orjson, ujson or stdlib json).
+    Streaming parser is ijson (optional, required for response streaming only) with its fastest available backend.
+
+    >>> JsonCodec('json').dumps({'foo': [1, 2]})
+    b'{"foo": [1, 2]}'
+    >>> JsonCodec('json').loads(b'{"foo": [1, 2]}')
+    {'foo': [1, 2]}
+    """
+
+    BACKENDS = ('orjson', 'ujson', 'json')
+
+    def __init__(self, backend: str | None = None, streaming_backend: str | None = None):
+        """
+        :param backend: one of BACKENDS (auto-selected if omitted)
+        :param streaming_backend: ijson backend name, e.g. yajl2_c or python (the fastest compiled one if omitted)
+        """
+        self.backend = backend or next(name for name in self.BACKENDS if importlib.util.find_spec(name) is not None)
+        if self.backend == 'orjson':
+            import orjson  # optional dependency
+            self.dumps = orjson.dumps
+            self.loads = orjson.loads
+        elif self.backend == 'ujson':
+            import ujson  # optional dependency
+            self.dumps = lambda value: ujson.dumps(value, ensure_ascii=False, escape_forward_slashes=False).encode('utf8')
+            self.loads = ujson.loads
+        elif self.backend == 'json':
+            self.dumps = lambda value: json.dumps(value).encode('utf8')
+            self.loads = json.loads
+        else:
+            raise ValueError(f'Unsupported JSON backend: {self.backend}, expected one of {self.BACKENDS}')
+
+        self.streaming_backend = streaming_backend
+
+    @property
+    def _ijson(self) -> t.Any:
+        import ijson  # optional dependency
+        return ijson.get_backend(self.streaming_backend) if self.streaming_backend else ijson
+
+    def items(self, file: t.Any) -> t.Iterator[t.Any]:
+        """
+        Parse items of JSON array one by one while reading file-like object.
+        """
+        return self._ijson.items(file, 'item', use_float=True)
+
+    def items_async(self, file: t.Any) -> t.AsyncIterator[t.Any]:
+        """
+        Parse items of JSON array one by one while reading async file-like object.
+        """
+        return self._ijson.items_async(file, 'item', use_float=True)
+
+    def stats(self) -> dict[str, str | None]:
+        try:
+            streaming_backend = self._ijson.backend
+        except ImportError:
+            streaming_backend = None
+
+        return dict(
+            backend=self.backend,
+            streaming_backend=streaming_backend,
+        )
+
 
 class BaseSerializer:
-    def __init__(self, deserializer: 'BaseDeserializer', use_request_payload_validation: bool):
+    def __init__(
+        self,
+        deserializer: 'BaseDeserializer',
+        use_request_payload_validation: bool,
+        schema_registry: 'SchemaRegistry',
+        json_codec: 'JsonCodec',
+        use_request_streaming: bool = False,
+        tracer: 'CallTracer | None' = None,
+    ):
         self._use_request_payload_validation = use_request_payload_validation
+        self._use_request_streaming = use_request_streaming
         self._deserializer = deserializer
+        self._schema_registry = schema_registry
+        self._json_codec = json_codec
+        self._tracer = tracer
+
+    def serialize(self, value: t.Any, is_payload=False) -> 'JSON_PAYLOAD | bytes | JsonArrayStream | None':
+        if self._tracer is not None:
+            return self._tracer.measure('serialize', self._serialize, value, is_payload)
+        return self._serialize(value, is_payload)
+
+    def _serialize(self, value: t.Any, is_payload: bool) -> 'JSON_PAYLOAD | bytes | JsonArrayStream | None':
+        if is_payload and self._use_request_streaming and isinstance(value, (list, tuple, set, t.Iterator)):
+            # encode items one at a time while request is being sent
+            return JsonArrayStream(value, encode=self._encode_payload_item)
+
+        if isinstance(value, t.Iterator):
+            value = list(value)
 
-    def serialize(self, value: t.Any, is_payload=False) -> JSON_PAYLOAD | None:
         # auto-detect collections
         many = False
         _type = type(value)
@@ -415,17 +1096,8 @@ class BaseSerializer:
                 return list(map(method, value))
             return method(value)
 
-        # use marshmallow in case of dataclass
-        if is_dataclass(_type):
-            schema = marshmallow_dataclass.class_schema(_type)()
-            func = schema.dump if is_payload else schema.dumps
-            serialized_data = func(value, many=many)
-
-            if self._use_request_payload_validation:
-                gen = self._deserializer.deserialize(serialized_data, _type, many=many)
-                for _ in gen:
-                    pass
-
+        serialized_data = self._serialize_model(value, _type, many, is_payload)
+        if serialized_data is not None:
             return serialized_data
 
         if isinstance(value, t.get_args(JSON_PAYLOAD)):
@@ -439,6 +1111,39 @@ class BaseSerializer:
 
         raise ValueError('Unable to serialize object of type {0}: {1}'.format(type(value), value))
 
+    def _serialize_model(self, value: t.Any, _type: t.Type, many: bool, is_payload: bool) -> 'JSON_PAYLOAD | bytes | None':
+        """
+        Serialized dataclass (or list of them), None for values of other types.
+        """
+        if not is_dataclass(_type):
+            return None
+
+        encoder = getattr(_type, 'to_dict', None)
+        if is_payload and encoder is not None:
+            # use generated encoder if available (USE_FAST_CODECS=1)
+            serialized_data = list(map(encoder, value)) if many else encoder(value)
+        else:
+            # use marshmallow in other cases
+            schema = self._schema_registry.get(_type, dump=True)
+            func = schema.dump if is_payload else schema.dumps
+            serialized_data = func(value, many=many)
+
+        if self._use_request_payload_validation:
+            self._validate(serialized_data, _type, many)
+
+        return serialized_data
+
+    def _validate(self, serialized_data: 'JSON_PAYLOAD | bytes', _type: t.Type, many: bool):
+        for _ in self._deserializer.deserialize(serialized_data, _type, many=many):
+            pass
+
+    def _encode_payload_item(self, item: t.Any) -> bytes:
+        serialized_data = self.serialize(item, is_payload=True)
+        if isinstance(serialized_data, bytes):
+            # encoded by model library already
+            return serialized_data
+        return self._json_codec.dumps(serialized_data)
+
     @classmethod
     def _serialize_datetime(cls, value: datetime) -> str:
         # use ISO format: YYYY-MM-DDTHH:mm:ss[.ms]Z
@@ -462,51 +1167,87 @@ class BaseSerializer:
 
 
 class BaseDeserializer:
-    def __init__(self, use_response_streaming: bool):
+    def __init__(
+        self,
+        use_response_streaming: bool,
+        schema_registry: 'SchemaRegistry',
+        json_codec: 'JsonCodec',
+        tracer: 'CallTracer | None' = None,
+    ):
         self._use_response_streaming = use_response_streaming
+        self._schema_registry = schema_registry
+        self._json_codec = json_codec
+        self._tracer = tracer
 
     def deserialize(self, raw_data: RESPONSE_BODY, data_class: t.Type | None = None, many: bool = False) -> t.Iterator[t.Any]:
+        if self._tracer is not None:
+            event = self._tracer.take_event(raw_data)
+            if event is not None:
+                yield from self._deserialize_traced(event, raw_data, data_class, many)
+                return
+
+        cached_objects = getattr(raw_data, 'cached_objects', None)
+        if cached_objects is not None:
+            # response from HTTP cache has not been modified, reuse objects deserialized from it before
+            key = (data_class, many)
+            if key not in cached_objects:
+                cached_objects[key] = list(self.deserialize(io.BytesIO(raw_data.getvalue()), data_class, many=many))
+            yield from cached_objects[key]
+            return
+
+        yield from self._load_items(raw_data, data_class, many)
+
+    def _load_items(self, raw_data: RESPONSE_BODY, data_class: t.Type | None, many: bool) -> t.Iterator[t.Any]:
+        """
+        Parse JSON of response, then construct objects of it.
+        """
         if hasattr(raw_data, 'read'):
             # read singular JSON objects at once and multiple objects in stream to reduce memory footprint
             if many and self._use_response_streaming:
-                raw_data = ijson.items(raw_data, 'item', use_float=True)
+                raw_data = self._json_codec.items(raw_data)
             else:
-                raw_data = json.loads(raw_data.read())
+                raw_data = self._json_codec.loads(raw_data.read())
 
         if raw_data == '':
             # blank response means null
             yield None
             return
 
+        load = self._get_loader(data_class)
+        if many:
+            yield from map(load, raw_data)
+        else:
+            yield load(raw_data)
+
+    def _deserialize_traced(self, event: 'CallEvent', raw_data: RESPONSE_BODY, data_class: t.Type | None, many: bool) -> t.Iterator[t.Any]:
+        if getattr(raw_data, 'cached_objects', None) is not None:
+            # objects deserialized before are reused
+            return self._tracer.trace_items(event, self.deserialize(raw_data, data_class, many=many), many)
+
+        # nested call only parses JSON (it is not traced since event has been taken), objects are constructed apart
+        return self._tracer.trace_items(event, self.deserialize(raw_data, many=many), many, load=self._get_loader(data_class))
+
+    def _get_loader(self, data_class: t.Type | None) -> t.Callable[[t.Any], t.Any]:
         if data_class is None:
             # skip further deserialization
-            if many:
-                yield from raw_data
-            else:
-                yield raw_data
-            return
+            return lambda value: value
 
         # pick built-in deserializer if specified for class
         method_name = '_deserialize_{type}'.format(type=data_class.__name__.lower())
         if hasattr(self, method_name):
-            method = getattr(self, method_name)
-            if many:
-                yield from map(method, raw_data)
-            else:
-                yield method(raw_data)
-        else:
-            try:
-                # use marshmallow in other cases
-                schema = marshmallow_dataclass.class_schema(data_class, base_schema=BaseSchema)()
-            except TypeError:
-                # fallback to default constructor
-                yield data_class(raw_data)
-                return
+            return getattr(self, method_name)
 
-            if many:
-                yield from map(schema.load, raw_data)
-            else:
-                yield schema.load(raw_data)
+        # use generated decoder if available (USE_FAST_CODECS=1)
+        decoder = getattr(data_class, 'from_dict', None)
+        if decoder is not None:
+            return decoder
+
+        try:
+            # use marshmallow in other cases
+            return self._schema_registry.get(data_class).load
+        except TypeError:
+            # fallback to default constructor
+            return data_class
 
     @classmethod
     def _deserialize_datetime(cls, raw: str) -> datetime:
@@ -521,87 +1262,1753 @@ class BaseDeserializer:
         raise NotImplementedError(f'Unsupported value for timedelta deserialization: {raw}')
 
 
-def _get_func_name_verbose(func: t.Callable) -> str:
-    if hasattr(func, '__self__'):
-        if hasattr(func.__self__, '__name__'):
-            return '{}.{}'.format(func.__self__.__name__, func.__name__)
-        return '{}.{}'.format(func.__self__.__class__.__name__, func.__name__)
-    elif hasattr(func, '__name__'):
-        return func.__name__
-    return repr(func)
-
+class BaseSchemaRegistry:
+    """
+    Cache of codecs of model library, built once per class and variant (e.g. load/dump or single/many).
+    """
 
-def failsafe_call(
-    func: t.Callable,
-    exceptions: t.Iterable[t.Type[Exception]],
-    args=None,
-    kwargs=None,
-    logger: t.Union[logging.Logger, t.Callable[[str], None]] = None,
-    attempt=1,
-    max_attempts=10,
-    on_transitional_fail: t.Callable[[Exception, dict], None] = None,
-):
-    args = args or tuple()
-    kwargs = kwargs or dict()
-    func_name_verbose = _get_func_name_verbose(func)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, data_class: t.Type | None, variant: bool = False) -> t.Any:
+        key = (data_class, variant)
+        schema = self._schemas.get(key)
+        if schema is not None:
+            with self._lock:
+                self._hits += 1
+            return schema
+
+        with self._lock:
+            # other thread might have built it while we were waiting
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self._hits += 1
+                return schema
+
+            self._misses += 1
+            schema = self._schemas[key] = self._build(data_class, variant)
+            return schema
+
+    def _build(self, data_class: t.Type | None, variant: bool) -> t.Any:
+        raise NotImplementedError
+
+    def is_model(self, value: t.Any) -> bool:
+        """
+        Whether value is a class handled by model library.
+        """
+        raise NotImplementedError
 
-    try:
-        return func(*args, **kwargs)
-    except exceptions as e:
-        if logger:
-            message = 'got %s on %s, attempt %d / %d' % (
-                e.__class__.__name__,
-                func_name_verbose,
-                attempt,
-                max_attempts
+    def warm_up(self, collection: type):
+        """
+        Build codecs for all classes of given collection (e.g. AllDataclassesCollection) in advance.
+        """
+        for value in vars(collection).values():
+            if self.is_model(value):
+                self.get(value, False)
+                self.get(value, True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                size=len(self._schemas),
+                hits=self._hits,
+                misses=self._misses,
             )
-            if hasattr(logger, 'warning'):
-                logger.warning(message)
-            else:
-                logger(message)
-
-        if attempt >= max_attempts:
-            raise e from None   # suppress context and multiple tracebacks of same error
-
-        if on_transitional_fail:
-            on_transitional_fail(e, dict(max_attempts=max_attempts, attempt=attempt))
-
-        return failsafe_call(
-            func,
-            exceptions,
-            args,
-            kwargs,
-            logger,
-            attempt + 1,
-            max_attempts,
-            on_transitional_fail
-        )
 
 
-def build_curl_command(url: str, method: str, headers: dict[str, str], body: str) -> str:
+class SchemaRegistry(BaseSchemaRegistry):
+    """
+    Cache of marshmallow schemas, built once per dataclass and direction (load/dump).
     """
-    >>> build_curl_command('https://example.com', 'get', {}, '')
-    'curl "https://example.com"'
 
-    >>> build_curl_command('https://example.com?param1=value1&param2=value2', 'post', {'content-type': 'application/json'}, '{"foo": "bar"}')
-    'curl "https://example.com?param1=value1&param2=value2" -X POST -H "content-type: application/json" -d "{\"foo\": \"bar\"}"'
+    def get(self, data_class: t.Type, dump: bool = False) -> marshmallow.Schema:
+        return super().get(data_class, dump)
+
+    def _build(self, data_class: t.Type, dump: bool) -> marshmallow.Schema:
+        if dump:
+            return marshmallow_dataclass.class_schema(data_class)()
+        return marshmallow_dataclass.class_schema(data_class, base_schema=BaseSchema)()
+
+    def is_model(self, value: t.Any) -> bool:
+        return is_dataclass(value)
+
+
+class RetryPolicy:
     """
-    method = method.upper()
+    Decides whether failed call should be repeated and how long to wait before next attempt.
 
-    if method != 'GET':
-        method = f' -X {method}'
-    else:
-        method = ''
+    Uses exponential backoff with full jitter and a retry budget (token bucket) shared by all calls of the client,
+    so that retries of many concurrent calls are spread in time and limited during outages.
+    Non-idempotent requests (e.g. POST) are repeated only if the server declined them (429, 503).
+    Delay from 'Retry-After' response header is respected.
+    """
 
-    headers = ''.join(f' -H "{k}: {v}"' for k, v in headers.items())
+    IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'TRACE', 'PUT', 'DELETE'))
+    RETRYABLE_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+    DECLINED_STATUSES = frozenset((429, 503))
 
-    if body:
-        body = body.replace('"', '\"')
-        body = f' -d "{body}"'
-    else:
-        body = ''
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_timeout: float = 1,
+        max_timeout: float = 60,
+        budget_rate: float | None = 10,
+        budget_burst: int = 20,
+        retry_non_idempotent: bool = False,
+    ):
+        """
+        :param max_attempts: number of attempts (including the first one) before error is raised
+        :param base_timeout: upper bound of delay before second attempt (seconds), doubled for each next one
+        :param max_timeout: upper bound of any delay, including the one requested by 'Retry-After' (seconds)
+        :param budget_rate: number of retries per second allowed for all calls together (None for unlimited)
+        :param budget_burst: max number of retries allowed at once after a quiet period
+        :param retry_non_idempotent: repeat non-idempotent requests after network and server errors too
+        """
+        self.max_attempts = max_attempts
+        self.base_timeout = base_timeout
+        self.max_timeout = max_timeout
+        self.budget_rate = budget_rate
+        self.budget_burst = budget_burst
+        self.retry_non_idempotent = retry_non_idempotent
+
+        self._lock = threading.Lock()
+        self._tokens = float(budget_burst)
+        self._tokens_updated_at = time.monotonic()
+        self._retries = 0
+        self._rejected_by_budget = 0
+
+    def is_idempotent(self, method: str) -> bool:
+        return self.retry_non_idempotent or method.upper() in self.IDEMPOTENT_METHODS
+
+    def get_delay(self, error: Exception, attempt: int, idempotent: bool = True) -> float | None:
+        """
+        Seconds to wait before next attempt, or None if error should be raised.
 
-    return f'curl "{url}"{method}{headers}{body}'
+        :param error: exception of failed attempt (HTTP errors are expected to have `status` and `headers` attributes)
+        :param attempt: number of failed attempt, starting from 1
+        :param idempotent: whether repeated call is safe in case of the first one has reached the server
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        status = getattr(error, 'status', None)
+        if status is not None and status not in self.RETRYABLE_STATUSES:
+            # client errors are not fixed by repeating
+            return None
+
+        if not idempotent and status not in self.DECLINED_STATUSES:
+            return None
+
+        retry_after = self._get_retry_after(error) if status in self.DECLINED_STATUSES else None
+        if retry_after is not None and retry_after > self.max_timeout:
+            # server asks to come back too late
+            return None
+
+        if not self._acquire_budget():
+            return None
+
+        if retry_after is not None:
+            return retry_after
+
+        # full jitter
+        return random.uniform(0, min(self.max_timeout, self.base_timeout * 2 ** (attempt - 1)))
+
+    def _acquire_budget(self) -> bool:
+        with self._lock:
+            if self.budget_rate is not None:
+                now = time.monotonic()
+                elapsed = now - self._tokens_updated_at
+                self._tokens = min(float(self.budget_burst), self._tokens + elapsed * self.budget_rate)
+                self._tokens_updated_at = now
+
+                if self._tokens < 1:
+                    self._rejected_by_budget += 1
+                    return False
+
+                self._tokens -= 1
+
+            self._retries += 1
+            return True
+
+    @staticmethod
+    def _get_retry_after(error: Exception) -> float | None:
+        headers = getattr(error, 'headers', None) or {}
+        value = headers.get('Retry-After')
+        if not value:
+            return None
+
+        try:
+            # delay in seconds
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            # HTTP date
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> dict[str, int]:
+        return dict(
+            retries=self._retries,
+            rejected_by_budget=self._rejected_by_budget,
+        )
+
+
+class CircuitOpenError(Exception):
+    """
+    Call is rejected without sending because the host keeps failing.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    Circuit of a host opens when the share of failed calls among the recent ones exceeds the threshold,
+    so further calls fail fast instead of waiting for timeouts and retries.
+    After cool-down a single probe call is let through (half-open state):
+    its success closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 50,
+        min_calls: int = 20,
+        cool_down: float = 30,
+    ):
+        """
+        :param failure_rate_threshold: share of failed calls (0..1) in the window which opens the circuit
+        :param window_size: number of recent calls of a host taken into account
+        :param min_calls: min number of calls in the window to evaluate failure rate
+        :param cool_down: seconds before the open circuit lets a probe call through
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.cool_down = cool_down
+
+        self._lock = threading.Lock()
+        self._circuits: dict[str, dict] = {}
+
+    def _get_circuit(self, host: str) -> dict:
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = dict(
+                state=self.CLOSED,
+                outcomes=collections.deque(maxlen=self.window_size),  # True for failed calls
+                opened_at=0.0,
+                rejected=0,
+            )
+        return circuit
+
+    def allow(self, host: str) -> bool:
+        """
+        Whether a call to the host may be sent now (should be followed by `record`).
+        """
+        with self._lock:
+            circuit = self._get_circuit(host)
+            if circuit['state'] == self.CLOSED:
+                return True
+
+            if time.monotonic() - circuit['opened_at'] >= self.cool_down:
+                # let a probe call through (and another one if the previous probe has not reported back in time)
+                circuit['state'] = self.HALF_OPEN
+                circuit['opened_at'] = time.monotonic()
+                return True
+
+            circuit['rejected'] += 1
+            return False
+
+    def record(self, host: str, error: Exception | None = None):
+        """
+        Report outcome of allowed call. Client errors (HTTP 4xx except 429) mean that the host is alive.
+        """
+        status = getattr(error, 'status', None)
+        if error is None or (status is not None and status < 500 and status != 429):
+            self.record_success(host)
+        else:
+            self.record_failure(host)
+
+    def record_success(self, host: str):
+        with self._lock:
+            circuit = self._get_circuit(host)
+            if circuit['state'] == self.HALF_OPEN:
+                circuit['state'] = self.CLOSED
+                circuit['outcomes'].clear()
+            circuit['outcomes'].append(False)
+
+    def record_failure(self, host: str):
+        with self._lock:
+            circuit = self._get_circuit(host)
+            outcomes = circuit['outcomes']
+            outcomes.append(True)
+
+            if circuit['state'] == self.HALF_OPEN:
+                # probe has failed
+                self._open(circuit)
+            elif circuit['state'] == self.CLOSED and len(outcomes) >= self.min_calls:
+                if sum(outcomes) / len(outcomes) >= self.failure_rate_threshold:
+                    self._open(circuit)
+
+    def _open(self, circuit: dict):
+        circuit['state'] = self.OPEN
+        circuit['opened_at'] = time.monotonic()
+
+    def get_state(self, host: str) -> str:
+        with self._lock:
+            return self._get_circuit(host)['state']
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                host: dict(
+                    state=circuit['state'],
+                    calls=len(circuit['outcomes']),
+                    failures=sum(circuit['outcomes']),
+                    rejected=circuit['rejected'],
+                )
+                for host, circuit in self._circuits.items()
+            }
+
+
+class ConcurrencyLimiter:
+    """
+    Adaptive limit of concurrent requests (additive increase, multiplicative decrease).
+
+    Limit starts low and grows by one per window of responses while it is reached and latency
+    stays near the baseline (the lowest latency seen recently). It is cut by backoff ratio when server
+    is overloaded (429/503 response or timeout). Requests beyond the limit wait for a free slot.
+    """
+
+    SUCCESS = 'success'
+    OVERLOAD = 'overload'
+    FAILURE = 'failure'
+
+    OVERLOAD_STATUSES = (429, 503)
+
+    # weight of new latency sample in smoothed latency
+    LATENCY_SMOOTHING = 0.2
+    # weight of higher latency sample in baseline (so that it follows slower upstream eventually)
+    BASELINE_DRIFT = 0.01
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        tolerance: float = 2.0,
+        backoff_ratio: float = 0.5,
+    ):
+        """
+        :param initial_limit: number of concurrent requests allowed at start
+        :param min_limit: lowest limit kept while server is overloaded
+        :param max_limit: highest limit reached while latency is low
+        :param tolerance: max ratio of latency to baseline while limit grows
+        :param backoff_ratio: multiplier of limit when server is overloaded
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff_ratio = backoff_ratio
+
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._latency: float | None = None
+        self._baseline: float | None = None
+        self._decreased_at = 0.0
+        self._waits = 0
+        self._decreases = 0
+
+    def acquire(self) -> float:
+        """
+        Wait for a free slot (blocking), return start time of request to be passed to release().
+        """
+        with self._lock:
+            if not self._has_slot():
+                self._waits += 1
+                self._released.wait_for(self._has_slot)
+            self._in_flight += 1
+        return time.monotonic()
+
+    def release(self, started_at: float, outcome: str):
+        """
+        Free the slot of finished request and adjust limit according to its outcome (latency for success).
+        """
+        with self._lock:
+            self._in_flight -= 1
+            if outcome == self.SUCCESS:
+                self._on_success(time.monotonic() - started_at)
+            elif outcome == self.OVERLOAD and started_at >= self._decreased_at:
+                # requests sent before previous decrease do not cut limit again
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                self._decreased_at = time.monotonic()
+                self._decreases += 1
+            self._released.notify_all()
+
+    def get_outcome(self, exc: BaseException, is_timeout: bool = False) -> str:
+        """
+        Outcome of failed request by its error.
+        """
+        if is_timeout or getattr(exc, 'status', None) in self.OVERLOAD_STATUSES:
+            return self.OVERLOAD
+        return self.FAILURE
+
+    def _has_slot(self) -> bool:
+        return self._in_flight < int(self._limit)
+
+    def _on_success(self, latency: float):
+        if self._latency is None:
+            self._latency = self._baseline = latency
+        self._latency += (latency - self._latency) * self.LATENCY_SMOOTHING
+        self._baseline = latency if latency < self._baseline else self._baseline + (latency - self._baseline) * self.BASELINE_DRIFT
+
+        # idle slots tell nothing about higher concurrency
+        if self._in_flight + 1 >= int(self._limit) and self._get_gradient() * self.tolerance >= 1:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _get_gradient(self) -> float:
+        """
+        Ratio of baseline to current latency: 1 while server keeps up, lower when requests queue up.
+        """
+        return self._baseline / self._latency if self._latency else 1.0
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            return dict(
+                limit=round(self._limit, 2),
+                in_flight=self._in_flight,
+                gradient=round(self._get_gradient(), 3),
+                latency=round(self._latency or 0, 4),
+                baseline_latency=round(self._baseline or 0, 4),
+                waits=self._waits,
+                decreases=self._decreases,
+            )
+
+
+class CachedResponse(io.BytesIO):
+    """
+    JSON response body replayed from memory (stored by HTTP cache or shared between coalesced requests).
+    """
+
+    def __init__(self, body: bytes, cached_objects: dict | None):
+        super().__init__(body)
+        # objects deserialized from the body, shared between calls (if enabled)
+        self.cached_objects = cached_objects
+
+
+class HttpCache:
+    """
+    Bounded store of JSON responses of GET requests along with their validators (ETag, Last-Modified).
+
+    Stored responses are revalidated by conditional requests, so unchanged body is not downloaded again
+    (304 Not Modified). Bodies are kept in memory or in files of given directory (which survive restarts);
+    least recently used ones are evicted when total size exceeds the limit.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, directory: str | None = None, reuse_objects: bool = False):
+        """
+        :param max_bytes: max total size of stored bodies
+        :param directory: path to store bodies on disk instead of memory
+        :param reuse_objects: return the same deserialized objects while response is not modified (they must not be changed by caller)
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.reuse_objects = reuse_objects
+
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[str, dict] = collections.OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._load_entries()
+
+    def accepts(self, headers: t.Mapping[str, str]) -> bool:
+        """
+        Whether response with given headers may be stored.
+        """
+        content_length = headers.get('content-length')
+        return (
+            'json' in headers.get('content-type', '')
+            and bool(headers.get('etag') or headers.get('last-modified'))
+            and (content_length is None or int(content_length) <= self.max_bytes)
+        )
+
+    def lookup(self, url: str) -> dict | None:
+        with self._lock:
+            return self._entries.get(url)
+
+    @staticmethod
+    def get_conditional_headers(entry: dict) -> dict[str, str]:
+        headers = {}
+        if entry['etag']:
+            headers['if-none-match'] = entry['etag']
+        if entry['last_modified']:
+            headers['if-modified-since'] = entry['last_modified']
+        return headers
+
+    def replay(self, entry: dict) -> CachedResponse | None:
+        """
+        Stored body of response which is not modified (or None if it has been lost).
+        """
+        body = entry['body']
+        if body is None:
+            try:
+                with open(self._get_path(entry['url'], '.body'), 'rb') as f:
+                    body = f.read()
+            except FileNotFoundError:
+                return None
+
+        with self._lock:
+            if entry['url'] in self._entries:
+                self._entries.move_to_end(entry['url'])
+            self._hits += 1
+
+        return CachedResponse(body, entry['cached_objects'])
+
+    def store(self, url: str, headers: t.Mapping[str, str], body: bytes) -> CachedResponse:
+        """
+        Save downloaded response (if it fits), return its body for deserialization.
+        """
+        entry = dict(
+            url=url,
+            etag=headers.get('etag'),
+            last_modified=headers.get('last-modified'),
+            size=len(body),
+            body=None if self.directory else body,
+            cached_objects={} if self.reuse_objects else None,
+        )
+
+        if entry['size'] <= self.max_bytes:
+            if self.directory is not None:
+                self._write_entry(entry, body)
+
+            with self._lock:
+                previous = self._entries.pop(url, None)
+                if previous is not None:
+                    self._size -= previous['size']
+                self._entries[url] = entry
+                self._size += entry['size']
+                self._evict()
+
+        with self._lock:
+            self._misses += 1
+
+        return CachedResponse(body, entry['cached_objects'])
+
+    def clear(self):
+        with self._lock:
+            while self._entries:
+                self._remove(self._entries.popitem(last=False)[1])
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._size,
+            )
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            self._remove(self._entries.popitem(last=False)[1])
+            self._evictions += 1
+
+    def _remove(self, entry: dict):
+        self._size -= entry['size']
+        if self.directory is not None:
+            for suffix in ('.meta', '.body'):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self._get_path(entry['url'], suffix))
+
+    def _get_path(self, url: str, suffix: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest() + suffix)
+
+    def _write_entry(self, entry: dict, body: bytes):
+        meta = {key: entry[key] for key in ('url', 'etag', 'last_modified', 'size')}
+        # write atomically, body first (entry without meta file is ignored)
+        for suffix, data in (('.body', body), ('.meta', json.dumps(meta).encode())):
+            path = self._get_path(entry['url'], suffix)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(path + '.tmp', path)
+
+    def _load_entries(self):
+        meta_paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.meta')]
+        for path in sorted(meta_paths, key=os.path.getmtime):
+            with open(path, 'rb') as f:
+                meta = json.loads(f.read())
+            entry = dict(meta, body=None, cached_objects={} if self.reuse_objects else None)
+            self._entries[entry['url']] = entry
+            self._size += entry['size']
+        self._evict()
+
+
+class EndpointCache:
+    """
+    Per-client store of results of cacheable endpoints.
+
+    Results expire after TTL (if specified for endpoint). Least recently used ones are evicted
+    when the number of entries or their approximate total size exceeds the limit.
+    Missing result is loaded by a single caller at once, others wait until it is stored.
+
+    In stale-while-revalidate mode (max_staleness > 0) expired result is returned immediately
+    while a single background refresh replaces it. Result older than max staleness is loaded by caller.
+
+    With shared backend results are kept (encoded) in it instead of memory, so that processes
+    using the same backend share stored results, their loading and refresh.
+    """
+
+    FRESH = 'fresh'
+    STALE = 'stale'
+    MISSING = 'missing'
+
+    LOCK_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_staleness: float = 0,
+        spawn: t.Callable[[t.Callable[[], None]], t.Any] | None = None,
+        backend: 'EndpointCacheBackend | None' = None,
+        lock_timeout: float = 10,
+    ):
+        """
+        :param max_entries: max number of stored results (in memory)
+        :param max_bytes: max approximate memory footprint of stored results
+        :param max_staleness: seconds after expiry while result is still returned (and refreshed in background)
+        :param spawn: runs background refresh (in a new daemon thread by default)
+        :param backend: shared store of results (e.g. between worker processes)
+        :param lock_timeout: max seconds to wait for result loaded by another caller
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_staleness = max_staleness
+        self._spawn = spawn or (lambda func: threading.Thread(target=func, daemon=True).start())
+        self.backend = backend
+        self.lock_timeout = lock_timeout
+
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[tuple[str, str], dict] = collections.OrderedDict()
+        # keys being loaded by this process along with callbacks waking up their waiters
+        self._loading: dict[tuple[str, str], list[t.Callable[[], None]]] = {}
+        self._size = 0
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._lock_waits = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+
+    def call(self, endpoint: str, load: t.Callable, *args, ttl: float | None = None) -> t.Any:
+        """
+        Return stored result of endpoint call with given arguments or load (and store) it.
+
+        :param endpoint: method name
+        :param load: performs actual call with given arguments
+        :param ttl: seconds before result expires (never if omitted)
+        """
+        key = self._make_key(endpoint, *args)
+        state, value = self._lookup(key)
+        if state == self.FRESH:
+            return value
+
+        if state == self.STALE:
+            if self._try_lock(key):
+                self._spawn(lambda: self._refresh(key, load, args, ttl))
+            return value
+
+        locked = self._try_lock(key)
+        if not locked:
+            self._count_lock_wait()
+            deadline = time.monotonic() + self.lock_timeout
+            while not locked:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    # lock holder is too slow (or has crashed), do not wait any longer
+                    return self._load(key, load, args, ttl)
+                self._wait_for_unlock(key, timeout)
+                locked = self._try_lock(key)
+
+        try:
+            # result may have been loaded by previous lock holder
+            state, value = self._lookup(key, count=False)
+            if state == self.FRESH:
+                return value
+            return self._load(key, load, args, ttl)
+        finally:
+            self._unlock(key)
+
+    def invalidate(self, endpoint: str | None = None):
+        """
+        Drop stored results of given endpoint (method name) or all of them.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if endpoint is None or key[0] == endpoint]:
+                self._remove(key)
+
+        if self.backend is not None:
+            self.backend.delete(f'{endpoint}:' if endpoint else '')
+
+    @classmethod
+    def _make_key(cls, endpoint: str, *args) -> tuple[str, str]:
+        """
+        Key of endpoint call: method name along with canonical JSON of arguments.
+
+        Arguments are compared by value and may be unhashable: keys of dicts are sorted, items of sets are ordered,
+        dataclasses and models are encoded as their fields, dates as ISO strings, enums as their values.
+        Other objects are encoded by repr(), so it should not depend on object identity.
+        Key is the same in every process, so results of shared backend are found by other clients.
+        """
+        try:
+            return endpoint, json.dumps(args, sort_keys=True, separators=(',', ':'), default=cls._encode_key_arg)
+        except (TypeError, ValueError):
+            # e.g. dict with keys of different types
+            return endpoint, repr(args)
+
+    @staticmethod
+    def _encode_key_arg(value: t.Any) -> t.Any:
+        if hasattr(value, 'model_dump'):
+            return value.model_dump(mode='json')
+        if hasattr(value, '__dataclass_fields__') or hasattr(value, '__struct_fields__'):
+            fields = getattr(value, '__struct_fields__', None) or value.__dataclass_fields__
+            return {name: getattr(value, name) for name in fields}
+        if isinstance(value, Enum):
+            return value.value
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        if isinstance(value, (set, frozenset)):
+            return sorted(value, key=repr)
+        if isinstance(value, bytes):
+            return value.hex()
+        return repr(value)
+
+    @staticmethod
+    def _get_backend_key(key: tuple[str, str]) -> str:
+        return '{}:{}'.format(key[0], hashlib.sha256(key[1].encode()).hexdigest())
+
+    def _get_state(self, expires_at: float | None, now: float) -> str:
+        if expires_at is None or now < expires_at:
+            return self.FRESH
+        if now < expires_at + self.max_staleness:
+            return self.STALE
+        return self.MISSING
+
+    def _lookup(self, key: tuple[str, str], count: bool = True) -> tuple[str, t.Any]:
+        if self.backend is not None:
+            stored = self.backend.get(self._get_backend_key(key))
+            state = self.MISSING if stored is None else self._get_state(stored[1], time.time())
+            value = pickle.loads(stored[0]) if state != self.MISSING else None
+            expired = stored is not None and state == self.MISSING
+        else:
+            with self._lock:
+                entry = self._entries.get(key)
+                state = self.MISSING if entry is None else self._get_state(entry['expires_at'], time.monotonic())
+                value = entry['value'] if state != self.MISSING else None
+                expired = entry is not None and state == self.MISSING
+                if expired:
+                    self._remove(key)
+                elif entry is not None:
+                    self._entries.move_to_end(key)
+
+        if count:
+            with self._lock:
+                self._expirations += expired
+                if state == self.FRESH:
+                    self._hits += 1
+                elif state == self.STALE:
+                    self._stale_hits += 1
+                else:
+                    self._misses += 1
+
+        return state, value
+
+    def _try_lock(self, key: tuple[str, str]) -> bool:
+        """
+        Whether caller should load result (no one else is loading it).
+        """
+        if self.backend is not None:
+            locked = self.backend.try_lock(self._get_backend_key(key), lease=self.lock_timeout)
+        with self._lock:
+            if self.backend is None:
+                locked = key not in self._loading
+            if locked:
+                self._loading.setdefault(key, [])
+        return locked
+
+    def _add_waiter(self, key: tuple[str, str], wake: t.Callable[[], None]) -> bool:
+        """
+        Call wake once key is unlocked, False if it is not locked by this process.
+        """
+        with self._lock:
+            waiters = self._loading.get(key)
+            if waiters is None:
+                return False
+            waiters.append(wake)
+            return True
+
+    def _wait_for_unlock(self, key: tuple[str, str], timeout: float):
+        if self.backend is not None:
+            # lock holder may be another process which can not wake us up, so backend is polled
+            timeout = min(timeout, self.LOCK_POLL_INTERVAL)
+        unlocked = threading.Event()
+        if self._add_waiter(key, unlocked.set):
+            unlocked.wait(timeout)
+        elif self.backend is not None:
+            time.sleep(timeout)
+
+    def _count_lock_wait(self):
+        with self._lock:
+            self._lock_waits += 1
+
+    def _unlock(self, key: tuple[str, str]):
+        if self.backend is not None:
+            self.backend.unlock(self._get_backend_key(key))
+        with self._lock:
+            waiters = self._loading.pop(key, [])
+        for wake in waiters:
+            wake()
+
+    def _load(self, key: tuple[str, str], load: t.Callable, args: tuple, ttl: float | None) -> t.Any:
+        value = load(*args)
+        self._store(key, value, ttl)
+        return value
+
+    def _refresh(self, key: tuple[str, str], load: t.Callable, args: tuple, ttl: float | None):
+        try:
+            self._load(key, load, args, ttl)
+        except Exception:
+            # stale result is kept until max staleness is exceeded
+            with self._lock:
+                self._refresh_failures += 1
+        else:
+            with self._lock:
+                self._refreshes += 1
+        finally:
+            self._unlock(key)
+
+    def _store(self, key: tuple[str, str], value: t.Any, ttl: float | None):
+        if self.backend is not None:
+            expires_at = None if ttl is None else time.time() + ttl
+            self.backend.set(
+                self._get_backend_key(key),
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                expires_at=expires_at,
+                keep_until=None if expires_at is None else expires_at + self.max_staleness,
+            )
+            return
+
+        size = self._get_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = dict(
+                value=value,
+                size=size,
+                expires_at=None if ttl is None else time.monotonic() + ttl,
+            )
+            self._size += size
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: tuple[str, str]):
+        self._size -= self._entries.pop(key)['size']
+
+    @staticmethod
+    def _get_size(value: t.Any) -> int:
+        """
+        Approximate memory footprint of value along with nested objects.
+        """
+        size = 0
+        seen = set()
+        stack = [value]
+        while stack:
+            item = stack.pop()
+            if id(item) in seen or isinstance(item, type):
+                continue
+            seen.add(id(item))
+            size += sys.getsizeof(item)
+
+            if isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            elif isinstance(item, (list, tuple, set, frozenset)):
+                stack.extend(item)
+            elif hasattr(item, '__dict__'):
+                stack.append(item.__dict__)
+            elif hasattr(item, '__slots__'):
+                stack.extend(getattr(item, name) for name in item.__slots__ if hasattr(item, name))
+
+        return size
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                stale_hits=self._stale_hits,
+                misses=self._misses,
+                lock_waits=self._lock_waits,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                refreshes=self._refreshes,
+                refresh_failures=self._refresh_failures,
+                entries=len(self._entries),
+                bytes=self._size,
+            )
+
+
+class EndpointCacheBackend:
+    """
+    Store of encoded results of cacheable endpoints shared between clients (e.g. worker processes of a host).
+    Subclass it to keep results elsewhere (e.g. in Redis).
+    """
+
+    def get(self, key: str) -> tuple[bytes, float | None] | None:
+        """
+        Encoded result along with its expiry time (unix timestamp, None if it never expires).
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, expires_at: float | None, keep_until: float | None):
+        """
+        :param keep_until: unix timestamp after which expired result may be deleted (never if None)
+        """
+        raise NotImplementedError
+
+    def delete(self, prefix: str):
+        """
+        Delete results with keys starting with prefix (all if it is empty).
+        """
+        raise NotImplementedError
+
+    def try_lock(self, key: str, lease: float) -> bool:
+        """
+        Acquire exclusive right to load result, it is released after lease seconds if holder has failed to unlock.
+        """
+        raise NotImplementedError
+
+    def unlock(self, key: str):
+        raise NotImplementedError
+
+
+class SqliteEndpointCacheBackend(EndpointCacheBackend):
+    """
+    Endpoint cache backend in SQLite database file shared by processes of a host.
+    Results are stored pickled, so the file must be writable by trusted processes only.
+    """
+
+    def __init__(self, path: str, namespace: str = '', timeout: float = 5):
+        """
+        :param path: database file (created if missing)
+        :param namespace: prefix of keys (for different APIs sharing the same file)
+        :param timeout: max seconds to wait for database lock held by another process
+        """
+        self.path = path
+        self.namespace = namespace
+        self.timeout = timeout
+        self._local = threading.local()
+
+        connection = self._get_connection()
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, keep_until REAL)')
+        connection.execute('CREATE INDEX IF NOT EXISTS results_keep_until ON results (keep_until)')
+        connection.execute('CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, locked_until REAL NOT NULL)')
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # connections are not shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        return connection
+
+    def get(self, key: str) -> tuple[bytes, float | None] | None:
+        return self._get_connection().execute(
+            'SELECT value, expires_at FROM results WHERE key = ?',
+            (self.namespace + key,),
+        ).fetchone()
+
+    def set(self, key: str, value: bytes, expires_at: float | None, keep_until: float | None):
+        connection = self._get_connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO results (key, value, expires_at, keep_until) VALUES (?, ?, ?, ?)',
+            (self.namespace + key, value, expires_at, keep_until),
+        )
+        connection.execute('DELETE FROM results WHERE keep_until < ?', (time.time(),))
+
+    def delete(self, prefix: str):
+        prefix = self.namespace + prefix
+        self._get_connection().execute('DELETE FROM results WHERE substr(key, 1, ?) = ?', (len(prefix), prefix))
+
+    def try_lock(self, key: str, lease: float) -> bool:
+        now = time.time()
+        cursor = self._get_connection().execute(
+            'INSERT INTO locks (key, locked_until) VALUES (?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET locked_until = excluded.locked_until WHERE locks.locked_until < ?',
+            (self.namespace + key, now + lease, now),
+        )
+        return cursor.rowcount == 1
+
+    def unlock(self, key: str):
+        self._get_connection().execute('DELETE FROM locks WHERE key = ?', (self.namespace + key,))
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent requests: the first caller sends the request, others wait for its response.
+    Streamed response is read once (only if someone is waiting for it), then each caller gets its own copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, dict] = {}
+        self._requests = 0
+        self._coalesced = 0
+
+    @staticmethod
+    def get_key(method: str, url: str, body: str | bytes | None) -> str:
+        if isinstance(body, str):
+            body = body.encode()
+        return '{} {} {}'.format(method.upper(), url, hashlib.sha256(body or b'').hexdigest())
+
+    def call(self, key: str, func: t.Callable[[], t.Any]) -> t.Any:
+        """
+        Return result of func() called by the first of concurrent callers with the same key.
+        """
+        call, leader = self._join(key, done=threading.Event())
+        if not leader:
+            call['done'].wait()
+            return self._get_result(call)
+
+        try:
+            result = func()
+        except BaseException as e:
+            if self._leave(key, call):
+                call['error'] = e
+                call['done'].set()
+            raise
+
+        if not self._leave(key, call):
+            # no one is waiting, so response is not buffered
+            return result
+
+        try:
+            call['result'] = self._buffer(result)
+        except BaseException as e:
+            call['error'] = e
+        call['done'].set()
+        return self._get_result(call)
+
+    def _join(self, key: str, **call) -> tuple[dict, bool]:
+        with self._lock:
+            if key in self._calls:
+                self._calls[key]['followers'] += 1
+                self._coalesced += 1
+                return self._calls[key], False
+
+            self._calls[key] = dict(call, followers=0, result=None, error=None)
+            self._requests += 1
+            return self._calls[key], True
+
+    def _leave(self, key: str, call: dict) -> bool:
+        """
+        Finish call (callers coming next send new request), return whether someone is waiting for its result.
+        """
+        with self._lock:
+            del self._calls[key]
+            return call['followers'] > 0
+
+    @staticmethod
+    def _buffer(result: t.Any) -> t.Any:
+        if isinstance(result, io.IOBase) and not isinstance(result, CachedResponse):
+            # read response stream into memory to be replayed to every caller
+            return CachedResponse(result.read(), cached_objects=None)
+        return result
+
+    @staticmethod
+    def _get_result(call: dict) -> t.Any:
+        if call['error'] is not None:
+            raise call['error']
+
+        result = call['result']
+        if isinstance(result, CachedResponse):
+            # file-like response is consumed by deserializer, so each caller reads its own one
+            return CachedResponse(result.getvalue(), result.cached_objects)
+        return result
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                requests=self._requests,
+                coalesced=self._coalesced,
+                in_flight=len(self._calls),
+            )
+
+
+class HedgePolicy:
+    """
+    Decides when to hedge request: send second identical one if response has not arrived within rolling
+    percentile of recent latencies of endpoint. Extra load is capped by budget (percent of requests).
+    """
+
+    # max number of hedges sent at once after a period of fast responses
+    MAX_BUDGET = 10
+
+    def __init__(self, percentile: float = 95, budget_percent: float = 10, window: int = 100, min_samples: int = 20):
+        """
+        :param percentile: percentile of recent latencies of endpoint after which request is hedged
+        :param budget_percent: max number of hedges, percent of hedgeable requests
+        :param window: number of recent latencies kept per endpoint
+        :param min_samples: number of latencies of endpoint needed before its requests are hedged
+        """
+        self.percentile = percentile
+        self.budget_percent = budget_percent
+        self.window = window
+        self.min_samples = min_samples
+
+        self._lock = threading.Lock()
+        self._latencies: dict[str, collections.deque[float]] = {}
+        self._budget = 0.0
+        self._requests = 0
+        self._hedges = 0
+        self._hedges_won = 0
+
+    def get_delay(self, endpoint: str) -> float | None:
+        """
+        Count request of endpoint, return seconds after which it is hedged (None while latency is not known).
+        """
+        with self._lock:
+            self._requests += 1
+            self._budget = min(self.MAX_BUDGET, self._budget + self.budget_percent / 100)
+
+            latencies = self._latencies.get(endpoint)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+
+    def try_hedge(self) -> bool:
+        """
+        Whether hedge may be sent (budget allows it).
+        """
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            self._hedges += 1
+            return True
+
+    def record(self, endpoint: str, latency: float):
+        """
+        Save latency of successful request of endpoint.
+        """
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = collections.deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def count_win(self):
+        """
+        Hedge has responded before original request.
+        """
+        with self._lock:
+            self._hedges_won += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                requests=self._requests,
+                hedges=self._hedges,
+                hedges_won=self._hedges_won,
+            )
+
+
+class CallEvent:
+    """
+    Outcome of endpoint call along with durations of its phases (in seconds, None if phase has not happened).
+
+    Phases which HTTP library does not tell apart are reported as the enclosing one, e.g. connection
+    and send are included in time to first byte by urllib3, read of streamed response is included in parsing.
+    Construction of objects is included in parsing by deserializers which do both in one native call.
+    """
+
+    PHASES = ('serialize', 'connect', 'send', 'ttfb', 'read', 'parse', 'construct')
+
+    def __init__(self):
+        self.endpoint: str | None = None
+        self.method: str | None = None
+        self.url: str | None = None
+        self.status: int | None = None
+        self.error: Exception | None = None
+        self.attempts = 0
+        self.request_bytes: int | None = None
+        self.response_bytes: int | None = None
+        self.items: int | None = None
+
+        self.serialize: float | None = None
+        self.connect: float | None = None
+        self.send: float | None = None
+        self.ttfb: float | None = None
+        self.read: float | None = None
+        self.parse: float | None = None
+        self.construct: float | None = None
+        self.duration: float | None = None
+
+        # wall clock time for exported spans, monotonic one for durations
+        self.timestamp = time.time()
+        self.started_at = time.perf_counter()
+
+        self.responded = False
+        self.response: t.Any = None
+        self._merged_into: CallEvent | None = None
+
+    def add(self, phase: str, seconds: float):
+        setattr(self, phase, (getattr(self, phase) or 0.0) + seconds)
+
+    def count_read(self, seconds: float | None, wire_bytes: int):
+        if self._merged_into is not None:
+            # response of the winning attempt is read after it has been merged
+            self._merged_into.count_read(seconds, wire_bytes)
+            return
+        if seconds is not None:
+            # read of streamed response is measured by parser
+            self.add('read', seconds)
+        self.response_bytes = (self.response_bytes or 0) + wire_bytes
+
+    def fork(self) -> 'CallEvent':
+        """
+        Separate event for one of concurrent attempts of the call (e.g. hedged requests), see merge().
+        """
+        return CallEvent()
+
+    def merge(self, attempt: 'CallEvent'):
+        """
+        Take request phases of the attempt whose outcome is returned, other attempts are not reported.
+        """
+        self.attempts += attempt.attempts
+        self.status = attempt.status
+        for phase in ('connect', 'send', 'ttfb', 'read', 'parse'):
+            seconds = getattr(attempt, phase)
+            if seconds is not None:
+                self.add(phase, seconds)
+        if attempt.response_bytes is not None:
+            self.response_bytes = (self.response_bytes or 0) + attempt.response_bytes
+        attempt._merged_into = self
+
+    def phases(self) -> dict[str, float]:
+        """
+        Durations of phases which have happened.
+        """
+        return {phase: getattr(self, phase) for phase in self.PHASES if getattr(self, phase) is not None}
+
+    def __repr__(self) -> str:
+        return '<CallEvent {} {} status={} duration={}>'.format(self.endpoint, self.method, self.status, self.duration)
+
+
+class CallTracer:
+    """
+    Collects phase timings of endpoint calls and passes each finished call to hook (e.g. to export OpenTelemetry span).
+
+    Call starts with serialization of its arguments or with request, and is finished once its response
+    is deserialized (or request fails, or non-JSON response is read). JSON response which is not
+    deserialized (e.g. of endpoint returning nothing) is reported when the next call starts.
+    Phases are tied by context variable, so calls of concurrent threads and tasks do not mix up.
+    """
+
+    def __init__(self, hook: t.Callable[[CallEvent], None]):
+        """
+        :param hook: callable receiving each finished call (invoked synchronously, so it should be fast)
+        """
+        self.hook = hook
+        self._current: contextvars.ContextVar[CallEvent | None] = contextvars.ContextVar('api_call_event', default=None)
+
+    def measure(self, phase: str, func: t.Callable, *args, **kwargs) -> t.Any:
+        """
+        Call function, add its duration to phase of current call.
+        """
+        event = self._open_event()
+        started_at = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            event.add(phase, time.perf_counter() - started_at)
+
+    def start_request(self, endpoint: str, method: str, url: str, body: 'str | bytes | JsonArrayStream | None') -> CallEvent:
+        """
+        Request of current call is about to be sent.
+        """
+        event = self._open_event()
+        event.endpoint = endpoint
+        event.method = method.upper()
+        event.url = url
+        if isinstance(body, (str, bytes)):
+            event.request_bytes = len(body)
+        return event
+
+    def set_response(self, event: CallEvent, response: t.Any):
+        """
+        Request has succeeded, its response waits for deserializer (non-JSON one has been read already).
+        """
+        if isinstance(response, str):
+            self.finish(event)
+            return
+        event.responded = True
+        event.response = response
+
+    def take_event(self, raw_data: t.Any) -> CallEvent | None:
+        """
+        Call which response is about to be deserialized (None for other data, e.g. validated request payload).
+        """
+        event = self._current.get()
+        if event is None or not event.responded or event.response is not raw_data:
+            return None
+        # calls started while response is being deserialized (e.g. of other lazy iterators) get their own events
+        self._current.set(None)
+        event.response = None
+        return event
+
+    def trace_items(self, event: CallEvent, items: t.Iterator, many: bool, load: t.Callable | None = None) -> t.Iterator:
+        """
+        Yield deserialized items of call response, measure JSON parsing (except for read of response)
+        and construction of objects by loader (if given). Call is finished once all items are yielded,
+        single object is reported before it is returned.
+        """
+        read = event.read or 0.0
+        parse = construct = 0.0
+        count = 0
+        item = None
+        error = None
+        try:
+            while True:
+                started_at = time.perf_counter()
+                item = next(items, self)
+                parsed_at = time.perf_counter()
+                parse += parsed_at - started_at
+                if item is self:
+                    break
+                if load is not None:
+                    item = load(item)
+                    construct += time.perf_counter() - parsed_at
+                count += 1
+                if not many:
+                    break
+                yield item
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._finish_deserialization(event, parse - ((event.read or 0.0) - read), construct if load is not None else None, count, error)
+
+        if not many and count:
+            yield item
+
+    async def trace_items_async(self, event: CallEvent, items: t.AsyncIterator, load: t.Callable) -> t.AsyncIterator:
+        """
+        Yield objects of streamed call response (read and parsed item by item) as trace_items() does.
+        """
+        parse = construct = 0.0
+        count = 0
+        error = None
+        try:
+            while True:
+                started_at = time.perf_counter()
+                try:
+                    item = await items.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    parse += time.perf_counter() - started_at
+                parsed_at = time.perf_counter()
+                item = load(item)
+                construct += time.perf_counter() - parsed_at
+                count += 1
+                yield item
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._finish_deserialization(event, parse, construct, count, error)
+            # release response if caller stops early
+            await items.aclose()
+
+    def finish(self, event: CallEvent, error: Exception | None = None):
+        """
+        Report finished call to hook.
+        """
+        if self._current.get() is event:
+            self._current.set(None)
+        event.error = error
+        event.duration = time.perf_counter() - event.started_at
+        event.response = None
+        self.hook(event)
+
+    def _finish_deserialization(self, event: CallEvent, parse: float, construct: float | None, items: int, error: Exception | None):
+        event.add('parse', parse)
+        if construct is not None:
+            event.add('construct', construct)
+        event.items = items
+        self.finish(event, error)
+
+    def _open_event(self) -> CallEvent:
+        """
+        Event of current call, new one if there is no call in progress.
+        """
+        event = self._current.get()
+        if event is not None and event.responded:
+            # response of previous call has not been deserialized
+            self.finish(event)
+            event = None
+        if event is None:
+            event = CallEvent()
+            self._current.set(event)
+        return event
+
+
+class RequestBatcher:
+    """
+    Collects concurrent calls of single-item endpoint into batches sent as one call of its bulk counterpart.
+    Batch is sent when it is full or when its first call has waited for max delay,
+    results of bulk call are split back to callers by position.
+    """
+
+    def __init__(self, max_size: int = 100, max_delay: float = 0.005):
+        """
+        :param max_size: max number of items in batch (1 disables batching)
+        :param max_delay: max seconds to wait for other calls before batch is sent
+        """
+        self.max_size = max_size
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._batches: dict[str, dict] = {}
+        self._calls = 0
+        self._requests = 0
+
+    def call(self, endpoint: str, load_many: t.Callable[[list], t.Iterable], item: t.Any) -> t.Any:
+        """
+        Return result of bulk call for given item.
+
+        :param endpoint: method name
+        :param load_many: bulk endpoint, takes list of items and returns their results in the same order
+        """
+        if self.max_size <= 1:
+            return self._load(load_many, [item])[0]
+
+        with self._lock:
+            batch = self._batches.get(endpoint)
+            leader = batch is None
+            if leader:
+                # first caller sends the batch
+                batch = self._batches[endpoint] = dict(items=[], full=threading.Event(), done=threading.Event(), results=None, error=None)
+            index = len(batch['items'])
+            batch['items'].append(item)
+            if len(batch['items']) >= self.max_size:
+                self._close(endpoint, batch)
+
+        if not leader:
+            batch['done'].wait()
+        else:
+            batch['full'].wait(self.max_delay)
+            with self._lock:
+                self._close(endpoint, batch)
+            try:
+                batch['results'] = self._load(load_many, batch['items'])
+            except BaseException as e:
+                batch['error'] = e
+            batch['done'].set()
+
+        if batch['error'] is not None:
+            raise batch['error']
+        return batch['results'][index]
+
+    def _close(self, endpoint: str, batch: dict):
+        """
+        Stop collecting items into batch (callers coming next start a new one).
+        """
+        if self._batches.get(endpoint) is batch:
+            del self._batches[endpoint]
+            batch['full'].set()
+
+    def _load(self, load_many: t.Callable[[list], t.Iterable], items: list) -> list:
+        results = list(load_many(items))
+        return self._check_results(items, results)
+
+    def _check_results(self, items: list, results: list) -> list:
+        if len(results) != len(items):
+            raise ValueError(f'Bulk call returned {len(results)} results for {len(items)} items')
+
+        with self._lock:
+            self._calls += len(items)
+            self._requests += 1
+        return results
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(
+                calls=self._calls,
+                requests=self._requests,
+                pending=sum(len(batch['items']) for batch in self._batches.values()),
+            )
+
+
+class RateLimiter:
+    """
+    Token bucket which limits average rate of requests while allowing short bursts.
+
+    Each request takes a token, tokens are refilled at constant rate up to burst size.
+    Missing token is reserved in advance, so callers are served in order of arrival and wait
+    for their turn outside of the lock (in a thread, coroutine or greenlet, whatever caller is).
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        :param rate: average number of requests per second
+        :param burst: max number of requests sent at once after idle period
+        """
+        if rate <= 0:
+            raise ValueError(f'Rate limit must be positive, got {rate}')
+        self.rate = rate
+        self.burst = max(1, burst)
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._requests = 0
+        self._delayed = 0
+        self._wait_seconds = 0.0
+
+    def reserve(self) -> float:
+        """
+        Take a token, return seconds to wait before request may be sent.
+        """
+        with self._lock:
+            now = time.monotonic()
+            # negative balance stands for tokens reserved by waiting callers
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate) - 1
+            self._updated_at = now
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            self._requests += 1
+            if delay:
+                self._delayed += 1
+                self._wait_seconds += delay
+            return delay
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            return dict(
+                requests=self._requests,
+                delayed=self._delayed,
+                wait_seconds=round(self._wait_seconds, 3),
+            )
+
+
+def _get_func_name_verbose(func: t.Callable) -> str:
+    if hasattr(func, '__self__'):
+        if hasattr(func.__self__, '__name__'):
+            return '{}.{}'.format(func.__self__.__name__, func.__name__)
+        return '{}.{}'.format(func.__self__.__class__.__name__, func.__name__)
+    elif hasattr(func, '__name__'):
+        return func.__name__
+    return repr(func)
+
+
+def failsafe_call(
+    func: t.Callable,
+    exceptions: t.Iterable[t.Type[Exception]],
+    retry_policy: 'RetryPolicy',
+    args=None,
+    kwargs=None,
+    logger: t.Union[logging.Logger, t.Callable[[str], None]] = None,
+    idempotent: bool = True,
+    on_transitional_fail: t.Callable[[Exception, dict], None] = None,
+):
+    """
+    Call function and repeat the call on given exceptions while retry policy allows it.
+
+    :param on_transitional_fail: callback which is expected to wait for `info['delay']` seconds before next attempt
+    """
+    args = args or tuple()
+    kwargs = kwargs or dict()
+    func_name_verbose = _get_func_name_verbose(func)
+    attempt = 1
+
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except exceptions as e:
+            if logger:
+                message = 'got %s on %s, attempt %d / %d' % (
+                    e.__class__.__name__,
+                    func_name_verbose,
+                    attempt,
+                    retry_policy.max_attempts
+                )
+                if hasattr(logger, 'warning'):
+                    logger.warning(message)
+                else:
+                    logger(message)
+
+            delay = retry_policy.get_delay(e, attempt, idempotent=idempotent)
+            if delay is None:
+                raise e from None   # suppress context and multiple tracebacks of same error
+
+            if on_transitional_fail:
+                on_transitional_fail(e, dict(max_attempts=retry_policy.max_attempts, attempt=attempt, delay=delay))
+
+            attempt += 1
+
+
+REQUEST_COMPRESSION_ENCODINGS = ('gzip', 'zstd')
+
+
+def compress_request_body(body: bytes, encoding: str) -> bytes:
+    """
+    Compress request body according to Content-Encoding.
+
+    >>> gzip.decompress(compress_request_body(b'{"foo": "bar"}', 'gzip'))
+    b'{"foo": "bar"}'
+    """
+    if encoding == 'gzip':
+        # fast level is enough for repetitive JSON
+        return gzip.compress(body, compresslevel=1)
+
+    if encoding == 'zstd':
+        try:
+            from compression import zstd  # python >= 3.14
+            return zstd.compress(body)
+        except ImportError:
+            import zstandard  # optional dependency
+            return zstandard.ZstdCompressor().compress(body)
+
+    raise ValueError(f'Unsupported request compression: {encoding}, expected one of {REQUEST_COMPRESSION_ENCODINGS}')
+
+
+def build_curl_command(url: str, method: str, headers: dict[str, str], body: 'JSON_PAYLOAD | bytes | JsonArrayStream | None') -> str:
+    """
+    >>> build_curl_command('https://example.com', 'get', {}, '')
+    'curl "https://example.com"'
+
+    >>> build_curl_command('https://example.com', 'get', {'accept-encoding': 'gzip,deflate'}, '')
+    'curl "https://example.com" --compressed'
+
+    >>> build_curl_command('https://example.com', 'put', {}, b'[1, 2]')
+    'curl "https://example.com" -X PUT -d "[1, 2]"'
+
+    >>> build_curl_command('https://example.com', 'put', {}, [1, 2])
+    'curl "https://example.com" -X PUT -d "[1, 2]"'
+
+    >>> build_curl_command('https://example.com?param1=value1&param2=value2', 'post', {'content-type': 'application/json'}, '{"foo": "bar"}')
+    'curl "https://example.com?param1=value1&param2=value2" -X POST -H "content-type: application/json" -d "{\"foo\": \"bar\"}"'
+    """
+    method = method.upper()
+
+    if method != 'GET':
+        method = f' -X {method}'
+    else:
+        method = ''
+
+    # let curl negotiate and decode compressed response itself
+    compressed = ' --compressed' if any(k.lower() == 'accept-encoding' for k in headers) else ''
+    headers = ''.join(f' -H "{k}: {v}"' for k, v in headers.items() if k.lower() != 'accept-encoding') + compressed
+
+    if isinstance(body, JsonArrayStream):
+        # do not consume payload iterator
+        body = b''.join(body) if body.replayable else b'[...]'
+
+    if isinstance(body, bytes):
+        body = body.decode('utf8', errors='replace')
+    elif body is not None and not isinstance(body, str):
+        body = json.dumps(body)
+
+    if body:
+        body = body.replace('"', '\"')
+        body = f' -d "{body}"'
+    else:
+        body = ''
+
+    return f'curl "{url}"{method}{headers}{body}'
+
+
+def map_concurrently(
+    func: t.Callable[..., t.Any],
+    kwargs_iter: t.Iterable[dict[str, t.Any]],
+    executor: concurrent.futures.Executor,
+    max_workers: int,
+    ordered: bool = True,
+    return_exceptions: bool = True,
+) -> t.Iterator[tuple[dict[str, t.Any], t.Any]]:
+    """
+    Call func(**kwargs) in executor for each item of kwargs_iter, yield (kwargs, result) pairs.
+    Arguments are consumed lazily, no more than max_workers calls are submitted at once.
+
+    :param ordered: yield results in order of arguments (otherwise as soon as calls complete)
+    :param return_exceptions: yield exception of failed call as its result (other calls go on), otherwise raise it and drop calls not started yet
+    """
+    def call(kwargs: dict[str, t.Any]) -> t.Any:
+        result = func(**kwargs)
+        # streamed results are read in worker thread as well
+        return list(result) if isinstance(result, t.Iterator) else result
+
+    kwargs_iter = iter(kwargs_iter)
+    pending: list[tuple[dict[str, t.Any], concurrent.futures.Future]] = []
+    try:
+        while True:
+            for kwargs in itertools.islice(kwargs_iter, max(max_workers - len(pending), 0)):
+                pending.append((kwargs, executor.submit(call, kwargs)))
+            if not pending:
+                return
+
+            awaited = [pending[0][1]] if ordered else [future for _, future in pending]
+            concurrent.futures.wait(awaited, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            if ordered:
+                finished = []
+                while pending and pending[0][1].done():
+                    finished.append(pending.pop(0))
+            else:
+                done = [future.done() for _, future in pending]
+                finished = [item for item, is_done in zip(pending, done) if is_done]
+                pending = [item for item, is_done in zip(pending, done) if not is_done]
+
+            for kwargs, future in finished:
+                error = future.exception()
+                if error is None:
+                    yield kwargs, future.result()
+                elif return_exceptions:
+                    yield kwargs, error
+                else:
+                    raise error
+    finally:
+        # calls not started yet are dropped (e.g. on error or when caller stops iteration)
+        for _, future in pending:
+            future.cancel()
 
 
 class AllConstantsCollection:
@@ -616,5 +3023,14 @@ class AllDataclassesCollection:
 __all__ = [
     "AllConstantsCollection",
     "AllDataclassesCollection",
+    "CallEvent",
+    "CircuitBreaker",
+    "ConcurrencyLimiter",
+    "EndpointCacheBackend",
     "Generated",
+    "HedgePolicy",
+    "HttpCache",
+    "JsonCodec",
+    "RetryPolicy",
+    "SqliteEndpointCacheBackend",
 ]
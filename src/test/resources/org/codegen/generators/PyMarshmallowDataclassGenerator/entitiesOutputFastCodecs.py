@@ -0,0 +1,425 @@
+# Auto-generated by ez-codegen TEST_VERSION, do not edit
+# flake8: noqa
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from enum import Enum
+import marshmallow
+import marshmallow_dataclass
+import re
+import typing as t
+
+
+class BaseSchema(marshmallow.Schema):
+    class Meta:
+        # allow backward-compatible changes when new fields have added (simply ignore them)
+        unknown = marshmallow.EXCLUDE
+
+
+class JavaDurationField(marshmallow.fields.Field):
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            return str_java_duration_to_timedelta(value)
+        except ValueError as error:
+            raise marshmallow.ValidationError(str(error)) from error
+
+    def _serialize(self, value: timedelta | None, attr: str, obj, **kwargs):
+        if value is None:
+            return None
+        return timedelta_to_java_duration(value) if value else "PT0S"
+
+
+def str_java_duration_to_timedelta(duration: str) -> timedelta:
+    """
+    >>> str_java_duration_to_timedelta('PT5S')
+    datetime.timedelta(seconds=5)
+
+    >>> str_java_duration_to_timedelta('PT10H59S')
+    datetime.timedelta(seconds=36059)
+
+    >>> str_java_duration_to_timedelta('PT0H5M')
+    datetime.timedelta(seconds=300)
+    """
+    groups = re.findall(r'PT(\d+H)?(\d+M)?([\d.]+S)?', duration)[0]
+    if not groups:
+        raise ValueError('Invalid duration: %s' % duration)
+
+    hours, minutes, seconds = groups
+
+    hours = int((hours or '0H').rstrip('H'))
+    minutes = int((minutes or '0M').rstrip('M'))
+    seconds = float((seconds or '0S').rstrip('S'))
+
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def timedelta_to_java_duration(delta: timedelta) -> str:
+    """
+    Converts a timedelta to java duration string format
+    Milliseconds are discarded
+
+    >>> timedelta_to_java_duration(timedelta(minutes=15))
+    'PT900S'
+
+    >>> timedelta_to_java_duration(timedelta(days=1, minutes=21, seconds=35))
+    'PT87695S'
+
+    >>> timedelta_to_java_duration(timedelta(microseconds=123456))
+    'PT0S'
+    """
+    seconds = delta.total_seconds()
+    return 'PT{}S'.format(int(seconds))
+
+
+class StrEnum(str, Enum):
+    """Enum where members are also (and must be) strings."""
+
+    def __new__(cls, *values):
+        """Values must already be of type `str`"""
+        value = str(*values)
+        member = str.__new__(cls, value)
+        member._value_ = value
+        return member
+
+    def __str__(self):
+        return self._value_
+
+
+class EnumValue(StrEnum):
+    VALUE_1 = "value 1"
+    VALUE_2 = "value 2"
+    VALUE_3 = "value 3"
+
+
+def _validation_error(key: str | int, message: str) -> marshmallow.ValidationError:
+    return marshmallow.ValidationError({key: [message]})
+
+
+def _not_null(value: t.Any, key: str | int, allow_none: bool) -> bool:
+    if value is not None:
+        return True
+    if allow_none:
+        return False
+    raise _validation_error(key, 'Field may not be null.')
+
+
+def check_input_mapping(data: t.Any):
+    """
+    Decoders counterpart of marshmallow schema input type check.
+    """
+    if not isinstance(data, t.Mapping):
+        raise _validation_error('_schema', 'Invalid input type.')
+
+
+def missing_field_error(error: KeyError) -> marshmallow.ValidationError:
+    return _validation_error(error.args[0], 'Missing data for required field.')
+
+
+def decode_str(value: t.Any, key: str | int, allow_none: bool = False) -> str | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            raise _validation_error(key, 'Not a valid utf-8 string.')
+    raise _validation_error(key, 'Not a valid string.')
+
+
+def decode_enum(value: t.Any, key: str | int, enum_class: t.Type, allow_none: bool = False) -> t.Any:
+    value = decode_str(value, key, allow_none)
+    if value is None:
+        return None
+    try:
+        return enum_class(value)
+    except ValueError:
+        raise _validation_error(key, 'Must be one of: {}.'.format(', '.join(map(str, enum_class))))
+
+
+def decode_int(value: t.Any, key: str | int, allow_none: bool = False) -> int | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    if value is True or value is False:
+        raise _validation_error(key, 'Not a valid integer.')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise _validation_error(key, 'Not a valid integer.')
+    except OverflowError:
+        raise _validation_error(key, 'Number too large.')
+
+
+def decode_float(value: t.Any, key: str | int, allow_none: bool = False) -> float | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    if value is True or value is False:
+        raise _validation_error(key, 'Not a valid number.')
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise _validation_error(key, 'Not a valid number.')
+    except OverflowError:
+        raise _validation_error(key, 'Number too large.')
+    if value != value or value in (float('inf'), float('-inf')):
+        raise _validation_error(key, 'Special numeric values (nan or infinity) are not permitted.')
+    return value
+
+
+def decode_decimal(value: t.Any, key: str | int, allow_none: bool = False) -> 'Decimal | None':
+    if not _not_null(value, key, allow_none):
+        return None
+    if value is True or value is False:
+        raise _validation_error(key, 'Not a valid number.')
+    try:
+        value = Decimal(str(value))
+    except ArithmeticError:
+        raise _validation_error(key, 'Not a valid number.')
+    if not value.is_finite():
+        raise _validation_error(key, 'Special numeric values (nan or infinity) are not permitted.')
+    return value
+
+
+def decode_bool(value: t.Any, key: str | int, allow_none: bool = False) -> bool | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    try:
+        if value in marshmallow.fields.Boolean.truthy:
+            return True
+        if value in marshmallow.fields.Boolean.falsy:
+            return False
+    except TypeError:
+        pass
+    raise _validation_error(key, 'Not a valid boolean.')
+
+
+def decode_datetime(value: t.Any, key: str | int, allow_none: bool = False) -> 'datetime | None':
+    if not _not_null(value, key, allow_none):
+        return None
+    try:
+        return marshmallow.fields.DateTime.DESERIALIZATION_FUNCS['iso'](value)
+    except (TypeError, AttributeError, ValueError):
+        raise _validation_error(key, 'Not a valid datetime.')
+
+
+def decode_java_duration(value: t.Any, key: str | int, allow_none: bool = False) -> 'timedelta | None':
+    if not _not_null(value, key, allow_none):
+        return None
+    try:
+        return str_java_duration_to_timedelta(value)
+    except ValueError as error:
+        raise _validation_error(key, str(error))
+
+
+def decode_dict(value: t.Any, key: str | int, allow_none: bool = False) -> dict | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    if not isinstance(value, t.Mapping):
+        raise _validation_error(key, 'Not a valid mapping type.')
+    return dict(value)
+
+
+def decode_nested(value: t.Any, key: str | int, data_class: t.Type, allow_none: bool = False) -> t.Any:
+    if not _not_null(value, key, allow_none):
+        return None
+    try:
+        return data_class.from_dict(value)
+    except marshmallow.ValidationError as error:
+        raise marshmallow.ValidationError({key: error.messages})
+
+
+def decode_list(value: t.Any, key: str | int, decode_item: t.Callable, *args, allow_none: bool = False) -> list | None:
+    if not _not_null(value, key, allow_none):
+        return None
+    if not marshmallow.utils.is_collection(value):
+        raise _validation_error(key, 'Not a valid list.')
+    try:
+        return [decode_item(item, index, *args) for index, item in enumerate(value)]
+    except marshmallow.ValidationError as error:
+        raise marshmallow.ValidationError({key: error.messages})
+
+
+def encode_value(value: t.Any) -> t.Any:
+    return value
+
+
+def encode_str(value: t.Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def encode_int(value: t.Any) -> int | None:
+    return None if value is None else int(value)
+
+
+def encode_float(value: t.Any) -> float | None:
+    return None if value is None else float(value)
+
+
+def encode_bool(value: t.Any) -> bool | None:
+    if value is None:
+        return None
+    try:
+        if value in marshmallow.fields.Boolean.truthy:
+            return True
+        if value in marshmallow.fields.Boolean.falsy:
+            return False
+    except TypeError:
+        pass
+    return bool(value)
+
+
+def encode_datetime(value: 'datetime | None') -> str | None:
+    if value is None:
+        return None
+    # use ISO format: YYYY-MM-DDTHH:mm:ss[.ms]Z
+    value = value.astimezone(timezone.utc).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def encode_java_duration(value: 'timedelta | None') -> str | None:
+    if value is None:
+        return None
+    return timedelta_to_java_duration(value) if value else "PT0S"
+
+
+def encode_dict(value: t.Any) -> dict | None:
+    return None if value is None else dict(value)
+
+
+def encode_nested(value: t.Any) -> dict | None:
+    return None if value is None else value.to_dict()
+
+
+def encode_list(value: t.Any, encode_item: t.Callable) -> list | None:
+    return None if value is None else [encode_item(item) for item in value]
+
+
+@dataclass
+class BasicDto:
+    timestamp: datetime = field(metadata=dict(marshmallow_field=marshmallow.fields.DateTime()))
+    duration: timedelta = field(metadata=dict(marshmallow_field=JavaDurationField()))
+    enum_value: EnumValue = field(metadata=dict(marshmallow_field=marshmallow.fields.String(validate=[marshmallow.fields.validate.OneOf(list(map(str, EnumValue)))])))
+    json_value: dict = field(metadata=dict(marshmallow_field=marshmallow.fields.Dict()))
+    # short description
+    # very long description lol
+    documented_value: float = field(metadata=dict(marshmallow_field=marshmallow.fields.Float(data_key="customName")))
+    list_value: list[int] = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Integer(), data_key="listValue")))
+    optional_value: float = field(metadata=dict(marshmallow_field=marshmallow.fields.Float()), default=0)
+    nullable_value: bool | None = field(metadata=dict(marshmallow_field=marshmallow.fields.Boolean(allow_none=True)), default=None)
+    optional_list_value: list[int] = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Integer())), default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: t.Mapping[str, t.Any]) -> 'BasicDto':
+        check_input_mapping(data)
+        try:
+            kwargs = dict(
+                timestamp=decode_datetime(data["timestamp"], "timestamp"),
+                duration=decode_java_duration(data["duration"], "duration"),
+                enum_value=decode_enum(data["enum_value"], "enum_value", EnumValue),
+                json_value=decode_dict(data["json_value"], "json_value"),
+                documented_value=decode_float(data["customName"], "customName"),
+                list_value=decode_list(data["listValue"], "listValue", decode_int),
+            )
+        except KeyError as error:
+            raise missing_field_error(error) from None
+        if "optional_value" in data:
+            kwargs["optional_value"] = decode_float(data["optional_value"], "optional_value")
+        if "nullable_value" in data:
+            kwargs["nullable_value"] = decode_bool(data["nullable_value"], "nullable_value", allow_none=True)
+        if "optional_list_value" in data:
+            kwargs["optional_list_value"] = decode_list(data["optional_list_value"], "optional_list_value", decode_int)
+        return cls(**kwargs)
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "timestamp": encode_datetime(self.timestamp),
+            "duration": encode_java_duration(self.duration),
+            "enum_value": encode_str(self.enum_value),
+            "json_value": encode_dict(self.json_value),
+            "customName": encode_float(self.documented_value),
+            "listValue": encode_list(self.list_value, encode_int),
+            "optional_value": encode_float(self.optional_value),
+            "nullable_value": encode_bool(self.nullable_value),
+            "optional_list_value": encode_list(self.optional_list_value, encode_int),
+        }
+
+
+@dataclass
+class AdvancedDto:
+    """
+    entity with all-singing all-dancing properties
+    """
+    a: int = field(metadata=dict(marshmallow_field=marshmallow.fields.Integer()))
+    b: int = field(metadata=dict(marshmallow_field=marshmallow.fields.Integer()))
+
+    def __post_init__(self):
+        if not(self.a < self.b):
+            raise marshmallow.ValidationError('a must be < b')
+        if not(self.a >= 0):
+            raise marshmallow.ValidationError('a must be >= 0')
+
+    @property
+    def sum(self) -> int:
+        return self.a + self.b
+
+    @classmethod
+    def from_dict(cls, data: t.Mapping[str, t.Any]) -> 'AdvancedDto':
+        check_input_mapping(data)
+        try:
+            kwargs = dict(
+                a=decode_int(data["a"], "a"),
+                b=decode_int(data["b"], "b"),
+            )
+        except KeyError as error:
+            raise missing_field_error(error) from None
+        return cls(**kwargs)
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "a": encode_int(self.a),
+            "b": encode_int(self.b),
+        }
+
+
+@dataclass
+class ContainerDto:
+    """
+    entity with containers
+    """
+    basic_single: BasicDto = field(metadata=dict(marshmallow_field=marshmallow.fields.Nested(marshmallow_dataclass.class_schema(BasicDto, base_schema=BaseSchema), data_key="basic")))
+    basic_list: list[BasicDto] = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Nested(marshmallow_dataclass.class_schema(BasicDto, base_schema=BaseSchema)), data_key="basics")))
+    basic_optional_list: list[BasicDto] | None = field(metadata=dict(marshmallow_field=marshmallow.fields.List(marshmallow.fields.Nested(marshmallow_dataclass.class_schema(BasicDto, base_schema=BaseSchema)), allow_none=True, data_key="basic_nullable_list")))
+
+    @classmethod
+    def from_dict(cls, data: t.Mapping[str, t.Any]) -> 'ContainerDto':
+        check_input_mapping(data)
+        try:
+            kwargs = dict(
+                basic_single=decode_nested(data["basic"], "basic", BasicDto),
+                basic_list=decode_list(data["basics"], "basics", decode_nested, BasicDto),
+                basic_optional_list=decode_list(data["basic_nullable_list"], "basic_nullable_list", decode_nested, BasicDto, allow_none=True),
+            )
+        except KeyError as error:
+            raise missing_field_error(error) from None
+        return cls(**kwargs)
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "basic": encode_nested(self.basic_single),
+            "basics": encode_list(self.basic_list, encode_nested),
+            "basic_nullable_list": encode_list(self.basic_optional_list, encode_nested),
+        }
+
+
+__all__ = [
+    "AdvancedDto",
+    "BasicDto",
+    "ContainerDto",
+    "EnumValue",
+]
@@ -0,0 +1,75 @@
+# Auto-generated by ez-codegen TEST_VERSION, do not edit
+# flake8: noqa
+from datetime import datetime
+from datetime import timedelta
+from enum import Enum
+import msgspec
+
+
+class StrEnum(str, Enum):
+    """Enum where members are also (and must be) strings."""
+
+    def __new__(cls, *values):
+        """Values must already be of type `str`"""
+        value = str(*values)
+        member = str.__new__(cls, value)
+        member._value_ = value
+        return member
+
+    def __str__(self):
+        return self._value_
+
+
+class EnumValue(StrEnum):
+    VALUE_1 = "value 1"
+    VALUE_2 = "value 2"
+    VALUE_3 = "value 3"
+
+
+class BasicDto(msgspec.Struct, kw_only=True):
+    timestamp: datetime
+    duration: timedelta
+    enum_value: EnumValue
+    json_value: dict
+    # short description
+    # very long description lol
+    documented_value: float = msgspec.field(name="customName")
+    list_value: list[int] = msgspec.field(name="listValue")
+    optional_value: float = 0
+    nullable_value: bool | None = None
+    optional_list_value: list[int] = msgspec.field(default_factory=list)
+
+
+class AdvancedDto(msgspec.Struct, kw_only=True):
+    """
+    entity with all-singing all-dancing properties
+    """
+    a: int
+    b: int
+
+    def __post_init__(self):
+        if not(self.a < self.b):
+            raise msgspec.ValidationError('a must be < b')
+        if not(self.a >= 0):
+            raise msgspec.ValidationError('a must be >= 0')
+
+    @property
+    def sum(self) -> int:
+        return self.a + self.b
+
+
+class ContainerDto(msgspec.Struct, kw_only=True):
+    """
+    entity with containers
+    """
+    basic_single: BasicDto = msgspec.field(name="basic")
+    basic_list: list[BasicDto] = msgspec.field(name="basics")
+    basic_optional_list: list[BasicDto] | None = msgspec.field(name="basic_nullable_list")
+
+
+__all__ = [
+    "AdvancedDto",
+    "BasicDto",
+    "ContainerDto",
+    "EnumValue",
+]
@@ -0,0 +1,80 @@
+# Auto-generated by ez-codegen TEST_VERSION, do not edit
+# flake8: noqa
+from datetime import datetime
+from datetime import timedelta
+from enum import Enum
+import pydantic
+
+
+class StrEnum(str, Enum):
+    """Enum where members are also (and must be) strings."""
+
+    def __new__(cls, *values):
+        """Values must already be of type `str`"""
+        value = str(*values)
+        member = str.__new__(cls, value)
+        member._value_ = value
+        return member
+
+    def __str__(self):
+        return self._value_
+
+
+class EnumValue(StrEnum):
+    VALUE_1 = "value 1"
+    VALUE_2 = "value 2"
+    VALUE_3 = "value 3"
+
+
+class BasicDto(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(populate_by_name=True)
+    timestamp: datetime
+    duration: timedelta
+    enum_value: EnumValue
+    json_value: dict
+    # short description
+    # very long description lol
+    documented_value: float = pydantic.Field(alias="customName")
+    list_value: list[int] = pydantic.Field(alias="listValue")
+    optional_value: float = 0
+    nullable_value: bool | None = None
+    optional_list_value: list[int] = pydantic.Field(default_factory=list)
+
+
+class AdvancedDto(pydantic.BaseModel):
+    """
+    entity with all-singing all-dancing properties
+    """
+    model_config = pydantic.ConfigDict(populate_by_name=True)
+    a: int
+    b: int
+
+    @pydantic.model_validator(mode="after")
+    def check_conditions(self):
+        if not(self.a < self.b):
+            raise ValueError('a must be < b')
+        if not(self.a >= 0):
+            raise ValueError('a must be >= 0')
+        return self
+
+    @property
+    def sum(self) -> int:
+        return self.a + self.b
+
+
+class ContainerDto(pydantic.BaseModel):
+    """
+    entity with containers
+    """
+    model_config = pydantic.ConfigDict(populate_by_name=True)
+    basic_single: BasicDto = pydantic.Field(alias="basic")
+    basic_list: list[BasicDto] = pydantic.Field(alias="basics")
+    basic_optional_list: list[BasicDto] | None = pydantic.Field(alias="basic_nullable_list")
+
+
+__all__ = [
+    "AdvancedDto",
+    "BasicDto",
+    "ContainerDto",
+    "EnumValue",
+]